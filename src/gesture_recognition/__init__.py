@@ -6,5 +6,6 @@ This package handles all gesture detection and recognition functionality.
 
 from .gesture_detector import GestureDetector
 from .gesture_mapping import GestureMapping
+from .trajectory_recognizer import TrajectoryRecognizer
 
-__all__ = ['GestureDetector', 'GestureMapping'] 
\ No newline at end of file
+__all__ = ['GestureDetector', 'GestureMapping', 'TrajectoryRecognizer'] 
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Landmark data augmentation.
+
+Every transform works on a whole batch of hands, an (N, 21, 3) array in the
+gesture_data.csv layout (wrist at the origin, palm length 1), with one NumPy
+expression per step and per-sample random parameters:
+
+    finger lengths  each finger's bones from the MCP (thumb: CMC) outwards
+                    are scaled by a random factor
+    mirroring       x is negated for a random share of the batch, turning right
+                    hands into left hands; direction labels are swapped
+                    (move_left <-> move_right)
+    rotation        random roll in the image plane plus smaller pitch and yaw
+    scaling         independent x, y and z factors (camera aspect, foreshortening);
+                    a uniform scale is removed again by the palm-length normalization
+    jitter          Gaussian noise on every landmark
+
+Results are normalized back to the dataset layout. Augmenter.generate
+streams any number of samples in fixed-size chunks, so memory stays bounded
+however large the generated set; src.scripts.augment_dataset writes such
+sets to disk on a process pool.
+"""
+import logging
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .landmarks import NUM_LANDMARKS, normalize_to_dataset
+
+logger = logging.getLogger(__name__)
+
+# Landmark chains from the finger base to the tip: thumb, index, middle, ring, pinky
+FINGER_CHAINS = np.array([
+    [1, 2, 3, 4],
+    [5, 6, 7, 8],
+    [9, 10, 11, 12],
+    [13, 14, 15, 16],
+    [17, 18, 19, 20]
+])
+
+# Labels that name a direction and swap under mirroring
+MIRRORED_LABELS: Dict[str, str] = {
+    'move_left': 'move_right',
+    'move_right': 'move_left',
+    'swipe_left': 'swipe_right',
+    'swipe_right': 'swipe_left'
+}
+
+
+def rotation_matrices(roll: np.ndarray, pitch: np.ndarray, yaw: np.ndarray) -> np.ndarray:
+    """
+    Batched 3D rotation matrices.
+
+    Args:
+        roll: Angles about the camera axis (z), radians, shape (N,)
+        pitch: Angles about the x axis, radians, shape (N,)
+        yaw: Angles about the y axis, radians, shape (N,)
+
+    Returns:
+        numpy.ndarray: Matrices of shape (N, 3, 3), yaw @ pitch @ roll
+    """
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    zeros, ones = np.zeros_like(roll), np.ones_like(roll)
+    rz = np.stack([cr, -sr, zeros, sr, cr, zeros, zeros, zeros, ones], axis=-1).reshape(-1, 3, 3)
+    rx = np.stack([ones, zeros, zeros, zeros, cp, -sp, zeros, sp, cp], axis=-1).reshape(-1, 3, 3)
+    ry = np.stack([cy, zeros, sy, zeros, ones, zeros, -sy, zeros, cy], axis=-1).reshape(-1, 3, 3)
+    return ry @ rx @ rz
+
+
+def scale_fingers(landmarks: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """
+    Scale the bones of each finger, keeping the finger bases in place.
+
+    Args:
+        landmarks: Array of shape (N, 21, 3)
+        factors: Per-finger length factors of shape (N, 5)
+
+    Returns:
+        numpy.ndarray: New array of shape (N, 21, 3)
+    """
+    chains = landmarks[:, FINGER_CHAINS]                      # (N, 5, 4, 3)
+    bones = np.diff(chains, axis=2) * factors[:, :, None, None]
+    result = landmarks.copy()
+    result[:, FINGER_CHAINS[:, 1:]] = chains[:, :, :1] + np.cumsum(bones, axis=2)
+    return result
+
+
+def mirror(landmarks: np.ndarray, labels: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mirror the selected hands left to right and swap their direction labels.
+
+    Args:
+        landmarks: Array of shape (N, 21, 3), wrist-relative
+        labels: Labels of shape (N,)
+        mask: Boolean array of shape (N,) selecting the hands to mirror
+
+    Returns:
+        tuple: (landmarks, labels) as new arrays
+    """
+    landmarks = landmarks.copy()
+    landmarks[mask, :, 0] *= -1
+    # Object dtype, so a longer swapped label is not truncated to the input's string width
+    swapped = labels.astype(object)
+    for label, other in MIRRORED_LABELS.items():
+        swapped[mask & (labels == label)] = other
+    return landmarks, swapped.astype(str)
+
+
+class Augmenter:
+    """Random, batched landmark augmentation."""
+
+    def __init__(self, roll: float = 30.0, tilt: float = 15.0, scale: float = 0.15,
+                 jitter: float = 0.02, finger_length: float = 0.1, mirror: float = 0.5,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            roll: Largest in-plane rotation, degrees
+            tilt: Largest pitch and yaw, degrees
+            scale: Largest relative change of each axis' scale
+            jitter: Standard deviation of the landmark noise, palm lengths
+            finger_length: Largest relative change of a finger's length
+            mirror: Probability of mirroring a sample
+            seed: Random seed, None for a fresh one
+        """
+        self.roll = np.radians(roll)
+        self.tilt = np.radians(tilt)
+        self.scale = scale
+        self.jitter = jitter
+        self.finger_length = finger_length
+        self.mirror = mirror
+        self.rng = np.random.default_rng(seed)
+
+    def augment(self, landmarks: np.ndarray, labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply one random variant of every transform to each sample of a batch.
+
+        Args:
+            landmarks: Array of shape (N, 21, 3) in the dataset layout
+            labels: Labels of shape (N,)
+
+        Returns:
+            tuple: (augmented landmarks in the dataset layout, labels)
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float64)
+        labels = np.asarray(labels)
+        count = len(landmarks)
+        rng = self.rng
+        if self.finger_length:
+            landmarks = scale_fingers(landmarks, rng.uniform(1 - self.finger_length, 1 + self.finger_length,
+                                                             (count, len(FINGER_CHAINS))))
+        if self.mirror:
+            landmarks, labels = mirror(landmarks, labels, rng.random(count) < self.mirror)
+        rotations = rotation_matrices(rng.uniform(-self.roll, self.roll, count),
+                                      rng.uniform(-self.tilt, self.tilt, count),
+                                      rng.uniform(-self.tilt, self.tilt, count))
+        # Row vectors: x' = x R^T, with one matrix per sample
+        landmarks = landmarks @ np.swapaxes(rotations, 1, 2)
+        if self.scale:
+            landmarks *= rng.uniform(1 - self.scale, 1 + self.scale, (count, 1, 3))
+        if self.jitter:
+            landmarks += rng.normal(0.0, self.jitter, landmarks.shape)
+        return normalize_to_dataset(landmarks), labels
+
+    def generate(self, landmarks: np.ndarray, labels: np.ndarray, count: int,
+                 chunk_size: int = 65536) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Stream augmented samples drawn evenly from a dataset.
+
+        Args:
+            landmarks: Source samples of shape (M, 21, 3)
+            labels: Source labels of shape (M,)
+            count: Number of samples to generate
+            chunk_size: Samples per yielded chunk
+
+        Yields:
+            tuple: (landmarks of shape (n, 21, 3), labels of shape (n,)), n <= chunk_size
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float64).reshape(-1, NUM_LANDMARKS, 3)
+        labels = np.asarray(labels)
+        if not len(landmarks):
+            raise ValueError("No source samples to augment")
+        for start in range(0, count, chunk_size):
+            # Cycle through the sources so every one is used about equally often
+            indices = np.arange(start, min(start + chunk_size, count)) % len(landmarks)
+            yield self.augment(landmarks[indices], labels[indices])
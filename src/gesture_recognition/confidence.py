@@ -0,0 +1,211 @@
+"""
+Gesture confidence from rule margins.
+
+Every static gesture rule in GestureDetector is a conjunction of conditions of
+the form "landmark a is above landmark b" or "landmark a is near landmark b".
+Instead of a yes/no answer, each condition here yields its margin - how far
+inside the threshold the pose is. Landmarks are in the canonical hand frame of
+landmarks.canonicalize, so margins are in palm lengths whatever the distance
+to the camera or the tilt of the hand. A margin of MARGIN_SCALE palm lengths
+or more scores 1, a pose on the threshold scores 0, and a gesture scores its
+weakest condition. All conditions of all gestures are
+evaluated with a handful of numpy operations on index tables, for one hand of
+shape (21, 3) or a batch of shape (N, 21, 3); scoring only the detected gesture
+of a single hand takes a scalar path of a few microseconds.
+"""
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+# MediaPipe hand landmark indices used by the rules
+THUMB_MCP, THUMB_TIP = 2, 4
+INDEX_PIP, INDEX_TIP = 6, 8
+MIDDLE_PIP, MIDDLE_TIP = 10, 12
+RING_PIP, RING_TIP = 14, 16
+PINKY_PIP, PINKY_TIP = 18, 20
+
+# Rule thresholds in palm lengths (about 0.1 in image units at arm's length)
+SCROLL_GAP = 0.5
+TOUCH_DISTANCE = 0.5
+# Tunable thresholds by name, as in the 'gestures.thresholds' configuration
+DEFAULT_THRESHOLDS = {'scroll_gap': SCROLL_GAP, 'touch_distance': TOUCH_DISTANCE}
+
+# Margin, in palm lengths, at which a condition is fully confident
+MARGIN_SCALE = 0.2
+
+
+def _above(upper, lower, gap=0.0):
+    """Condition: y[upper] < y[lower] - gap (image y grows downwards)."""
+    return ('above', upper, lower, gap)
+
+
+def _near(a, b, threshold):
+    """Condition: xy distance between a and b < threshold."""
+    return ('near', a, b, threshold)
+
+
+def resolve_thresholds(thresholds: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """
+    Complete threshold overrides with the defaults.
+
+    Raises:
+        ValueError: If a threshold name is unknown
+    """
+    unknown = set(thresholds or {}) - set(DEFAULT_THRESHOLDS)
+    if unknown:
+        raise ValueError(f"Unknown gesture thresholds: {', '.join(sorted(unknown))}")
+    return {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+
+
+def gesture_conditions(thresholds: Optional[Dict[str, float]] = None) -> Dict[str, list]:
+    """
+    The conditions of each rule, mirroring the _is_*_gesture predicates.
+
+    Gestures are listed in the order GestureDetector tries them; the first
+    matching rule wins.
+
+    Args:
+        thresholds: Threshold overrides by name (see DEFAULT_THRESHOLDS)
+    """
+    thresholds = resolve_thresholds(thresholds)
+    scroll_gap, touch_distance = thresholds['scroll_gap'], thresholds['touch_distance']
+    return {
+        'cursor_move': [_above(INDEX_TIP, INDEX_PIP), _above(INDEX_PIP, MIDDLE_TIP),
+                        _above(INDEX_PIP, RING_TIP), _above(INDEX_PIP, PINKY_TIP)],
+        'cursor_click': [_above(THUMB_TIP, THUMB_MCP), _above(INDEX_TIP, INDEX_PIP),
+                         _above(MIDDLE_TIP, MIDDLE_PIP), _above(RING_TIP, RING_PIP),
+                         _above(PINKY_TIP, PINKY_PIP)],
+        'scroll_up': [_above(PINKY_TIP, INDEX_TIP, scroll_gap)],
+        'scroll_down': [_above(RING_TIP, INDEX_TIP, scroll_gap)],
+        'press_enter': [_near(THUMB_TIP, INDEX_TIP, touch_distance), _near(THUMB_TIP, MIDDLE_TIP, touch_distance)],
+        'minimize_window': [_above(INDEX_TIP, INDEX_PIP), _above(MIDDLE_TIP, MIDDLE_PIP),
+                            _above(MIDDLE_PIP, RING_TIP), _above(MIDDLE_PIP, PINKY_TIP)],
+        'open_application': [_above(INDEX_TIP, INDEX_PIP), _above(MIDDLE_TIP, MIDDLE_PIP),
+                             _above(RING_TIP, RING_PIP), _above(THUMB_MCP, THUMB_TIP),
+                             _above(PINKY_PIP, PINKY_TIP)],
+        'show_shutdown_options': [_above(INDEX_TIP, INDEX_PIP), _above(PINKY_TIP, PINKY_PIP),
+                                  _above(THUMB_MCP, THUMB_TIP), _above(MIDDLE_PIP, MIDDLE_TIP),
+                                  _above(RING_PIP, RING_TIP)],
+        'confirm_shutdown': [_above(THUMB_TIP, THUMB_MCP), _above(INDEX_TIP, INDEX_PIP),
+                             _above(PINKY_TIP, PINKY_PIP), _above(MIDDLE_PIP, MIDDLE_TIP),
+                             _above(RING_PIP, RING_TIP)],
+        'take_screenshot': [_above(INDEX_TIP, INDEX_PIP), _above(MIDDLE_TIP, MIDDLE_PIP),
+                            _above(RING_TIP, RING_PIP), _above(THUMB_MCP, THUMB_TIP),
+                            _above(PINKY_PIP, PINKY_TIP)]
+    }
+
+
+GESTURE_CONDITIONS = gesture_conditions()
+GESTURES = tuple(GESTURE_CONDITIONS)
+GESTURE_INDEX = {gesture: index for index, gesture in enumerate(GESTURES)}
+
+
+def _build_tables(gesture_conditions: Dict[str, list]):
+    conditions = [condition for gesture in GESTURES for condition in gesture_conditions[gesture]]
+    above = [i for i, c in enumerate(conditions) if c[0] == 'above']
+    near = [i for i, c in enumerate(conditions) if c[0] == 'near']
+    starts, position = [], 0
+    for gesture in GESTURES:
+        starts.append(position)
+        position += len(gesture_conditions[gesture])
+    return {
+        'count': len(conditions),
+        'above_slots': np.array(above),
+        'above_upper': np.array([conditions[i][1] for i in above]),
+        'above_lower': np.array([conditions[i][2] for i in above]),
+        'above_gap': np.array([conditions[i][3] for i in above]),
+        'near_slots': np.array(near),
+        'near_a': np.array([conditions[i][1] for i in near]),
+        'near_b': np.array([conditions[i][2] for i in near]),
+        'near_threshold': np.array([conditions[i][3] for i in near]),
+        'starts': np.array(starts)
+    }
+
+
+_TABLES = _build_tables(GESTURE_CONDITIONS)
+
+
+def _rule_margins(landmarks: np.ndarray, thresholds: Optional[Dict[str, float]]) -> np.ndarray:
+    """Margin of the weakest condition of every rule, in palm lengths."""
+    t = _TABLES if not thresholds else _build_tables(gesture_conditions(thresholds))
+    landmarks = np.asarray(landmarks, dtype=np.float64)
+    y = landmarks[..., 1]
+    margins = np.empty(landmarks.shape[:-2] + (t['count'],))
+    margins[..., t['above_slots']] = y[..., t['above_lower']] - y[..., t['above_upper']] - t['above_gap']
+    delta = landmarks[..., t['near_a'], :2] - landmarks[..., t['near_b'], :2]
+    margins[..., t['near_slots']] = t['near_threshold'] - np.hypot(delta[..., 0], delta[..., 1])
+    return np.minimum.reduceat(margins, t['starts'], axis=-1)
+
+
+def pose_confidences(landmarks: np.ndarray, thresholds: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Score every static gesture for one hand or a batch of hands.
+
+    Args:
+        landmarks: Canonical landmarks of shape (21, 3) or (N, 21, 3)
+        thresholds: Threshold overrides by name (see DEFAULT_THRESHOLDS)
+
+    Returns:
+        numpy.ndarray: Scores in [0, 1] of shape (len(GESTURES),) or (N, len(GESTURES)),
+            ordered like GESTURES; 0 means the rule does not match
+    """
+    return np.clip(_rule_margins(landmarks, thresholds) / MARGIN_SCALE, 0.0, 1.0)
+
+
+def classify_poses(landmarks: np.ndarray, thresholds: Optional[Dict[str, float]] = None):
+    """
+    Classify a batch of hands with the detector's static rules.
+
+    Args:
+        landmarks: Canonical landmarks of shape (N, 21, 3)
+        thresholds: Threshold overrides by name (see DEFAULT_THRESHOLDS)
+
+    Returns:
+        tuple: (gestures, confidences); gestures are indices into GESTURES of the
+            first matching rule, -1 where none matches, and confidences the pose
+            scores of those rules (0 where none matches)
+    """
+    margins = _rule_margins(landmarks, thresholds)
+    matched = margins > 0
+    gestures = np.where(matched.any(axis=-1), matched.argmax(axis=-1), -1)
+    winning = np.take_along_axis(margins, np.maximum(gestures, 0)[:, None], axis=-1)[:, 0]
+    confidences = np.where(gestures >= 0, np.clip(winning / MARGIN_SCALE, 0.0, 1.0), 0.0)
+    return gestures, confidences
+
+
+def gesture_confidence(landmarks: np.ndarray, gesture: str, tracking_score: float = 1.0,
+                       conditions: Optional[Dict[str, list]] = None) -> float:
+    """
+    Confidence of one gesture for one hand.
+
+    Args:
+        landmarks: Canonical landmarks of shape (21, 3)
+        gesture: Gesture name
+        tracking_score: MediaPipe handedness score of the hand, in [0, 1]
+        conditions: Rule conditions from gesture_conditions, defaults to GESTURE_CONDITIONS
+
+    Returns:
+        float: Confidence in [0, 1]; gestures without a pose rule (e.g. swipes)
+            get the tracking score alone
+    """
+    conditions = (conditions or GESTURE_CONDITIONS).get(gesture)
+    if conditions is None:
+        return float(tracking_score)
+    # Per-frame path: a few scalar comparisons beat numpy's per-call overhead
+    points = landmarks.tolist() if isinstance(landmarks, np.ndarray) else landmarks
+    score = MARGIN_SCALE
+    for kind, a, b, limit in conditions:
+        if kind == 'above':
+            margin = points[b][1] - points[a][1] - limit
+        else:
+            margin = limit - math.hypot(points[a][0] - points[b][0], points[a][1] - points[b][1])
+        score = min(score, margin)
+    return max(score, 0.0) / MARGIN_SCALE * float(tracking_score)
+
+
+def confidences_by_gesture(landmarks: np.ndarray, tracking_score: Optional[float] = 1.0,
+                           thresholds: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """Scores of all static gestures for one hand, keyed by gesture name."""
+    scores = pose_confidences(landmarks, thresholds) * tracking_score
+    return {gesture: float(score) for gesture, score in zip(GESTURES, scores)}
@@ -0,0 +1,328 @@
+"""
+User-defined static gestures.
+
+A custom gesture is learned from a few seconds of the live feed: the user
+holds a new pose, GestureRecorder collects its landmarks from the event bus
+and adds them to a GestureIndex, and the gesture can be recognized and bound
+to an action right away, without retraining anything.
+
+GestureIndex is an incremental nearest-neighbour index over pose features -
+the landmarks in the canonical hand frame (wrist at the origin, palm length
+1, palm axis up), so a pose matches whatever its position, size and tilt in
+the image. Samples live in one preallocated float32 matrix with their squared
+norms, grown by doubling; a lookup is one matrix-vector product and a
+partial sort, a few tens of microseconds for thousands of samples. Each
+gesture keeps at most max_per_class samples: beyond that, reservoir sampling
+replaces random ones, so a long recording keeps an even spread over time in
+bounded memory. Poses farther than max_distance from every sample match
+nothing, so the index never forces an unknown pose onto a custom gesture.
+"""
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .landmarks import NUM_LANDMARKS, canonicalize
+from ..utils.clock import SYSTEM_CLOCK
+from ..utils.event_bus import LandmarksEvent
+
+logger = logging.getLogger(__name__)
+
+# The wrist is the origin of the canonical frame and carries no information
+FEATURE_SIZE = (NUM_LANDMARKS - 1) * 3
+
+
+def pose_features(landmarks: np.ndarray, aspect_ratio: float = 1.0) -> np.ndarray:
+    """
+    Pose features of one hand or a batch of hands.
+
+    Args:
+        landmarks: Array of shape (21, 3) or (N, 21, 3) in normalized image coordinates
+        aspect_ratio: Frame width / height
+
+    Returns:
+        numpy.ndarray: float32 features of shape (60,) or (N, 60)
+    """
+    canonical = canonicalize(landmarks, aspect_ratio=aspect_ratio)
+    return canonical_features(canonical)
+
+
+def canonical_features(canonical: np.ndarray) -> np.ndarray:
+    """Pose features of landmarks already in the canonical hand frame."""
+    canonical = np.asarray(canonical)
+    return canonical[..., 1:, :].reshape(canonical.shape[:-2] + (FEATURE_SIZE,)).astype(np.float32)
+
+
+class GestureIndex:
+    """Incremental nearest-neighbour index of custom gesture samples."""
+
+    def __init__(self, max_per_class: int = 200, k: int = 5, max_distance: float = 0.15,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            max_per_class: Samples kept per gesture
+            k: Neighbours voting on a match
+            max_distance: Largest RMS landmark distance, in palm lengths, from the
+                nearest sample at which a pose still matches
+            seed: Random seed for the reservoir sampling
+        """
+        self.max_per_class = max_per_class
+        self.k = k
+        self.max_distance = max_distance
+        # Bindings of gestures to actions, saved with the samples (see GestureMapping.bind)
+        self.bindings: Dict[str, str] = {}
+        self._rng = np.random.default_rng(seed)
+        self._names: List[str] = []
+        self._seen: List[int] = []
+        self._features = np.empty((64, FEATURE_SIZE), dtype=np.float32)
+        self._norms = np.empty(64, dtype=np.float32)
+        self._classes = np.empty(64, dtype=np.int32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the known gestures."""
+        return list(self._names)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of stored samples per gesture."""
+        counts = np.bincount(self._classes[:self._size], minlength=len(self._names))
+        return dict(zip(self._names, counts.tolist()))
+
+    def add(self, name: str, features: np.ndarray) -> None:
+        """
+        Add samples of a gesture, creating it if it is new.
+
+        Args:
+            name: Gesture name
+            features: Pose features of shape (60,) or (N, 60)
+        """
+        features = np.asarray(features, dtype=np.float32).reshape(-1, FEATURE_SIZE)
+        if name not in self._names:
+            self._names.append(name)
+            self._seen.append(0)
+        class_id = self._names.index(name)
+        for feature in features:
+            self._seen[class_id] += 1
+            stored = self._seen[class_id] - 1
+            if stored < self.max_per_class:
+                slot = self._append_slot()
+            else:
+                # Reservoir sampling: every sample seen so far is kept with equal probability
+                position = self._rng.integers(self._seen[class_id])
+                if position >= self.max_per_class:
+                    continue
+                slot = np.flatnonzero(self._classes[:self._size] == class_id)[position]
+            self._features[slot] = feature
+            self._norms[slot] = feature @ feature
+            self._classes[slot] = class_id
+
+    def _append_slot(self) -> int:
+        if self._size == len(self._features):
+            capacity = 2 * len(self._features)
+            self._features = np.resize(self._features, (capacity, FEATURE_SIZE))
+            self._norms = np.resize(self._norms, capacity)
+            self._classes = np.resize(self._classes, capacity)
+        self._size += 1
+        return self._size - 1
+
+    def remove(self, name: str) -> bool:
+        """
+        Forget a gesture and its samples.
+
+        Returns:
+            bool: False if the gesture was unknown
+        """
+        if name not in self._names:
+            return False
+        class_id = self._names.index(name)
+        keep = np.flatnonzero(self._classes[:self._size] != class_id)
+        size = len(keep)
+        self._features[:size] = self._features[keep]
+        self._norms[:size] = self._norms[keep]
+        classes = self._classes[keep]
+        self._classes[:size] = classes - (classes > class_id)
+        self._size = size
+        del self._names[class_id]
+        del self._seen[class_id]
+        self.bindings.pop(name, None)
+        return True
+
+    def query(self, features: np.ndarray) -> Optional[Tuple[str, float]]:
+        """
+        Match a pose against the stored gestures.
+
+        Args:
+            features: Pose features of shape (60,)
+
+        Returns:
+            tuple or None: (gesture name, confidence in [0, 1]), None if no sample is
+                within max_distance
+        """
+        size = self._size
+        if not size:
+            return None
+        features = np.asarray(features, dtype=np.float32).ravel()
+        distances = self._norms[:size] - 2.0 * (self._features[:size] @ features) + features @ features
+        k = min(self.k, size)
+        nearest = np.argpartition(distances, k - 1)[:k] if k < size else np.arange(size)
+        # RMS distance per landmark in palm lengths
+        rms = np.sqrt(np.maximum(distances[nearest], 0.0) / (NUM_LANDMARKS - 1))
+        closest = rms.min()
+        if closest > self.max_distance:
+            return None
+        weights = 1.0 / (rms + 1e-3)
+        votes = np.bincount(self._classes[nearest], weights=weights, minlength=len(self._names))
+        class_id = int(votes.argmax())
+        agreement = votes[class_id] / votes.sum()
+        proximity = 1.0 - rms[self._classes[nearest] == class_id].min() / self.max_distance
+        return self._names[class_id], float(agreement * proximity)
+
+    def save(self, path: str) -> None:
+        """Save the samples and bindings to an .npz file."""
+        temporary = path + '.tmp.npz'
+        np.savez(temporary, features=self._features[:self._size], classes=self._classes[:self._size],
+                 seen=np.array(self._seen, dtype=np.int64),
+                 names=json.dumps(self._names), bindings=json.dumps(self.bindings))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'GestureIndex':
+        """
+        Load an index saved with save().
+
+        Args:
+            path: .npz file
+            **kwargs: GestureIndex settings
+
+        Returns:
+            GestureIndex: The loaded index
+        """
+        index = cls(**kwargs)
+        with np.load(path) as data:
+            names = json.loads(str(data['names']))
+            index.bindings = json.loads(str(data['bindings']))
+            features, classes = data['features'], data['classes']
+            for class_id, name in enumerate(names):
+                index.add(name, features[classes == class_id])
+                index._seen[class_id] = int(data['seen'][class_id])
+        return index
+
+
+class GestureRecorder:
+    """Record a custom gesture from the landmarks published on the event bus."""
+
+    def __init__(self, index: GestureIndex, event_bus, clock=None, path: Optional[str] = None):
+        """
+        Args:
+            index: Index the recorded samples are added to
+            event_bus: Bus carrying LandmarksEvents
+            clock: Clock providing now() in seconds, defaults to the monotonic system clock
+            path: File the index is saved to after each recording, None to keep it in memory
+        """
+        self.index = index
+        self.event_bus = event_bus
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.path = path
+        self.min_samples = 10
+        self._subscription = None
+        self._name = ''
+        self._samples: List[np.ndarray] = []
+        self._start = self._end = 0.0
+        self._aspect_ratio = 1.0
+        self._on_finished: Optional[Callable[[str, int], None]] = None
+
+    @property
+    def recording(self) -> bool:
+        return self._subscription is not None
+
+    def start(self, name: str, duration: float = 3.0, delay: float = 1.0, aspect_ratio: float = 1.0,
+              on_finished: Optional[Callable[[str, int], None]] = None) -> None:
+        """
+        Start recording a gesture.
+
+        Args:
+            name: Gesture name, new or existing (samples are added)
+            duration: Seconds of landmarks to record
+            delay: Seconds to get the pose ready before recording starts
+            aspect_ratio: Frame width / height of the camera
+            on_finished: Called with the name and the number of samples added (0 if too few)
+
+        Raises:
+            ValueError: If the name is empty
+        """
+        if not name:
+            raise ValueError("A custom gesture needs a name")
+        self.cancel()
+        self._name = name
+        self._samples = []
+        self._aspect_ratio = aspect_ratio
+        self._on_finished = on_finished
+        self._start = self.clock.now() + delay
+        self._end = self._start + duration
+        self._subscription = self.event_bus.subscribe(LandmarksEvent, self._on_landmarks,
+                                                      name='gesture-recorder')
+        logger.info("Recording custom gesture '%s' for %.1f s", name, duration)
+
+    def cancel(self) -> None:
+        """Stop recording without adding anything."""
+        if self._subscription is not None:
+            self.event_bus.unsubscribe(self._subscription)
+            self._subscription = None
+
+    def _on_landmarks(self, event: LandmarksEvent) -> None:
+        if event.timestamp >= self._end:
+            self._finish()
+        elif event.timestamp >= self._start and event.landmarks is not None:
+            self._samples.append(event.landmarks)
+
+    def _finish(self) -> None:
+        self.cancel()
+        added = 0
+        if len(self._samples) < self.min_samples:
+            logger.warning("Custom gesture '%s' not learned: only %d frames with a hand",
+                           self._name, len(self._samples))
+        else:
+            self.index.add(self._name, pose_features(np.stack(self._samples), self._aspect_ratio))
+            added = len(self._samples)
+            logger.info("Learned custom gesture '%s' from %d samples", self._name, added)
+            if self.path:
+                try:
+                    self.index.save(self.path)
+                except OSError as e:
+                    logger.error(f"Error saving custom gestures: {str(e)}")
+        if self._on_finished is not None:
+            self._on_finished(self._name, added)
+
+
+def create_gesture_index(config: Dict[str, Any]) -> Optional[GestureIndex]:
+    """
+    Create the custom gesture index from the 'custom_gestures' configuration section,
+    loading the saved gestures if the file exists.
+
+    Returns:
+        GestureIndex or None: The index, None if custom gestures are disabled
+    """
+    if not config['enabled']:
+        return None
+    settings = {'max_per_class': config['max_samples'], 'max_distance': config['max_distance']}
+    path = config['path']
+    if path and os.path.exists(path):
+        try:
+            index = GestureIndex.load(path, **settings)
+            logger.info("Loaded custom gestures: %s", ', '.join(index.names) or 'none')
+            return index
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Error loading custom gestures from {path}: {str(e)}")
+    return GestureIndex(**settings)
+
+
+def gesture_bindings(config: Dict[str, Any], index: Optional[GestureIndex]) -> Dict[str, str]:
+    """Actions of custom gestures: those saved with the gestures, overridden by the configuration."""
+    saved = index.bindings if index is not None else {}
+    return dict(saved, **config['bindings'])
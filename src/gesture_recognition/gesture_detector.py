@@ -1,71 +1,128 @@
 import cv2
-import mediapipe as mp
 import numpy as np
 import logging
-from typing import Tuple, Optional, Dict, Any
+from collections import deque
+from typing import Tuple, Optional, Dict, Any, List
 import pyautogui
-import time
+from .trajectory_recognizer import TrajectoryRecognizer
+from .hand_backends import HandBackend, HandDetection, LegacyHandsBackend, draw_hand
+from .landmarks import HandLandmark, canonicalize, hand_roi, roi_contains, Point
+from .confidence import gesture_confidence, gesture_conditions, resolve_thresholds
+from .custom_gestures import canonical_features
+from ..utils.clock import SYSTEM_CLOCK
+from ..utils.frame_pool import FramePool
+from ..utils.metrics import METRICS
+from ..utils.resource_governor import QUALITY_LADDER
 
 logger = logging.getLogger(__name__)
 
+# Static poses a swipe can be made with: the open hand
+SWIPE_POSES = frozenset({'cursor_click'})
+
 class GestureDetector:
-    def __init__(self):
-        """Initialize the gesture detector with updated parameters."""
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+    def __init__(self, clock=None, metrics=None, draw=True, thresholds=None, motion_gate=None, quality=None,
+                 custom_gestures=None, smoothing=None, backend=None):
+        """
+        Initialize the gesture detector with updated parameters.
+
+        Args:
+            clock: Clock providing now() in seconds, defaults to the monotonic system clock
+            metrics: Metrics registry for confidence statistics, defaults to the shared one
+            draw: Draw the landmark and gesture overlay on frames; off when nobody watches them
+            thresholds: Rule threshold overrides in palm lengths, e.g. from
+                src.scripts.tune_thresholds (see confidence.DEFAULT_THRESHOLDS)
+            motion_gate: Optional MotionGate; frames it finds unchanged reuse the
+                previous hand tracking result instead of running inference
+            quality: QualityLevel to track at (see src.utils.resource_governor),
+                defaults to the top of the quality ladder
+            custom_gestures: Optional GestureIndex of user-defined poses; a match
+                takes precedence over the built-in pose rules
+            smoothing: Optional LandmarkFilter applied to the tracked landmarks
+                before any gesture analysis
+            backend: HandBackend to track hands with, or a (picklable) callable creating one
+                from the model complexity, e.g. partial(create_hand_backend, config);
+                defaults to MediaPipe's legacy Hands solution. Created on the first frame,
+                so a detector that only classifies recorded landmarks loads no model.
+        """
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.thresholds = resolve_thresholds(thresholds)
+        self.gesture_conditions = gesture_conditions(self.thresholds)
+        self.draw = draw
+        self.metrics = metrics if metrics is not None else METRICS
+        # Time of the frame being processed, shared by all timing-dependent checks
+        self._frame_time = 0.0
+        # Hand tracking score of the hand being processed
+        self._tracking_score = 1.0
+        # Width / height of the camera frames, so landmark x and y share a unit
+        self.aspect_ratio = 1.0
+        self.quality = quality or QUALITY_LADDER[-1]
+        self._backend_factory = LegacyHandsBackend if backend is None else backend
+        self._backend: Optional[HandBackend] = backend if isinstance(backend, HandBackend) else None
+        # Pixel bounds (x0, y0, x1, y1) of the tracking crop in ROI mode, None for the whole frame
+        self._roi = None
+        # (capture time, crop) of recent frames, to map results of asynchronous backends
+        self._recent_rois = deque(maxlen=16)
         self.gesture_data = self._load_gesture_data()
         # Set PyAutoGUI failsafe
         pyautogui.FAILSAFE = False
-        # Set cursor movement speed
-        pyautogui.PAUSE = 0.01
         # Initialize click tracking
         self._last_click_time = 0
         self._click_count = 0
         self._click_threshold = 0.5  # seconds between clicks for double-click
+        # Motion-trajectory recognizer for dynamic gestures (swipes)
+        self.trajectory_recognizer = TrajectoryRecognizer()
+        # Landmarks of the most recent frame as a (21, 3) array, None without a hand
+        self.last_landmarks: Optional[np.ndarray] = None
+        # Scratch buffer for the RGB copy MediaPipe needs, reused every frame
+        self._rgb_pool = FramePool(capacity=1)
+        self._scaled_pool = FramePool(capacity=1)
+        self.motion_gate = motion_gate
+        self.custom_gestures = custom_gestures
+        self.smoothing = smoothing
+        # Hand detections of the last frame that went through inference
+        self._cached_detections: Optional[List[HandDetection]] = None
         logger.info("Gesture detector initialized with updated parameters")
 
-    def detect_gestures(self, frame: np.ndarray) -> Tuple[np.ndarray, Optional[Dict]]:
+    def detect_gestures(self, frame: np.ndarray, timestamp: Optional[float] = None) -> Tuple[np.ndarray, Optional[Dict]]:
         """
         Detect hand gestures in the given frame.
         
         Args:
             frame: numpy.ndarray, BGR image frame
+            timestamp: Capture time of the frame, defaults to the current clock time
             
         Returns:
             tuple: (processed_frame, gesture_data)
             gesture_data: dict containing gesture name and parameters
         """
         try:
-            # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Process the frame
-            results = self.hands.process(rgb_frame)
+            self._frame_time = self.clock.now() if timestamp is None else timestamp
+            self.aspect_ratio = frame.shape[1] / frame.shape[0]
+
+            detections = self._track_hands(frame)
+            self.last_landmarks = None
             
             # Draw hand landmarks and detect gestures
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
+            if detections:
+                for detection in detections:
+                    self.last_landmarks = detection.landmarks
+                    if self.smoothing is not None:
+                        self.last_landmarks = self.smoothing(self.last_landmarks, self._frame_time)
+                    self._tracking_score = detection.score
+
                     # Draw landmarks
-                    self.mp_draw.draw_landmarks(
-                        frame,
-                        hand_landmarks,
-                        self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                        self.mp_draw.DrawingSpec(color=(0, 0, 255), thickness=2)
-                    )
+                    if self.draw:
+                        draw_hand(frame, detection.landmarks)
                     
                     # Analyze gesture
-                    gesture_data = self._analyze_gesture(hand_landmarks)
+                    gesture_data = self._classify()
                     if gesture_data and gesture_data.get('gesture'):
+                        if not self.draw:
+                            return frame, gesture_data
                         # Draw gesture name on frame
-                        gesture_name = self.gesture_data[gesture_data['gesture']]['name']
-                        cv2.putText(frame, f"Gesture: {gesture_name}", (10, 30),
+                        gesture_name = self.gesture_data.get(gesture_data['gesture'], {}).get(
+                            'name', gesture_data['gesture'])
+                        cv2.putText(frame, f"Gesture: {gesture_name} ({gesture_data['confidence']:.0%})", (10, 30),
                                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
                         
                         # Draw cursor position
@@ -76,13 +133,222 @@ class GestureDetector:
                             cv2.circle(frame, (screen_x, screen_y), 5, (255, 0, 0), -1)
                             
                         return frame, gesture_data
-                    
+            else:
+                self.trajectory_recognizer.reset()
+                if self.smoothing is not None:
+                    self.smoothing.reset()
+
             return frame, None
             
         except Exception as e:
             logger.error(f"Error in gesture detection: {e}")
             return frame, None
 
+    @property
+    def backend(self) -> HandBackend:
+        """The hand landmark backend, created on first use."""
+        if self._backend is None:
+            self._backend = self._backend_factory(self.quality.model_complexity)
+        return self._backend
+
+    def set_backend(self, backend) -> None:
+        """
+        Track hands with another backend from the next frame on.
+
+        Args:
+            backend: HandBackend, or a callable creating one from the model complexity
+        """
+        try:
+            if self._backend is not None:
+                self._backend.close()
+            self._backend_factory = backend
+            self._backend = backend if isinstance(backend, HandBackend) else None
+            self._reset_tracking()
+        except Exception as e:
+            logger.error(f"Error switching hand tracking backend: {str(e)}")
+
+    def _reset_tracking(self) -> None:
+        """Forget the tracking crop and cached detections, e.g. after a tracker change."""
+        self._roi = None
+        self._recent_rois.clear()
+        self._cached_detections = None
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
+        if self.smoothing is not None:
+            self.smoothing.reset()
+
+    def set_quality(self, quality) -> None:
+        """
+        Switch to another quality level, e.g. on a resource governor transition.
+
+        Args:
+            quality: QualityLevel from src.utils.resource_governor
+        """
+        try:
+            if quality.model_complexity != self.quality.model_complexity and self._backend is not None:
+                self._backend.set_model_complexity(quality.model_complexity)
+            self.quality = quality
+            self._roi = None
+            self._cached_detections = None
+            if self.motion_gate is not None:
+                self.motion_gate.reset()
+        except Exception as e:
+            logger.error(f"Error switching detection quality: {str(e)}")
+
+    def _track_hands(self, frame: np.ndarray) -> List[HandDetection]:
+        """Run hand tracking on a frame, or reuse the last result if the motion gate finds it unchanged."""
+        if self.motion_gate is not None:
+            # The gate always sees the frame so that inferred frames become its reference
+            if not self.motion_gate.should_infer(frame) and self._cached_detections is not None:
+                self.metrics.increment('inference.cached')
+                return self._cached_detections
+
+        roi = self._roi if self.quality.roi else None
+        image = frame if roi is None else frame[roi[1]:roi[3], roi[0]:roi[2]]
+        scaled = None
+        max_width = self.quality.max_width
+        if max_width and image.shape[1] > max_width:
+            # Landmarks are normalized, so tracking a downscaled frame needs no mapping back
+            height = max(int(round(image.shape[0] * max_width / image.shape[1])), 1)
+            scaled = self._scaled_pool.acquire((height, max_width) + image.shape[2:])
+            cv2.resize(image, (max_width, height), dst=scaled, interpolation=cv2.INTER_AREA)
+            image = scaled
+
+        # Convert BGR to RGB into the reused scratch buffer
+        rgb_frame = self._rgb_pool.acquire(image.shape)
+        try:
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+
+            # Process the frame (backends copy the pixels they keep)
+            detections = self.backend.process(rgb_frame, self._frame_time)
+        finally:
+            self._rgb_pool.release(rgb_frame)
+            if scaled is not None:
+                self._scaled_pool.release(scaled)
+        self.metrics.increment('inference.run')
+        self._recent_rois.append((self._frame_time, roi))
+        detections = self._detections_to_frame(detections, roi, frame.shape)
+        if self.quality.roi:
+            self._update_roi(detections, frame.shape)
+        if self.motion_gate is not None:
+            self._cached_detections = detections
+        return detections
+
+    def _detections_to_frame(self, detections: List[HandDetection], roi, frame_shape) -> List[HandDetection]:
+        """Map detections to frame coordinates with the crop of the frame each was tracked on."""
+        mapped = []
+        for detection in detections:
+            source_roi = roi
+            if detection.timestamp is not None:
+                # Asynchronous result of an earlier frame, tracked in that frame's crop
+                crops = [crop for time, crop in self._recent_rois if time == detection.timestamp]
+                if not crops:
+                    logger.debug("Dropping a hand tracked on a frame with unknown crop")
+                    continue
+                source_roi = crops[-1]
+            if source_roi is not None:
+                self._roi_to_frame([detection], source_roi, frame_shape)
+            mapped.append(detection)
+        return mapped
+
+    @staticmethod
+    def _roi_to_frame(detections: List[HandDetection], roi, frame_shape) -> None:
+        """Map landmarks tracked in a crop back to normalized frame coordinates, in place."""
+        x0, y0, x1, y1 = roi
+        height, width = frame_shape[:2]
+        scale = np.array([(x1 - x0) / width, (y1 - y0) / height, (x1 - x0) / width], dtype=np.float32)
+        offset = np.array([x0 / width, y0 / height, 0.0], dtype=np.float32)
+        for detection in detections:
+            np.multiply(detection.landmarks, scale, out=detection.landmarks)
+            np.add(detection.landmarks, offset, out=detection.landmarks)
+
+    def _update_roi(self, detections: List[HandDetection], frame_shape) -> None:
+        """Keep the crop while the hand stays well inside it, so the tracker's own tracking stays valid."""
+        if not detections:
+            # Lost the hand: search the whole frame next time
+            self._roi = None
+            return
+        height, width = frame_shape[:2]
+        landmarks = detections[0].landmarks
+        if self._roi is None or not roi_contains(self._roi, landmarks, width, height):
+            self._roi = hand_roi(landmarks, width, height)
+
+    def classify_landmarks(self, landmarks: np.ndarray, timestamp: Optional[float] = None,
+                           tracking_score: float = 1.0) -> Dict[str, Any]:
+        """
+        Classify a landmark array without running hand tracking, e.g. from a recorded trace.
+
+        The landmarks are not smoothed: recorded landmarks (LandmarksEvent) already are.
+
+        Args:
+            landmarks: Array of shape (21, 3) with normalized (x, y, z) coordinates
+            timestamp: Capture time of the landmarks, defaults to the current clock time
+            tracking_score: Hand tracking score in [0, 1] to weight the confidence with
+
+        Returns:
+            dict: Gesture data as returned by detect_gestures, empty if no gesture matched
+        """
+        self._frame_time = self.clock.now() if timestamp is None else timestamp
+        self._tracking_score = tracking_score
+        self.last_landmarks = np.asarray(landmarks, dtype=np.float32)
+        return self._classify()
+
+    def _classify(self) -> Dict[str, Any]:
+        """Classify the static pose and the motion trajectory of the current hand."""
+        # All pose rules and confidence scores work in the canonical hand frame
+        canonical = canonicalize(self.last_landmarks, aspect_ratio=self.aspect_ratio)
+        gesture_data = self._match_custom_gesture(canonical)
+        if not gesture_data:
+            gesture_data = self._analyze_gesture(self.last_landmarks, canonical)
+
+        # A completed swipe of the open hand takes precedence over the static pose, and while the
+        # open hand sweeps the pose is held back so it does not click along the way; other poses
+        # keep their meaning while moving fast (a quick cursor move is not a swipe)
+        swipe = self._update_trajectory(self.last_landmarks)
+        if gesture_data.get('gesture') in SWIPE_POSES and not gesture_data.get('custom'):
+            if swipe:
+                gesture_data = {'gesture': swipe}
+            elif self.trajectory_recognizer.sweeping:
+                gesture_data = {}
+
+        if gesture_data:
+            gesture = gesture_data['gesture']
+            if 'confidence' not in gesture_data:
+                gesture_data['confidence'] = gesture_confidence(canonical, gesture, self._tracking_score,
+                                                                self.gesture_conditions)
+            self.metrics.observe('confidence.' + gesture, gesture_data['confidence'])
+        return gesture_data
+
+    def _match_custom_gesture(self, canonical: np.ndarray) -> Dict[str, Any]:
+        """Look the pose up among the user-defined gestures."""
+        if self.custom_gestures is None or not len(self.custom_gestures):
+            return {}
+        try:
+            match = self.custom_gestures.query(canonical_features(canonical))
+            if match is None:
+                return {}
+            name, confidence = match
+            index_tip = self.last_landmarks[HandLandmark.INDEX_FINGER_TIP]
+            return {
+                'gesture': name,
+                'custom': True,
+                'confidence': confidence * float(self._tracking_score),
+                'cursor_pos': {'x': 1 - float(index_tip[0]), 'y': float(index_tip[1])}
+            }
+        except Exception as e:
+            logger.error(f"Error matching custom gestures: {str(e)}")
+            return {}
+
+    def _update_trajectory(self, landmarks: np.ndarray) -> Optional[str]:
+        """Feed the tracked landmark positions to the trajectory recognizer."""
+        try:
+            points = landmarks[list(self.trajectory_recognizer.tracked_landmarks), :2].copy()
+            points[:, 0] = 1 - points[:, 0]  # Flip x-coordinate like the cursor
+            return self.trajectory_recognizer.update(points, self._frame_time)
+        except Exception as e:
+            logger.error(f"Error updating trajectory: {str(e)}")
+            return None
+
     def _calculate_finger_angle(self, tip, pip, mcp):
         """Calculate the angle between finger segments."""
         try:
@@ -116,12 +382,10 @@ class GestureDetector:
             ])
 
             is_pointing = index_extended and others_folded
-            if is_pointing:
-                logger.debug("Pointing gesture detected")
-                logger.debug(f"Index tip Y: {landmarks['index']['tip'].y:.3f}, Index PIP Y: {landmarks['index']['pip'].y:.3f}")
-                logger.debug("Other fingers Y: {:.3f}, {:.3f}, {:.3f}".format(
-                    landmarks['middle']['tip'].y, landmarks['ring']['tip'].y, landmarks['pinky']['tip'].y
-                ))
+            if is_pointing and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Pointing gesture detected (index tip y=%.3f, pip y=%.3f; other tips y=%.3f, %.3f, %.3f)",
+                             landmarks['index']['tip'].y, landmarks['index']['pip'].y,
+                             landmarks['middle']['tip'].y, landmarks['ring']['tip'].y, landmarks['pinky']['tip'].y)
 
             return is_pointing
 
@@ -142,7 +406,7 @@ class GestureDetector:
             ])
             
             if all_fingers_extended:
-                current_time = time.time()
+                current_time = self._frame_time
                 time_since_last_click = current_time - self._last_click_time
                 
                 if time_since_last_click < self._click_threshold:
@@ -169,7 +433,7 @@ class GestureDetector:
         try:
             pinky_tip = landmarks['pinky']['tip']
             index_tip = landmarks['index']['tip']
-            return pinky_tip.y < index_tip.y - 0.1
+            return pinky_tip.y < index_tip.y - self.thresholds['scroll_gap']
         except Exception as e:
             logger.error(f"Error in scroll up gesture detection: {str(e)}")
             return False
@@ -179,7 +443,7 @@ class GestureDetector:
         try:
             ring_tip = landmarks['ring']['tip']
             index_tip = landmarks['index']['tip']
-            return ring_tip.y < index_tip.y - 0.1
+            return ring_tip.y < index_tip.y - self.thresholds['scroll_gap']
         except Exception as e:
             logger.error(f"Error in scroll down gesture detection: {str(e)}")
             return False
@@ -205,9 +469,7 @@ class GestureDetector:
             ])
             
             if is_screenshot:
-                logger.debug("Screenshot gesture detected (index, middle, ring extended)")
-                logger.debug(f"Index extended: {index_extended}, Middle extended: {middle_extended}, Ring extended: {ring_extended}")
-                logger.debug(f"Thumb folded: {thumb_folded}, Pinky folded: {pinky_folded}")
+                logger.debug("Screenshot gesture detected (index, middle, ring extended; thumb, pinky folded)")
             
             return is_screenshot
             
@@ -230,9 +492,7 @@ class GestureDetector:
             
             is_minimize = index_extended and middle_extended and others_folded
             if is_minimize:
-                logger.debug("Minimize gesture detected")
-                logger.debug(f"Index extended: {index_extended}, Middle extended: {middle_extended}")
-                logger.debug(f"Other fingers folded: {others_folded}")
+                logger.debug("Minimize gesture detected (index, middle extended; ring, pinky folded)")
             
             return is_minimize
             
@@ -318,15 +578,15 @@ class GestureDetector:
             thumb_index_dist = np.linalg.norm(thumb_tip - index_tip)
             thumb_middle_dist = np.linalg.norm(thumb_tip - middle_tip)
             
-            # Check if fingers are touching thumb (within a small threshold)
+            # Check if fingers are touching thumb (within a fraction of the palm length)
             is_touching = all([
-                thumb_index_dist < 0.1,  # Threshold for touching
-                thumb_middle_dist < 0.1
+                thumb_index_dist < self.thresholds['touch_distance'],
+                thumb_middle_dist < self.thresholds['touch_distance']
             ])
             
             if is_touching:
-                logger.debug("Enter gesture detected (index and middle touching thumb)")
-                logger.debug(f"Thumb-Index distance: {thumb_index_dist:.3f}, Thumb-Middle distance: {thumb_middle_dist:.3f}")
+                logger.debug("Enter gesture detected (thumb-index distance %.3f, thumb-middle distance %.3f)",
+                             thumb_index_dist, thumb_middle_dist)
             
             return is_touching
             
@@ -334,37 +594,46 @@ class GestureDetector:
             logger.error(f"Error in enter gesture detection: {str(e)}")
             return False
 
-    def _analyze_gesture(self, hand_landmarks) -> Dict[str, Any]:
-        """Analyze hand landmarks to detect gestures."""
+    def _analyze_gesture(self, landmarks_array: np.ndarray, canonical: np.ndarray) -> Dict[str, Any]:
+        """
+        Analyze hand landmarks to detect gestures.
+
+        Args:
+            landmarks_array: Landmarks of shape (21, 3) in normalized image coordinates
+            canonical: The same landmarks in the canonical hand frame
+        """
         try:
-            # Cache frequently used landmarks
+            # Cache frequently used landmarks, in the canonical hand frame
+            points = canonical.tolist()
+            hand_landmark = HandLandmark
             landmarks = {
                 'thumb': {
-                    'tip': hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP],
-                    'mcp': hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_MCP]
+                    'tip': Point(*points[hand_landmark.THUMB_TIP]),
+                    'mcp': Point(*points[hand_landmark.THUMB_MCP])
                 },
                 'index': {
-                    'tip': hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP],
-                    'pip': hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP]
+                    'tip': Point(*points[hand_landmark.INDEX_FINGER_TIP]),
+                    'pip': Point(*points[hand_landmark.INDEX_FINGER_PIP])
                 },
                 'middle': {
-                    'tip': hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP],
-                    'pip': hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP]
+                    'tip': Point(*points[hand_landmark.MIDDLE_FINGER_TIP]),
+                    'pip': Point(*points[hand_landmark.MIDDLE_FINGER_PIP])
                 },
                 'ring': {
-                    'tip': hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP],
-                    'pip': hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP]
+                    'tip': Point(*points[hand_landmark.RING_FINGER_TIP]),
+                    'pip': Point(*points[hand_landmark.RING_FINGER_PIP])
                 },
                 'pinky': {
-                    'tip': hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP],
-                    'pip': hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP]
+                    'tip': Point(*points[hand_landmark.PINKY_TIP]),
+                    'pip': Point(*points[hand_landmark.PINKY_PIP])
                 }
             }
             
-            # Get index finger tip coordinates for cursor control
+            # Get index finger tip image coordinates for cursor control
+            index_tip = landmarks_array[hand_landmark.INDEX_FINGER_TIP]
             cursor_pos = {
-                'x': 1 - landmarks['index']['tip'].x,  # Flip x-coordinate
-                'y': landmarks['index']['tip'].y
+                'x': 1 - float(index_tip[0]),  # Flip x-coordinate
+                'y': float(index_tip[1])
             }
             
             # Check gestures in order of most common to least common
@@ -392,7 +661,7 @@ class GestureDetector:
                 gesture = None
                 
             if gesture:
-                logger.debug(f"Detected gesture: {gesture}")
+                logger.debug("Detected gesture: %s", gesture)
                 return {
                     'gesture': gesture,
                     'cursor_pos': cursor_pos
@@ -406,7 +675,8 @@ class GestureDetector:
 
     def release(self):
         """Release resources."""
-        self.hands.close()
+        if self._backend is not None:
+            self._backend.close()
         logger.info("Gesture detector resources released")
         print("Gesture Detector Started")
 
@@ -452,5 +722,13 @@ class GestureDetector:
             'press_enter': {
                 'name': 'Press Enter',
                 'description': 'All fingers extended'
+            },
+            'swipe_left': {
+                'name': 'Swipe Left',
+                'description': 'Sweep the hand quickly to the left'
+            },
+            'swipe_right': {
+                'name': 'Swipe Right',
+                'description': 'Sweep the hand quickly to the right'
             }
         }
@@ -1,18 +1,64 @@
 import logging
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 from ..utils.application_controller import ApplicationController
-import win32gui
-import win32con
-import pyautogui
+from ..utils.clock import SYSTEM_CLOCK
+from ..utils.config import merge_config
+from ..utils.event_bus import EventBus, GestureEvent, ActionResultEvent
+from ..utils.metrics import METRICS
+from .gesture_sequences import DEFAULT_SEQUENCES, SequenceAutomaton, parse_sequences
 import time
 import os
 
 logger = logging.getLogger(__name__)
 
+# Minimum detection confidence for gestures whose actions are costly or hard to undo
+DEFAULT_MIN_CONFIDENCE = {
+    'take_screenshot': 0.3,
+    'minimize_window': 0.3,
+    'open_application': 0.3,
+    'press_enter': 0.3,
+    'show_shutdown_options': 0.4,
+    'confirm_shutdown': 0.6
+}
+
+# Gestures acted on in every frame, where a newer frame supersedes a queued one; all other
+# gestures are discrete and must never be dropped on the way to actuation
+COALESCED_GESTURES = frozenset({'cursor_move'})
+
 class GestureMapping:
-    def __init__(self):
-        """Initialize gesture mapping with application controller."""
-        self.app_controller = ApplicationController()
+    def __init__(self, event_bus: Optional[EventBus] = None, clock=None, actuator=None,
+                 min_confidence: Optional[Dict[str, float]] = None, metrics=None, cursor_predictor=None,
+                 bindings: Optional[Dict[str, str]] = None,
+                 sequences: Optional[Dict[str, Dict[str, Any]]] = None,
+                 dispatch_sink: Optional[Callable[[float, float], None]] = None):
+        """
+        Initialize gesture mapping with application controller.
+
+        Args:
+            event_bus: Optional bus on which action results are published
+            clock: Clock providing now() in seconds, defaults to the monotonic system clock
+            actuator: Input injector, defaults to a DesktopActuator
+            min_confidence: Per-gesture minimum confidence, merged over DEFAULT_MIN_CONFIDENCE
+            metrics: Metrics registry for rejected gestures and latency, defaults to the shared one
+            cursor_predictor: Optional CursorPredictor fed with the measured capture-to-actuation latency
+            bindings: Actions of custom gestures by gesture name (see bind)
+            sequences: Gesture sequences by name, merged over DEFAULT_SEQUENCES: 'steps',
+                'within' (seconds) and the 'action' run on completion
+            dispatch_sink: Optional callback receiving (dispatch time, capture time) for each
+                executed frame, e.g. TraceRecorder.record_dispatch
+        """
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.metrics = metrics if metrics is not None else METRICS
+        self.min_confidence = dict(DEFAULT_MIN_CONFIDENCE, **(min_confidence or {}))
+        self.app_controller = ApplicationController(clock=self.clock, actuator=actuator,
+                                                    cursor_predictor=cursor_predictor)
+        self.cursor_predictor = cursor_predictor
+        self.dispatch_sink = dispatch_sink
+        # Capture time of the gesture being executed
+        self._frame_time = 0.0
+        self.actuator = self.app_controller.actuator
+        self.macros = self.app_controller.macros
+        self.event_bus = event_bus
         self.gesture_actions = {
             'cursor_move': self._handle_cursor_move,
             'cursor_click': self._handle_cursor_click,
@@ -23,37 +69,185 @@ class GestureMapping:
             'open_application': self._handle_open_application,
             'show_shutdown_options': self._handle_show_shutdown_options,
             'confirm_shutdown': self._handle_confirm_shutdown,
-            'press_enter': self._handle_press_enter
+            'press_enter': self._handle_press_enter,
+            'swipe_left': self._handle_swipe_left,
+            'swipe_right': self._handle_swipe_right
+        }
+        # Status text reported for each dispatched gesture
+        self.gesture_status = {
+            'cursor_move': 'Controlling cursor',
+            'cursor_click': 'Controlling cursor',
+            'scroll_up': 'Scrolling up',
+            'scroll_down': 'Scrolling down',
+            'take_screenshot': 'Screenshot taken',
+            'minimize_window': 'Window minimized',
+            'open_application': 'Opening application',
+            'show_shutdown_options': 'Shutdown options',
+            'confirm_shutdown': 'Shutdown confirmed',
+            'press_enter': 'Enter pressed',
+            'swipe_left': 'Swiped left',
+            'swipe_right': 'Swiped right'
         }
         self._last_enter_press = 0
         self._last_screenshot = 0
+        self._last_shutdown_options = float('-inf')
+        # Actions bound to custom gestures, and the last time each fired (for its cooldown)
+        self.custom_bindings: Dict[str, str] = {}
+        self._last_binding_time: Dict[str, float] = {}
+        for gesture, action in (bindings or {}).items():
+            try:
+                self.bind(gesture, action)
+            except ValueError as e:
+                logger.error(f"Error binding custom gesture: {str(e)}")
+        self.sequences = self._compile_sequences(merge_config(DEFAULT_SEQUENCES, sequences))
         logger.info("Gesture mapping initialized with updated gesture controls")
 
-    def execute_gesture(self, gesture_data: Dict[str, Any]) -> None:
-        """Execute the appropriate action based on the detected gesture."""
+    def execute_gesture(self, gesture_data: Dict[str, Any], timestamp: Optional[float] = None) -> bool:
+        """
+        Execute the appropriate action based on the detected gesture.
+
+        Args:
+            gesture_data: Gesture data from the detector
+            timestamp: Capture time of the frame, for latency measurement and compensation
+
+        Returns:
+            bool: True if an action was dispatched for the gesture
+        """
         try:
             if not gesture_data:
                 logger.debug("No gesture data received")
-                return
+                return False
+
+            now = self.clock.now()
+            # Without a worker thread (virtual clock) macro steps advance with the gestures
+            self.macros.run_pending()
+            self._frame_time = now if timestamp is None else timestamp
+            if timestamp is not None:
+                if self.dispatch_sink is not None:
+                    self.dispatch_sink(now, timestamp)
+                latency = now - timestamp
+                self.metrics.observe('latency.capture_to_actuation', latency)
+                if self.cursor_predictor is not None:
+                    self.cursor_predictor.observe_latency(latency)
                 
             gesture = gesture_data.get('gesture')
-            cursor_pos = gesture_data.get('cursor_pos')
             
-            if gesture in self.gesture_actions:
-                logger.debug(f"Executing action for gesture: {gesture}")
+            if self._below_min_confidence(gesture_data):
+                logger.debug("Ignoring %s: confidence %.2f below %.2f", gesture,
+                             gesture_data['confidence'], self.min_confidence[gesture])
+                self.metrics.increment('rejected_low_confidence.' + gesture)
+                return False
+            
+            dispatched = gesture in self.gesture_actions
+            if dispatched:
+                logger.debug("Executing action for gesture: %s", gesture)
                 self.gesture_actions[gesture](gesture_data)
             else:
-                logger.debug(f"Unknown gesture: {gesture}")
+                logger.debug("Unknown gesture: %s", gesture)
+            if self.sequences is not None:
+                for name in self.sequences.push(gesture, self._frame_time):
+                    self._run_sequence(name, gesture_data)
+            return dispatched
         except Exception as e:
             logger.error(f"Error executing gesture: {str(e)}")
+            return False
+
+    def on_gesture_event(self, event: GestureEvent) -> None:
+        """Event bus subscriber: execute the gesture and publish the action result."""
+        if not event.gesture:
+            return
+        success = self.execute_gesture(event.data, event.timestamp)
+        if self.event_bus is not None:
+            if not success and self._below_min_confidence(event.data):
+                status = f"Unsure about {event.gesture} ({event.data['confidence']:.0%}), ignored"
+            else:
+                status = self.gesture_status.get(event.gesture, event.gesture)
+            self.event_bus.publish(ActionResultEvent(event.gesture, success, status, self.clock.now()))
+
+    def bind(self, gesture: str, action: str, cooldown: float = 1.0) -> None:
+        """
+        Bind a (custom) gesture to an action.
+
+        Args:
+            gesture: Gesture name
+            action: A built-in gesture whose action to reuse (e.g. 'take_screenshot'),
+                'key:<key>' to press a key or 'hotkey:<key>+<key>...' for a combination
+            cooldown: Seconds a held pose waits before the action repeats
+
+        Raises:
+            ValueError: If the action is not understood or the gesture is built in
+        """
+        if gesture in self.gesture_actions and gesture not in self.custom_bindings:
+            raise ValueError(f"'{gesture}' is a built-in gesture")
+        kind, _, argument = action.partition(':')
+        if action in self.gesture_actions and action not in self.custom_bindings:
+            perform = self.gesture_actions[action]
+        elif kind == 'key' and argument:
+            perform = lambda gesture_data: self.actuator.press(argument)
+        elif kind == 'hotkey' and argument:
+            keys = argument.split('+')
+            perform = lambda gesture_data: self.actuator.hotkey(*keys)
+        else:
+            raise ValueError(f"Unknown action '{action}' for gesture '{gesture}'")
+
+        def handler(gesture_data: Dict[str, Any]) -> None:
+            now = self.clock.now()
+            if now - self._last_binding_time.get(gesture, float('-inf')) < cooldown:
+                return
+            self._last_binding_time[gesture] = now
+            try:
+                perform(gesture_data)
+                logger.info("Custom gesture %s: %s", gesture, action)
+            except Exception as e:
+                logger.error(f"Error performing {action} for {gesture}: {str(e)}")
+
+        self.gesture_actions[gesture] = handler
+        self.gesture_status[gesture] = f'Custom: {gesture}'
+        self.custom_bindings[gesture] = action
+
+    def unbind(self, gesture: str) -> bool:
+        """Remove the binding of a custom gesture; returns False if it had none."""
+        if self.custom_bindings.pop(gesture, None) is None:
+            return False
+        del self.gesture_actions[gesture]
+        del self.gesture_status[gesture]
+        self._last_binding_time.pop(gesture, None)
+        return True
+
+    def _compile_sequences(self, config: Dict[str, Dict[str, Any]]) -> Optional[SequenceAutomaton]:
+        """Bind the actions of the configured sequences and compile them into one automaton."""
+        sequences = []
+        for sequence in parse_sequences(config):
+            try:
+                self.bind(sequence.name, config[sequence.name].get('action', ''))
+            except ValueError as e:
+                logger.error(f"Error binding gesture sequence: {str(e)}")
+                continue
+            self.gesture_status[sequence.name] = f'Sequence: {sequence.name}'
+            sequences.append(sequence)
+        return SequenceAutomaton(sequences) if sequences else None
+
+    def _run_sequence(self, name: str, gesture_data: Dict[str, Any]) -> None:
+        """Run the action of a completed sequence and report it."""
+        logger.info("Gesture sequence completed: %s", name)
+        self.metrics.increment('sequence.' + name)
+        self.gesture_actions[name](gesture_data)
+        if self.event_bus is not None:
+            self.event_bus.publish(ActionResultEvent(name, True, self.gesture_status[name], self.clock.now()))
+
+    def _below_min_confidence(self, gesture_data: Dict[str, Any]) -> bool:
+        """Check whether a detection is too uncertain to act on."""
+        confidence = gesture_data.get('confidence')
+        return confidence is not None and confidence < self.min_confidence.get(gesture_data.get('gesture'), 0.0)
 
     def _handle_cursor_move(self, gesture_data: Dict[str, Any]) -> None:
         """Handle cursor movement gesture."""
         try:
             cursor_pos = gesture_data.get('cursor_pos', {})
             if isinstance(cursor_pos, dict) and 'x' in cursor_pos and 'y' in cursor_pos:
-                logger.debug(f"Processing cursor movement to position: {cursor_pos}")
-                self.app_controller.control_cursor(cursor_pos, 'move')
+                logger.debug("Processing cursor movement to (%.3f, %.3f)", cursor_pos['x'], cursor_pos['y'])
+                self.app_controller.control_cursor(cursor_pos, 'move', self._frame_time,
+                                                   gesture_data.get('confidence'))
             else:
                 logger.warning(f"Invalid cursor position data: {cursor_pos}")
         except Exception as e:
@@ -64,7 +258,8 @@ class GestureMapping:
         try:
             cursor_pos = gesture_data.get('cursor_pos', {})
             if isinstance(cursor_pos, dict) and 'x' in cursor_pos and 'y' in cursor_pos:
-                self.app_controller.control_cursor(cursor_pos, 'click')
+                self.app_controller.control_cursor(cursor_pos, 'click', self._frame_time,
+                                                   gesture_data.get('confidence'))
             else:
                 logger.warning(f"Invalid cursor position data: {cursor_pos}")
         except Exception as e:
@@ -88,7 +283,7 @@ class GestureMapping:
         """Handle screenshot gesture."""
         try:
             # Add a small delay to prevent multiple rapid screenshots
-            current_time = time.time()
+            current_time = self.clock.now()
             if hasattr(self, '_last_screenshot') and current_time - self._last_screenshot < 2.0:
                 logger.debug("Screenshot throttled")
                 return
@@ -99,8 +294,8 @@ class GestureMapping:
                 os.makedirs(screenshots_dir)
                 logger.info(f"Created screenshots directory: {screenshots_dir}")
             
-            # Take full screen screenshot using pyautogui
-            screenshot = pyautogui.screenshot()
+            # Take full screen screenshot
+            screenshot = self.actuator.screenshot()
             
             # Save screenshot with timestamp in screenshots directory
             timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -117,11 +312,8 @@ class GestureMapping:
     def _handle_minimize_window(self, gesture_data: Dict[str, Any]) -> None:
         """Handle minimize window gesture."""
         try:
-            # Get the current active window
-            hwnd = win32gui.GetForegroundWindow()
-            if hwnd:
-                # Minimize the window
-                win32gui.ShowWindow(hwnd, win32con.SW_MINIMIZE)
+            # Minimize the current active window
+            if self.actuator.minimize_foreground_window():
                 logger.info("Minimized active window")
             else:
                 logger.warning("No active window found to minimize")
@@ -137,32 +329,31 @@ class GestureMapping:
             logger.error(f"Error handling open application: {str(e)}")
 
     def _handle_show_shutdown_options(self, gesture_data: Dict[str, Any]) -> None:
-        """Handle show shutdown options gesture."""
+        """Open the shutdown menu, once per time the pose is shown."""
         try:
-            # TODO: Implement shutdown options display
-            logger.info("Show shutdown options gesture detected")
+            current_time = self.clock.now()
+            shown_again = current_time - self._last_shutdown_options > 0.5
+            self._last_shutdown_options = current_time
+            if shown_again:
+                self.app_controller.show_shutdown_options()
         except Exception as e:
             logger.error(f"Error handling show shutdown options: {str(e)}")
 
     def _handle_confirm_shutdown(self, gesture_data: Dict[str, Any]) -> None:
-        """Handle confirm shutdown gesture."""
-        try:
-            # TODO: Implement shutdown confirmation
-            logger.info("Confirm shutdown gesture detected")
-        except Exception as e:
-            logger.error(f"Error handling confirm shutdown: {str(e)}")
+        """Confirm shutdown gesture: only acts as the last step of the 'shutdown' sequence."""
+        logger.debug("Confirm shutdown gesture detected")
 
     def _handle_press_enter(self, gesture_data: Dict[str, Any]) -> None:
         """Press the Enter key."""
         try:
             # Add a small delay to prevent multiple rapid presses
-            current_time = time.time()
+            current_time = self.clock.now()
             if current_time - self._last_enter_press < 1.0:
                 logger.debug("Enter key press throttled")
                 return
                 
             # Press Enter key
-            pyautogui.press('enter')
+            self.actuator.press('enter')
             logger.info("Enter key pressed")
             self._last_enter_press = current_time
             
@@ -170,6 +361,22 @@ class GestureMapping:
             logger.error(f"Error pressing Enter key: {str(e)}")
             logger.error(f"Error details: {str(e)}", exc_info=True)
 
+    def _handle_swipe_left(self, gesture_data: Dict[str, Any]) -> None:
+        """Go back (previous slide, page or image) on a left swipe."""
+        try:
+            self.actuator.press('left')
+            logger.info("Swipe left: previous")
+        except Exception as e:
+            logger.error(f"Error handling swipe left: {str(e)}")
+
+    def _handle_swipe_right(self, gesture_data: Dict[str, Any]) -> None:
+        """Go forward (next slide, page or image) on a right swipe."""
+        try:
+            self.actuator.press('right')
+            logger.info("Swipe right: next")
+        except Exception as e:
+            logger.error(f"Error handling swipe right: {str(e)}")
+
     def get_gesture_instructions(self) -> Dict[str, str]:
         """Get human-readable instructions for each gesture."""
         return {
@@ -181,6 +388,8 @@ class GestureMapping:
             'minimize_window': 'Raise index and middle fingers with hover to minimize',
             'open_application': 'Raise index, middle, and ring fingers to open app',
             'show_shutdown_options': 'Raise index, middle, ring, and pinky fingers to show shutdown options',
-            'confirm_shutdown': 'Make a fist with hover to confirm shutdown',
-            'take_screenshot': 'Extend index, middle, and ring fingers (others closed) to take screenshot'
+            'confirm_shutdown': 'Make a fist within 5 seconds of showing shutdown options to confirm shutdown',
+            'take_screenshot': 'Extend index, middle, and ring fingers (others closed) to take screenshot',
+            'swipe_left': 'Sweep the hand quickly to the left to go back',
+            'swipe_right': 'Sweep the hand quickly to the right to go forward'
         } 
\ No newline at end of file
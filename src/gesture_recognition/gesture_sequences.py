@@ -0,0 +1,166 @@
+"""
+Gesture sequences (combos).
+
+A sequence is a list of gestures performed one after another within a time
+window, e.g. show_shutdown_options then confirm_shutdown within 5 seconds.
+All configured sequences are compiled into one deterministic automaton (a
+trie of their steps with Aho-Corasick failure links, completed over the
+gestures they use), so a gesture event advances every sequence at once with
+a single table lookup, whatever the number of sequences.
+
+Step events are gesture changes: a pose held over many frames is one step,
+and the same gesture counts again only after a pause of more than hold_gap
+seconds (hand lowered, or another pose held). Gestures no sequence uses are
+ignored, so a transitional frame between two steps does not break a combo.
+
+Timeouts are evaluated lazily against the timestamps of the steps when the
+next gesture arrives, so nothing is polled per frame: a partial match whose
+window has passed falls back to the longest suffix that can still complete.
+"""
+import logging
+from collections import deque, namedtuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A combo: its name, the gestures in order and the seconds allowed from the first to the last
+GestureSequence = namedtuple('GestureSequence', ['name', 'steps', 'within'])
+
+# Sequences by name, each with the action run when it completes (see GestureMapping.bind)
+DEFAULT_SEQUENCES: Dict[str, Dict[str, Any]] = {
+    # show_shutdown_options opens the Windows shutdown menu, 's' then shuts down
+    'shutdown': {'steps': ['show_shutdown_options', 'confirm_shutdown'], 'within': 5.0, 'action': 'key:s'}
+}
+
+
+def parse_sequences(config: Dict[str, Dict[str, Any]]) -> List[GestureSequence]:
+    """
+    Sequences from their configuration, skipping those without steps.
+
+    Args:
+        config: Sequence settings by name: 'steps' (gesture names) and 'within' (seconds)
+
+    Returns:
+        list: The sequences
+
+    Raises:
+        ValueError: If a sequence's steps or window are invalid
+    """
+    sequences = []
+    for name, settings in config.items():
+        steps = settings.get('steps') or []
+        if not steps:
+            continue
+        if isinstance(steps, str) or not all(isinstance(step, str) and step for step in steps):
+            raise ValueError(f"Steps of sequence '{name}' must be a list of gesture names")
+        within = float(settings.get('within', 0))
+        if within <= 0:
+            raise ValueError(f"Sequence '{name}' needs a positive 'within' window")
+        sequences.append(GestureSequence(name, tuple(steps), within))
+    return sequences
+
+
+class SequenceAutomaton:
+    """Recognize many gesture sequences at once with one state machine."""
+
+    def __init__(self, sequences: Iterable[GestureSequence], hold_gap: float = 0.3):
+        """
+        Args:
+            sequences: Sequences to recognize
+            hold_gap: Seconds without a gesture after which repeating it counts as a new step
+        """
+        self.sequences = [sequence for sequence in sequences if sequence.steps]
+        self.hold_gap = hold_gap
+        self._length = max((len(sequence.steps) for sequence in self.sequences), default=1)
+        self._compile()
+        self.reset()
+
+    def _compile(self) -> None:
+        # Trie of the steps: depth of each state and the longest window of the sequences through it
+        goto: List[Dict[str, int]] = [{}]
+        self._depth = [0]
+        self._window = [0.0]
+        ends: List[List[GestureSequence]] = [[]]
+        for sequence in self.sequences:
+            state = 0
+            for step in sequence.steps:
+                following = goto[state].get(step)
+                if following is None:
+                    following = goto[state][step] = len(goto)
+                    goto.append({})
+                    self._depth.append(self._depth[state] + 1)
+                    self._window.append(0.0)
+                    ends.append([])
+                state = following
+                self._window[state] = max(self._window[state], sequence.within)
+            ends[state].append(sequence)
+
+        # Breadth-first: failure links to the longest proper suffix that is also a prefix,
+        # missing transitions filled in from the failure state, outputs inherited from it
+        self.alphabet = frozenset(step for sequence in self.sequences for step in sequence.steps)
+        self._fail = [0] * len(goto)
+        self._delta: List[Dict[str, int]] = [{} for _ in goto]
+        self._outputs: List[Tuple[GestureSequence, ...]] = [tuple(end) for end in ends]
+        queue = deque()
+        for symbol in self.alphabet:
+            following = goto[0].get(symbol, 0)
+            self._delta[0][symbol] = following
+            if following:
+                queue.append(following)
+        while queue:
+            state = queue.popleft()
+            self._outputs[state] += self._outputs[self._fail[state]]
+            for symbol in self.alphabet:
+                following = goto[state].get(symbol)
+                if following is None:
+                    self._delta[state][symbol] = self._delta[self._fail[state]][symbol]
+                else:
+                    self._fail[following] = self._delta[self._fail[state]][symbol]
+                    self._delta[state][symbol] = following
+                    queue.append(following)
+        logger.info("Compiled %d gesture sequences into %d states", len(self.sequences), len(goto))
+
+    def reset(self) -> None:
+        """Forget all partial matches."""
+        self._state = 0
+        self._times = [0.0] * self._length
+        self._count = 0
+        self._last: Optional[str] = None
+        self._last_time = float('-inf')
+
+    @property
+    def progress(self) -> int:
+        """Steps of the longest partial match in progress."""
+        return self._depth[self._state]
+
+    def _start(self, steps: int) -> float:
+        """Time of the first of the last `steps` steps."""
+        return self._times[(self._count - steps) % self._length]
+
+    def push(self, gesture: Optional[str], timestamp: float) -> Tuple[str, ...]:
+        """
+        Advance all sequences with a gesture event.
+
+        Args:
+            gesture: Detected gesture
+            timestamp: Capture time of the gesture in seconds
+
+        Returns:
+            tuple: Names of the sequences completed by this event
+        """
+        if gesture not in self.alphabet:
+            return ()
+        held = gesture == self._last and timestamp - self._last_time <= self.hold_gap
+        self._last, self._last_time = gesture, timestamp
+        if held:
+            return ()
+
+        state = self._state
+        # Drop partial matches too old to complete, keeping the longest suffix that still can
+        while state and timestamp - self._start(self._depth[state]) > self._window[state]:
+            state = self._fail[state]
+        state = self._state = self._delta[state][gesture]
+        self._times[self._count % self._length] = timestamp
+        self._count += 1
+        return tuple(sequence.name for sequence in self._outputs[state]
+                     if timestamp - self._start(len(sequence.steps)) <= sequence.within)
@@ -0,0 +1,335 @@
+"""
+Hand landmark backends.
+
+Everything after hand tracking works on plain arrays, so the tracker behind
+GestureDetector is exchangeable. A backend takes an RGB frame and its
+capture time and returns one HandDetection per hand: the (21, 3) landmarks in
+normalized image coordinates, the handedness label and the tracking score.
+
+    legacy  MediaPipe's original Hands solution (mp.solutions.hands), with the
+            lite (0) and full (1) landmark models of the quality ladder
+    tasks   MediaPipe Tasks HandLandmarker from a .task model file, in VIDEO
+            mode (synchronous) or LIVE_STREAM mode (asynchronous: each call
+            returns the latest finished result, usually one frame old, so
+            inference overlaps capture; its detections carry the capture time
+            of the frame they were tracked on)
+    replay  landmarks from a session trace or the gesture dataset, with no
+            inference at all: for tests, benchmarks of everything downstream
+            of tracking, and machines without a usable model
+
+'auto' takes the Tasks backend when its model file exists and the legacy
+solution otherwise, falling back to the other one if the first fails to
+load (recent MediaPipe releases no longer ship mp.solutions).
+src.scripts.benchmark_hand_backends compares latency and CPU use of the
+backends side by side.
+"""
+import logging
+import os
+import threading
+from collections import namedtuple
+from typing import Any, Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from .landmarks import HAND_CONNECTIONS, NUM_LANDMARKS, landmarks_to_array
+
+logger = logging.getLogger(__name__)
+
+# One tracked hand: (21, 3) float32 landmarks, 'Left' or 'Right', tracking score in [0, 1], and the
+# capture time of the frame it was tracked on if that is an earlier frame (asynchronous backends)
+HandDetection = namedtuple('HandDetection', ['landmarks', 'handedness', 'score', 'timestamp'], defaults=(None,))
+
+BACKENDS = ('auto', 'legacy', 'tasks', 'replay')
+
+
+class HandBackend:
+    """Interface of hand landmark backends."""
+
+    name = 'none'
+
+    def process(self, rgb: np.ndarray, timestamp: float) -> List[HandDetection]:
+        """
+        Track the hands in a frame.
+
+        Args:
+            rgb: RGB image, shape (height, width, 3)
+            timestamp: Capture time of the frame in seconds
+
+        Returns:
+            list: One HandDetection per hand, empty without hands. The caller owns
+                the landmark arrays and may modify them.
+        """
+        raise NotImplementedError
+
+    def set_model_complexity(self, model_complexity: int) -> None:
+        """Switch the landmark model (0: lite, 1: full) where the backend has several."""
+
+    def close(self) -> None:
+        """Release the tracker."""
+
+
+class LegacyHandsBackend(HandBackend):
+    """MediaPipe's legacy Hands solution."""
+
+    name = 'legacy'
+
+    def __init__(self, model_complexity: int = 1, max_hands: int = 1, min_detection_confidence: float = 0.5,
+                 min_tracking_confidence: float = 0.5):
+        """
+        Raises:
+            RuntimeError: If the installed MediaPipe has no legacy solutions
+        """
+        import mediapipe as mp
+        solutions = getattr(mp, 'solutions', None)
+        if solutions is None:
+            raise RuntimeError(f"MediaPipe {getattr(mp, '__version__', '')} has no legacy Hands solution")
+        self._solution = solutions.hands
+        self.max_hands = max_hands
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.model_complexity = model_complexity
+        self.hands = self._create(model_complexity)
+
+    def _create(self, model_complexity: int):
+        return self._solution.Hands(
+            static_image_mode=False,
+            max_num_hands=self.max_hands,
+            model_complexity=model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
+        )
+
+    def process(self, rgb: np.ndarray, timestamp: float) -> List[HandDetection]:
+        results = self.hands.process(rgb)
+        detections = []
+        for index, hand_landmarks in enumerate(results.multi_hand_landmarks or []):
+            try:
+                category = results.multi_handedness[index].classification[0]
+                handedness, score = category.label, float(category.score)
+            except (AttributeError, IndexError, TypeError):
+                handedness, score = '', 1.0
+            detections.append(HandDetection(landmarks_to_array(hand_landmarks), handedness, score))
+        return detections
+
+    def set_model_complexity(self, model_complexity: int) -> None:
+        if model_complexity != self.model_complexity:
+            self.hands.close()
+            self.hands = self._create(model_complexity)
+            self.model_complexity = model_complexity
+
+    def close(self) -> None:
+        self.hands.close()
+
+
+class TasksHandBackend(HandBackend):
+    """MediaPipe Tasks HandLandmarker."""
+
+    name = 'tasks'
+
+    def __init__(self, model_path: str, running_mode: str = 'video', max_hands: int = 1,
+                 min_detection_confidence: float = 0.5, min_tracking_confidence: float = 0.5):
+        """
+        Args:
+            model_path: hand_landmarker.task model file
+            running_mode: 'video' (synchronous) or 'live_stream' (asynchronous, latest result)
+            max_hands: Hands to track
+            min_detection_confidence: Minimum palm detection and hand presence score
+            min_tracking_confidence: Minimum tracking score before detection runs again
+
+        Raises:
+            FileNotFoundError: If the model file does not exist
+            ValueError: If the running mode is unknown
+        """
+        import mediapipe as mp
+        from mediapipe.tasks.python import BaseOptions, vision
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Hand landmarker model not found: {model_path}")
+        modes = {'video': vision.RunningMode.VIDEO, 'live_stream': vision.RunningMode.LIVE_STREAM}
+        if running_mode not in modes:
+            raise ValueError(f"Unknown running mode '{running_mode}', expected one of: {', '.join(modes)}")
+        self._mp = mp
+        self.live_stream = running_mode == 'live_stream'
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path),
+            running_mode=modes[running_mode],
+            num_hands=max_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._on_result if self.live_stream else None
+        )
+        self._landmarker = vision.HandLandmarker.create_from_options(options)
+        self._last_ms = -1
+        self._lock = threading.Lock()
+        self._latest: List[HandDetection] = []
+        # Capture times of the frames in flight, by millisecond timestamp
+        self._pending: Dict[int, float] = {}
+
+    def process(self, rgb: np.ndarray, timestamp: float) -> List[HandDetection]:
+        # Tasks require strictly increasing integer millisecond timestamps
+        timestamp_ms = max(int(timestamp * 1000), self._last_ms + 1)
+        self._last_ms = timestamp_ms
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=np.ascontiguousarray(rgb))
+        if not self.live_stream:
+            return self._convert(self._landmarker.detect_for_video(image, timestamp_ms))
+        with self._lock:
+            self._pending[timestamp_ms] = timestamp
+        self._landmarker.detect_async(image, timestamp_ms)
+        with self._lock:
+            # Copies: the same result is returned until the next one arrives
+            return [detection._replace(landmarks=detection.landmarks.copy()) for detection in self._latest]
+
+    def _on_result(self, result, image, timestamp_ms: int) -> None:
+        detections = self._convert(result)
+        with self._lock:
+            timestamp = self._pending.pop(timestamp_ms, timestamp_ms / 1000)
+            # Frames the landmarker dropped never get a result
+            for dropped in [pending for pending in self._pending if pending < timestamp_ms]:
+                del self._pending[dropped]
+            self._latest = [detection._replace(timestamp=timestamp) for detection in detections]
+
+    @staticmethod
+    def _convert(result) -> List[HandDetection]:
+        detections = []
+        for index, hand_landmarks in enumerate(result.hand_landmarks or []):
+            landmarks = np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks], dtype=np.float32)
+            try:
+                category = result.handedness[index][0]
+                handedness, score = category.category_name, float(category.score)
+            except (AttributeError, IndexError, TypeError):
+                handedness, score = '', 1.0
+            detections.append(HandDetection(landmarks, handedness, score))
+        return detections
+
+    def close(self) -> None:
+        self._landmarker.close()
+
+
+class ReplayHandBackend(HandBackend):
+    """Serve prerecorded landmarks instead of tracking, one entry per frame."""
+
+    name = 'replay'
+
+    def __init__(self, landmarks: Sequence[Optional[np.ndarray]], loop: bool = True,
+                 handedness: str = 'Right', score: float = 1.0):
+        """
+        Args:
+            landmarks: Landmarks of shape (21, 3) per frame, None for frames without a hand
+            loop: Start over at the end instead of reporting no hand
+            handedness: Handedness label of the replayed hand
+            score: Tracking score of the replayed hand
+
+        Raises:
+            ValueError: If there are no frames
+        """
+        self.frames = [None if hand is None else np.asarray(hand, dtype=np.float32).reshape(NUM_LANDMARKS, 3)
+                       for hand in landmarks]
+        if not self.frames:
+            raise ValueError("Nothing to replay")
+        self.loop = loop
+        self.handedness = handedness
+        self.score = score
+        self.position = 0
+
+    @classmethod
+    def from_trace(cls, path: str, **kwargs) -> 'ReplayHandBackend':
+        """Replay the landmarks of a session trace (src.utils.session_trace)."""
+        from ..utils.session_trace import FRAME, read_trace
+        _, records = read_trace(path)
+        return cls([record.landmarks for record in records if record.kind == FRAME], **kwargs)
+
+    @classmethod
+    def from_dataset(cls, path: str, center=(0.5, 0.6), size: float = 0.12, **kwargs) -> 'ReplayHandBackend':
+        """
+        Replay the samples of a gesture_data.csv dataset as hands in the image.
+
+        Args:
+            path: Dataset file
+            center: Normalized image position of the wrist
+            size: Palm length in normalized image units
+        """
+        from .landmarks import load_dataset
+        _, landmarks = load_dataset(path)
+        placed = landmarks * size
+        placed[..., 0] += center[0]
+        placed[..., 1] += center[1]
+        return cls(list(placed), **kwargs)
+
+    def process(self, rgb: np.ndarray, timestamp: float) -> List[HandDetection]:
+        if self.position >= len(self.frames):
+            if not self.loop:
+                return []
+            self.position = 0
+        hand = self.frames[self.position]
+        self.position += 1
+        if hand is None:
+            return []
+        # A copy, since the detector maps crop coordinates in place
+        return [HandDetection(hand.copy(), self.handedness, self.score)]
+
+
+def draw_hand(image: np.ndarray, landmarks: np.ndarray) -> None:
+    """
+    Draw a hand skeleton on a BGR image in place.
+
+    Args:
+        image: BGR image
+        landmarks: Array of shape (21, 3) in normalized image coordinates
+    """
+    height, width = image.shape[:2]
+    points = np.rint(landmarks[:, :2] * (width, height)).astype(np.int32)
+    for start, end in HAND_CONNECTIONS:
+        cv2.line(image, tuple(points[start].tolist()), tuple(points[end].tolist()), (0, 0, 255), 2)
+    for point in points.tolist():
+        cv2.circle(image, tuple(point), 2, (0, 255, 0), -1)
+
+
+def create_hand_backend(config: Dict[str, Any], model_complexity: int = 1) -> HandBackend:
+    """
+    Create the hand landmark backend from the 'hand_tracking' configuration section.
+
+    Args:
+        config: Configuration section
+        model_complexity: Landmark model of the legacy backend (0: lite, 1: full)
+
+    Returns:
+        HandBackend: The backend
+
+    Raises:
+        ValueError: If the backend name is unknown or the replay backend has no trace
+        RuntimeError: If no backend could be loaded
+    """
+    name = config['backend']
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown hand tracking backend '{name}', expected one of: {', '.join(BACKENDS)}")
+    if name == 'replay':
+        if not config.get('trace'):
+            raise ValueError("The replay backend needs a trace (hand_tracking.trace)")
+        return ReplayHandBackend.from_trace(config['trace'])
+
+    factories = {
+        'legacy': lambda: LegacyHandsBackend(model_complexity, config['max_hands'],
+                                             config['min_detection_confidence'],
+                                             config['min_tracking_confidence']),
+        'tasks': lambda: TasksHandBackend(config['model_path'], config['running_mode'], config['max_hands'],
+                                          config['min_detection_confidence'],
+                                          config['min_tracking_confidence'])
+    }
+    if name == 'auto':
+        order = ['tasks', 'legacy'] if os.path.exists(config['model_path']) else ['legacy', 'tasks']
+    else:
+        order = [name] + [other for other in factories if other != name]
+    errors = []
+    for candidate in order:
+        try:
+            backend = factories[candidate]()
+        except Exception as e:
+            logger.error(f"Error loading the {candidate} hand tracking backend: {str(e)}")
+            errors.append(f"{candidate}: {e}")
+            continue
+        if candidate != order[0]:
+            logger.warning("Falling back to the %s hand tracking backend", candidate)
+        logger.info("Hand tracking backend: %s", candidate)
+        return backend
+    raise RuntimeError(f"No hand tracking backend could be loaded ({'; '.join(errors)})")
@@ -0,0 +1,203 @@
+from collections import namedtuple
+from enum import IntEnum
+from types import SimpleNamespace
+import numpy as np
+
+# Number of landmarks in a MediaPipe hand model
+NUM_LANDMARKS = 21
+
+# A single landmark, shaped like MediaPipe's (x, y, z attributes)
+Point = namedtuple('Point', ['x', 'y', 'z'])
+
+
+class HandLandmark(IntEnum):
+    """Landmark indices of the MediaPipe hand model, whatever the backend."""
+    WRIST = 0
+    THUMB_CMC = 1
+    THUMB_MCP = 2
+    THUMB_IP = 3
+    THUMB_TIP = 4
+    INDEX_FINGER_MCP = 5
+    INDEX_FINGER_PIP = 6
+    INDEX_FINGER_DIP = 7
+    INDEX_FINGER_TIP = 8
+    MIDDLE_FINGER_MCP = 9
+    MIDDLE_FINGER_PIP = 10
+    MIDDLE_FINGER_DIP = 11
+    MIDDLE_FINGER_TIP = 12
+    RING_FINGER_MCP = 13
+    RING_FINGER_PIP = 14
+    RING_FINGER_DIP = 15
+    RING_FINGER_TIP = 16
+    PINKY_MCP = 17
+    PINKY_PIP = 18
+    PINKY_DIP = 19
+    PINKY_TIP = 20
+
+
+# Bones of the hand skeleton as landmark index pairs
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20)
+)
+
+
+def landmarks_to_array(hand_landmarks) -> np.ndarray:
+    """
+    Convert MediaPipe hand landmarks to an array.
+
+    Args:
+        hand_landmarks: MediaPipe NormalizedLandmarkList
+
+    Returns:
+        numpy.ndarray: Array of shape (21, 3) with normalized (x, y, z) coordinates
+    """
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+
+
+def array_to_landmarks(landmarks: np.ndarray) -> SimpleNamespace:
+    """
+    Wrap a landmark array in an object shaped like MediaPipe hand landmarks.
+
+    Args:
+        landmarks: Array of shape (21, 3) with normalized (x, y, z) coordinates
+
+    Returns:
+        SimpleNamespace: Object with a `landmark` list of points having x, y, z attributes
+    """
+    return SimpleNamespace(landmark=[
+        SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in landmarks
+    ])
+
+
+# Landmarks defining the dataset's reference frame: wrist and middle finger MCP
+WRIST = 0
+MIDDLE_FINGER_MCP = 9
+
+# Column layout of gesture_data.csv
+DATASET_COLUMNS = ['label'] + [f"landmark_{i}_{axis}" for i in range(NUM_LANDMARKS) for axis in 'xyz']
+
+
+def normalize_to_dataset(landmarks: np.ndarray) -> np.ndarray:
+    """
+    Convert landmarks to the gesture_data.csv layout.
+
+    Coordinates are made relative to the wrist and scaled so the distance from
+    the wrist to the middle finger MCP is 1.
+
+    Args:
+        landmarks: Array of shape (21, 3) or (N, 21, 3)
+
+    Returns:
+        numpy.ndarray: Normalized array of the same shape (float64)
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float64)
+    relative = landmarks - landmarks[..., WRIST:WRIST + 1, :]
+    scale = np.linalg.norm(relative[..., MIDDLE_FINGER_MCP, :], axis=-1)
+    scale = np.where(scale > 0, scale, 1.0)
+    return relative / scale[..., np.newaxis, np.newaxis]
+
+
+def canonicalize(landmarks: np.ndarray, rotate: bool = True, aspect_ratio: float = 1.0) -> np.ndarray:
+    """
+    Transform landmarks into a canonical hand frame.
+
+    The origin is the wrist, the unit is the palm length (wrist to middle
+    finger MCP, as in gesture_data.csv) and, with rotate=True, the palm axis is
+    turned in the image plane to point straight up (-y), so a raised finger has
+    a tip above its PIP whatever the tilt of the hand or its distance from the
+    camera. Each hand is transformed with one matrix, and a batch of hands with
+    one batched matrix product.
+
+    Args:
+        landmarks: Array of shape (21, 3) or (N, 21, 3) with normalized image coordinates
+        rotate: Align the palm axis; False gives exactly the gesture_data.csv layout
+        aspect_ratio: Frame width / height, so x and y share a unit before rotating
+
+    Returns:
+        numpy.ndarray: Canonical landmarks of the same shape (float64)
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float64)
+    if aspect_ratio != 1.0:
+        landmarks = landmarks * (aspect_ratio, 1.0, aspect_ratio)
+    if not rotate:
+        return normalize_to_dataset(landmarks)
+    relative = landmarks - landmarks[..., WRIST:WRIST + 1, :]
+    axis = relative[..., MIDDLE_FINGER_MCP, :]
+    palm_length = np.linalg.norm(axis, axis=-1)
+    planar_length = np.hypot(axis[..., 0], axis[..., 1])
+    # Unit palm direction in the image plane; a degenerate hand keeps its orientation
+    degenerate = planar_length <= 0
+    ux = np.where(degenerate, 0.0, axis[..., 0] / np.where(degenerate, 1.0, planar_length))
+    uy = np.where(degenerate, -1.0, axis[..., 1] / np.where(degenerate, 1.0, planar_length))
+    scale = 1.0 / np.where(palm_length > 0, palm_length, 1.0)
+
+    # Rotation taking (ux, uy) to (0, -1), combined with the scaling
+    transform = np.zeros(landmarks.shape[:-2] + (3, 3))
+    transform[..., 0, 0] = -uy * scale
+    transform[..., 0, 1] = ux * scale
+    transform[..., 1, 0] = -ux * scale
+    transform[..., 1, 1] = -uy * scale
+    transform[..., 2, 2] = scale
+    return relative @ np.swapaxes(transform, -1, -2)
+
+
+def load_dataset(path: str):
+    """
+    Load a landmark dataset in the gesture_data.csv format.
+
+    Args:
+        path: CSV file path
+
+    Returns:
+        tuple: (labels as a numpy array of str, landmarks of shape (N, 21, 3))
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        next(f, None)
+        rows = [line.rstrip('\n').split(',') for line in f if line.strip()]
+    labels = np.array([row[0] for row in rows], dtype=str)
+    # One numpy conversion of all values, much faster than genfromtxt on large datasets
+    landmarks = np.array([row[1:] for row in rows], dtype=np.float64).reshape(-1, NUM_LANDMARKS, 3)
+    return labels, landmarks
+
+
+def format_dataset_row(label: str, landmarks: np.ndarray) -> str:
+    """Format one normalized sample as a gesture_data.csv line (without newline)."""
+    return ','.join([label] + [repr(float(v)) for v in np.asarray(landmarks).ravel()])
+
+
+def hand_roi(landmarks: np.ndarray, width: int, height: int, scale: float = 2.5,
+             min_fraction: float = 0.4):
+    """
+    Square crop around a hand for region-of-interest tracking.
+
+    Args:
+        landmarks: Array of shape (21, 3) with normalized image coordinates
+        width: Frame width in pixels
+        height: Frame height in pixels
+        scale: Side of the crop relative to the larger side of the hand's bounding box
+        min_fraction: Smallest side of the crop relative to the frame height
+
+    Returns:
+        tuple: (x0, y0, x1, y1) pixel bounds inside the frame
+    """
+    xs = np.asarray(landmarks)[:, 0] * width
+    ys = np.asarray(landmarks)[:, 1] * height
+    side = max(xs.max() - xs.min(), ys.max() - ys.min()) * scale
+    side = int(min(max(side, min_fraction * height), width, height))
+    x0 = int(min(max((xs.min() + xs.max() - side) / 2, 0), width - side))
+    y0 = int(min(max((ys.min() + ys.max() - side) / 2, 0), height - side))
+    return x0, y0, x0 + side, y0 + side
+
+
+def roi_contains(roi, landmarks: np.ndarray, width: int, height: int, margin: float = 0.15) -> bool:
+    """Check that a hand lies inside a crop, at least `margin` of its side from the edges."""
+    x0, y0, x1, y1 = roi
+    inset = (x1 - x0) * margin
+    xs = np.asarray(landmarks)[:, 0] * width
+    ys = np.asarray(landmarks)[:, 1] * height
+    return bool(xs.min() >= x0 + inset and xs.max() <= x1 - inset and
+                ys.min() >= y0 + inset and ys.max() <= y1 - inset)
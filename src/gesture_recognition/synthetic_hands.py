@@ -0,0 +1,370 @@
+"""
+Synthetic hand landmark streams.
+
+Load and stress tests of everything after hand tracking (classification,
+smoothing, sequences, mapping, actuation) need landmark streams far faster
+than a camera delivers them, with known labels. SyntheticHands generates
+them from a small kinematic hand model instead of recordings:
+
+    pose        per-finger flexion from 0 (straight) to 1 (curled), turned into
+                the 21 landmarks of the canonical hand frame (wrist at the origin,
+                palm length 1, fingers up) by forward kinematics
+    schedule    a list of steps, each a pose held for a while or a swipe, with
+                smooth transitions in between; POSES has one flexion per static
+                gesture, labelled with the gesture the detector's rules find
+    placement   per-step hand scale, roll, pitch and yaw, interpolated across
+                transitions, a motion path of the hand center (still, Lissajous
+                or random walk) and Gaussian tracking noise
+
+Everything is computed for a whole chunk of frames with one NumPy expression
+per step, and the kinematics only for frames whose pose changes: about a
+million frames per second on one core, in float32. Frames come out in
+normalized image coordinates like a HandBackend's, so they feed
+GestureDetector.classify_landmarks, confidence.classify_poses (after
+canonicalize) or, through ReplayHandBackend, the whole detector.
+src.scripts.stress_pipeline drives the downstream stages with them.
+"""
+import logging
+from collections import namedtuple
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .augmentation import rotation_matrices
+from .landmarks import NUM_LANDMARKS
+
+logger = logging.getLogger(__name__)
+
+# Flexion of thumb, index, middle, ring and pinky for each static gesture the rules can report
+# (take_screenshot has the same conditions as open_application, which is tried first)
+POSES: Dict[str, Tuple[float, ...]] = {
+    'cursor_move': (1.0, 0.0, 1.0, 1.0, 1.0),
+    'cursor_click': (0.0, 0.0, 0.0, 0.0, 0.0),
+    'scroll_up': (1.0, 1.0, 1.0, 1.0, 0.0),
+    'scroll_down': (1.0, 1.0, 1.0, 0.0, 1.0),
+    'press_enter': (0.6, 1.3, 1.3, 1.0, 1.0),
+    'minimize_window': (1.0, 0.0, 0.0, 1.0, 1.0),
+    'open_application': (1.0, 0.0, 0.0, 0.0, 1.0),
+    'show_shutdown_options': (1.0, 0.0, 1.0, 1.0, 0.0),
+    'confirm_shutdown': (0.0, 0.0, 1.0, 1.0, 0.0)
+}
+
+# Swipes: the open hand sweeping across the image, with the direction of travel in image x
+# (the detector mirrors x, so moving right in the image is a swipe to the left)
+SWIPES: Dict[str, float] = {'swipe_left': 1.0, 'swipe_right': -1.0}
+
+PATHS = ('still', 'lissajous', 'random_walk')
+
+# Travel of the hand center in a swipe, image heights either side of its path, and its duration
+_SWEEP = 0.2
+_SWEEP_TIME = 0.25
+
+# Gaussian samples kept for the landmark noise, enough for a 65536-frame chunk
+_NOISE_BANK = 1 << 22
+
+# Hand model in the canonical frame: x right, y down, z towards the camera negative.
+# Finger MCP positions (index to pinky); the middle finger MCP defines the palm length
+_FINGER_BASES = np.array([[-0.32, -0.95, 0.0], [0.0, -1.0, 0.0], [0.26, -0.95, 0.0], [0.48, -0.85, 0.0]])
+# Finger directions in the image plane, radians from straight up (positive: towards the pinky)
+_FINGER_SPLAY = np.radians([-8.0, 0.0, 8.0, 16.0])
+# Proximal, middle and distal phalanx lengths of each finger
+_FINGER_BONES = np.array([[0.42, 0.25, 0.20], [0.46, 0.29, 0.22], [0.43, 0.27, 0.21], [0.34, 0.21, 0.19]])
+# MCP, PIP and DIP angles of a fully curled finger, accumulated along the finger
+_CURL = np.cumsum(np.radians([85.0, 100.0, 70.0]))
+_THUMB_CMC = np.array([-0.25, -0.22, 0.0])
+_THUMB_MCP = np.array([-0.45, -0.45, 0.0])
+_THUMB_BONES = np.array([0.30, 0.26])
+# Direction of the straight thumb in the image plane and how far each bone turns across the palm
+_THUMB_ANGLE = np.arctan2(-0.8, -0.6)
+_THUMB_TURN = np.radians([110.0, 215.0])
+
+# A generated stream: landmarks (N, 21, 3), labels (N,) with '' during transitions, timestamps (N,)
+SyntheticFrames = namedtuple('SyntheticFrames', ['landmarks', 'labels', 'timestamps'])
+
+
+def _chain_matrix() -> np.ndarray:
+    """
+    Homogeneous landmark positions as a linear map of the bone vectors.
+
+    Returns:
+        numpy.ndarray: Matrix of shape (3 * 14 + 1, 21 * 4) taking the x, y and z components of
+            the 14 bones followed by a 1 to the (x, y, z, 1) of the 21 landmarks, flattened
+    """
+    chains = np.zeros((NUM_LANDMARKS, 14))
+    rest = np.zeros((NUM_LANDMARKS, 3))
+    rest[1], rest[2:5] = _THUMB_CMC, _THUMB_MCP
+    chains[3, 12] = chains[4, 12:14] = 1.0
+    for finger in range(4):
+        base = 5 + 4 * finger
+        rest[base:base + 4] = _FINGER_BASES[finger]
+        for joint in range(1, 4):
+            chains[base + joint, 3 * finger:3 * finger + joint] = 1.0
+    # Every landmark is its rest position plus the bones before it on its chain
+    matrix = np.zeros((3, 14, NUM_LANDMARKS, 4))
+    for axis in range(3):
+        matrix[axis, :, :, axis] = chains.T
+    last = np.concatenate([rest, np.ones((NUM_LANDMARKS, 1))], axis=1)
+    return np.concatenate([matrix.reshape(42, -1), last.reshape(1, -1)]).astype(np.float32)
+
+
+_CHAINS = _chain_matrix()
+
+
+def hand_pose(flexion: np.ndarray) -> np.ndarray:
+    """
+    Canonical landmarks of hands with the given finger flexion.
+
+    Args:
+        flexion: Flexion of thumb, index, middle, ring and pinky, shape (N, 5);
+            0 is straight, 1 curled into the palm
+
+    Returns:
+        numpy.ndarray: Float32 landmarks of shape (N, 21, 3) in the canonical hand frame
+    """
+    return np.ascontiguousarray(_homogeneous_pose(flexion)[..., :3])
+
+
+def _homogeneous_pose(flexion: np.ndarray) -> np.ndarray:
+    """hand_pose in homogeneous coordinates, shape (N, 21, 4)."""
+    flexion = np.asarray(flexion, dtype=np.float32).reshape(-1, 5)
+    count = len(flexion)
+    # Bone vectors by axis, then a constant 1 for the rest positions
+    bones = np.empty((count, 3 * 14 + 1), dtype=np.float32)
+    x, y, z = (bones[:, axis * 14:(axis + 1) * 14] for axis in range(3))
+    bones[:, -1] = 1.0
+
+    # Fingers: each phalanx turns by the accumulated joint angles towards the camera
+    angles = (flexion[:, 1:, None] * _CURL.astype(np.float32)).reshape(count, 12)
+    lengths = _FINGER_BONES.reshape(-1)
+    splay = np.repeat(_FINGER_SPLAY, 3)
+    np.cos(angles, out=z[:, :12])
+    np.multiply(z[:, :12], (np.sin(splay) * lengths).astype(np.float32), out=x[:, :12])
+    np.multiply(z[:, :12], (-np.cos(splay) * lengths).astype(np.float32), out=y[:, :12])
+    np.sin(angles, out=z[:, :12])
+    z[:, :12] *= -lengths.astype(np.float32)
+
+    # Thumb: both bones swing across the palm in the image plane and slightly towards the camera
+    turn = _THUMB_ANGLE + flexion[:, :1] * _THUMB_TURN.astype(np.float32)
+    np.cos(turn, out=x[:, 12:])
+    x[:, 12:] *= _THUMB_BONES.astype(np.float32)
+    np.sin(turn, out=y[:, 12:])
+    y[:, 12:] *= _THUMB_BONES.astype(np.float32)
+    np.multiply(flexion[:, :1], (-0.3 * _THUMB_BONES).astype(np.float32), out=z[:, 12:])
+
+    return (bones @ _CHAINS).reshape(count, NUM_LANDMARKS, 4)
+
+
+class SyntheticHands:
+    """Random, vectorized generator of labelled hand landmark streams."""
+
+    def __init__(self, fps: float = 30.0, noise: float = 0.003, scale: Tuple[float, float] = (0.1, 0.2),
+                 roll: float = 20.0, tilt: float = 10.0, path: str = 'lissajous', speed: float = 0.1,
+                 hold: Tuple[float, float] = (0.3, 1.5), transition: Tuple[float, float] = (0.1, 0.3),
+                 swipe_rate: float = 0.1, aspect_ratio: float = 4 / 3, seed: Optional[int] = None):
+        """
+        Args:
+            fps: Frame rate of the generated streams
+            noise: Standard deviation of the landmark noise, normalized image units
+            scale: Range of the palm length, in image heights
+            roll: Largest in-plane rotation of a hand, degrees
+            tilt: Largest pitch and yaw of a hand, degrees
+            path: Motion of the hand center: 'still', 'lissajous' or 'random_walk'
+            speed: Typical speed of the hand center along the path, image heights per second
+            hold: Range of the seconds a pose is held
+            transition: Range of the seconds a change of pose takes
+            swipe_rate: Share of the random steps that are swipes
+            aspect_ratio: Width / height of the simulated frames
+            seed: Random seed, None for a fresh one
+
+        Raises:
+            ValueError: If the path is unknown
+        """
+        if path not in PATHS:
+            raise ValueError(f"Unknown motion path '{path}', expected one of: {', '.join(PATHS)}")
+        self.fps = fps
+        self.noise = noise
+        self.scale = scale
+        self.roll = np.radians(roll)
+        self.tilt = np.radians(tilt)
+        self.path = path
+        self.speed = speed
+        self.hold = hold
+        self.transition = transition
+        self.swipe_rate = swipe_rate
+        self.aspect_ratio = aspect_ratio
+        self.rng = np.random.default_rng(seed)
+        self._time = 0.0
+        self._center = np.array([0.5, 0.55])
+        self._last = None
+        self._noise_bank: Optional[np.ndarray] = None
+
+    def sequence(self, steps: Sequence[str], hold: float = 0.5, transition: float = 0.15) -> SyntheticFrames:
+        """
+        Frames of a scripted sequence of poses and swipes, e.g. to drive a gesture combo.
+
+        Args:
+            steps: Gesture names from POSES or SWIPES, in order
+            hold: Seconds each pose is held
+            transition: Seconds each change of pose takes
+
+        Returns:
+            SyntheticFrames: The frames, continuing the time line of earlier calls
+
+        Raises:
+            ValueError: If a step is not a known pose or swipe
+        """
+        unknown = [step for step in steps if step not in POSES and step not in SWIPES]
+        if unknown:
+            raise ValueError(f"Unknown synthetic gestures: {', '.join(unknown)}")
+        count = len(steps)
+        return self._render(np.array(steps, dtype=object), np.full(count, hold), np.full(count, transition))
+
+    def stream(self, count: int, chunk_size: int = 65536) -> Iterator[SyntheticFrames]:
+        """
+        Stream frames of random poses, transitions and swipes.
+
+        Args:
+            count: Number of frames to generate
+            chunk_size: Frames per yielded chunk
+
+        Yields:
+            SyntheticFrames: Consecutive chunks of at most chunk_size frames
+        """
+        names = np.array(list(POSES) + list(SWIPES), dtype=object)
+        weights = np.concatenate([np.full(len(POSES), (1 - self.swipe_rate) / len(POSES)),
+                                  np.full(len(SWIPES), self.swipe_rate / len(SWIPES))])
+        mean_step = (np.mean(self.hold) + np.mean(self.transition)) * self.fps
+        pending = None
+        produced = 0
+        while produced < count:
+            wanted = min(chunk_size, count - produced)
+            while pending is None or len(pending.labels) < wanted:
+                # Enough steps for the chunk on average, topped up when short
+                steps = max(int(wanted / mean_step * 1.2), 1) + 1
+                frames = self._render(self.rng.choice(names, steps, p=weights),
+                                      self.rng.uniform(*self.hold, steps),
+                                      self.rng.uniform(*self.transition, steps))
+                pending = frames if pending is None else SyntheticFrames(
+                    *(np.concatenate([old, new]) for old, new in zip(pending, frames)))
+            yield SyntheticFrames(*(field[:wanted] for field in pending))
+            pending = SyntheticFrames(*(field[wanted:] for field in pending))
+            produced += wanted
+
+    def _render(self, steps: np.ndarray, holds: np.ndarray, transitions: np.ndarray) -> SyntheticFrames:
+        """Frames of a schedule of steps, each entered by a transition and then held."""
+        rng = self.rng
+        # A swipe becomes a slow approach to one side of the center and a quick sweep to the other;
+        # moving back after a sweep is slow too, so only the sweep is fast enough to be a swipe
+        names, labels, shifts, durations = [], [], [], []
+        swept = False
+        for step, hold, transition in zip(steps, holds, transitions):
+            direction = SWIPES.get(step)
+            if direction is None:
+                names.append(step)
+                labels.append(step)
+                shifts.append(0.0)
+                durations.append((max(transition, 1.0) if swept else transition, hold))
+            else:
+                names += ['cursor_click', 'cursor_click']
+                labels += ['', step]
+                shifts += [-_SWEEP * direction, _SWEEP * direction]
+                durations += [(1.0, 0.0), (_SWEEP_TIME, 0.0)]
+            swept = direction is not None
+        count = len(names)
+        transitions, holds = np.array(durations).T
+        sweeps = np.array([label in SWIPES for label in labels])
+
+        # Key state at the end of each step's transition: flexion (5), roll, pitch, yaw,
+        # scale and the x shift of the center; row 0 is where the previous call ended
+        keys = np.empty((count + 1, 10), dtype=np.float32)
+        keys[1:, :5] = [POSES[name] for name in names]
+        keys[1:, 5] = rng.uniform(-self.roll, self.roll, count)
+        keys[1:, 6:8] = rng.uniform(-self.tilt, self.tilt, (count, 2))
+        keys[1:, 8] = rng.uniform(*self.scale, count)
+        keys[1:, 9] = shifts
+        # The hand keeps its placement through a swipe
+        for index in np.flatnonzero(sweeps) + 1:
+            keys[index, 5:9] = keys[index - 1, 5:9]
+        keys[0] = keys[1] if self._last is None else self._last
+        self._last = keys[-1].copy()
+
+        # Placement of each key as a linear map from the canonical frame to normalized image
+        # coordinates: rotation and hand scale, with x and z (on the scale of x) in image widths
+        placements = np.zeros((count + 1, 4, 3), dtype=np.float32)
+        placements[:, :3] = np.swapaxes(rotation_matrices(keys[:, 5], keys[:, 6], keys[:, 7]), 1, 2)
+        placements[:, :3] *= keys[:, 8, None, None]
+        placements[:, :3, 0::2] /= self.aspect_ratio
+
+        # Frame time line: the step each frame is in and how far through its transition
+        ends = np.cumsum(transitions + holds)
+        starts = ends - transitions - holds
+        total = int(ends[-1] * self.fps)
+        times = np.arange(total, dtype=np.float64) / self.fps
+        step = np.minimum(np.searchsorted(ends, times, side='right'), count - 1)
+        progress = np.clip((times - starts[step]) / transitions[step], 0.0, 1.0)
+        weight = (progress * progress * (3 - 2 * progress)).astype(np.float32)
+        # Poses are labelled while held, swipes while sweeping
+        labels = np.array(labels)[step]
+        labels[np.where(sweeps[step], progress <= 0.0, progress < 1.0)] = ''
+
+        # Held frames share the pose of their key; in transitions flexion is interpolated before
+        # the kinematics, so fingers bend naturally
+        poses = _homogeneous_pose(keys[:, :5])[step + 1]
+        moving = np.flatnonzero(weight < 1.0)
+        flexion = keys[step[moving], :5] + (keys[step[moving] + 1, :5] - keys[step[moving], :5]) * weight[moving, None]
+        poses[moving] = _homogeneous_pose(flexion)
+        # Placements are blended as matrices, which stays within a few percent of a rotation at these angles
+        placement = placements[step] + (placements[step + 1] - placements[step]) * weight[:, None, None]
+        # The hand center is the translation row of the homogeneous map
+        centers = self._path(times + self._time)
+        centers[:, 0] += keys[step, 9] + (keys[step + 1, 9] - keys[step, 9]) * weight
+        placement[:, 3, 0] = 0.5 + (centers[:, 0] - 0.5) / self.aspect_ratio
+        placement[:, 3, 1] = centers[:, 1]
+        landmarks = poses @ placement
+        if self.noise:
+            self._add_noise(landmarks.reshape(-1))
+        timestamps = times + self._time
+        self._time += total / self.fps
+        return SyntheticFrames(landmarks, labels, timestamps)
+
+    def _add_noise(self, values: np.ndarray) -> None:
+        """
+        Add Gaussian noise in place.
+
+        Drawing normals dominates the cost of a frame, so they come from a bank drawn
+        once, read from a random offset per call: frames within a chunk get distinct noise.
+        The bank has a fixed size, so a short first call does not shorten its period.
+        """
+        if self._noise_bank is None:
+            self._noise_bank = self.rng.standard_normal(_NOISE_BANK, dtype=np.float32)
+            self._noise_bank *= self.noise
+        size = len(self._noise_bank)
+        offset = int(self.rng.integers(size))
+        done = 0
+        while done < len(values):
+            count = min(len(values) - done, size - offset)
+            values[done:done + count] += self._noise_bank[offset:offset + count]
+            done += count
+            offset = 0
+
+    def _path(self, times: np.ndarray) -> np.ndarray:
+        """Hand center (x, y) in image heights around the middle of the frame."""
+        centers = np.empty((len(times), 2))
+        if self.path == 'still':
+            centers[:] = self._center
+        elif self.path == 'lissajous':
+            # Slow figure eight with an average speed of about `speed`
+            amplitude = 0.1
+            frequency = self.speed / (2 * np.pi * amplitude)
+            centers[:, 0] = 0.5 + amplitude * np.sin(2 * np.pi * frequency * times)
+            centers[:, 1] = 0.55 + amplitude * 0.5 * np.sin(4 * np.pi * frequency * times)
+        else:
+            steps = self.rng.normal(0.0, self.speed / np.sqrt(self.fps), (len(times), 2))
+            walk = self._center + np.cumsum(steps, axis=0)
+            # Reflect off the borders of a band in the middle of the frame instead of drifting away;
+            # the band sits low because the fingers reach up to two hand sizes above the wrist
+            low = np.array([0.35, 0.45])
+            centers[:] = low + 0.3 - np.abs((walk - low) % 0.6 - 0.3)
+            if len(walk):
+                self._center = walk[-1]
+        return centers
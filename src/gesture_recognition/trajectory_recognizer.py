@@ -0,0 +1,179 @@
+import logging
+import math
+from typing import Optional, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Landmarks tracked for motion: wrist and the five fingertips
+DEFAULT_TRACKED_LANDMARKS = (0, 4, 8, 12, 16, 20)
+
+# Dataset labels in gesture_data.csv for each swipe event
+DATASET_LABELS = {
+    'swipe_left': 'move_left',
+    'swipe_right': 'move_right'
+}
+
+
+class TrajectoryRecognizer:
+    """
+    Streaming recognizer for dynamic (motion) gestures such as swipes.
+
+    Recent hand positions are kept in a fixed-size ring buffer. Path length and
+    a length-weighted direction histogram are maintained incrementally as steps
+    enter and leave the window, so each update costs O(1) regardless of the
+    window size.
+    """
+
+    def __init__(self,
+                 window_size: int = 12,
+                 min_displacement: float = 0.25,
+                 min_velocity: float = 0.6,
+                 min_straightness: float = 0.7,
+                 min_direction_ratio: float = 0.6,
+                 direction_bins: int = 8,
+                 cooldown: float = 0.5,
+                 tracked_landmarks: Sequence[int] = DEFAULT_TRACKED_LANDMARKS):
+        """
+        Initialize the trajectory recognizer.
+
+        Args:
+            window_size: Number of recent frames kept in the ring buffer
+            min_displacement: Minimum horizontal travel (normalized image width)
+            min_velocity: Minimum average speed (normalized width per second)
+            min_straightness: Minimum ratio of net displacement to path length
+            min_direction_ratio: Minimum share of path length in the swipe direction
+            direction_bins: Number of bins in the direction histogram
+            cooldown: Seconds to ignore motion after a swipe is emitted
+            tracked_landmarks: Landmark indices averaged into the trajectory point
+        """
+        self.window_size = max(2, int(window_size))
+        self.min_displacement = min_displacement
+        self.min_velocity = min_velocity
+        self.min_straightness = min_straightness
+        self.min_direction_ratio = min_direction_ratio
+        self.direction_bins = direction_bins
+        self.cooldown = cooldown
+        self.tracked_landmarks = tuple(tracked_landmarks)
+
+        # Ring buffer of trajectory points, timestamps and the step ending at each slot
+        self._points = np.zeros((self.window_size, 2), dtype=np.float64)
+        self._times = np.zeros(self.window_size, dtype=np.float64)
+        self._step_lengths = np.zeros(self.window_size, dtype=np.float64)
+        self._step_bins = np.full(self.window_size, -1, dtype=np.int64)
+        self._histogram = np.zeros(self.direction_bins, dtype=np.float64)
+        self._path_length = 0.0
+        self._head = 0
+        self._count = 0
+        self._cooldown_until = float('-inf')
+        # Latest point and time, kept through cooldowns, and whether the hand is sweeping sideways
+        self._last_point: Optional[np.ndarray] = None
+        self._last_time = 0.0
+        self.sweeping = False
+        logger.info("Trajectory recognizer initialized")
+
+    def reset(self) -> None:
+        """Clear the buffered trajectory, e.g. when the hand is lost."""
+        self._step_lengths.fill(0.0)
+        self._step_bins.fill(-1)
+        self._histogram.fill(0.0)
+        self._path_length = 0.0
+        self._head = 0
+        self._count = 0
+        self._last_point = None
+        self.sweeping = False
+
+    def update(self, points: np.ndarray, timestamp: float) -> Optional[str]:
+        """
+        Add the latest hand position and check for a completed swipe.
+
+        Args:
+            points: Array of shape (len(tracked_landmarks), 2) with mirrored,
+                normalized (x, y) positions of the tracked landmarks
+            timestamp: Frame time in seconds
+
+        Returns:
+            'swipe_left', 'swipe_right' or None
+        """
+        point = np.asarray(points, dtype=np.float64).reshape(-1, 2).mean(axis=0)
+        self._update_sweeping(point, timestamp)
+
+        if timestamp < self._cooldown_until:
+            return None
+
+        slot = self._head
+        # Evict the step leaving the window before overwriting its slot
+        if self._count == self.window_size:
+            self._remove_step(slot)
+
+        if self._count > 0:
+            previous = self._points[(slot - 1) % self.window_size]
+            dx = point[0] - previous[0]
+            dy = point[1] - previous[1]
+            length = math.hypot(dx, dy)
+            if length > 0.0:
+                angle = math.atan2(dy, dx) % (2 * math.pi)
+                bin_index = int(angle / (2 * math.pi) * self.direction_bins + 0.5) % self.direction_bins
+                self._step_bins[slot] = bin_index
+                self._step_lengths[slot] = length
+                self._histogram[bin_index] += length
+                self._path_length += length
+
+        self._points[slot] = point
+        self._times[slot] = timestamp
+        self._head = (slot + 1) % self.window_size
+        self._count = min(self._count + 1, self.window_size)
+
+        gesture = self._classify(slot)
+        if gesture:
+            logger.debug("Trajectory gesture detected: %s", gesture)
+            self._cooldown_until = timestamp + self.cooldown
+            self.reset()
+            self._last_point, self._last_time, self.sweeping = point, timestamp, True
+        return gesture
+
+    def _update_sweeping(self, point: np.ndarray, timestamp: float) -> None:
+        """Check whether the latest step moves sideways at swipe speed, before and after a swipe."""
+        if self._last_point is not None and timestamp > self._last_time:
+            dx = point[0] - self._last_point[0]
+            dy = point[1] - self._last_point[1]
+            self.sweeping = abs(dx) >= 2 * abs(dy) and abs(dx) / (timestamp - self._last_time) >= self.min_velocity
+        else:
+            self.sweeping = False
+        self._last_point = point
+        self._last_time = timestamp
+
+    def _remove_step(self, slot: int) -> None:
+        """Remove the step starting at the point evicted from the given slot."""
+        # That step is stored at the slot holding the next-oldest point
+        next_slot = (slot + 1) % self.window_size
+        bin_index = self._step_bins[next_slot]
+        if bin_index >= 0:
+            self._histogram[bin_index] -= self._step_lengths[next_slot]
+            self._path_length -= self._step_lengths[next_slot]
+            self._step_bins[next_slot] = -1
+            self._step_lengths[next_slot] = 0.0
+
+    def _classify(self, newest: int) -> Optional[str]:
+        """Classify the buffered trajectory from its incremental features."""
+        if self._count < 3 or self._path_length <= 0.0:
+            return None
+
+        oldest = (newest - self._count + 1) % self.window_size
+        dx = self._points[newest, 0] - self._points[oldest, 0]
+        dy = self._points[newest, 1] - self._points[oldest, 1]
+        dt = self._times[newest] - self._times[oldest]
+
+        if abs(dx) < self.min_displacement or abs(dx) < 2 * abs(dy) or dt <= 0:
+            return None
+        if abs(dx) / dt < self.min_velocity:
+            return None
+        if math.hypot(dx, dy) / self._path_length < self.min_straightness:
+            return None
+
+        # Share of the path travelled in the swipe direction (bin 0 is +x)
+        direction_bin = 0 if dx > 0 else self.direction_bins // 2
+        if self._histogram[direction_bin] / self._path_length < self.min_direction_ratio:
+            return None
+
+        return 'swipe_right' if dx > 0 else 'swipe_left'
@@ -0,0 +1,241 @@
+"""
+Headless gesture control service.
+
+Runs capture -> detection -> mapping as a plain loop, without Qt, a preview
+window or the landmark overlay, for kiosk and tray deployments where nobody
+watches the camera feed. The loop honours a frame rate cap to bound its CPU
+use and stops cleanly on SIGINT/SIGTERM (and Ctrl+Break on Windows).
+
+Usage:
+    python -m src.headless --config hologest.json
+    python src/main.py --headless
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+from functools import partial
+from typing import Any, Dict, Optional
+
+from src.gesture_recognition.custom_gestures import create_gesture_index, gesture_bindings
+from src.gesture_recognition.hand_backends import BACKENDS, create_hand_backend
+from src.gesture_recognition.landmark_filter import create_landmark_filter
+from src.utils.camera_manager import CameraManager
+from src.utils.clock import SYSTEM_CLOCK
+from src.utils.config import load_config
+from src.utils.cursor_predictor import create_cursor_predictor
+from src.utils.event_bus import EventBus, LandmarksEvent, GestureEvent, THREAD, DROP_OLDEST
+from src.utils.event_server import create_event_server
+from src.utils.frame_pool import FramePool
+from src.utils.motion_gate import create_motion_gate
+from src.utils.profiler import create_profiler, install_signal_trigger
+from src.utils.resource_governor import create_resource_governor
+
+logger = logging.getLogger(__name__)
+
+
+class HeadlessService:
+    """Capture, detect and act on gestures until stopped."""
+
+    def __init__(self, config: Dict[str, Any], camera_manager=None, gesture_detector=None,
+                 gesture_mapping=None, event_bus: Optional[EventBus] = None, clock=None):
+        """
+        Args:
+            config: Configuration as returned by load_config
+            camera_manager: Camera source, defaults to a CameraManager from the camera section
+            gesture_detector: Detector, defaults to a GestureDetector without overlay drawing;
+                must provide set_quality when the resource governor is enabled
+            gesture_mapping: Action dispatcher, defaults to a GestureMapping on the event bus
+            event_bus: Event bus, defaults to a new one
+            clock: Clock providing now() in seconds, defaults to the monotonic system clock
+        """
+        self.config = config
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.event_bus = event_bus if event_bus is not None else EventBus()
+        camera = config['camera']
+        self.camera_manager = camera_manager or CameraManager(
+            camera['index'], camera['width'], camera['height'], camera['fps'],
+            camera['fourcc'], camera['buffer_size'])
+        self.governor = create_resource_governor(config['governor'])
+        self.custom_gestures = create_gesture_index(config['custom_gestures'])
+        if gesture_detector is None:
+            from src.gesture_recognition.gesture_detector import GestureDetector
+            gesture_detector = GestureDetector(clock=self.clock, draw=config['service']['draw_landmarks'],
+                                               thresholds=config['gestures']['thresholds'],
+                                               motion_gate=create_motion_gate(config['motion_gate']),
+                                               quality=self.governor.level if self.governor else None,
+                                               custom_gestures=self.custom_gestures,
+                                               smoothing=create_landmark_filter(config['smoothing']),
+                                               backend=partial(create_hand_backend, config['hand_tracking']))
+        self.gesture_detector = gesture_detector
+        if gesture_mapping is None:
+            from src.gesture_recognition.gesture_mapping import GestureMapping
+            gesture_mapping = GestureMapping(self.event_bus, clock=self.clock,
+                                             min_confidence=config['gestures']['min_confidence'],
+                                             cursor_predictor=create_cursor_predictor(config['cursor']),
+                                             bindings=gesture_bindings(config['custom_gestures'], self.custom_gestures),
+                                             sequences=config['gestures']['sequences'])
+        self.gesture_mapping = gesture_mapping
+        self.frame_pool = FramePool(capacity=2)
+        self.frame_id = 0
+        # Seconds to wait before reopening a camera that stopped delivering frames
+        self.reconnect_delay = 1.0
+        self.max_read_failures = 30
+        self._stop = threading.Event()
+
+        # Actuation runs on its own thread, as in the UI, so input injection never stalls capture;
+        # when it falls behind only superseded cursor moves are dropped
+        from src.gesture_recognition.gesture_mapping import COALESCED_GESTURES
+        self.event_bus.subscribe(
+            GestureEvent,
+            self.gesture_mapping.on_gesture_event,
+            mode=THREAD,
+            predicate=lambda event: event.gesture is not None,
+            maxsize=4,
+            policy=DROP_OLDEST,
+            droppable=lambda event: event.gesture in COALESCED_GESTURES,
+            name='actuation'
+        )
+        self.event_server = create_event_server(config['server'], self.event_bus)
+        self.profiler = create_profiler(config['profiling'])
+
+    def stop(self, *_) -> None:
+        """Ask the loop to stop; safe to call from signal handlers and other threads."""
+        self._stop.set()
+
+    def install_signal_handlers(self) -> None:
+        """Stop cleanly on SIGINT and SIGTERM (and Ctrl+Break on Windows); SIGUSR1 toggles profiling."""
+        for name in ('SIGINT', 'SIGTERM', 'SIGBREAK'):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), self.stop)
+        install_signal_trigger(self.profiler)
+
+    def run(self) -> int:
+        """
+        Run the service loop until stop() is called.
+
+        Returns:
+            int: Process exit code
+        """
+        if not self.camera_manager.initialize():
+            logger.error("Camera not available, headless service not started")
+            self.shutdown()
+            return 1
+        max_fps = self.config['service']['max_fps']
+        frame_interval = 1.0 / max_fps if max_fps else 0.0
+        frame_shape = None
+        read_failures = 0
+        logger.info("Headless service running (max %s fps)", max_fps or 'camera')
+        try:
+            while not self._stop.is_set():
+                started = self.clock.now()
+                buffer = self.frame_pool.acquire(frame_shape) if frame_shape else None
+                success, frame = self.camera_manager.read_frame(buffer)
+                if not success:
+                    self.frame_pool.release(buffer)
+                    read_failures += 1
+                    if read_failures >= self.max_read_failures:
+                        self._reconnect()
+                        read_failures = 0
+                    continue
+                read_failures = 0
+                frame_shape = frame.shape
+                try:
+                    self.process_frame(frame, self.clock.now())
+                finally:
+                    self.frame_pool.release(frame)
+
+                remaining = frame_interval - (self.clock.now() - started)
+                if remaining > 0:
+                    self._stop.wait(remaining)
+        finally:
+            self.shutdown()
+        return 0
+
+    def process_frame(self, frame, timestamp: float) -> None:
+        """Detect gestures in a frame and publish the results."""
+        self.frame_id += 1
+        _, gesture_data = self.gesture_detector.detect_gestures(frame, timestamp)
+        if self.event_bus.has_subscribers(LandmarksEvent):
+            self.event_bus.publish(LandmarksEvent(self.frame_id, self.gesture_detector.last_landmarks, timestamp))
+        gesture = gesture_data.get('gesture') if gesture_data else None
+        self.event_bus.publish(GestureEvent(self.frame_id, gesture, gesture_data, timestamp))
+        if self.governor is not None:
+            quality = self.governor.record_frame(self.clock.now() - timestamp)
+            if quality is not None:
+                self.gesture_detector.set_quality(quality)
+
+    def _reconnect(self) -> None:
+        """Reopen a camera that stopped delivering frames."""
+        logger.warning("Camera stopped delivering frames, reconnecting")
+        self.camera_manager.release()
+        while not self._stop.is_set():
+            if self.camera_manager.initialize():
+                return
+            self._stop.wait(self.reconnect_delay)
+
+    def shutdown(self) -> None:
+        """Finish profiling and release the camera, detector, event server, event bus and macros."""
+        self.profiler.stop()
+        self.camera_manager.release()
+        if self.event_server is not None:
+            self.event_server.stop()
+        self.event_bus.close()
+        self.gesture_mapping.macros.stop()
+        self.gesture_detector.release()
+        logger.info("Headless service stopped")
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='HoloGest headless gesture control service')
+    add_service_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def add_service_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options shared by the headless service and the main entry point."""
+    parser.add_argument('--config', metavar='PATH', help='JSON configuration file')
+    parser.add_argument('--camera', type=int, help='Camera index')
+    parser.add_argument('--max-fps', type=float, help='Upper bound on processed frames per second (0: no limit)')
+    parser.add_argument('--hand-backend', choices=BACKENDS,
+                        help='Hand landmark backend (see src.gesture_recognition.hand_backends)')
+    parser.add_argument('--event-server', action='store_true', default=None,
+                        help='Stream gesture events to local clients (see src.utils.event_server)')
+    parser.add_argument('--profile', type=float, metavar='SECONDS',
+                        help='Profile the session for this long from startup (reports in the profiling dir; '
+                             'SIGUSR1 starts and stops sessions at any time)')
+    parser.add_argument('--log-level', default=os.environ.get('HOLOGEST_LOG_LEVEL'),
+                        help='Log level (DEBUG, INFO, WARNING, ERROR); DEBUG enables per-frame diagnostics')
+    parser.add_argument('--log-dir', default=os.environ.get('HOLOGEST_LOG_DIR'),
+                        help='Directory for rotating JSON-lines log files')
+
+
+def config_overrides(args) -> Dict[str, Any]:
+    """Configuration values given on the command line (or environment), over the config file."""
+    return {
+        'camera': {'index': args.camera},
+        'service': {'max_fps': args.max_fps},
+        'hand_tracking': {'backend': args.hand_backend},
+        'server': {'enabled': args.event_server},
+        'logging': {'level': args.log_level, 'dir': args.log_dir}
+    }
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    from src.utils.logging_config import setup_logging
+    args = parse_args(argv)
+    config = load_config(args.config, config_overrides(args))
+    setup_logging(level=config['logging']['level'], log_dir=config['logging']['dir'])
+    service = HeadlessService(config)
+    service.install_signal_handlers()
+    if args.profile:
+        service.profiler.start(args.profile)
+    return service.run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,47 +5,89 @@ import os
 # Add the src directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import argparse
+from functools import partial
 import logging
-from PyQt5.QtWidgets import QApplication
-from src.ui.main_window import MainWindow
-from src.gesture_recognition.gesture_detector import GestureDetector
-from src.utils.helpers import setup_logging
+from src.headless import HeadlessService, add_service_arguments, config_overrides
+from src.utils.config import load_config
+from src.utils.logging_config import setup_logging
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='HoloGest - Touchless Computer Interaction')
+    add_service_arguments(parser)
+    parser.add_argument('--headless', action='store_true',
+                        help='Run without the Qt window as a background service (stop with Ctrl+C or SIGTERM)')
+    parser.add_argument('--record-trace', metavar='PATH',
+                        help='Record a session trace for replay with python -m src.utils.session_trace')
+    parser.add_argument('--inference-process', action='store_true',
+                        help='Run gesture detection in a separate process fed through shared memory')
+    return parser.parse_args(argv)
+
+def run_gui(args, config):
+    """Run the Qt user interface."""
+    # Qt is only imported when the window is wanted
+    from PyQt5.QtWidgets import QApplication
+    from src.ui.main_window import MainWindow
+    from src.gesture_recognition.gesture_detector import GestureDetector
+    from src.utils.inference_process import InferenceProcess
+    from src.utils.motion_gate import create_motion_gate
+    from src.gesture_recognition.custom_gestures import create_gesture_index
+    from src.gesture_recognition.landmark_filter import create_landmark_filter
+    from src.gesture_recognition.hand_backends import create_hand_backend
+    from src.utils.profiler import install_signal_trigger
+    logger = logging.getLogger(__name__)
+    
+    # Initialize Qt application
+    logger.debug("Initializing Qt Application")
+    app = QApplication(sys.argv)
+    
+    # Initialize gesture detector, in this process or a child process
+    logger.debug("Initializing Gesture Detector")
+    custom_gestures = create_gesture_index(config['custom_gestures'])
+    detector_factory = partial(GestureDetector, thresholds=config['gestures']['thresholds'],
+                               motion_gate=create_motion_gate(config['motion_gate']),
+                               custom_gestures=custom_gestures,
+                               smoothing=create_landmark_filter(config['smoothing']),
+                               backend=partial(create_hand_backend, config['hand_tracking']))
+    gesture_detector = None if args.inference_process else detector_factory()
+    inference_process = InferenceProcess(detector_factory=detector_factory) if args.inference_process else None
+    
+    # Create and show main window
+    logger.debug("Creating Main Window")
+    window = MainWindow(gesture_detector, trace_path=args.record_trace,
+                        inference_process=inference_process, config=config, custom_gestures=custom_gestures)
+    install_signal_trigger(window.profiler)
+    if args.profile:
+        window.toggle_profiling(args.profile)
+    logger.debug("Showing Main Window")
+    window.show()
+    
+    logger.info("Application initialized successfully. Starting event loop.")
+    print("HoloGest is running. Press Ctrl+C to exit.")
+    
+    # Start the event loop
+    return app.exec_()
 
 def main():
-    # Setup logging with more verbose output
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    args = parse_args()
+    config = load_config(args.config, config_overrides(args))
+    # Logging runs on a background writer thread, off the frame loop
+    setup_logging(level=config['logging']['level'], log_dir=config['logging']['dir'])
     logger = logging.getLogger(__name__)
     logger.info("Starting HoloGest application")
     
     try:
-        # Initialize Qt application
-        logger.debug("Initializing Qt Application")
-        app = QApplication(sys.argv)
-        
-        # Initialize gesture detector
-        logger.debug("Initializing Gesture Detector")
-        gesture_detector = GestureDetector()
-        
-        # Create and show main window
-        logger.debug("Creating Main Window")
-        window = MainWindow(gesture_detector)
-        logger.debug("Showing Main Window")
-        window.show()
-        
-        logger.info("Application initialized successfully. Starting event loop.")
-        print("HoloGest is running. Press Ctrl+C to exit.")
-        
-        # Start the event loop
-        sys.exit(app.exec_())
+        if args.headless:
+            service = HeadlessService(config)
+            service.install_signal_handlers()
+            if args.profile:
+                service.profiler.start(args.profile)
+            sys.exit(service.run())
+        sys.exit(run_gui(args, config))
         
     except Exception as e:
-        logger.error(f"Application error: {str(e)}", exc_info=True)
+        logger.error("Application error: %s", e, exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":
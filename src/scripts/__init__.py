@@ -0,0 +1,5 @@
+"""
+Scripts Package
+
+This package contains command line tools and system scripts.
+"""
@@ -0,0 +1,165 @@
+"""
+Generate an augmented landmark dataset.
+
+Reads a dataset in the gesture_data.csv format, draws the requested number
+of augmented samples from it (see src.gesture_recognition.augmentation) and
+streams them to a CSV in the same format. Chunks are generated and
+formatted on a process pool and written in order as they complete, with a
+bounded number in flight, so memory use depends on the chunk size only.
+
+Usage:
+    python -m src.scripts.augment_dataset gesture_data.csv augmented.csv --count 1000000 --workers 8
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.gesture_recognition.augmentation import Augmenter
+from src.gesture_recognition.landmarks import DATASET_COLUMNS, NUM_LANDMARKS, load_dataset
+
+logger = logging.getLogger(__name__)
+
+
+def format_chunk(landmarks: np.ndarray, labels: np.ndarray, digits: int = 6) -> str:
+    """
+    Format samples as gesture_data.csv lines.
+
+    One %-format over the whole chunk keeps the formatting in C, far faster
+    than formatting values one by one.
+
+    Args:
+        landmarks: Array of shape (N, 21, 3)
+        labels: Labels of shape (N,)
+        digits: Significant digits per value
+
+    Returns:
+        str: The lines, each ending in a newline
+    """
+    row = ','.join(['%s'] + [f'%.{digits}g'] * (NUM_LANDMARKS * 3)) + '\n'
+    values = np.column_stack([np.asarray(labels, dtype=object),
+                              landmarks.reshape(len(landmarks), -1).astype(object)])
+    return (row * len(values)) % tuple(values.ravel())
+
+
+# Source samples and Augmenter settings, set once per worker by _init_worker
+_source = None
+_settings = {}
+
+
+def _init_worker(landmarks: np.ndarray, labels: np.ndarray, settings: Dict[str, Any]) -> None:
+    global _source, _settings
+    _source = (landmarks, labels)
+    _settings = settings
+
+
+def _augment_chunk(task: Tuple[int, int, np.random.SeedSequence]) -> str:
+    """Generate and format the samples [start, stop), cycling through the sources."""
+    start, stop, seed = task
+    landmarks, labels = _source
+    indices = np.arange(start, stop) % len(landmarks)
+    augmenter = Augmenter(seed=seed, **_settings)
+    return format_chunk(*augmenter.augment(landmarks[indices], labels[indices]))
+
+
+def augment_dataset(input_path: str, output_path: str, count: int, settings: Optional[Dict[str, Any]] = None,
+                    seed: Optional[int] = None, chunk_size: int = 65536, include_source: bool = False,
+                    workers: Optional[int] = None) -> int:
+    """
+    Write an augmented dataset.
+
+    Every chunk has its own seed derived from `seed`, so the output is the
+    same for any number of workers.
+
+    Args:
+        input_path: Source dataset
+        output_path: Output CSV, written through a temporary file and renamed when complete
+        count: Number of augmented samples
+        settings: Augmenter keyword arguments (roll, tilt, scale, ...)
+        seed: Random seed, None for a fresh one
+        chunk_size: Samples generated and written at a time
+        include_source: Also write the unmodified source samples first
+        workers: Worker processes, defaults to the CPU count; 1 generates in this process
+
+    Returns:
+        int: Number of rows written
+
+    Raises:
+        ValueError: If the source dataset is empty
+    """
+    labels, landmarks = load_dataset(input_path)
+    if not len(labels):
+        raise ValueError(f"No samples in {input_path}")
+    settings = settings or {}
+    starts = range(0, count, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    tasks = [(start, min(start + chunk_size, count), chunk_seed) for start, chunk_seed in zip(starts, seeds)]
+    workers = workers or os.cpu_count() or 1
+
+    temporary = output_path + '.tmp'
+    written = 0
+    with open(temporary, 'w', encoding='utf-8', newline='') as output:
+        output.write(','.join(DATASET_COLUMNS) + '\n')
+        if include_source:
+            output.write(format_chunk(landmarks, labels))
+            written += len(labels)
+        if workers == 1:
+            _init_worker(landmarks, labels, settings)
+            for task in tasks:
+                output.write(_augment_chunk(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(landmarks, labels, settings)) as executor:
+                # A bounded window of chunks in flight keeps memory independent of the count
+                pending = deque()
+                for task in tasks:
+                    pending.append(executor.submit(_augment_chunk, task))
+                    if len(pending) >= 2 * workers:
+                        output.write(pending.popleft().result())
+                while pending:
+                    output.write(pending.popleft().result())
+        written += count
+    os.replace(temporary, output_path)
+    return written
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Generate an augmented landmark dataset')
+    parser.add_argument('input', help='Dataset in the gesture_data.csv format')
+    parser.add_argument('output', help='Output CSV path')
+    parser.add_argument('--count', type=int, default=100000, help='Augmented samples to generate')
+    parser.add_argument('--chunk-size', type=int, default=65536, help='Samples per chunk (bounds memory)')
+    parser.add_argument('--include-source', action='store_true', help='Also copy the source samples')
+    parser.add_argument('--roll', type=float, default=30.0, help='Largest in-plane rotation, degrees')
+    parser.add_argument('--tilt', type=float, default=15.0, help='Largest pitch and yaw, degrees')
+    parser.add_argument('--scale', type=float, default=0.15, help='Largest relative per-axis scale change')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Landmark noise, palm lengths')
+    parser.add_argument('--finger-length', type=float, default=0.1, help='Largest relative finger length change')
+    parser.add_argument('--mirror', type=float, default=0.5, help='Probability of mirroring a sample')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible output')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    settings = {'roll': args.roll, 'tilt': args.tilt, 'scale': args.scale, 'jitter': args.jitter,
+                'finger_length': args.finger_length, 'mirror': args.mirror}
+    started = time.perf_counter()
+    try:
+        written = augment_dataset(args.input, args.output, args.count, settings, args.seed,
+                                  args.chunk_size, args.include_source, args.workers)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error augmenting dataset: {str(e)}")
+        return 1
+    logger.info("Wrote %d samples to %s in %.1f s", written, args.output, time.perf_counter() - started)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
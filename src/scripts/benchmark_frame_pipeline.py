@@ -0,0 +1,153 @@
+"""
+Benchmark per-frame memory churn of the capture -> detection -> preview path.
+
+Runs the buffer handling of MainWindow.update_frame and
+GestureDetector.detect_gestures (decode, RGB conversion for MediaPipe,
+preview conversion) in two variants:
+
+    allocating  every stage returns a new array, as before the frame pool
+    pooled      decode and conversions write into FramePool buffers
+
+Frames come from a video file, or from a generated MJPG clip so the decoder
+path is the real one. Memory is traced with tracemalloc, which sees numpy
+(and therefore OpenCV) buffers: the transient peak above the baseline shows
+how many frame-sized buffers each frame allocates, and the growth between the
+end of warm-up and the end of the run shows whether steady-state memory is
+flat. MediaPipe itself is not run; its cost is the same in both variants.
+
+Usage:
+    python -m src.scripts.benchmark_frame_pipeline --width 1280 --height 720 --frames 300
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from src.utils.frame_pool import FramePool
+
+
+def _make_clip(path: str, width: int, height: int, frames: int = 30) -> None:
+    """Write a short MJPG clip with moving content."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (width, height))
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    for index in range(frames):
+        writer.write(np.roll(base, index * 8, axis=1))
+    writer.release()
+
+
+class _LoopingCapture:
+    """VideoCapture that rewinds at the end of the file."""
+
+    def __init__(self, path: str):
+        self.capture = cv2.VideoCapture(path)
+
+    def read(self, out=None):
+        success, frame = self.capture.read(out) if out is not None else self.capture.read()
+        if not success:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.capture.read(out) if out is not None else self.capture.read()
+        return success, frame
+
+    def release(self):
+        self.capture.release()
+
+
+def _allocating_frame(capture) -> None:
+    success, frame = capture.read()
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)  # detect_gestures
+    preview = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)  # display
+    del rgb_frame, preview
+
+
+class _PooledPipeline:
+    def __init__(self, shape):
+        self.shape = shape
+        self.frame_pool = FramePool(capacity=2)
+        self.rgb_pool = FramePool(capacity=1)
+
+    def __call__(self, capture) -> None:
+        buffer = self.frame_pool.acquire(self.shape)
+        success, frame = capture.read(buffer)
+        try:
+            rgb_frame = self.rgb_pool.acquire(frame.shape)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+            self.rgb_pool.release(rgb_frame)
+            # The preview wraps the BGR frame directly (QImage.Format_BGR888)
+        finally:
+            self.frame_pool.release(frame)
+
+    @property
+    def allocations(self) -> int:
+        return self.frame_pool.allocations + self.rgb_pool.allocations
+
+
+def run(step, capture, frames: int, warmup: int, frame_bytes: int) -> dict:
+    """Run one variant and return its per-frame statistics."""
+    for _ in range(warmup):
+        step(capture)
+    tracemalloc.start()
+    steady = tracemalloc.get_traced_memory()[0]
+    peaks = []
+    started = time.perf_counter()
+    for _ in range(frames):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step(capture)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    elapsed = time.perf_counter() - started
+    growth = tracemalloc.get_traced_memory()[0] - steady
+    tracemalloc.stop()
+    transient = float(np.median(peaks))
+    return {
+        'ms_per_frame': elapsed / frames * 1000,
+        'transient_bytes': transient,
+        'buffers_per_frame': transient / frame_bytes,
+        'growth_bytes': growth
+    }
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark per-frame allocations of the frame pipeline')
+    parser.add_argument('--video', help='Video file to read frames from (default: generated clip)')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--fps', type=float, default=30.0, help='Frame rate used to express churn in MB/s')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.video
+        if path is None:
+            path = os.path.join(directory, 'clip.avi')
+            _make_clip(path, args.width, args.height)
+        probe = _LoopingCapture(path)
+        success, frame = probe.read()
+        probe.release()
+        if not success:
+            print(f"Cannot read frames from {path}", file=sys.stderr)
+            return 1
+        frame_bytes = frame.nbytes
+
+        pooled = _PooledPipeline(frame.shape)
+        print(f"{frame.shape[1]}x{frame.shape[0]} frames, {args.frames} measured after {args.warmup} warm-up")
+        print(f"{'variant':<12}{'ms/frame':>10}{'buffers/frame':>15}{'MB/s churn':>12}{'growth KB':>11}")
+        for name, step in (('allocating', _allocating_frame), ('pooled', pooled)):
+            capture = _LoopingCapture(path)
+            stats = run(step, capture, args.frames, args.warmup, frame_bytes)
+            capture.release()
+            print(f"{name:<12}{stats['ms_per_frame']:>10.2f}{stats['buffers_per_frame']:>15.2f}"
+                  f"{stats['transient_bytes'] * args.fps / 1e6:>12.1f}{stats['growth_bytes'] / 1024:>11.1f}")
+        print(f"pooled buffers allocated in total: {pooled.allocations}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Benchmark the hand landmark backends side by side.
+
+Feeds the same frames to each backend of src.gesture_recognition.hand_backends
+and reports per frame the wall-clock latency (median and 90th percentile), the
+CPU time of the whole process (MediaPipe runs its graph on its own threads,
+so thread CPU time would miss most of it) and the share of frames with a hand.
+In LIVE_STREAM mode the Tasks backend returns before inference finishes, so
+its latency is the cost to the capture thread, not the age of the result.
+
+Frames come from a video file (use one with a hand in view for meaningful
+detection rates), or from a generated clip otherwise. Backends that cannot be
+loaded here, e.g. tasks without a model file or legacy on a MediaPipe release
+without mp.solutions, are reported and skipped.
+
+Usage:
+    python -m src.scripts.benchmark_hand_backends --video hand.mp4 --model hand_landmarker.task
+    python -m src.scripts.benchmark_hand_backends --backends legacy:0 legacy:1 tasks:video tasks:live_stream
+"""
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from src.gesture_recognition.hand_backends import LegacyHandsBackend, ReplayHandBackend, TasksHandBackend
+
+DEFAULT_BACKENDS = ['legacy:0', 'legacy:1', 'tasks:video', 'tasks:live_stream', 'replay']
+
+
+def _generated_frames(width: int, height: int, count: int = 30):
+    """Frames with moving content and no hand."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return [np.roll(base, index * 8, axis=1) for index in range(count)]
+
+
+def _video_frames(path: str, limit: int):
+    """Up to `limit` frames of a video file."""
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        success, frame = capture.read()
+        if not success:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def create_backend(spec: str, model_path: str):
+    """
+    Create a backend from a 'name[:option]' spec.
+
+    legacy:<model complexity>, tasks:<running mode>, and replay (a still hand).
+    """
+    name, _, option = spec.partition(':')
+    if name == 'legacy':
+        return LegacyHandsBackend(model_complexity=int(option or 1))
+    if name == 'tasks':
+        return TasksHandBackend(model_path, running_mode=option or 'video')
+    if name == 'replay':
+        return ReplayHandBackend([np.full((21, 3), 0.5, dtype=np.float32)])
+    raise ValueError(f"Unknown backend '{spec}'")
+
+
+def run(backend, frames, count: int, warmup: int, fps: float) -> dict:
+    """Run one backend over the frames and return its per-frame statistics."""
+    rgb_frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames]
+    timestamp = 0.0
+    for index in range(warmup):
+        backend.process(rgb_frames[index % len(rgb_frames)], timestamp)
+        timestamp += 1.0 / fps
+    latencies = []
+    detected = 0
+    cpu_started = time.process_time()
+    for index in range(count):
+        started = time.perf_counter()
+        detections = backend.process(rgb_frames[index % len(rgb_frames)], timestamp)
+        latencies.append(time.perf_counter() - started)
+        detected += bool(detections)
+        timestamp += 1.0 / fps
+    cpu = time.process_time() - cpu_started
+    return {
+        'median_ms': float(np.median(latencies)) * 1000,
+        'p90_ms': float(np.percentile(latencies, 90)) * 1000,
+        'cpu_ms': cpu / count * 1000,
+        'detection_rate': detected / count
+    }
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark hand landmark backends side by side')
+    parser.add_argument('--video', help='Video file to read frames from (default: generated frames)')
+    parser.add_argument('--model', default='hand_landmarker.task', help='Tasks hand landmarker model file')
+    parser.add_argument('--backends', nargs='+', default=DEFAULT_BACKENDS,
+                        help='Backends to compare: legacy:<0|1>, tasks:<video|live_stream>, replay')
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--fps', type=float, default=30.0, help='Frame rate the timestamps advance at')
+    args = parser.parse_args(argv)
+
+    frames = _video_frames(args.video, args.frames) if args.video else _generated_frames(args.width, args.height)
+    if not frames:
+        print(f"Cannot read frames from {args.video}", file=sys.stderr)
+        return 1
+    print(f"{frames[0].shape[1]}x{frames[0].shape[0]} frames, {args.frames} measured after {args.warmup} warm-up")
+    print(f"{'backend':<20}{'median ms':>10}{'p90 ms':>9}{'CPU ms':>9}{'detected':>10}")
+    for spec in args.backends:
+        try:
+            backend = create_backend(spec, args.model)
+        except Exception as e:
+            print(f"{spec:<20}unavailable: {e}")
+            continue
+        try:
+            stats = run(backend, frames, args.frames, args.warmup, args.fps)
+        finally:
+            backend.close()
+        print(f"{spec:<20}{stats['median_ms']:>10.2f}{stats['p90_ms']:>9.2f}{stats['cpu_ms']:>9.2f}"
+              f"{stats['detection_rate']:>10.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Offline evaluation of latency-compensating cursor prediction.
+
+Replays cursor trajectories - from session traces recorded with
+--record-trace, or synthetic reaching movements - through CursorPredictor and
+compares every sample, as it would reach the desktop after the pipeline
+latency, with where the finger actually was at that moment:
+
+    lag        distance between the command and the finger position
+    overshoot  how far the command ran ahead of the finger along its motion,
+               or away from it while the finger was still
+
+Without prediction the error is pure lag; a good predictor trades most of it
+for a small overshoot.
+
+Usage:
+    python -m src.scripts.evaluate_cursor_prediction session.trace --latency 0.05,0.1,0.15
+    python -m src.scripts.evaluate_cursor_prediction --synthetic 60
+"""
+import argparse
+import logging
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.cursor_predictor import CursorPredictor
+from src.utils.session_trace import FRAME, read_trace
+
+logger = logging.getLogger(__name__)
+
+# Trajectory: sample times (N,), normalized positions (N, 2), confidences (N,)
+Trajectory = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def trace_trajectory(path: str) -> Trajectory:
+    """Cursor samples of the cursor_move frames of a session trace."""
+    _, records = read_trace(path)
+    samples = []
+    for record in records:
+        if record.kind != FRAME or record.data.get('gesture') != 'cursor_move':
+            continue
+        cursor = record.data.get('cursor_pos')
+        if cursor:
+            samples.append((record.timestamp, cursor['x'], cursor['y'], record.data.get('confidence', 1.0)))
+    samples = np.array(samples, dtype=np.float64).reshape(-1, 4)
+    return samples[:, 0], samples[:, 1:3], samples[:, 3]
+
+
+def synthetic_trajectory(moves: int = 40, rate: float = 30.0, noise: float = 0.002,
+                         seed: int = 0) -> Trajectory:
+    """
+    Minimum-jerk reaching movements between random targets, with pauses and tracking noise.
+
+    Args:
+        moves: Number of reaches
+        rate: Camera frame rate
+        noise: Standard deviation of the position noise, normalized units
+        seed: Random seed
+    """
+    rng = np.random.default_rng(seed)
+    positions, confidences = [], []
+    start = rng.uniform(0.2, 0.8, 2)
+    for _ in range(moves):
+        target = rng.uniform(0.1, 0.9, 2)
+        duration = rng.uniform(0.3, 0.9)
+        s = np.linspace(0.0, 1.0, max(int(duration * rate), 2))
+        profile = 10 * s ** 3 - 15 * s ** 4 + 6 * s ** 5
+        positions.append(start + profile[:, None] * (target - start))
+        pause = int(rng.uniform(0.2, 0.6) * rate)
+        positions.append(np.repeat(target[None], pause, axis=0))
+        confidences.append(rng.uniform(0.6, 1.0, len(s) + pause))
+        start = target
+    xy = np.concatenate(positions)
+    xy += rng.normal(0.0, noise, xy.shape)
+    return np.arange(len(xy)) / rate, xy, np.concatenate(confidences)
+
+
+def evaluate(trajectory: Trajectory, latency: float,
+             predictor: Optional[CursorPredictor] = None) -> Dict[str, Any]:
+    """
+    Lag and overshoot of cursor commands delivered `latency` seconds after capture.
+
+    Args:
+        trajectory: (times, positions, confidences)
+        latency: Capture-to-actuation latency in seconds
+        predictor: Predictor to evaluate, None for the uncompensated input
+
+    Returns:
+        dict: samples, lag_mean, lag_p95, overshoot_mean, overshoot_max (normalized units)
+    """
+    times, positions, confidences = trajectory
+    if predictor is None:
+        commands = positions
+    else:
+        predictor.reset()
+        predictor.latency = latency
+        commands = np.array([predictor.predict(x, y, t, c)
+                             for t, (x, y), c in zip(times, positions, confidences)]).reshape(-1, 2)
+
+    # Only samples whose delivery time falls inside the same stretch of tracking
+    gap = predictor.max_gap if predictor is not None else CursorPredictor().max_gap
+    segment = np.concatenate([[0], np.cumsum(np.diff(times) > gap)])
+    segment_end = times[np.r_[np.flatnonzero(np.diff(segment)), len(times) - 1]][segment]
+    valid = times + latency <= segment_end
+    if not np.any(valid):
+        return {'samples': 0, 'lag_mean': 0.0, 'lag_p95': 0.0, 'overshoot_mean': 0.0, 'overshoot_max': 0.0}
+
+    delivered = times[valid] + latency
+    actual = np.stack([np.interp(delivered, times, positions[:, axis]) for axis in range(2)], axis=1)
+    error = commands[valid] - actual
+    lag = np.hypot(error[:, 0], error[:, 1])
+    travel = actual - positions[valid]
+    distance = np.hypot(travel[:, 0], travel[:, 1])
+    moving = distance > 1e-3
+    ahead = np.einsum('ij,ij->i', error, travel) / np.where(moving, distance, 1.0)
+    overshoot = np.where(moving, np.maximum(ahead, 0.0), lag)
+    return {
+        'samples': int(valid.sum()),
+        'lag_mean': float(lag.mean()),
+        'lag_p95': float(np.percentile(lag, 95)),
+        'overshoot_mean': float(overshoot.mean()),
+        'overshoot_max': float(overshoot.max())
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Evaluate cursor prediction on recorded or synthetic trajectories')
+    parser.add_argument('traces', nargs='*', help='Session traces recorded with --record-trace')
+    parser.add_argument('--synthetic', type=int, default=0, metavar='MOVES',
+                        help='Also evaluate this many synthetic reaching movements')
+    parser.add_argument('--latency', default='0.05,0.1,0.15',
+                        help='Comma separated capture-to-actuation latencies in seconds')
+    parser.add_argument('--max-lead', type=float, default=0.08, help='Predictor lead cap (normalized)')
+    parser.add_argument('--screen-width', type=int, default=1920, help='Pixels per normalized unit in the report')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    trajectories = [(path, trace_trajectory(path)) for path in args.traces]
+    if args.synthetic or not trajectories:
+        trajectories.append(('synthetic', synthetic_trajectory(args.synthetic or 40)))
+
+    scale = args.screen_width
+    print(f"{'trajectory':<24}{'latency':>8}  {'method':<10}{'lag px':>8}{'p95 px':>8}"
+          f"{'over px':>9}{'max over':>9}")
+    for name, trajectory in trajectories:
+        if len(trajectory[0]) < 2:
+            logger.warning("%s has no cursor movement", name)
+            continue
+        for latency in (float(value) for value in args.latency.split(',')):
+            for method, predictor in (('none', None),
+                                      ('predicted', CursorPredictor(max_horizon=latency, max_lead=args.max_lead))):
+                result = evaluate(trajectory, latency, predictor)
+                print(f"{name[-24:]:<24}{latency:>8.3f}  {method:<10}{result['lag_mean'] * scale:>8.1f}"
+                      f"{result['lag_p95'] * scale:>8.1f}{result['overshoot_mean'] * scale:>9.1f}"
+                      f"{result['overshoot_max'] * scale:>9.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Batch landmark extraction from labelled videos and images.
+
+The input directory holds one subdirectory per label:
+
+    corpus/
+        move_left/clip1.mp4, clip2.mp4, ...
+        move_right/frame_001.jpg, ...
+
+Every file (or fixed-size segment of a long video) is a work unit. Units are
+decoded and run through MediaPipe Hands on a process pool with one model per
+worker (a second, static-image one only if the corpus mixes images and
+videos), and each finished unit is written atomically as its own chunk file.
+Chunks are keyed by the unit and the extraction settings: re-running the
+command skips units whose chunk already exists for the same settings, and the
+chunks are merged in unit order, so the output is identical however the work
+was scheduled or interrupted.
+
+Usage:
+    python -m src.scripts.extract_landmarks corpus/ dataset.csv --workers 8
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import mediapipe as mp
+
+from src.gesture_recognition.landmarks import (DATASET_COLUMNS, landmarks_to_array,
+                                               normalize_to_dataset, format_dataset_row)
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp'}
+
+# A unit is (label, path, first frame, end frame); images use (0, 1)
+Unit = Tuple[str, str, int, int]
+
+# Per-worker MediaPipe models by static_image_mode, created on first use by _hands
+_models = {}
+_worker_options = {}
+
+
+def discover_units(input_dir: str, segment_frames: int = 0) -> List[Unit]:
+    """
+    List the work units of a labelled corpus in a deterministic order.
+
+    Args:
+        input_dir: Directory with one subdirectory per label
+        segment_frames: Split videos into segments of this many frames, 0 for whole files
+
+    Returns:
+        list: Sorted work units
+    """
+    units: List[Unit] = []
+    for label in sorted(os.listdir(input_dir)):
+        label_dir = os.path.join(input_dir, label)
+        if not os.path.isdir(label_dir):
+            continue
+        for name in sorted(os.listdir(label_dir)):
+            path = os.path.join(label_dir, name)
+            extension = os.path.splitext(name)[1].lower()
+            if extension in IMAGE_EXTENSIONS:
+                units.append((label, path, 0, 1))
+            elif extension in VIDEO_EXTENSIONS:
+                frame_count = _video_frame_count(path)
+                if segment_frames and frame_count > segment_frames:
+                    for start in range(0, frame_count, segment_frames):
+                        units.append((label, path, start, min(start + segment_frames, frame_count)))
+                else:
+                    units.append((label, path, 0, max(frame_count, 0) or sys.maxsize))
+    return units
+
+
+def _video_frame_count(path: str) -> int:
+    capture = cv2.VideoCapture(path)
+    try:
+        return int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        capture.release()
+
+
+def _extraction_options(min_detection_confidence: float, frame_stride: int) -> dict:
+    """Settings that change the samples extracted from a unit."""
+    return {'min_detection_confidence': min_detection_confidence, 'frame_stride': max(1, frame_stride)}
+
+
+def _init_worker(min_detection_confidence: float, frame_stride: int) -> None:
+    """Set up a worker; its models are created when the first unit needing them arrives."""
+    # One inference thread per process; the pool provides the parallelism
+    cv2.setNumThreads(1)
+    _models.clear()
+    _worker_options.update(_extraction_options(min_detection_confidence, frame_stride))
+
+
+def _create_hands(static_image_mode: bool, min_detection_confidence: float):
+    """Create a MediaPipe Hands model for still images or video."""
+    return mp.solutions.hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=1,
+        min_detection_confidence=min_detection_confidence,
+        min_tracking_confidence=0.5
+    )
+
+
+def _hands(static_image_mode: bool):
+    """This worker's model for images or videos."""
+    if static_image_mode not in _models:
+        _models[static_image_mode] = _create_hands(static_image_mode, _worker_options['min_detection_confidence'])
+    return _models[static_image_mode]
+
+
+def _frames(unit: Unit) -> Iterator:
+    """Decode the BGR frames of a unit."""
+    label, path, start, end = unit
+    extension = os.path.splitext(path)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        image = cv2.imread(path)
+        if image is not None:
+            yield image
+        return
+    capture = cv2.VideoCapture(path)
+    try:
+        if start:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+        stride = _worker_options['frame_stride']
+        for index in range(start, end):
+            if not capture.grab():
+                break
+            if (index - start) % stride:
+                continue
+            success, frame = capture.retrieve()
+            if success:
+                yield frame
+    finally:
+        capture.release()
+
+
+def process_unit(unit: Unit) -> List[str]:
+    """
+    Extract normalized landmarks from one unit.
+
+    Returns:
+        list: Dataset lines, one per frame with a detected hand
+    """
+    label, path = unit[0], unit[1]
+    is_image = os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS
+    hands = _hands(is_image)
+    if not is_image:
+        # Tracking state must not leak between units handled by the same worker
+        hands.reset()
+    rows = []
+    for frame in _frames(unit):
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if results.multi_hand_landmarks:
+            landmarks = normalize_to_dataset(landmarks_to_array(results.multi_hand_landmarks[0]))
+            rows.append(format_dataset_row(label, landmarks))
+    return rows
+
+
+def _unit_key(unit: Unit, options: dict) -> str:
+    """Chunk key of a unit, so chunks extracted with other settings are never reused."""
+    return hashlib.sha1(json.dumps([unit, options], sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def _write_chunk(chunk_path: str, rows: List[str]) -> None:
+    """Write a chunk atomically so an interrupted run never leaves a partial one."""
+    temporary_path = chunk_path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8', newline='') as f:
+        for row in rows:
+            f.write(row + '\n')
+    os.replace(temporary_path, chunk_path)
+
+
+def extract(input_dir: str, output_path: str, workers: Optional[int] = None,
+            segment_frames: int = 0, frame_stride: int = 1,
+            min_detection_confidence: float = 0.5, chunk_dir: Optional[str] = None) -> int:
+    """
+    Extract a landmark dataset from a labelled corpus.
+
+    Args:
+        input_dir: Directory with one subdirectory per label
+        output_path: Output CSV in the gesture_data.csv format
+        workers: Number of worker processes, defaults to the CPU count
+        segment_frames: Split videos into segments of this many frames, 0 for whole files
+        frame_stride: Use every n-th video frame
+        min_detection_confidence: MediaPipe detection confidence threshold
+        chunk_dir: Directory for per-unit chunks, defaults to <output>.chunks
+
+    Returns:
+        int: Number of samples written
+    """
+    units = discover_units(input_dir, segment_frames)
+    chunk_dir = chunk_dir or output_path + '.chunks'
+    os.makedirs(chunk_dir, exist_ok=True)
+    options = _extraction_options(min_detection_confidence, frame_stride)
+    chunk_paths = [os.path.join(chunk_dir, f"{index:06d}-{_unit_key(unit, options)}.csv")
+                   for index, unit in enumerate(units)]
+    pending = [(unit, path) for unit, path in zip(units, chunk_paths) if not os.path.exists(path)]
+    logger.info("%d units, %d already done, %d to process",
+                len(units), len(units) - len(pending), len(pending))
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(min_detection_confidence, frame_stride)) as executor:
+            results = executor.map(process_unit, [unit for unit, _ in pending], chunksize=1)
+            for done, ((unit, chunk_path), rows) in enumerate(zip(pending, results), 1):
+                _write_chunk(chunk_path, rows)
+                logger.info("[%d/%d] %s: %d samples", done, len(pending), unit[1], len(rows))
+
+    # Merge chunks in unit order for a deterministic dataset
+    samples = 0
+    temporary_path = output_path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8', newline='') as output:
+        output.write(','.join(DATASET_COLUMNS) + '\n')
+        for chunk_path in chunk_paths:
+            with open(chunk_path, 'r', encoding='utf-8') as chunk:
+                for line in chunk:
+                    output.write(line)
+                    samples += 1
+    os.replace(temporary_path, output_path)
+    logger.info("Wrote %d samples to %s", samples, output_path)
+    return samples
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Extract hand landmark datasets from labelled videos and images')
+    parser.add_argument('input_dir', help='Directory with one subdirectory of videos/images per label')
+    parser.add_argument('output', help='Output CSV in the gesture_data.csv format')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--segment-frames', type=int, default=0,
+                        help='Split videos into segments of this many frames to balance the pool')
+    parser.add_argument('--frame-stride', type=int, default=1, help='Use every n-th video frame')
+    parser.add_argument('--min-detection-confidence', type=float, default=0.5)
+    parser.add_argument('--chunk-dir', default=None, help='Directory for resumable per-unit chunks')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    extract(args.input_dir, args.output, args.workers, args.segment_frames, args.frame_stride,
+            args.min_detection_confidence, args.chunk_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Stress test the stages after hand tracking with synthetic landmarks.
+
+Streams labelled frames from SyntheticHands (see
+src.gesture_recognition.synthetic_hands) through each stage headless, as
+fast as it will go, and reports its throughput and, where the stage
+classifies, its agreement with the generated labels on held poses:
+
+    generate   SyntheticHands.stream alone
+    batch      canonicalize + confidence.classify_poses over whole chunks
+    detector   LandmarkFilter smoothing + GestureDetector.classify_landmarks
+               per frame (custom gestures, swipes, confidence)
+    mapping    detector, then GestureMapping.execute_gesture per frame on a
+               virtual clock with a RecordingActuator: cooldowns, sequences,
+               macros and actuation without touching the desktop
+
+Usage:
+    python -m src.scripts.stress_pipeline --frames 1000000 --stages generate batch
+    python -m src.scripts.stress_pipeline --frames 20000 --path random_walk --noise 0.006
+"""
+import argparse
+import logging
+import sys
+import time
+
+import numpy as np
+
+from src.gesture_recognition.confidence import GESTURES, classify_poses
+from src.gesture_recognition.landmarks import canonicalize
+from src.gesture_recognition.synthetic_hands import PATHS, SyntheticHands
+
+STAGES = ('generate', 'batch', 'detector', 'mapping')
+
+
+def run_generate(generator: SyntheticHands, frames: int) -> dict:
+    """Throughput of the generator alone."""
+    for _ in generator.stream(frames):
+        pass
+    return {}
+
+
+def run_batch(generator: SyntheticHands, frames: int) -> dict:
+    """Batched rule classification of every frame."""
+    names = np.array(GESTURES + ('',))
+    agreed = held = 0
+    for chunk in generator.stream(frames):
+        gestures, _ = classify_poses(canonicalize(chunk.landmarks, aspect_ratio=generator.aspect_ratio))
+        mask = np.isin(chunk.labels, GESTURES)
+        agreed += np.count_nonzero(names[gestures[mask]] == chunk.labels[mask])
+        held += np.count_nonzero(mask)
+    return {'agreement': agreed / max(held, 1)}
+
+
+def run_detector(generator: SyntheticHands, frames: int, mapping=None, clock=None) -> dict:
+    """Per-frame smoothing and classification, optionally followed by gesture mapping."""
+    from src.gesture_recognition.gesture_detector import GestureDetector
+    from src.gesture_recognition.landmark_filter import LandmarkFilter
+    from src.utils.metrics import Metrics
+    detector = GestureDetector(clock=clock, metrics=Metrics(), draw=False)
+    detector.aspect_ratio = generator.aspect_ratio
+    smoothing = LandmarkFilter()
+    agreed = held = dispatched = 0
+    for chunk in generator.stream(frames, chunk_size=4096):
+        for landmarks, label, timestamp in zip(*chunk):
+            if clock is not None:
+                clock.set(timestamp)
+            gesture_data = detector.classify_landmarks(smoothing(landmarks, timestamp), timestamp)
+            if label in GESTURES:
+                held += 1
+                agreed += gesture_data.get('gesture') == label
+            if mapping is not None and gesture_data:
+                dispatched += mapping.execute_gesture(gesture_data, timestamp)
+    stats = {'agreement': agreed / max(held, 1)}
+    if mapping is not None:
+        stats['dispatched'] = dispatched
+    return stats
+
+
+def run_mapping(generator: SyntheticHands, frames: int) -> dict:
+    """The detector stage followed by gesture mapping and recorded actuation."""
+    from src.gesture_recognition.gesture_mapping import GestureMapping
+    from src.utils.clock import VirtualClock
+    from src.utils.event_bus import EventBus
+    from src.utils.metrics import Metrics
+    from src.utils.session_trace import RecordingActuator
+    clock = VirtualClock()
+    actuator = RecordingActuator(clock=clock)
+    mapping = GestureMapping(EventBus(), clock=clock, actuator=actuator, metrics=Metrics())
+    stats = run_detector(generator, frames, mapping=mapping, clock=clock)
+    stats['actuations'] = len(actuator.calls)
+    return stats
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Stress test the stages after hand tracking with synthetic hands')
+    parser.add_argument('--frames', type=int, default=100000)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--path', choices=PATHS, default='lissajous', help='Motion path of the hand')
+    parser.add_argument('--noise', type=float, default=0.003, help='Landmark noise, normalized image units')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Per-frame info logs (sequence compilation, recognizer setup) would drown the table
+    logging.basicConfig(level=logging.WARNING)
+    runners = {'generate': run_generate, 'batch': run_batch, 'detector': run_detector, 'mapping': run_mapping}
+    print(f"{args.frames} synthetic frames, {args.path} path, noise {args.noise}")
+    print(f"{'stage':<10}{'frames/s':>14}{'us/frame':>10}  result")
+    for stage in args.stages:
+        generator = SyntheticHands(noise=args.noise, path=args.path, seed=args.seed)
+        started = time.perf_counter()
+        stats = runners[stage](generator, args.frames)
+        elapsed = time.perf_counter() - started
+        result = ', '.join(f"{name} {value:.1%}" if isinstance(value, float) else f"{name} {value}"
+                           for name, value in stats.items())
+        print(f"{stage:<10}{args.frames / elapsed:>14,.0f}{elapsed / args.frames * 1e6:>10.2f}  {result}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+Threshold tuning for the static gesture rules.
+
+Evaluates the rule thresholds of GestureDetector (see
+confidence.DEFAULT_THRESHOLDS) against labelled landmark datasets in the
+gesture_data.csv layout. Each candidate is scored on all samples at once with
+the vectorized rules of confidence.classify_poses, and a grid or random search
+over the candidates is spread across a process pool whose workers each hold
+one copy of the canonicalized samples. For every candidate the per-gesture
+minimum confidence that maximizes that gesture's F1 is chosen as well, and
+candidates are ranked by the macro F1 over the labelled gestures.
+
+Labels are gesture names (cursor_move, scroll_up, ...). Samples labelled none
+or background are negatives that should match no rule; other labels, such as
+the move_left/move_right swipes, which are motion gestures, are skipped.
+
+The result is a configuration file for --config:
+
+    {"gestures": {"thresholds": {...}, "min_confidence": {...}}}
+
+Usage:
+    python -m src.scripts.tune_thresholds poses.csv --output tuned.json --workers 8
+    python -m src.scripts.tune_thresholds poses.csv --search random --trials 500
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.gesture_recognition.confidence import GESTURES, DEFAULT_THRESHOLDS, classify_poses
+from src.gesture_recognition.landmarks import canonicalize, load_dataset
+
+logger = logging.getLogger(__name__)
+
+NEGATIVE_LABELS = {'none', 'background'}
+# Confusion matrix rows and columns: the gestures, then "no gesture"
+CLASSES = GESTURES + ('none',)
+NONE = len(GESTURES)
+
+# Search ranges in palm lengths
+SEARCH_SPACE = {
+    'scroll_gap': (0.1, 1.0),
+    'touch_distance': (0.1, 1.0)
+}
+MIN_CONFIDENCE_CANDIDATES = np.round(np.arange(0.0, 0.95, 0.05), 2)
+
+# Samples of each worker, set once by _init_worker
+_worker_samples: Tuple[np.ndarray, np.ndarray] = None
+
+
+def load_samples(paths: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load and canonicalize labelled samples.
+
+    Args:
+        paths: Datasets in the gesture_data.csv layout
+
+    Returns:
+        tuple: (classes, landmarks); classes index CLASSES, landmarks are canonical (N, 21, 3)
+
+    Raises:
+        ValueError: If no sample is labelled with a static gesture
+    """
+    classes, landmarks, skipped = [], [], set()
+    for path in paths:
+        labels, samples = load_dataset(path)
+        for label, sample in zip(labels, samples):
+            if label in NEGATIVE_LABELS:
+                classes.append(NONE)
+            elif label in GESTURES:
+                classes.append(GESTURES.index(label))
+            else:
+                skipped.add(label)
+                continue
+            landmarks.append(sample)
+    if skipped:
+        logger.warning("Skipping samples of labels without a static rule: %s", ', '.join(sorted(skipped)))
+    classes = np.array(classes, dtype=np.int64)
+    if not np.any(classes < NONE):
+        raise ValueError("No samples labelled with a static gesture (" + ', '.join(GESTURES) + ")")
+    return classes, canonicalize(np.stack(landmarks))
+
+
+def grid_candidates(steps: int) -> List[Dict[str, float]]:
+    """Every combination of `steps` evenly spaced values per threshold."""
+    axes = [np.round(np.linspace(low, high, steps), 4) for low, high in SEARCH_SPACE.values()]
+    grid = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, len(axes))
+    return [dict(zip(SEARCH_SPACE, map(float, point))) for point in grid]
+
+
+def random_candidates(trials: int, seed: int = 0) -> List[Dict[str, float]]:
+    """`trials` thresholds drawn uniformly from SEARCH_SPACE, plus the current defaults."""
+    rng = np.random.default_rng(seed)
+    low, high = np.array(list(SEARCH_SPACE.values())).T
+    points = rng.uniform(low, high, size=(trials, len(SEARCH_SPACE)))
+    return [dict(DEFAULT_THRESHOLDS)] + [dict(zip(SEARCH_SPACE, map(float, point))) for point in points]
+
+
+def confusion_matrix(truth: np.ndarray, predicted: np.ndarray) -> np.ndarray:
+    """Counts of (true class, predicted class) over CLASSES."""
+    size = len(CLASSES)
+    return np.bincount(truth * size + predicted, minlength=size * size).reshape(size, size)
+
+
+def tune_min_confidence(truth: np.ndarray, predicted: np.ndarray,
+                        confidences: np.ndarray) -> Dict[str, float]:
+    """
+    Per-gesture minimum confidence maximizing each labelled gesture's F1.
+
+    A prediction below its gesture's minimum is ignored, as GestureMapping
+    does, which only affects that gesture's counts.
+
+    Args:
+        truth: True classes
+        predicted: Predicted classes
+        confidences: Confidence of each prediction
+
+    Returns:
+        dict: Minimum confidence by gesture, the lowest of equally good values
+    """
+    minimums = {}
+    # (candidates, samples): whether each prediction survives each minimum
+    kept = confidences[None, :] >= MIN_CONFIDENCE_CANDIDATES[:, None]
+    for index, gesture in enumerate(GESTURES):
+        support = np.count_nonzero(truth == index)
+        if not support:
+            continue
+        is_predicted = predicted == index
+        true_positives = np.count_nonzero(kept & (is_predicted & (truth == index)), axis=1)
+        positives = np.count_nonzero(kept & is_predicted, axis=1)
+        f1 = 2 * true_positives / np.maximum(positives + support, 1)
+        minimums[gesture] = float(MIN_CONFIDENCE_CANDIDATES[np.argmax(f1)])
+    return minimums
+
+
+def evaluate(truth: np.ndarray, landmarks: np.ndarray, thresholds: Dict[str, float],
+             min_confidence: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Classify all samples with the given thresholds and score the result.
+
+    Args:
+        truth: True classes, indices into CLASSES
+        landmarks: Canonical landmarks of shape (N, 21, 3)
+        thresholds: Rule thresholds by name
+        min_confidence: Per-gesture minimum confidence; None to choose the best ones
+
+    Returns:
+        dict: thresholds, min_confidence, confusion (matrix over CLASSES), per-gesture
+            precision/recall/f1/support and macro_f1 over the labelled gestures
+    """
+    gestures, confidences = classify_poses(landmarks, thresholds)
+    predicted = np.where(gestures < 0, NONE, gestures)
+    if min_confidence is None:
+        min_confidence = tune_min_confidence(truth, predicted, confidences)
+    minimums = np.array([min_confidence.get(gesture, 0.0) for gesture in GESTURES] + [0.0])
+    predicted = np.where(confidences >= minimums[predicted], predicted, NONE)
+
+    confusion = confusion_matrix(truth, predicted)
+    per_gesture = {}
+    for index, gesture in enumerate(GESTURES):
+        true_positives = confusion[index, index]
+        support = confusion[index].sum()
+        predictions = confusion[:, index].sum()
+        precision = true_positives / predictions if predictions else 0.0
+        recall = true_positives / support if support else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        per_gesture[gesture] = {'precision': float(precision), 'recall': float(recall),
+                                'f1': float(f1), 'support': int(support)}
+    labelled = [scores['f1'] for scores in per_gesture.values() if scores['support']]
+    return {
+        'thresholds': dict(thresholds),
+        'min_confidence': min_confidence,
+        'confusion': confusion.tolist(),
+        'gestures': per_gesture,
+        'macro_f1': float(np.mean(labelled)) if labelled else 0.0
+    }
+
+
+def _init_worker(truth: np.ndarray, landmarks: np.ndarray) -> None:
+    """Keep this worker's copy of the samples."""
+    global _worker_samples
+    _worker_samples = (truth, landmarks)
+
+
+def evaluate_candidate(thresholds: Dict[str, float]) -> Tuple[float, Dict[str, float]]:
+    """Macro F1 of a candidate on the worker's samples."""
+    truth, landmarks = _worker_samples
+    return evaluate(truth, landmarks, thresholds)['macro_f1'], thresholds
+
+
+def search(truth: np.ndarray, landmarks: np.ndarray, candidates: List[Dict[str, float]],
+           workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Evaluate all candidates and report the best one.
+
+    Args:
+        truth: True classes, indices into CLASSES
+        landmarks: Canonical landmarks of shape (N, 21, 3)
+        candidates: Threshold candidates
+        workers: Worker processes, defaults to the CPU count; 1 evaluates in this process
+
+    Returns:
+        dict: evaluate() report of the best candidate, the first of equally good ones
+    """
+    if workers == 1:
+        _init_worker(truth, landmarks)
+        scores = list(map(evaluate_candidate, candidates))
+    else:
+        workers = workers or os.cpu_count() or 1
+        # A few chunks per worker balance the load without a round trip per candidate
+        chunksize = max(1, len(candidates) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(truth, landmarks)) as executor:
+            scores = list(executor.map(evaluate_candidate, candidates, chunksize=chunksize))
+    best = max(range(len(scores)), key=lambda index: (scores[index][0], -index))
+    logger.info("Evaluated %d candidates on %d samples, best macro F1 %.3f",
+                len(candidates), len(truth), scores[best][0])
+    return evaluate(truth, landmarks, scores[best][1])
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human-readable thresholds, per-gesture scores and confusion matrix."""
+    lines = ['Thresholds: ' + ', '.join(f"{name}={value:.3f}" for name, value in report['thresholds'].items()),
+             f"Macro F1: {report['macro_f1']:.3f}", '',
+             f"{'gesture':<24}{'precision':>10}{'recall':>10}{'f1':>10}{'support':>9}{'min conf':>10}"]
+    for gesture, scores in report['gestures'].items():
+        minimum = report['min_confidence'].get(gesture)
+        lines.append(f"{gesture:<24}{scores['precision']:>10.3f}{scores['recall']:>10.3f}"
+                     f"{scores['f1']:>10.3f}{scores['support']:>9d}"
+                     f"{'-' if minimum is None else format(minimum, '.2f'):>10}")
+    lines += ['', 'Confusion (rows: true, columns: predicted):',
+              ' ' * 24 + ''.join(f"{index:>5d}" for index in range(len(CLASSES)))]
+    for index, (name, row) in enumerate(zip(CLASSES, report['confusion'])):
+        lines.append(f"{index:>2d} {name:<21}" + ''.join(f"{count:>5d}" for count in row))
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Tune gesture rule thresholds on labelled landmark datasets')
+    parser.add_argument('datasets', nargs='+', help='Datasets in the gesture_data.csv format')
+    parser.add_argument('--output', default='tuned_thresholds.json',
+                        help='Configuration file to write the best settings to')
+    parser.add_argument('--report', metavar='PATH', help='Also write the full evaluation as JSON')
+    parser.add_argument('--search', choices=('grid', 'random'), default='grid')
+    parser.add_argument('--steps', type=int, default=19, help='Grid values per threshold')
+    parser.add_argument('--trials', type=int, default=400, help='Random search candidates')
+    parser.add_argument('--seed', type=int, default=0, help='Random search seed')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        truth, landmarks = load_samples(args.datasets)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    candidates = grid_candidates(args.steps) if args.search == 'grid' else random_candidates(args.trials, args.seed)
+    baseline = evaluate(truth, landmarks, DEFAULT_THRESHOLDS, min_confidence={})
+    best = search(truth, landmarks, candidates, args.workers)
+    print(format_report(best))
+    print(f"\nCurrent thresholds without minimum confidence: macro F1 {baseline['macro_f1']:.3f}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'gestures': {'thresholds': best['thresholds'], 'min_confidence': best['min_confidence']}},
+                  f, indent=2)
+    logger.info("Wrote tuned settings to %s (use with --config)", args.output)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'classes': list(CLASSES), 'best': best, 'baseline': baseline}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
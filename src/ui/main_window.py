@@ -1,22 +1,92 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QPushButton, 
                             QLabel, QMessageBox, QHBoxLayout, QComboBox,
-                            QGroupBox, QGridLayout)
-from PyQt5.QtCore import Qt, QTimer
+                            QGroupBox, QGridLayout, QInputDialog)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QImage, QPixmap
 import cv2
 import logging
+import numpy as np
 from src.utils.camera_manager import CameraManager
-from src.gesture_recognition.gesture_mapping import GestureMapping
+from src.utils.camera_discovery import enumerate_cameras
+from src.utils.clock import SYSTEM_CLOCK
+from src.utils.actuator import DesktopActuator
+from src.utils.session_trace import TraceRecorder, RecordingActuator, mapping_metadata
+from src.utils.frame_pool import FramePool
+from src.utils.config import DEFAULT_CONFIG
+from src.utils.cursor_predictor import create_cursor_predictor
+from src.utils.event_server import create_event_server
+from src.utils.profiler import create_profiler
+from src.utils.resource_governor import QUALITY_LADDER, create_resource_governor
+from src.utils.event_bus import (EventBus, FrameEvent, LandmarksEvent, GestureEvent,
+                                 ActionResultEvent, THREAD, DROP_OLDEST)
+from src.gesture_recognition.gesture_mapping import COALESCED_GESTURES, GestureMapping
+from src.gesture_recognition.custom_gestures import GestureRecorder, gesture_bindings
 
 logger = logging.getLogger(__name__)
 
+# Qt 5.14+ displays BGR frames directly, saving a color conversion per frame
+QIMAGE_BGR888 = getattr(QImage, 'Format_BGR888', None)
+
 class MainWindow(QMainWindow):
-    def __init__(self, gesture_detector):
+    # Action results arrive on the actuation thread and are delivered on the GUI thread
+    action_result_received = pyqtSignal(object)
+
+    def __init__(self, gesture_detector, trace_path=None, inference_process=None, config=None,
+                 custom_gestures=None):
+        """
+        Args:
+            gesture_detector: In-process GestureDetector, unused when inference_process is given
+            trace_path: Optional session trace file to record
+            inference_process: Optional InferenceProcess running detection out of process
+            config: Configuration as returned by load_config, defaults to DEFAULT_CONFIG
+            custom_gestures: GestureIndex the detector matches user-defined gestures with,
+                None to disable recording them
+        """
         super().__init__()
+        config = config or DEFAULT_CONFIG
+        camera = config['camera']
         self.gesture_detector = gesture_detector
-        self.camera_manager = CameraManager()
-        self.gesture_mapping = GestureMapping()
+        self.inference_process = inference_process
+        self.camera_manager = CameraManager(camera['index'], camera['width'], camera['height'],
+                                            camera['fps'], camera['fourcc'], camera['buffer_size'])
+        self.event_bus = EventBus()
+        self.trace_recorder = None
+        actuator = DesktopActuator()
+        bindings = gesture_bindings(config['custom_gestures'], custom_gestures)
+        if trace_path:
+            # Record the session, the mapping settings and every input injected into the desktop
+            self.trace_recorder = TraceRecorder(trace_path, {
+                'screen_size': list(actuator.size()),
+                'cursor': list(actuator.position()),
+                'mapping': mapping_metadata(config, bindings)
+            })
+            actuator = RecordingActuator(actuator, sink=self.trace_recorder.record_actuation)
+        self.gesture_mapping = GestureMapping(self.event_bus, actuator=actuator,
+                                              min_confidence=config['gestures']['min_confidence'],
+                                              cursor_predictor=create_cursor_predictor(config['cursor']),
+                                              bindings=bindings,
+                                              sequences=config['gestures']['sequences'],
+                                              dispatch_sink=self.trace_recorder.record_dispatch
+                                              if self.trace_recorder is not None else None)
+        self.frame_id = 0
+        # Capture buffers are reused across frames; see update_frame for their lifetime
+        self.frame_pool = FramePool(capacity=2)
+        self.preview_pool = FramePool(capacity=1)
+        self.frame_shape = None
+        # Quality governor for in-process detection; the child process' CPU is not visible here
+        self.governor = create_resource_governor(config['governor']) if inference_process is None else None
+        self.quality = self.governor.level if self.governor else QUALITY_LADDER[-1]
+        if self.governor is not None:
+            self.gesture_detector.set_quality(self.quality)
+        self._last_display = float('-inf')
+        # Camera status waiting for the capture measurement, None once reported
+        self._camera_status = None
+        self.profiler = create_profiler(config['profiling'])
+        self.gesture_recorder = (GestureRecorder(custom_gestures, self.event_bus, path=config['custom_gestures']['path'])
+                                 if custom_gestures is not None else None)
         self.init_ui()
+        self.setup_event_bus()
+        self.event_server = create_event_server(config['server'], self.event_bus)
         self.setup_camera()
         
     def init_ui(self):
@@ -80,6 +150,9 @@ class MainWindow(QMainWindow):
         gesture_help_layout.addWidget(QLabel("Confirm Shutdown:"), 9, 0)
         gesture_help_layout.addWidget(QLabel("Extend thumb, index, and little finger"), 9, 1)
         
+        gesture_help_layout.addWidget(QLabel("Swipe Left / Right:"), 10, 0)
+        gesture_help_layout.addWidget(QLabel("Sweep hand quickly left or right"), 10, 1)
+        
         gesture_help_group.setLayout(gesture_help_layout)
         layout.addWidget(gesture_help_group)
         
@@ -105,12 +178,40 @@ class MainWindow(QMainWindow):
         self.camera_button.clicked.connect(self.switch_camera)
         button_layout.addWidget(self.camera_button)
         
+        self.record_button = QPushButton('Record Gesture')
+        self.record_button.clicked.connect(self.record_gesture)
+        button_layout.addWidget(self.record_button)
+        
+        self.profile_button = QPushButton('Profile')
+        self.profile_button.clicked.connect(lambda: self.toggle_profiling())
+        button_layout.addWidget(self.profile_button)
+        
         layout.addLayout(button_layout)
         
         # Setup camera timer
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
         
+    def setup_event_bus(self):
+        """Subscribe actuation and the UI to pipeline events."""
+        # Actuation runs on its own thread so pyautogui calls never stall the frame loop; when it
+        # falls behind only superseded cursor moves are dropped, never discrete gestures
+        self.event_bus.subscribe(
+            GestureEvent,
+            self.gesture_mapping.on_gesture_event,
+            mode=THREAD,
+            predicate=lambda event: event.gesture is not None,
+            maxsize=4,
+            policy=DROP_OLDEST,
+            droppable=lambda event: event.gesture in COALESCED_GESTURES,
+            name='actuation'
+        )
+        self.event_bus.subscribe(GestureEvent, self.on_gesture_event, name='ui-gesture')
+        self.action_result_received.connect(self.on_action_result)
+        self.event_bus.subscribe(ActionResultEvent, self.action_result_received.emit, name='ui-status')
+        if self.trace_recorder is not None:
+            self.trace_recorder.attach(self.event_bus)
+
     def setup_camera(self):
         """Initialize the camera."""
         if not self.camera_manager.initialize():
@@ -120,53 +221,216 @@ class MainWindow(QMainWindow):
                 'Failed to initialize camera. Please check your camera connection and permissions.'
             )
             self.status_label.setText('Status: Camera not available')
+            self._camera_status = None
             return
             
-        self.status_label.setText('Status: Camera initialized')
+        mode = self.camera_manager.mode
+        self.frame_shape = (mode['height'], mode['width'], 3) if mode['width'] and mode['height'] else None
+        self._camera_status = f"Status: Camera initialized ({mode['width']}x{mode['height']} {mode['fourcc'] or ''}"
+        # Timed on the first frames of the frame loop; see _report_capture
+        self.camera_manager.measure_capture(frames=10)
+        self.status_label.setText(self._camera_status + ')')
+        if self.inference_process is not None:
+            self.inference_process.stop()
         self.timer.start(30)  # 30ms = ~33fps
         
     def update_frame(self):
-        """Update the camera frame and process gestures."""
-        success, frame = self.camera_manager.read_frame()
+        """Capture a frame, run gesture detection and publish the results."""
+        if self._camera_status is not None:
+            self._report_capture()
+        if self.inference_process is not None:
+            self.update_frame_out_of_process()
+            return
+        # The frame buffer is owned by this method: decoded into, annotated in place,
+        # displayed (Qt copies it into the pixmap) and returned to the pool
+        buffer = self.frame_pool.acquire(self.frame_shape) if self.frame_shape else None
+        success, frame = self.camera_manager.read_frame(buffer)
         if not success:
+            self.frame_pool.release(buffer)
             return
+        if frame is not buffer:
+            # The camera delivered a different size; adopt its frame size from now on
+            self.frame_shape = frame.shape
             
-        # Process frame for gestures
-        processed_frame, gesture_data = self.gesture_detector.detect_gestures(frame)
-        
-        # Update status if gesture detected
-        if gesture_data:
-            gesture = gesture_data.get('gesture')
-            if gesture:
-                self.gesture_label.setText(f'Current Gesture: {gesture}')
-                
-                # Execute gesture command
-                self.gesture_mapping.execute_gesture(gesture_data)
+        try:
+            # One timestamp per frame, shared by detection and all events
+            timestamp = SYSTEM_CLOCK.now()
+            self.frame_id += 1
+            if self.event_bus.has_subscribers(FrameEvent):
+                self.event_bus.publish(FrameEvent(self.frame_id, frame, timestamp))
                 
-                # Update status based on gesture type
-                if gesture.startswith('cursor_'):
-                    self.status_label.setText(f'Status: Controlling cursor')
-                elif gesture.startswith('scroll_'):
-                    self.status_label.setText(f'Status: Scrolling {gesture.split("_")[1]}')
-                elif gesture == 'take_screenshot':
-                    self.status_label.setText('Status: Screenshot taken')
-        else:
-            self.gesture_label.setText('Current Gesture: None')
-            self.status_label.setText('Status: Ready')
+            # Process frame for gestures
+            processed_frame, gesture_data = self.gesture_detector.detect_gestures(frame, timestamp)
+            
+            if self.event_bus.has_subscribers(LandmarksEvent):
+                self.event_bus.publish(LandmarksEvent(self.frame_id, self.gesture_detector.last_landmarks, timestamp))
+            gesture = gesture_data.get('gesture') if gesture_data else None
+            self.event_bus.publish(GestureEvent(self.frame_id, gesture, gesture_data, timestamp))
+            if self.governor is not None:
+                quality = self.governor.record_frame(SYSTEM_CLOCK.now() - timestamp)
+                if quality is not None:
+                    self.gesture_detector.set_quality(quality)
+                    self.quality = quality
+            
+            if self._preview_due(timestamp):
+                self.display_frame(processed_frame)
+        finally:
+            self.frame_pool.release(frame)
+        
+    def update_frame_out_of_process(self):
+        """Publish finished results from the inference process and submit the next frame."""
+        if self.inference_process.process is None:
+            # Size the shared frame ring from the first frame of this camera
+            success, frame = self.camera_manager.read_frame()
+            if success:
+                self.inference_process.start(frame.shape)
+            return
+        self._publish_results()
+            
+        acquired = self.inference_process.acquire()
+        if acquired is None:
+            # The child is still busy with earlier frames; leave this one in the camera
+            return
+        slot, buffer = acquired
+        # Decode straight into the shared slot
+        success, frame = self.camera_manager.read_frame(buffer)
+        if not success:
+            self.inference_process.release(slot)
+            return
+        if not np.shares_memory(frame, buffer):
+            if frame.shape != buffer.shape:
+                logger.info("Camera frame shape changed to %s", frame.shape)
+                # The ring is unmapped on restart, so no view into it may outlive this point
+                self.inference_process.release(slot)
+                del acquired, buffer
+                self.inference_process.restart(frame.shape)
+                return
+            buffer[...] = frame
+            
+        timestamp = SYSTEM_CLOCK.now()
+        self.frame_id += 1
+        if self.event_bus.has_subscribers(FrameEvent):
+            # Subscribers may hold the frame past a restart, so they get a copy rather than a ring view
+            self.event_bus.publish(FrameEvent(self.frame_id, buffer.copy(), timestamp))
+        self.inference_process.submit(slot, self.frame_id, timestamp)
+
+    def _publish_results(self):
+        """Publish the finished inference results and release their slots."""
+        # Kept out of update_frame_out_of_process so no result's ring view is alive at a restart
+        for result in self.inference_process.poll():
+            if self.event_bus.has_subscribers(LandmarksEvent):
+                self.event_bus.publish(LandmarksEvent(result.frame_id, result.landmarks, result.timestamp))
+            gesture = result.gesture_data.get('gesture') if result.gesture_data else None
+            self.event_bus.publish(GestureEvent(result.frame_id, gesture, result.gesture_data, result.timestamp))
+            if self._preview_due(result.timestamp):
+                self.display_frame(result.frame)
+            self.inference_process.release(result.slot)
         
-        # Convert frame to QImage and display
-        rgb_frame = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_frame.shape
+    def _report_capture(self):
+        """Add the measured frame rate and read time to the camera status once they are known."""
+        capture = self.camera_manager.capture_stats
+        if capture:
+            self.status_label.setText(f"{self._camera_status}, {capture['fps']:.0f} fps, "
+                                      f"{capture['read_ms']:.0f} ms read time)")
+            self._camera_status = None
+
+    def _preview_due(self, timestamp: float) -> bool:
+        """Check whether the preview should be repainted, at most at the quality level's preview rate."""
+        # Some slack, so camera jitter at the full rate does not skip every other frame
+        if timestamp - self._last_display < 0.8 / self.quality.preview_fps:
+            return False
+        self._last_display = timestamp
+        return True
+
+    def display_frame(self, frame):
+        """Show a BGR frame in the camera view."""
+        h, w, ch = frame.shape
         bytes_per_line = ch * w
+        if QIMAGE_BGR888 is not None:
+            qt_image = QImage(frame.data, w, h, bytes_per_line, QIMAGE_BGR888)
+            self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
+            return
+        rgb_frame = self.preview_pool.acquire(frame.shape)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
         qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
+        # fromImage copies the pixels, so the buffer can be reused right away
         self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
+        self.preview_pool.release(rgb_frame)
+        
+    def on_gesture_event(self, event: GestureEvent):
+        """Show the current gesture."""
+        if event.gesture:
+            confidence = event.data.get('confidence') if event.data else None
+            if confidence is not None:
+                self.gesture_label.setText(f'Current Gesture: {event.gesture} ({confidence:.0%} confidence)')
+            else:
+                self.gesture_label.setText(f'Current Gesture: {event.gesture}')
+        else:
+            self.gesture_label.setText('Current Gesture: None')
+            self.status_label.setText('Status: Ready')
+            
+    def on_action_result(self, event: ActionResultEvent):
+        """Show the outcome of the last dispatched action."""
+        self.status_label.setText(f'Status: {event.status}')
         
     def switch_camera(self):
         """Switch to the next available camera."""
+        indices = [camera.index for camera in enumerate_cameras()]
+        if not indices:
+            self.status_label.setText('Status: No cameras found')
+            return
+        current = self.camera_manager.camera_index
+        following = [index for index in indices if index > current]
         self.camera_manager.release()
-        self.camera_manager.camera_index = (self.camera_manager.camera_index + 1) % 2
+        self.camera_manager.camera_index = following[0] if following else indices[0]
         self.setup_camera()
         
+    def record_gesture(self):
+        """Ask for a name and an action, then learn a new pose from the live feed."""
+        if self.gesture_recorder is None:
+            self.status_label.setText('Status: Custom gestures are disabled')
+            return
+        name, ok = QInputDialog.getText(self, 'Record Gesture', 'Gesture name:')
+        if not ok or not name.strip():
+            return
+        action, ok = QInputDialog.getText(
+            self, 'Record Gesture',
+            "Action (a built-in gesture such as take_screenshot, key:<key> or hotkey:ctrl+c):",
+            text='key:space')
+        if not ok:
+            return
+        name, action = name.strip(), action.strip()
+
+        def finished(gesture, samples):
+            if not samples:
+                self.status_label.setText(f"Status: '{gesture}' not learned, keep your hand in view")
+                return
+            try:
+                self.gesture_mapping.bind(gesture, action)
+                self.gesture_recorder.index.bindings[gesture] = action
+                if self.gesture_recorder.path:
+                    self.gesture_recorder.index.save(self.gesture_recorder.path)
+            except (ValueError, OSError) as e:
+                self.status_label.setText(f'Status: Learned {gesture}, but not bound: {e}')
+                return
+            note = ' (active after a restart with --inference-process)' if self.inference_process else ''
+            self.status_label.setText(f"Status: Learned '{gesture}' from {samples} frames -> {action}{note}")
+
+        aspect_ratio = self.frame_shape[1] / self.frame_shape[0] if self.frame_shape else 4 / 3
+        self.gesture_recorder.start(name, duration=3.0, delay=1.0, aspect_ratio=aspect_ratio,
+                                    on_finished=finished)
+        self.status_label.setText(f"Status: Hold the '{name}' pose... recording for 3 s")
+        
+    def toggle_profiling(self, duration=None):
+        """Start a profiling session, or stop the running one and report where its results went."""
+        if self.profiler.active:
+            reports = self.profiler.stop()
+            if reports:
+                self.status_label.setText(f"Status: Profile written to {reports['top']}")
+            return
+        self.profiler.start(duration)
+        self.status_label.setText(f'Status: Profiling for {duration or self.profiler.default_duration:g} s')
+        
     def show_settings(self):
         """Show the settings window."""
         # TODO: Implement settings window
@@ -174,6 +438,16 @@ class MainWindow(QMainWindow):
         
     def closeEvent(self, event):
         """Handle application closure."""
+        self.profiler.stop()
         self.camera_manager.release()
-        self.gesture_detector.release()
+        if self.event_server is not None:
+            self.event_server.stop()
+        self.event_bus.close()
+        self.gesture_mapping.macros.stop()
+        if self.trace_recorder is not None:
+            self.trace_recorder.close()
+        if self.inference_process is not None:
+            self.inference_process.stop()
+        if self.gesture_detector is not None:
+            self.gesture_detector.release()
         event.accept()
@@ -4,6 +4,7 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout,
                              QComboBox, QMessageBox)
 from PyQt5.QtCore import Qt
 from src.utils.camera_manager import CameraManager
+from src.utils.camera_discovery import enumerate_cameras
 
 
 logger = logging.getLogger(__name__)
@@ -35,7 +36,8 @@ class SettingsWindow(QDialog):
         camera_layout = QHBoxLayout()
         camera_label = QLabel('Camera Device:')
         self.camera_combo = QComboBox()
-        self.camera_combo.addItems(['Default Camera', 'External Camera'])
+        for camera in enumerate_cameras():
+            self.camera_combo.addItem(camera.name, camera.index)
         camera_layout.addWidget(camera_label)
         camera_layout.addWidget(self.camera_combo)
         layout.addLayout(camera_layout)
@@ -68,7 +70,7 @@ class SettingsWindow(QDialog):
             logger.info(f"Saving sensitivity setting: {sensitivity}")
             
             # Save camera selection
-            camera_index = self.camera_combo.currentIndex()
+            camera_index = self.camera_combo.currentData()
             logger.info(f"Saving camera selection: {camera_index}")
             
             # Save gesture toggles
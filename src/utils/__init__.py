@@ -4,8 +4,9 @@ Utility Package
 This package contains helper functions and utilities.
 """
 
-from .helpers import setup_logging
+from .logging_config import setup_logging
 from .shutdown import shutdown_system
 from .camera_manager import CameraManager
+from .event_bus import EventBus
 
-__all__ = ['setup_logging', 'shutdown_system', 'CameraManager'] 
\ No newline at end of file
+__all__ = ['setup_logging', 'shutdown_system', 'CameraManager', 'EventBus'] 
\ No newline at end of file
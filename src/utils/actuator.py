@@ -0,0 +1,73 @@
+import logging
+from typing import Optional, Tuple
+import pyautogui
+import win32gui
+import win32con
+
+logger = logging.getLogger(__name__)
+
+
+class DesktopActuator:
+    """
+    Injects mouse and keyboard input into the desktop.
+
+    All OS side effects of gesture actions go through this class, so a
+    different actuator (e.g. a recording one) can be swapped in for replay
+    and testing.
+    """
+
+    def __init__(self):
+        """Initialize the actuator and configure pyautogui."""
+        # Set PyAutoGUI failsafe
+        pyautogui.FAILSAFE = False
+        # No pause after every call: pauses between inputs are scheduled by MacroExecutor
+        pyautogui.PAUSE = 0.0
+
+    def size(self) -> Tuple[int, int]:
+        """Get the screen size in pixels."""
+        return tuple(pyautogui.size())
+
+    def position(self) -> Tuple[int, int]:
+        """Get the current cursor position in pixels."""
+        return tuple(pyautogui.position())
+
+    def move_to(self, x: float, y: float, duration: float = 0.0) -> None:
+        """Move the cursor to a screen position."""
+        pyautogui.moveTo(x, y, duration=duration)
+
+    def click(self, x: Optional[float] = None, y: Optional[float] = None) -> None:
+        """Click at a screen position, or at the cursor if none is given."""
+        pyautogui.click(x, y)
+
+    def double_click(self) -> None:
+        """Double click at the cursor."""
+        pyautogui.doubleClick()
+
+    def scroll(self, clicks: int) -> None:
+        """Scroll by a number of clicks (positive is up)."""
+        pyautogui.scroll(clicks)
+
+    def press(self, key: str) -> None:
+        """Press and release a key."""
+        pyautogui.press(key)
+
+    def hotkey(self, *keys: str) -> None:
+        """Press a key combination."""
+        pyautogui.hotkey(*keys)
+
+    def screenshot(self):
+        """Capture the full screen as a PIL image."""
+        return pyautogui.screenshot()
+
+    def minimize_foreground_window(self) -> bool:
+        """
+        Minimize the active window.
+
+        Returns:
+            bool: True if a window was minimized
+        """
+        hwnd = win32gui.GetForegroundWindow()
+        if not hwnd:
+            return False
+        win32gui.ShowWindow(hwnd, win32con.SW_MINIMIZE)
+        return True
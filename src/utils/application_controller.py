@@ -1,21 +1,29 @@
 import os
-import pyautogui
 import webbrowser
 import logging
 import subprocess
 import time
-import math
-import numpy as np
-from typing import List, Dict, Optional, Any, Tuple
-import win32gui
-import win32con
-import win32api
+from typing import Dict, Optional, Any, Tuple
+from .actuator import DesktopActuator
+from .clock import SYSTEM_CLOCK
+from .macro_executor import MacroExecutor, MacroStep
 
 logger = logging.getLogger(__name__)
 
 class ApplicationController:
-    def __init__(self):
-        """Initialize the application controller with cursor control parameters."""
+    def __init__(self, clock=None, actuator=None, cursor_predictor=None, macros=None):
+        """
+        Initialize the application controller with cursor control parameters.
+
+        Args:
+            clock: Clock providing now() in seconds, defaults to the monotonic system clock
+            actuator: Input injector, defaults to a DesktopActuator
+            cursor_predictor: Optional CursorPredictor compensating the pipeline latency
+            macros: MacroExecutor for timed input sequences, defaults to one on the actuator
+        """
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.actuator = actuator if actuator is not None else DesktopActuator()
+        self.macros = macros if macros is not None else MacroExecutor(self.actuator, clock=self.clock)
         self.applications: Dict[str, str] = {
             'notepad': 'notepad.exe',
             'calculator': 'calc.exe',
@@ -29,7 +37,7 @@ class ApplicationController:
             'desktop': os.path.expanduser('~\\Desktop'),
             'pictures': os.path.expanduser('~\\Pictures')
         }
-        self.screen_width, self.screen_height = pyautogui.size()
+        self.screen_width, self.screen_height = self.actuator.size()
         self.cursor_control = {
             'deadzone': 0.1,  # Deadzone to prevent small movements
             'acceleration': 0.3,  # Medium acceleration
@@ -37,10 +45,9 @@ class ApplicationController:
             'smoothing_factor': 0.4  # Medium smoothing
         }
         self.sensitivity = 1.0  # Normal sensitivity
-        # Set PyAutoGUI failsafe
-        pyautogui.FAILSAFE = False
-        # Set cursor movement speed
-        pyautogui.PAUSE = 0.01  # Medium pause time
+        self.glide_rate = 60  # Cursor steps per second while gliding to a target
+        # Last position the cursor was sent to; moves start from here rather than from wherever
+        # a glide still in flight happens to have got to
         self.last_position = None
         # Gesture timing parameters
         self.click_hold_time = 0.5
@@ -55,20 +62,18 @@ class ApplicationController:
         # Velocity tracking
         self.velocity_history = []
         self.max_velocity_history = 5
-        # Motion prediction
-        self.prediction_window = 3  # Number of frames to predict ahead
-        self.position_buffer: List[Tuple[float, float, float]] = []  # (x, y, timestamp)
-        self.max_buffer_size = 10  # Maximum size of position buffer
+        # Motion prediction over the measured pipeline latency
+        self.cursor_predictor = cursor_predictor
         # Error handling
         self.error_count = 0
         self.max_errors = 5
         self.error_reset_time = 5.0  # Time in seconds to reset error count
         self.last_error_time = 0
+        self.cooldown_until = 0.0  # Cursor control is paused until this time after errors
         # Hover detection
         self.hover_start_time = None
         self.hover_threshold = 2.0  # 2 seconds hover threshold
         self.last_hover_position = None
-        self.shutdown_options_shown = False
         logger.info("Application controller initialized with updated cursor control parameters")
 
     def update_sensitivity(self, base: float = 1.0, vertical: float = 1.0, horizontal: float = 1.0) -> None:
@@ -94,7 +99,7 @@ class ApplicationController:
         Returns:
             Tuple of (x_velocity, y_velocity)
         """
-        current_time = time.time()
+        current_time = self.clock.now()
         self.velocity_history.append((current_x, current_y, current_time))
         
         # Keep only recent history
@@ -152,10 +157,10 @@ class ApplicationController:
     def take_screenshot(self) -> bool:
         """Take a screenshot of the current screen."""
         try:
-            screenshot = pyautogui.screenshot()
+            screenshot = self.actuator.screenshot()
             screenshots_dir = os.path.join(os.path.expanduser('~\\Pictures'), 'Screenshots')
             os.makedirs(screenshots_dir, exist_ok=True)
-            screenshot_path = os.path.join(screenshots_dir, f'screenshot_{pyautogui.time.time()}.png')
+            screenshot_path = os.path.join(screenshots_dir, f'screenshot_{time.time()}.png')
             screenshot.save(screenshot_path)
             logger.info(f"Screenshot taken and saved to: {screenshot_path}")
             return True
@@ -163,63 +168,17 @@ class ApplicationController:
             logger.error(f"Error taking screenshot: {e}")
             return False
 
-    def _predict_position(self, current_x: float, current_y: float) -> Tuple[float, float]:
-        """
-        Predict future cursor position based on recent movement.
-        
-        Args:
-            current_x: Current x position
-            current_y: Current y position
-            
-        Returns:
-            Tuple of (predicted_x, predicted_y)
-        """
-        current_time = time.time()
-        self.position_buffer.append((current_x, current_y, current_time))
-        
-        # Keep buffer size limited
-        if len(self.position_buffer) > self.max_buffer_size:
-            self.position_buffer.pop(0)
-        
-        if len(self.position_buffer) < 3:
-            return current_x, current_y
-            
-        # Calculate velocity and acceleration
-        positions = np.array([(x, y) for x, y, _ in self.position_buffer])
-        times = np.array([t for _, _, t in self.position_buffer])
-        
-        # Calculate derivatives
-        dt = np.diff(times)
-        dx = np.diff(positions[:, 0])
-        dy = np.diff(positions[:, 1])
-        
-        if len(dt) > 0 and np.all(dt > 0):
-            velocity_x = dx[-1] / dt[-1]
-            velocity_y = dy[-1] / dt[-1]
-            
-            if len(dt) > 1:
-                acceleration_x = (dx[-1]/dt[-1] - dx[-2]/dt[-2]) / (dt[-1] + dt[-2])/2
-                acceleration_y = (dy[-1]/dt[-1] - dy[-2]/dt[-2]) / (dt[-1] + dt[-2])/2
-            else:
-                acceleration_x = acceleration_y = 0
-                
-            # Predict future position
-            prediction_time = self.prediction_window * pyautogui.PAUSE
-            predicted_x = current_x + velocity_x * prediction_time + 0.5 * acceleration_x * prediction_time**2
-            predicted_y = current_y + velocity_y * prediction_time + 0.5 * acceleration_y * prediction_time**2
-            
-            return predicted_x, predicted_y
-            
-        return current_x, current_y
-
     def _handle_error(self, error: Exception) -> None:
         """
         Handle errors with exponential backoff and recovery.
         
+        The backoff is a non-blocking cooldown: cursor control is skipped until
+        it expires instead of sleeping on the processing thread.
+        
         Args:
             error: The exception that occurred
         """
-        current_time = time.time()
+        current_time = self.clock.now()
         
         # Reset error count if enough time has passed
         if current_time - self.last_error_time > self.error_reset_time:
@@ -237,7 +196,11 @@ class ApplicationController:
             
         # Implement exponential backoff
         backoff_time = min(2 ** self.error_count, 10)  # Cap at 10 seconds
-        time.sleep(backoff_time)
+        self.cooldown_until = current_time + backoff_time
+
+    def in_cooldown(self) -> bool:
+        """Check whether cursor control is paused after recent errors."""
+        return self.clock.now() < self.cooldown_until
 
     def _reset_states(self) -> None:
         """Reset all internal states to default values."""
@@ -247,25 +210,37 @@ class ApplicationController:
         self.drag_start_position = None
         self.last_click_time = 0
         self.velocity_history.clear()
-        self.position_buffer.clear()
+        if self.cursor_predictor is not None:
+            self.cursor_predictor.reset()
         self.error_count = 0
+        self.cooldown_until = 0.0
         logger.info("All states reset to default values")
 
-    def control_cursor(self, cursor_pos: Dict[str, float], action: str = 'move') -> None:
+    def control_cursor(self, cursor_pos: Dict[str, float], action: str = 'move',
+                       timestamp: Optional[float] = None, confidence: Optional[float] = None) -> None:
         """
         Control the cursor based on hand position with hover detection.
         
         Args:
             cursor_pos: Dictionary containing x and y coordinates (0-1 range)
             action: Type of cursor action ('move' or 'click')
+            timestamp: Capture time of the hand position, defaults to the current clock time
+            confidence: Detection confidence, damping the latency compensation
         """
         try:
             if not cursor_pos or 'x' not in cursor_pos or 'y' not in cursor_pos:
                 logger.warning("Invalid cursor position data")
                 return
 
+            if self.in_cooldown():
+                return
+
             # Get normalized coordinates (0-1 range)
             x, y = cursor_pos['x'], cursor_pos['y']
+            if self.cursor_predictor is not None and action == 'move':
+                # Where the finger is by the time the move lands, not where it was captured
+                x, y = self.cursor_predictor.predict(
+                    x, y, self.clock.now() if timestamp is None else timestamp, confidence)
             
             # Calculate center-relative position (-1 to 1 range)
             rel_x = (x - 0.5) * 2
@@ -286,7 +261,7 @@ class ApplicationController:
             speed_y = max(min(speed_y, self.cursor_control['max_speed']), -self.cursor_control['max_speed'])
             
             # Get current cursor position
-            current_x, current_y = pyautogui.position()
+            current_x, current_y = self._cursor_position()
             
             # Calculate new position with smoothing
             new_x = current_x + (speed_x * self.screen_width * self.cursor_control['smoothing_factor'])
@@ -297,38 +272,64 @@ class ApplicationController:
             new_y = max(0, min(new_y, self.screen_height))
             
             # Check for hover
-            current_time = time.time()
+            current_time = self.clock.now()
             if self.last_hover_position and abs(new_x - self.last_hover_position[0]) < 5 and abs(new_y - self.last_hover_position[1]) < 5:
                 if self.hover_start_time is None:
                     self.hover_start_time = current_time
                 elif current_time - self.hover_start_time >= self.hover_threshold:
                     # Hover detected, perform click
                     if action == 'move':
-                        pyautogui.click(new_x, new_y)
+                        self.actuator.click(new_x, new_y)
+                        self.last_position = (new_x, new_y)
                         logger.info("Hover click performed")
                         self.hover_start_time = None
             else:
                 self.hover_start_time = None
                 self.last_hover_position = (new_x, new_y)
             
-            logger.debug(f"Moving cursor from ({current_x}, {current_y}) to ({new_x}, {new_y})")
+            logger.debug("Moving cursor from (%d, %d) to (%d, %d)", current_x, current_y, new_x, new_y)
             
             if action == 'move':
-                pyautogui.moveTo(new_x, new_y, duration=0.15)  # Medium duration for smooth movement
+                self.glide_to(new_x, new_y, duration=0.15)  # Medium duration for smooth movement
             elif action == 'click':
-                pyautogui.click(new_x, new_y)
+                self.actuator.click(new_x, new_y)
+                self.last_position = (new_x, new_y)
                 
         except Exception as e:
             logger.error(f"Error controlling cursor: {str(e)}")
+            self._handle_error(e)
+
+    def glide_to(self, x: float, y: float, duration: float) -> None:
+        """
+        Move the cursor to a screen position in steps over `duration` seconds.
+
+        The first step is taken at once and the rest are scheduled, so nothing
+        sleeps; a new glide replaces the one in flight and starts from its
+        target, so the path does not depend on how far the old one got.
+        """
+        start_x, start_y = self._cursor_position()
+        self.last_position = (x, y)
+        count = max(1, int(round(duration * self.glide_rate)))
+        self.macros.run('cursor', [
+            MacroStep(1.0 / self.glide_rate if i > 1 else 0.0, 'move_to',
+                      (start_x + (x - start_x) * i / count, start_y + (y - start_y) * i / count))
+            for i in range(1, count + 1)
+        ], replace=True)
+
+    def _cursor_position(self) -> Tuple[float, float]:
+        """Where the cursor was last sent, or its actual position before the first move."""
+        if self.last_position is None:
+            self.last_position = self.actuator.position()
+        return self.last_position
 
     def scroll_page(self, direction: str = 'down', amount: int = 1) -> bool:
         """Scroll web page or document."""
         try:
             if direction.lower() == 'down':
-                pyautogui.scroll(-amount * 100)
+                self.actuator.scroll(-amount * 100)
             else:
-                pyautogui.scroll(amount * 100)
-            logger.info(f"Scrolled {direction} by {amount} units")
+                self.actuator.scroll(amount * 100)
+            logger.info("Scrolled %s by %d units", direction, amount)
             return True
         except Exception as e:
             logger.error(f"Error scrolling: {e}")
@@ -355,9 +356,9 @@ class ApplicationController:
             elif gesture == 'open_application':
                 self._open_application(cursor_pos)
             elif gesture == 'show_shutdown_options':
-                self._show_shutdown_options()
-            elif gesture == 'confirm_shutdown':
-                self._confirm_shutdown()
+                self.show_shutdown_options()
+            # confirm_shutdown acts only as the last step of the 'shutdown' gesture
+            # sequence (see GestureMapping and gesture_sequences)
                 
         except Exception as e:
             logger.error(f"Error handling gesture: {e}")
@@ -365,38 +366,37 @@ class ApplicationController:
     def _move_cursor(self, cursor_pos: Dict[str, float]) -> None:
         """Move cursor to the specified position."""
         try:
-            screen_width, screen_height = pyautogui.size()
-            x = int(cursor_pos['x'] * screen_width)
-            y = int(cursor_pos['y'] * screen_height)
-            pyautogui.moveTo(x, y, duration=0.1)
+            x = int(cursor_pos['x'] * self.screen_width)
+            y = int(cursor_pos['y'] * self.screen_height)
+            self.glide_to(x, y, duration=0.1)
         except Exception as e:
             logger.error(f"Error moving cursor: {e}")
 
     def _click(self) -> None:
         """Perform a mouse click."""
         try:
-            pyautogui.click()
+            self.actuator.click()
         except Exception as e:
             logger.error(f"Error performing click: {e}")
 
     def _scroll_up(self) -> None:
         """Scroll up."""
         try:
-            pyautogui.scroll(100)
+            self.actuator.scroll(100)
         except Exception as e:
             logger.error(f"Error scrolling up: {e}")
 
     def _scroll_down(self) -> None:
         """Scroll down."""
         try:
-            pyautogui.scroll(-100)
+            self.actuator.scroll(-100)
         except Exception as e:
             logger.error(f"Error scrolling down: {e}")
 
     def _take_screenshot(self) -> None:
         """Take a screenshot."""
         try:
-            screenshot = pyautogui.screenshot()
+            screenshot = self.actuator.screenshot()
             timestamp = time.strftime("%Y%m%d-%H%M%S")
             filename = f"screenshot_{timestamp}.png"
             screenshot.save(filename)
@@ -407,7 +407,7 @@ class ApplicationController:
     def _minimize_window(self) -> None:
         """Minimize the current window."""
         try:
-            pyautogui.hotkey('win', 'down')
+            self.actuator.hotkey('win', 'down')
             logger.info("Window minimized")
         except Exception as e:
             logger.error(f"Error minimizing window: {e}")
@@ -416,29 +416,17 @@ class ApplicationController:
         """Open application at cursor position."""
         try:
             # Double click to open application
-            pyautogui.doubleClick()
+            self.actuator.double_click()
             logger.info("Attempting to open application at cursor position")
         except Exception as e:
             logger.error(f"Error opening application: {e}")
 
-    def _show_shutdown_options(self) -> None:
-        """Show shutdown options."""
+    def show_shutdown_options(self) -> None:
+        """Open the shutdown menu (Win+X, U); pressing S in it shuts down."""
         try:
-            if not self.shutdown_options_shown:
-                pyautogui.hotkey('win', 'x')
-                time.sleep(0.5)
-                pyautogui.press('u')
-                self.shutdown_options_shown = True
+            # The menu needs a moment to open before it takes the U
+            if self.macros.run('shutdown_menu', [MacroStep(0.0, 'hotkey', ('win', 'x')),
+                                                 MacroStep(0.5, 'press', ('u',))]):
                 logger.info("Shutdown options shown")
         except Exception as e:
             logger.error(f"Error showing shutdown options: {e}")
-
-    def _confirm_shutdown(self) -> None:
-        """Confirm system shutdown."""
-        try:
-            if self.shutdown_options_shown:
-                pyautogui.press('s')  # Select shutdown
-                self.shutdown_options_shown = False
-                logger.info("Shutdown confirmed")
-        except Exception as e:
-            logger.error(f"Error confirming shutdown: {e}") 
\ No newline at end of file
@@ -1,37 +1,141 @@
 import cv2
 import logging
+import statistics
+import time
+from typing import Dict, Optional
+from .camera_discovery import preferred_backend, invalidate_camera_cache
 
 logger = logging.getLogger(__name__)
 
 class CameraManager:
-    def __init__(self, camera_index=0):
-        """Initialize camera manager."""
+    def __init__(self, camera_index=0, width=640, height=480, fps=30, fourcc='MJPG', buffer_size=1):
+        """
+        Initialize camera manager.
+
+        The defaults request the lowest-latency mode that is still enough for
+        hand tracking: 640x480 MJPG (decoded cheaply, and uncompressed YUYV
+        often caps USB cameras below 30 fps) with a single-frame driver buffer
+        so read() always returns the newest frame instead of a stale one.
+
+        Args:
+            camera_index: Camera device index
+            width: Requested frame width, None to keep the camera default
+            height: Requested frame height, None to keep the camera default
+            fps: Requested frame rate, None to keep the camera default
+            fourcc: Requested pixel format, None to keep the camera default
+            buffer_size: Driver-side frame queue length, None to keep the default
+        """
         self.camera_index = camera_index
+        self.requested_mode = {'width': width, 'height': height, 'fps': fps,
+                               'fourcc': fourcc, 'buffer_size': buffer_size}
+        # Mode actually granted by the driver, filled in by initialize()
+        self.mode: Dict = {}
         self.camera = None
+        # Frame rate and read() time of the reads timed after measure_capture, None until done
+        self.capture_stats: Optional[Dict[str, float]] = None
+        self._measure_frames = 0
+        self._read_times = []
+        self._first_read = None
         logger.info("Camera manager initialized")
 
     def initialize(self) -> bool:
         """Initialize camera capture."""
         try:
-            self.camera = cv2.VideoCapture(self.camera_index)
+            self.camera = cv2.VideoCapture(self.camera_index, preferred_backend())
             if not self.camera.isOpened():
-                logger.error("Failed to open camera")
+                logger.error("Failed to open camera %s", self.camera_index)
+                # The device list may be stale (camera unplugged or renumbered)
+                invalidate_camera_cache()
                 return False
-            logger.info("Camera initialized successfully")
+            self._negotiate_mode()
+            logger.info("Camera initialized successfully: %s", self.mode)
             return True
         except Exception as e:
             logger.error(f"Error initializing camera: {e}")
             return False
 
-    def read_frame(self):
-        """Read a frame from the camera."""
+    def _negotiate_mode(self) -> None:
+        """Request the configured capture mode and record what the driver granted."""
+        requested = self.requested_mode
+        # The pixel format must be set before the size for V4L2 to honour it
+        if requested['fourcc']:
+            self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*requested['fourcc']))
+        if requested['width']:
+            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, requested['width'])
+        if requested['height']:
+            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, requested['height'])
+        if requested['fps']:
+            self.camera.set(cv2.CAP_PROP_FPS, requested['fps'])
+        if requested['buffer_size']:
+            self.camera.set(cv2.CAP_PROP_BUFFERSIZE, requested['buffer_size'])
+
+        fourcc = int(self.camera.get(cv2.CAP_PROP_FOURCC))
+        self.mode = {
+            'width': int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.camera.get(cv2.CAP_PROP_FPS),
+            'fourcc': ''.join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)) if fourcc else None,
+            'buffer_size': int(self.camera.get(cv2.CAP_PROP_BUFFERSIZE))
+        }
+        for key in ('width', 'height', 'fourcc'):
+            if requested[key] and self.mode[key] != requested[key]:
+                logger.warning("Camera granted %s=%s instead of %s", key, self.mode[key], requested[key])
+
+    def measure_capture(self, frames: int = 30) -> None:
+        """
+        Time the next reads made through read_frame.
+
+        Nothing is read here, so the caller's frame loop is never stalled: the
+        frames it reads anyway are timed, and capture_stats is filled in once
+        `frames` of them have been read.
+
+        Args:
+            frames: Number of frames to time, at least 2
+        """
+        self.capture_stats = None
+        self._measure_frames = max(2, frames)
+        self._read_times = []
+        self._first_read = None
+
+    def read_frame(self, out=None):
+        """
+        Read a frame from the camera.
+
+        Args:
+            out: Optional preallocated BGR array to decode into
+
+        Returns:
+            tuple: (success, frame)
+        """
         if self.camera is None:
             return False, None
-        return self.camera.read()
+        if not self._measure_frames:
+            return self.camera.read() if out is None else self.camera.read(out)
+        before = time.perf_counter()
+        success, frame = self.camera.read() if out is None else self.camera.read(out)
+        if success:
+            self._record_read(before, time.perf_counter())
+        return success, frame
+
+    def _record_read(self, before: float, after: float) -> None:
+        """Add a timed read to the measurement started by measure_capture."""
+        if self._first_read is None:
+            self._first_read = after
+        self._read_times.append(after - before)
+        if len(self._read_times) < self._measure_frames:
+            return
+        # The frame rate the reads achieved, and how long read() blocked - not the capture latency
+        self.capture_stats = {
+            'fps': (len(self._read_times) - 1) / max(after - self._first_read, 1e-9),
+            'read_ms': statistics.median(self._read_times) * 1000
+        }
+        self._measure_frames = 0
+        logger.info("Capture: %.1f fps, %.1f ms median read() time",
+                    self.capture_stats['fps'], self.capture_stats['read_ms'])
 
     def release(self):
         """Release camera resources."""
         if self.camera is not None:
             self.camera.release()
             self.camera = None
-            logger.info("Camera resources released") 
\ No newline at end of file
+            logger.info("Camera resources released")
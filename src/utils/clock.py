@@ -0,0 +1,57 @@
+import time
+
+
+class MonotonicClock:
+    """
+    System clock backed by time.monotonic_ns.
+
+    Unlike time.time(), it never jumps when the wall clock is adjusted, so
+    intervals measured with it (hover, double click, throttles) are reliable.
+    """
+
+    def now_ns(self) -> int:
+        """Current time in integer nanoseconds."""
+        return time.monotonic_ns()
+
+    def now(self) -> float:
+        """Current time in seconds."""
+        return time.monotonic_ns() * 1e-9
+
+
+class VirtualClock:
+    """
+    Manually advanced clock for replays, simulations and tests.
+
+    Time only moves when set() or advance() is called, so timing-dependent
+    logic runs deterministically and as fast as the CPU allows.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now_ns = int(round(start * 1e9))
+        self._now = float(start)
+
+    def now_ns(self) -> int:
+        """Current virtual time in integer nanoseconds."""
+        return self._now_ns
+
+    def now(self) -> float:
+        """Current virtual time in seconds."""
+        return self._now
+
+    def set(self, timestamp: float) -> None:
+        """Move the clock to a timestamp in seconds (kept exactly as given)."""
+        self._now = timestamp
+        self._now_ns = int(round(timestamp * 1e9))
+
+    def set_ns(self, timestamp_ns: int) -> None:
+        """Move the clock to a timestamp in nanoseconds."""
+        self._now_ns = int(timestamp_ns)
+        self._now = self._now_ns * 1e-9
+
+    def advance(self, seconds: float) -> None:
+        """Advance the clock by a number of seconds."""
+        self.set_ns(self._now_ns + int(round(seconds * 1e9)))
+
+
+# Shared default clock for all components
+SYSTEM_CLOCK = MonotonicClock()
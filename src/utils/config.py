@@ -0,0 +1,194 @@
+"""
+Application configuration.
+
+Settings come from DEFAULT_CONFIG, overridden by an optional JSON file and
+then by command line options. Sections are merged key by key, so a file only
+needs the values it changes:
+
+    {
+        "camera": {"index": 1, "width": 1280, "height": 720},
+        "service": {"max_fps": 15},
+        "gestures": {"min_confidence": {"confirm_shutdown": 0.8}}
+    }
+"""
+import copy
+import json
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    'camera': {
+        'index': 0,
+        'width': 640,
+        'height': 480,
+        'fps': 30,
+        'fourcc': 'MJPG',
+        'buffer_size': 1
+    },
+    'logging': {
+        'level': 'INFO',
+        'dir': 'logs'
+    },
+    'service': {
+        # Upper bound on processed frames per second, 0 for as fast as the camera delivers
+        'max_fps': 30.0,
+        # Draw the landmark overlay on frames (only useful when someone watches them)
+        'draw_landmarks': False
+    },
+    'gestures': {
+        # Per-gesture minimum confidence, merged over GestureMapping's defaults
+        'min_confidence': {},
+        # Rule thresholds in palm lengths, over confidence.DEFAULT_THRESHOLDS
+        # (python -m src.scripts.tune_thresholds writes both sections)
+        'thresholds': {},
+        # Gesture sequences by name, over gesture_sequences.DEFAULT_SEQUENCES:
+        # {"steps": [gesture, ...], "within": seconds, "action": ...} with the actions
+        # of custom gesture bindings; "steps": [] disables a sequence
+        'sequences': {}
+    },
+    'custom_gestures': {
+        # Recognize poses recorded by the user (see gesture_recognition.custom_gestures)
+        'enabled': True,
+        # File the recorded gestures and their bindings are kept in
+        'path': 'custom_gestures.npz',
+        # Samples kept per gesture
+        'max_samples': 200,
+        # Largest RMS landmark distance, in palm lengths, at which a pose still matches
+        'max_distance': 0.15,
+        # Actions by gesture name, over the saved ones: a built-in gesture whose action
+        # to reuse, 'key:<key>' or 'hotkey:<key>+<key>'
+        'bindings': {}
+    },
+    'cursor': {
+        # Extrapolate the cursor over the measured capture-to-actuation latency
+        'prediction': True,
+        # Longest extrapolation in seconds
+        'max_horizon': 0.15,
+        # Latency after actuation the pipeline cannot measure (display), seconds
+        'extra_latency': 0.0,
+        # Largest lead in normalized screen units
+        'max_lead': 0.08
+    },
+    'hand_tracking': {
+        # Landmark backend (see gesture_recognition.hand_backends): 'auto' (tasks if its
+        # model file exists, else legacy), 'legacy', 'tasks' or 'replay'
+        'backend': 'auto',
+        # MediaPipe Tasks hand_landmarker.task model file
+        'model_path': 'hand_landmarker.task',
+        # Tasks running mode: 'video' (synchronous) or 'live_stream' (asynchronous)
+        'running_mode': 'video',
+        # Session trace whose landmarks the replay backend serves
+        'trace': None,
+        'max_hands': 1,
+        'min_detection_confidence': 0.5,
+        'min_tracking_confidence': 0.5
+    },
+    'smoothing': {
+        # One-Euro filter over the tracked landmarks (see gesture_recognition.landmark_filter)
+        'enabled': True,
+        # Cutoff frequency of a still hand in Hz, per axis (x, y, z): lower is smoother
+        'min_cutoff': [1.0, 1.0, 0.5],
+        # Cutoff increase per unit of speed, per axis: higher lags less in motion
+        'beta': [10.0, 10.0, 5.0],
+        # Cutoff frequency of the speed estimate in Hz
+        'd_cutoff': 1.0
+    },
+    'motion_gate': {
+        # Reuse the last hand tracking result while the image stays still
+        'enabled': True,
+        # Mean thumbnail difference of the most changed block, in gray levels, below which a frame is unchanged
+        'threshold': 2.0,
+        # Unchanged frames served from the cache before tracking runs again
+        'max_skips': 4
+    },
+    'governor': {
+        # Trade detection quality for CPU and latency (see src.utils.resource_governor)
+        'enabled': True,
+        # Process CPU time allowed per second, in cores
+        'cpu_budget': 0.6,
+        # Capture-to-result latency allowed (90th percentile), seconds
+        'latency_budget': 0.05,
+        # Fraction of both budgets below which quality is raised again
+        'headroom': 0.7,
+        # Seconds between evaluations
+        'interval': 2.0,
+        # Quality level to start at: minimal, low, medium, high or full
+        'start': 'full'
+    },
+    'profiling': {
+        # Reports of on-demand profiling sessions (see src.utils.profiler)
+        'dir': 'profiles',
+        # Session length in seconds when started from the UI or SIGUSR1
+        'duration': 10.0,
+        # Seconds between stack samples
+        'interval': 0.01,
+        # Entries in the top-N reports
+        'top': 25,
+        # Also diff tracemalloc snapshots (slows allocations while a session runs)
+        'memory': True
+    },
+    'server': {
+        # Stream gesture events to local clients (see src.utils.event_server)
+        'enabled': False,
+        'host': '127.0.0.1',
+        'port': 8765,
+        # Unix domain socket path, used instead of host and port when set
+        'unix_socket': None,
+        # Bytes queued for a client above which its messages are dropped
+        'max_buffer': 262144
+    }
+}
+
+
+def merge_config(base: Dict[str, Any], overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Recursively merge overrides into a copy of base.
+
+    Args:
+        base: Base configuration
+        overrides: Values to override; None values are ignored
+
+    Returns:
+        dict: Merged configuration
+    """
+    merged = copy.deepcopy(base)
+    for key, value in (overrides or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def load_config(path: Optional[str] = None, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Load the configuration.
+
+    Args:
+        path: Optional JSON configuration file
+        overrides: Values taking precedence over the file, e.g. from the command line
+
+    Returns:
+        dict: Complete configuration
+
+    Raises:
+        ValueError: If the file is not valid JSON or not a JSON object
+    """
+    config = DEFAULT_CONFIG
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                file_config = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid configuration file {path}: {e}") from e
+        if not isinstance(file_config, dict):
+            raise ValueError(f"Configuration file {path} must contain a JSON object")
+        unknown = set(file_config) - set(DEFAULT_CONFIG)
+        if unknown:
+            logger.warning("Ignoring unknown configuration sections: %s", ', '.join(sorted(unknown)))
+        config = merge_config(config, {key: value for key, value in file_config.items() if key in DEFAULT_CONFIG})
+    return merge_config(config, overrides)
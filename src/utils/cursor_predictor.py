@@ -0,0 +1,144 @@
+"""
+Latency-compensating cursor prediction.
+
+By the time a cursor command reaches the desktop, the finger has moved on by
+the capture, inference and dispatch latency of the pipeline. CursorPredictor
+tracks the cursor input with an alpha-beta filter and extrapolates it over
+the measured capture-to-actuation latency, so the cursor follows where the
+finger is rather than where it was.
+
+Extrapolation amplifies noise and overshoots when the hand stops, so the lead
+is:
+    - zero below min_speed, leaving a still hand (and hover clicks) untouched
+    - scaled down with the detection confidence, to nothing at min_confidence
+    - limited to the stopping distance while the hand decelerates
+    - capped at max_lead
+
+Positions are the normalized (0-1) cursor coordinates of the gesture data.
+src.scripts.evaluate_cursor_prediction measures lag and overshoot offline.
+"""
+import logging
+import math
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CursorPredictor:
+    """Extrapolate the cursor input over the measured pipeline latency."""
+
+    def __init__(self, max_horizon: float = 0.15, extra_latency: float = 0.0, alpha: float = 0.85,
+                 beta: float = 0.5, min_speed: float = 0.15, max_lead: float = 0.08,
+                 min_confidence: float = 0.3, latency_smoothing: float = 0.1, max_gap: float = 0.25):
+        """
+        Args:
+            max_horizon: Longest extrapolation in seconds, whatever the measured latency
+            extra_latency: Latency after actuation not seen by the pipeline (e.g. display), seconds
+            alpha: Position gain of the alpha-beta filter
+            beta: Velocity gain of the alpha-beta filter
+            min_speed: Speed, in screen widths per second, below which nothing is extrapolated
+            max_lead: Largest lead, in normalized screen units
+            min_confidence: Detection confidence at or below which nothing is extrapolated
+            latency_smoothing: Weight of each new latency measurement in the running average
+            max_gap: Seconds without samples after which the motion estimate restarts
+        """
+        self.max_horizon = max_horizon
+        self.extra_latency = extra_latency
+        self.alpha = alpha
+        self.beta = beta
+        self.min_speed = min_speed
+        self.max_lead = max_lead
+        self.min_confidence = min_confidence
+        self.latency_smoothing = latency_smoothing
+        self.max_gap = max_gap
+        # Running average of the capture-to-actuation latency, None until measured
+        self.latency: Optional[float] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the motion estimate (the latency estimate is kept)."""
+        self._time: Optional[float] = None
+        self._position = (0.0, 0.0)
+        self._velocity = (0.0, 0.0)
+        self._acceleration = (0.0, 0.0)
+
+    @property
+    def horizon(self) -> float:
+        """Extrapolation time in seconds."""
+        return min((self.latency or 0.0) + self.extra_latency, self.max_horizon)
+
+    def observe_latency(self, seconds: float) -> None:
+        """Add a capture-to-actuation latency measurement."""
+        if seconds < 0:
+            return
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += self.latency_smoothing * (seconds - self.latency)
+
+    def predict(self, x: float, y: float, timestamp: float,
+                confidence: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Add a cursor sample and return where it is expected to be after the latency.
+
+        Args:
+            x: Normalized x position
+            y: Normalized y position
+            timestamp: Capture time of the sample in seconds
+            confidence: Detection confidence, None for full confidence
+
+        Returns:
+            tuple: Predicted normalized (x, y)
+        """
+        vx, vy = self._update(x, y, timestamp)
+        speed = math.hypot(vx, vy)
+        horizon = self.horizon
+        if speed < self.min_speed or horizon <= 0:
+            return x, y
+
+        lead = speed * horizon
+        # Braking: never lead past the point where the hand comes to rest
+        along = (self._acceleration[0] * vx + self._acceleration[1] * vy) / speed
+        if along < 0:
+            lead = min(lead, speed * speed / (2 * -along))
+        lead = min(lead, self.max_lead)
+        if confidence is not None:
+            lead *= min(max((confidence - self.min_confidence) / (1.0 - self.min_confidence), 0.0), 1.0)
+        return x + vx / speed * lead, y + vy / speed * lead
+
+    def _update(self, x: float, y: float, timestamp: float) -> Tuple[float, float]:
+        """Alpha-beta filter step; returns the velocity estimate."""
+        if self._time is None or timestamp - self._time > self.max_gap:
+            self._position, self._velocity, self._acceleration = (x, y), (0.0, 0.0), (0.0, 0.0)
+            self._time = timestamp
+            return self._velocity
+        dt = timestamp - self._time
+        if dt <= 0:
+            # Repeated sample time: keep the current estimate
+            return self._velocity
+        px = self._position[0] + self._velocity[0] * dt
+        py = self._position[1] + self._velocity[1] * dt
+        rx, ry = x - px, y - py
+        vx = self._velocity[0] + self.beta / dt * rx
+        vy = self._velocity[1] + self.beta / dt * ry
+        # Smoothed acceleration, only used to detect braking
+        ax = (vx - self._velocity[0]) / dt
+        ay = (vy - self._velocity[1]) / dt
+        self._acceleration = (0.5 * (self._acceleration[0] + ax), 0.5 * (self._acceleration[1] + ay))
+        self._position = (px + self.alpha * rx, py + self.alpha * ry)
+        self._velocity = (vx, vy)
+        self._time = timestamp
+        return self._velocity
+
+
+def create_cursor_predictor(config: Dict[str, Any]) -> Optional[CursorPredictor]:
+    """
+    Create a cursor predictor from the 'cursor' configuration section.
+
+    Returns:
+        CursorPredictor or None: The predictor, None if prediction is disabled
+    """
+    if not config['prediction']:
+        return None
+    return CursorPredictor(max_horizon=config['max_horizon'], extra_latency=config['extra_latency'],
+                           max_lead=config['max_lead'])
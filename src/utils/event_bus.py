@@ -0,0 +1,260 @@
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from .clock import SYSTEM_CLOCK
+
+logger = logging.getLogger(__name__)
+
+# Delivery modes
+SYNC = 'sync'
+THREAD = 'thread'
+
+# Backpressure policies for thread-handoff subscribers
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+BLOCK = 'block'
+
+
+class Event:
+    """Base class for all pipeline events (timestamps are monotonic clock seconds)."""
+    __slots__ = ('timestamp',)
+
+    def __init__(self, timestamp: Optional[float] = None):
+        self.timestamp = SYSTEM_CLOCK.now() if timestamp is None else timestamp
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}"
+                           for cls in type(self).__mro__ for name in getattr(cls, '__slots__', ())
+                           if name not in ('frame', 'landmarks'))
+        return f"{type(self).__name__}({fields})"
+
+
+class FrameEvent(Event):
+    """
+    A camera frame was captured.
+
+    The frame is only valid during synchronous delivery; it is annotated in
+    place by detection afterwards and its buffer is reused for later frames,
+    so thread-handoff subscribers must copy it.
+    """
+    __slots__ = ('frame_id', 'frame')
+
+    def __init__(self, frame_id: int, frame, timestamp: Optional[float] = None):
+        super().__init__(timestamp)
+        self.frame_id = frame_id
+        self.frame = frame
+
+
+class LandmarksEvent(Event):
+    """Hand landmarks were extracted from a frame (None when no hand is visible)."""
+    __slots__ = ('frame_id', 'landmarks')
+
+    def __init__(self, frame_id: int, landmarks, timestamp: Optional[float] = None):
+        super().__init__(timestamp)
+        self.frame_id = frame_id
+        self.landmarks = landmarks
+
+
+class GestureEvent(Event):
+    """A gesture was classified for a frame (gesture is None when nothing matched)."""
+    __slots__ = ('frame_id', 'gesture', 'data')
+
+    def __init__(self, frame_id: int, gesture: Optional[str], data: Optional[Dict[str, Any]] = None,
+                 timestamp: Optional[float] = None):
+        super().__init__(timestamp)
+        self.frame_id = frame_id
+        self.gesture = gesture
+        self.data = data or {}
+
+
+class ActionResultEvent(Event):
+    """An action was dispatched for a gesture."""
+    __slots__ = ('gesture', 'success', 'status')
+
+    def __init__(self, gesture: str, success: bool, status: str, timestamp: Optional[float] = None):
+        super().__init__(timestamp)
+        self.gesture = gesture
+        self.success = success
+        self.status = status
+
+
+class Subscription:
+    """A registered event callback with its delivery mode and statistics."""
+
+    def __init__(self, event_type: Type[Event], callback: Callable[[Event], None],
+                 predicate: Optional[Callable[[Event], bool]] = None, name: Optional[str] = None):
+        self.event_type = event_type
+        self.callback = callback
+        self.predicate = predicate
+        self.name = name or getattr(callback, '__qualname__', repr(callback))
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def offer(self, event: Event) -> None:
+        """Deliver an event from the publishing thread."""
+        self._invoke(event)
+
+    def close(self) -> None:
+        """Stop delivering events."""
+
+    def _invoke(self, event: Event) -> None:
+        try:
+            self.callback(event)
+            self.delivered += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error in event subscriber {self.name}: {str(e)}")
+
+
+class ThreadedSubscription(Subscription):
+    """A subscription whose callback runs on its own worker thread behind a bounded queue."""
+
+    def __init__(self, event_type: Type[Event], callback: Callable[[Event], None],
+                 predicate: Optional[Callable[[Event], bool]] = None, name: Optional[str] = None,
+                 maxsize: int = 64, policy: str = DROP_OLDEST,
+                 droppable: Optional[Callable[[Event], bool]] = None):
+        super().__init__(event_type, callback, predicate, name)
+        if policy not in (DROP_OLDEST, DROP_NEWEST, BLOCK):
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.droppable = droppable
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"event-{self.name}", daemon=True)
+        self._thread.start()
+
+    def offer(self, event: Event) -> None:
+        """Queue an event for the worker thread, applying the backpressure policy."""
+        with self._condition:
+            if not self._running:
+                return
+            if len(self._queue) >= self.maxsize:
+                # Events that may not be dropped are queued past the bound
+                if self.policy == DROP_NEWEST:
+                    if self.droppable is None or self.droppable(event):
+                        self.dropped += 1
+                        return
+                elif self.policy == DROP_OLDEST:
+                    for index, queued in enumerate(self._queue):
+                        if self.droppable is None or self.droppable(queued):
+                            del self._queue[index]
+                            self.dropped += 1
+                            break
+                else:
+                    while self._running and len(self._queue) >= self.maxsize:
+                        self._condition.wait()
+                    if not self._running:
+                        return
+            self._queue.append(event)
+            self._condition.notify_all()
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Stop the worker thread after the events already queued are delivered."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    @property
+    def pending(self) -> int:
+        """Number of events waiting for delivery."""
+        return len(self._queue)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                event = self._queue.popleft()
+                self._condition.notify_all()
+            self._invoke(event)
+
+
+class EventBus:
+    """
+    Typed in-process publish/subscribe bus for pipeline events.
+
+    Publishing iterates an immutable tuple of subscribers, so it takes no lock
+    on the hot path. Synchronous subscribers run inline on the publishing
+    thread; thread-handoff subscribers receive events through a bounded queue
+    and never block the publisher unless they use the BLOCK policy.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[Type[Event], Tuple[Subscription, ...]] = {}
+        self._lock = threading.Lock()
+        logger.info("Event bus initialized")
+
+    def subscribe(self, event_type: Type[Event], callback: Callable[[Event], None],
+                  mode: str = SYNC, predicate: Optional[Callable[[Event], bool]] = None,
+                  maxsize: int = 64, policy: str = DROP_OLDEST,
+                  name: Optional[str] = None,
+                  droppable: Optional[Callable[[Event], bool]] = None) -> Subscription:
+        """
+        Subscribe a callback to events of the given type (including subclasses).
+
+        Args:
+            event_type: Event class to receive
+            callback: Function called with each event
+            mode: SYNC to run on the publishing thread, THREAD for a worker thread
+            predicate: Optional filter evaluated on the publishing thread
+            maxsize: Queue bound for THREAD subscribers
+            policy: DROP_OLDEST, DROP_NEWEST or BLOCK when the queue is full
+            name: Name used in logs and thread names
+            droppable: Optional filter of the events the drop policies may discard; the
+                others are always delivered, even past maxsize
+
+        Returns:
+            Subscription handle for unsubscribe() and statistics
+        """
+        if mode == SYNC:
+            subscription = Subscription(event_type, callback, predicate, name)
+        elif mode == THREAD:
+            subscription = ThreadedSubscription(event_type, callback, predicate, name, maxsize, policy,
+                                                droppable)
+        else:
+            raise ValueError(f"Unknown delivery mode: {mode}")
+
+        with self._lock:
+            self._subscribers[event_type] = self._subscribers.get(event_type, ()) + (subscription,)
+        logger.debug("Subscribed %s to %s (%s)", subscription.name, event_type.__name__, mode)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription and stop its worker thread, if any."""
+        with self._lock:
+            current = self._subscribers.get(subscription.event_type, ())
+            self._subscribers[subscription.event_type] = tuple(s for s in current if s is not subscription)
+        subscription.close()
+
+    def publish(self, event: Event) -> None:
+        """Deliver an event to every subscriber of its type or a base type."""
+        subscribers = self._subscribers
+        for cls in type(event).__mro__:
+            for subscription in subscribers.get(cls, ()):
+                if subscription.predicate is None or subscription.predicate(event):
+                    subscription.offer(event)
+
+    def has_subscribers(self, event_type: Type[Event]) -> bool:
+        """Check whether publishing an event type would reach anyone."""
+        return any(self._subscribers.get(cls) for cls in event_type.__mro__)
+
+    def subscriptions(self) -> List[Subscription]:
+        """List all current subscriptions."""
+        return [s for subs in self._subscribers.values() for s in subs]
+
+    def close(self) -> None:
+        """Remove all subscriptions and stop worker threads."""
+        with self._lock:
+            subscriptions = [s for subs in self._subscribers.values() for s in subs]
+            self._subscribers = {}
+        for subscription in subscriptions:
+            subscription.close()
+        logger.info("Event bus closed")
@@ -0,0 +1,486 @@
+"""
+Local gesture event server.
+
+Streams gesture, cursor, landmark and action events from the event bus to
+external consumers (overlays, games, accessibility tools) over a localhost
+TCP port or a Unix domain socket. The server runs an asyncio loop on its own
+thread; the bus callbacks only hand events over to that loop, so serving any
+number of clients adds no work to the detection loop beyond one
+call_soon_threadsafe per event while clients are connected. Events are
+encoded once and the same bytes are written to every client that wants them.
+
+Slow clients never hold anyone up: a message is dropped for a client whose
+socket write buffer is over max_buffer, and a client that keeps falling
+behind is disconnected.
+
+Wire format (little endian), in both directions:
+    message length (u32) | message
+
+Server messages start with kind (u8) | timestamp (f64) | frame id (u32):
+    HELLO      JSON {"version", "kinds", "gestures"}
+    GESTURE    confidence (f32) | name length (u8) | name (UTF-8)
+    CURSOR     x (f32) | y (f32), normalized screen coordinates
+    LANDMARKS  21x3 float32 image-normalized landmarks
+    ACTION     success (u8) | name length (u8) | name | status (UTF-8)
+
+Clients send JSON subscription messages, all keys optional:
+    {"events": ["gesture", "cursor"], "gestures": ["scroll_up"], "min_confidence": 0.5}
+
+Enable the server with "server": {"enabled": true} in the configuration or
+--event-server, then watch the stream with:
+    python -m src.utils.event_server --events gesture,cursor
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import struct
+import sys
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import numpy as np
+from .event_bus import EventBus, LandmarksEvent, GestureEvent, ActionResultEvent
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 8765
+
+# Message kinds
+HELLO = 0
+GESTURE = 1
+CURSOR = 2
+LANDMARKS = 3
+ACTION = 4
+
+KINDS = {'gesture': GESTURE, 'cursor': CURSOR, 'landmarks': LANDMARKS, 'action': ACTION}
+KIND_NAMES = {HELLO: 'hello', **{kind: name for name, kind in KINDS.items()}}
+# Subscription of a client that has not sent one
+DEFAULT_KINDS = frozenset({GESTURE})
+
+_LENGTH = struct.Struct('<I')
+_HEADER = struct.Struct('<BdI')
+_GESTURE = struct.Struct('<fB')
+_CURSOR = struct.Struct('<ff')
+_ACTION = struct.Struct('<?B')
+
+# Largest client message accepted; subscriptions are a few hundred bytes
+MAX_CONTROL_MESSAGE = 64 * 1024
+
+
+def _frame(kind: int, timestamp: float, frame_id: int, body: bytes) -> bytes:
+    message = _HEADER.pack(kind, timestamp, frame_id & 0xFFFFFFFF) + body
+    return _LENGTH.pack(len(message)) + message
+
+
+def _short_string(value: str) -> bytes:
+    return value.encode('utf-8')[:255]
+
+
+def encode_gesture(event: GestureEvent) -> bytes:
+    """Encode a gesture event as a length-prefixed GESTURE message."""
+    name = _short_string(event.gesture)
+    confidence = (event.data or {}).get('confidence', 1.0)
+    return _frame(GESTURE, event.timestamp, event.frame_id,
+                  _GESTURE.pack(confidence, len(name)) + name)
+
+
+def encode_cursor(event: GestureEvent) -> bytes:
+    """Encode the cursor position of a gesture event as a length-prefixed CURSOR message."""
+    cursor = event.data['cursor_pos']
+    return _frame(CURSOR, event.timestamp, event.frame_id, _CURSOR.pack(cursor['x'], cursor['y']))
+
+
+def encode_landmarks(event: LandmarksEvent) -> bytes:
+    """Encode a landmarks event as a length-prefixed LANDMARKS message."""
+    landmarks = np.ascontiguousarray(event.landmarks, dtype='<f4')
+    return _frame(LANDMARKS, event.timestamp, event.frame_id, landmarks.tobytes())
+
+
+def encode_action(event: ActionResultEvent) -> bytes:
+    """Encode an action result as a length-prefixed ACTION message."""
+    name = _short_string(event.gesture or '')
+    return _frame(ACTION, event.timestamp, 0,
+                  _ACTION.pack(bool(event.success), len(name)) + name + (event.status or '').encode('utf-8'))
+
+
+def encode_hello(timestamp: float = 0.0) -> bytes:
+    """Encode the HELLO message sent to every client on connect."""
+    from src.gesture_recognition.confidence import GESTURES
+    body = json.dumps({'version': PROTOCOL_VERSION, 'kinds': sorted(KINDS), 'gestures': list(GESTURES)})
+    return _frame(HELLO, timestamp, 0, body.encode('utf-8'))
+
+
+def decode_message(message: bytes) -> Dict[str, Any]:
+    """
+    Decode a server message (without its length prefix).
+
+    Args:
+        message: Message bytes
+
+    Returns:
+        dict: 'kind', 'timestamp' and 'frame_id', plus the fields of the message kind
+
+    Raises:
+        ValueError: If the message kind is unknown
+    """
+    kind, timestamp, frame_id = _HEADER.unpack_from(message)
+    body = message[_HEADER.size:]
+    decoded = {'kind': KIND_NAMES.get(kind), 'timestamp': timestamp, 'frame_id': frame_id}
+    if kind == HELLO:
+        decoded.update(json.loads(body.decode('utf-8')))
+    elif kind == GESTURE:
+        confidence, length = _GESTURE.unpack_from(body)
+        decoded['confidence'] = confidence
+        decoded['gesture'] = body[_GESTURE.size:_GESTURE.size + length].decode('utf-8')
+    elif kind == CURSOR:
+        decoded['x'], decoded['y'] = _CURSOR.unpack_from(body)
+    elif kind == LANDMARKS:
+        decoded['landmarks'] = np.frombuffer(body, dtype='<f4').reshape(21, 3)
+    elif kind == ACTION:
+        success, length = _ACTION.unpack_from(body)
+        decoded['success'] = success
+        decoded['gesture'] = body[_ACTION.size:_ACTION.size + length].decode('utf-8')
+        decoded['status'] = body[_ACTION.size + length:].decode('utf-8')
+    else:
+        raise ValueError(f"Unknown message kind {kind}")
+    return decoded
+
+
+class _Client:
+    """A connected consumer and its subscription."""
+    __slots__ = ('writer', 'peer', 'kinds', 'gestures', 'min_confidence', 'dropped', 'behind')
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.peer = writer.get_extra_info('peername') or 'unix'
+        self.kinds = DEFAULT_KINDS
+        self.gestures = None
+        self.min_confidence = 0.0
+        self.dropped = 0
+        # Consecutive messages dropped; reset by every message written
+        self.behind = 0
+
+    def subscribe(self, request: Dict[str, Any]) -> None:
+        """Apply a subscription message."""
+        if 'events' in request:
+            unknown = set(request['events']) - set(KINDS)
+            if unknown:
+                raise ValueError(f"Unknown event kinds: {', '.join(sorted(unknown))}")
+            self.kinds = frozenset(KINDS[name] for name in request['events'])
+        if 'gestures' in request:
+            gestures = request['gestures']
+            self.gestures = frozenset(gestures) if gestures is not None else None
+        if 'min_confidence' in request:
+            self.min_confidence = float(request['min_confidence'])
+
+    def wants_gesture(self, gesture: str, confidence: float) -> bool:
+        return ((self.gestures is None or gesture in self.gestures)
+                and confidence >= self.min_confidence)
+
+
+class EventServer:
+    """Serve bus events to local clients from a background asyncio loop."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, unix_path: Optional[str] = None,
+                 max_buffer: int = 256 * 1024, max_behind: int = 256):
+        """
+        Args:
+            host: Interface to listen on; keep to loopback, the stream is not authenticated
+            port: TCP port, 0 for any free port (see address)
+            unix_path: Listen on this Unix domain socket instead of TCP
+            max_buffer: Bytes queued on a client socket above which its messages are dropped
+            max_behind: Consecutive dropped messages after which a client is disconnected
+        """
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.max_buffer = max_buffer
+        self.max_behind = max_behind
+        self.address = None
+        self.dropped = 0
+        self.disconnected_slow = 0
+        self._clients: Dict[asyncio.StreamWriter, _Client] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._startup_error: Optional[BaseException] = None
+        self._subscriptions = []
+        self._event_bus: Optional[EventBus] = None
+
+    @property
+    def client_count(self) -> int:
+        """Number of connected clients."""
+        return len(self._clients)
+
+    def start(self, timeout: float = 5.0) -> None:
+        """
+        Start listening on the server thread.
+
+        Raises:
+            OSError: If the address cannot be bound
+        """
+        self._thread = threading.Thread(target=self._run, name='event-server', daemon=True)
+        self._thread.start()
+        self._started.wait(timeout)
+        if self._startup_error is not None:
+            self._thread.join()
+            raise self._startup_error
+        logger.info("Event server listening on %s", self.address)
+
+    def attach(self, event_bus: EventBus) -> None:
+        """Forward gesture, landmark and action events published on the bus to clients."""
+        self._event_bus = event_bus
+        self._subscriptions = [
+            event_bus.subscribe(GestureEvent, self._on_gesture,
+                                predicate=lambda event: event.gesture is not None, name='server-gesture'),
+            event_bus.subscribe(LandmarksEvent, self._on_landmarks,
+                                predicate=lambda event: event.landmarks is not None, name='server-landmarks'),
+            event_bus.subscribe(ActionResultEvent, self._on_action, name='server-action')
+        ]
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Detach from the bus, disconnect all clients and stop the server thread."""
+        if self._event_bus is not None:
+            for subscription in self._subscriptions:
+                self._event_bus.unsubscribe(subscription)
+            self._subscriptions = []
+            self._event_bus = None
+        if self._loop is not None and self._thread is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+        self._thread = None
+
+    # Bus callbacks, called on the publishing (detection) thread: hand over and return
+
+    def _on_gesture(self, event: GestureEvent) -> None:
+        if self._clients:
+            self._loop.call_soon_threadsafe(self._broadcast_gesture, event)
+
+    def _on_landmarks(self, event: LandmarksEvent) -> None:
+        if self._clients:
+            self._loop.call_soon_threadsafe(self._broadcast, LANDMARKS, encode_landmarks, event)
+
+    def _on_action(self, event: ActionResultEvent) -> None:
+        if self._clients:
+            self._loop.call_soon_threadsafe(self._broadcast, ACTION, encode_action, event)
+
+    # Server loop
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            if self.unix_path:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_unix_server(self._handle_client, path=self.unix_path))
+                self.address = self.unix_path
+            else:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_server(self._handle_client, self.host, self.port))
+                self.address = self._server.sockets[0].getsockname()[:2]
+        except BaseException as e:
+            self._startup_error = e
+            self._started.set()
+            self._loop.close()
+            return
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            for writer in list(self._clients):
+                writer.close()
+            self._clients.clear()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+            if self.unix_path and os.path.exists(self.unix_path):
+                os.unlink(self.unix_path)
+            logger.info("Event server stopped")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = _Client(writer)
+        self._clients[writer] = client
+        logger.info("Event client connected: %s", client.peer)
+        writer.write(encode_hello(self._loop.time()))
+        try:
+            while True:
+                length, = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+                if length > MAX_CONTROL_MESSAGE:
+                    raise ValueError(f"Control message of {length} bytes")
+                client.subscribe(json.loads(await reader.readexactly(length)))
+                logger.debug("Event client %s subscribed to %s", client.peer,
+                             sorted(KIND_NAMES[kind] for kind in client.kinds))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning("Closing event client %s after invalid message: %s", client.peer, e)
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+            logger.info("Event client disconnected: %s (%d messages dropped)", client.peer, client.dropped)
+
+    def _broadcast_gesture(self, event: GestureEvent) -> None:
+        confidence = (event.data or {}).get('confidence', 1.0)
+        gesture_bytes = cursor_bytes = None
+        has_cursor = event.data is not None and 'cursor_pos' in event.data
+        for client in list(self._clients.values()):
+            if not client.wants_gesture(event.gesture, confidence):
+                continue
+            if GESTURE in client.kinds:
+                if gesture_bytes is None:
+                    gesture_bytes = encode_gesture(event)
+                self._send(client, gesture_bytes)
+            if has_cursor and CURSOR in client.kinds:
+                if cursor_bytes is None:
+                    cursor_bytes = encode_cursor(event)
+                self._send(client, cursor_bytes)
+
+    def _broadcast(self, kind: int, encode, event) -> None:
+        data = None
+        for client in list(self._clients.values()):
+            if kind not in client.kinds:
+                continue
+            if data is None:
+                data = encode(event)
+            self._send(client, data)
+
+    def _send(self, client: _Client, data: bytes) -> None:
+        transport = client.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > self.max_buffer:
+            client.dropped += 1
+            client.behind += 1
+            self.dropped += 1
+            if client.behind >= self.max_behind:
+                logger.warning("Disconnecting slow event client %s", client.peer)
+                self.disconnected_slow += 1
+                self._clients.pop(client.writer, None)
+                transport.abort()
+            return
+        client.behind = 0
+        client.writer.write(data)
+
+
+def create_event_server(config: Dict[str, Any], event_bus: EventBus) -> Optional[EventServer]:
+    """
+    Start an event server attached to the bus, if enabled in the configuration.
+
+    Args:
+        config: The 'server' configuration section
+        event_bus: Bus whose events are served
+
+    Returns:
+        EventServer or None: The running server, None if disabled or it could not be started
+    """
+    if not config['enabled']:
+        return None
+    server = EventServer(config['host'], config['port'], config['unix_socket'], config['max_buffer'])
+    try:
+        server.start()
+    except OSError as e:
+        logger.error(f"Error starting event server: {str(e)}")
+        return None
+    server.attach(event_bus)
+    return server
+
+
+class EventClient:
+    """Blocking client for the event server, for scripts and tests."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, unix_path: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        """
+        Connect to an event server.
+
+        Args:
+            host: Server host
+            port: Server TCP port
+            unix_path: Unix domain socket path, used instead of host and port
+            timeout: Socket timeout in seconds, None to block
+        """
+        if unix_path:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.settimeout(timeout)
+            self.socket.connect(unix_path)
+        else:
+            self.socket = socket.create_connection((host, port), timeout)
+        self._file = self.socket.makefile('rb')
+        self.hello = self.receive()
+
+    def subscribe(self, events: Optional[Iterable[str]] = None, gestures: Optional[Iterable[str]] = None,
+                  min_confidence: Optional[float] = None) -> None:
+        """Change the subscription; arguments left as None keep their current value."""
+        request = {}
+        if events is not None:
+            request['events'] = list(events)
+        if gestures is not None:
+            request['gestures'] = list(gestures)
+        if min_confidence is not None:
+            request['min_confidence'] = min_confidence
+        payload = json.dumps(request).encode('utf-8')
+        self.socket.sendall(_LENGTH.pack(len(payload)) + payload)
+
+    def receive(self) -> Dict[str, Any]:
+        """
+        Wait for the next message.
+
+        Raises:
+            ConnectionError: If the server closed the connection
+        """
+        header = self._file.read(_LENGTH.size)
+        if len(header) < _LENGTH.size:
+            raise ConnectionError("Event server closed the connection")
+        length, = _LENGTH.unpack(header)
+        message = self._file.read(length)
+        if len(message) < length:
+            raise ConnectionError("Event server closed the connection")
+        return decode_message(message)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            try:
+                yield self.receive()
+            except ConnectionError:
+                return
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._file.close()
+        self.socket.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print events from a running server as JSON lines."""
+    parser = argparse.ArgumentParser(description='Print HoloGest gesture events from a local event server')
+    parser.add_argument('--host', default='127.0.0.1', help='Server host')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Server port')
+    parser.add_argument('--unix', metavar='PATH', help='Unix domain socket of the server')
+    parser.add_argument('--events', default='gesture,cursor',
+                        help='Comma separated event kinds: ' + ', '.join(sorted(KINDS)))
+    parser.add_argument('--min-confidence', type=float, help='Only gestures at or above this confidence')
+    args = parser.parse_args(argv)
+    try:
+        client = EventClient(args.host, args.port, args.unix)
+    except OSError as e:
+        logger.error("Cannot connect to the event server: %s", e)
+        return 1
+    client.subscribe(args.events.split(','), min_confidence=args.min_confidence)
+    try:
+        for message in client:
+            if 'landmarks' in message:
+                message['landmarks'] = message['landmarks'].tolist()
+            print(json.dumps(message), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
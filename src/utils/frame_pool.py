@@ -0,0 +1,67 @@
+"""
+Reusable frame buffers.
+
+Capturing, converting and previewing a frame used to allocate three or four
+full-size arrays every frame. A FramePool hands out preallocated buffers
+instead: the owner acquires one, fills it (camera reads and cv2 conversions
+write into it through their `dst` arguments) and releases it once nothing
+refers to the frame any more. In steady state no frame memory is allocated.
+"""
+import logging
+from collections import deque
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FramePool:
+    """Free list of equally shaped frame buffers with explicit ownership."""
+
+    def __init__(self, capacity: int = 2, dtype=np.uint8):
+        """
+        Args:
+            capacity: Number of released buffers kept for reuse
+            dtype: Buffer element type
+        """
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        self._free = deque()
+        # Buffers allocated because none of the right shape was free
+        self.allocations = 0
+        self.reuses = 0
+
+    def acquire(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Take a buffer, allocating only if no free one has the requested shape.
+
+        The caller owns the buffer until it passes it to release().
+
+        Args:
+            shape: Buffer shape, e.g. (480, 640, 3)
+
+        Returns:
+            numpy.ndarray: Uninitialized buffer
+        """
+        shape = tuple(shape)
+        while self._free:
+            buffer = self._free.popleft()
+            if buffer.shape == shape:
+                self.reuses += 1
+                return buffer
+            # Frame size changed: buffers of the old size are dropped
+        self.allocations += 1
+        return np.empty(shape, dtype=self.dtype)
+
+    def release(self, buffer: Optional[np.ndarray]) -> None:
+        """
+        Return a buffer for reuse; the caller must not touch it afterwards.
+
+        Arrays allocated elsewhere (e.g. by cv2 after a size change) can be
+        released too and are adopted by the pool; views of other memory are not.
+        """
+        if buffer is None or buffer.base is not None or buffer.dtype != self.dtype:
+            return
+        if len(self._free) < self.capacity:
+            self._free.append(buffer)
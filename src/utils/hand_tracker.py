@@ -1,32 +1,52 @@
+"""
+Standalone hand tracker for scripts: finds the hands in BGR images and lists
+the pixel positions of their landmarks. Tracking runs on a HandBackend
+(src.gesture_recognition.hand_backends), by default the one the default
+'hand_tracking' configuration selects.
+"""
 import cv2
-import mediapipe as mp
+
+from ..gesture_recognition.hand_backends import create_hand_backend, draw_hand
+from .clock import SYSTEM_CLOCK
+from .config import DEFAULT_CONFIG
+
 
 class HandTracker:
-    def __init__(self, maxHands=1, detectionCon=0.7, trackCon=0.5):
+    def __init__(self, maxHands=1, detectionCon=0.7, trackCon=0.5, backend=None, clock=None):
+        """
+        Args:
+            maxHands: Hands to track
+            detectionCon: Minimum hand detection confidence
+            trackCon: Minimum tracking confidence before detection runs again
+            backend: HandBackend to track with, instead of the configured default
+            clock: Clock timestamping the frames, defaults to the system clock
+        """
+        if backend is None:
+            config = dict(DEFAULT_CONFIG['hand_tracking'], max_hands=maxHands,
+                          min_detection_confidence=detectionCon, min_tracking_confidence=trackCon)
+            backend = create_hand_backend(config)
         self.maxHands = maxHands
-        self.mpHands = mp.solutions.hands
-        self.hands = self.mpHands.Hands(static_image_mode=False,
-                                        max_num_hands=self.maxHands,
-                                        min_detection_confidence=detectionCon,
-                                        min_tracking_confidence=trackCon)
-        self.mpDraw = mp.solutions.drawing_utils
+        self.backend = backend
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        # HandDetections of the last image passed to findHands
+        self.detections = []
 
-    def findHands(self, img, draw=True):
+    def findHands(self, img, draw=True, timestamp=None):
         imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(imgRGB)
+        self.detections = self.backend.process(imgRGB, self.clock.now() if timestamp is None else timestamp)
 
-        if self.results.multi_hand_landmarks:
-            for handLms in self.results.multi_hand_landmarks:
-                if draw:
-                    self.mpDraw.draw_landmarks(img, handLms, self.mpHands.HAND_CONNECTIONS)
+        if draw:
+            for detection in self.detections:
+                draw_hand(img, detection.landmarks)
         return img
 
     def getPosition(self, img, handNo=0):
         lmList = []
-        if self.results.multi_hand_landmarks:
-            hand = self.results.multi_hand_landmarks[handNo]
-            for id, lm in enumerate(hand.landmark):
-                h, w, _ = img.shape
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                lmList.append((id, cx, cy))
+        if handNo < len(self.detections):
+            h, w = img.shape[:2]
+            for id, (x, y) in enumerate(self.detections[handNo].landmarks[:, :2].tolist()):
+                lmList.append((id, int(x * w), int(y * h)))
         return lmList
+
+    def close(self):
+        self.backend.close()
@@ -0,0 +1,252 @@
+"""
+Gesture detection in a separate process.
+
+Frames travel to the child through a ring of preallocated slots in shared
+memory: the camera decodes straight into a free slot and only the slot index,
+frame id and timestamp go over the pipe. The child runs GestureDetector on the
+slot in place (so the landmark overlay is drawn into the same buffer) and sends
+back the compact result - landmarks and gesture data - for the UI process to
+publish on its event bus. Frame pixels are never pickled or copied between
+processes, inference no longer competes with Qt for the GIL, and a crash in the
+detector takes down only the child, which is restarted.
+"""
+import logging
+import multiprocessing
+import sys
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SharedFrameRing:
+    """Fixed number of uint8 frame slots in one shared memory block."""
+
+    def __init__(self, frame_shape: Tuple[int, ...], slots: int = 2, name: Optional[str] = None):
+        """
+        Create a ring, or attach to an existing one by name.
+
+        Args:
+            frame_shape: Shape of one frame, e.g. (480, 640, 3)
+            slots: Number of frame slots
+            name: Shared memory name to attach to, None to create a new block
+        """
+        self.frame_shape = tuple(frame_shape)
+        self.slots = slots
+        self._owner = name is None
+        size = slots * int(np.prod(self.frame_shape))
+        self._memory = shared_memory.SharedMemory(name=name, create=self._owner, size=size if self._owner else 0)
+        self.frames = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=self._memory.buf)
+
+    @property
+    def name(self) -> str:
+        """Name other processes use to attach to the ring."""
+        return self._memory.name
+
+    def __getitem__(self, slot: int) -> np.ndarray:
+        return self.frames[slot]
+
+    @property
+    def in_use(self) -> bool:
+        """Whether views of the slots are still alive; every view keeps `frames` referenced as its base."""
+        # One reference is the attribute, one is getrefcount's argument
+        return self.frames is not None and sys.getrefcount(self.frames) > 2
+
+    def close(self) -> bool:
+        """
+        Detach from the ring, and free it if this process created it.
+
+        Unmapping the memory under a live view would crash the next access to
+        it, so the ring stays mapped while any view is out.
+
+        Returns:
+            bool: True if the ring was closed, False if views are still alive
+        """
+        if self.frames is None:
+            return True
+        if self.in_use:
+            return False
+        self.frames = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+        return True
+
+
+class InferenceResult:
+    """Detection result for one frame; `frame` is the annotated slot until released."""
+
+    __slots__ = ('slot', 'frame_id', 'timestamp', 'frame', 'landmarks', 'gesture_data')
+
+    def __init__(self, slot: int, frame_id: int, timestamp: float, frame: np.ndarray,
+                 landmarks: Optional[np.ndarray], gesture_data: Optional[Dict[str, Any]]):
+        self.slot = slot
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self.frame = frame
+        self.landmarks = landmarks
+        self.gesture_data = gesture_data
+
+
+def _default_detector():
+    from src.gesture_recognition.gesture_detector import GestureDetector
+    return GestureDetector()
+
+
+def _inference_main(ring_name: str, frame_shape: Tuple[int, ...], slots: int, connection,
+                     detector_factory: Callable, log_level: int) -> None:
+    """Child process loop: detect gestures on submitted slots until told to stop."""
+    logging.basicConfig(level=log_level, format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s')
+    ring = SharedFrameRing(frame_shape, slots, name=ring_name)
+    detector = detector_factory()
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+            slot, frame_id, timestamp = message
+            _, gesture_data = detector.detect_gestures(ring[slot], timestamp)
+            connection.send((slot, frame_id, timestamp, detector.last_landmarks, gesture_data))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        detector.release()
+        ring.close()
+
+
+class InferenceProcess:
+    """Runs a gesture detector in a child process fed through a SharedFrameRing."""
+
+    def __init__(self, slots: int = 2, detector_factory: Optional[Callable] = None):
+        """
+        Args:
+            slots: Frame slots; two keep the child busy while bounding the queue to one frame
+            detector_factory: Picklable callable creating the detector in the child,
+                defaults to GestureDetector
+        """
+        self.slots = slots
+        self.detector_factory = detector_factory or _default_detector
+        self.frame_shape: Optional[Tuple[int, ...]] = None
+        self.ring: Optional[SharedFrameRing] = None
+        self.process = None
+        self._connection = None
+        self._free = deque()
+        # Rings replaced by a restart while their slot views were still alive
+        self._retired: List[SharedFrameRing] = []
+        self.dropped = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self, frame_shape: Tuple[int, ...]) -> None:
+        """
+        Allocate the ring and start the child process.
+
+        Args:
+            frame_shape: Shape of the frames that will be submitted
+        """
+        # Spawn rather than fork so the child never inherits Qt or camera state
+        context = multiprocessing.get_context('spawn')
+        self.frame_shape = tuple(frame_shape)
+        self.ring = SharedFrameRing(self.frame_shape, self.slots)
+        self._connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_inference_main,
+            args=(self.ring.name, self.frame_shape, self.slots, child_connection,
+                  self.detector_factory, logging.getLogger().getEffectiveLevel()),
+            name='hologest-inference',
+            daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self._free = deque(range(self.slots))
+        logger.info("Inference process started (pid %s, %d slots of %s)",
+                    self.process.pid, self.slots, self.frame_shape)
+
+    def restart(self, frame_shape: Optional[Tuple[int, ...]] = None) -> None:
+        """Restart the child, optionally with a new frame shape."""
+        frame_shape = frame_shape or self.frame_shape
+        self.stop()
+        self.start(frame_shape)
+
+    def acquire(self) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        Take a free slot to fill with the next frame.
+
+        Returns:
+            tuple: (slot, writable frame buffer), or None if every slot is in flight
+        """
+        if self.process is None:
+            return None
+        self._close_retired()
+        if not self.process.is_alive():
+            logger.error("Inference process exited unexpectedly; restarting")
+            self.restart()
+        if not self._free:
+            self.dropped += 1
+            return None
+        slot = self._free.popleft()
+        return slot, self.ring[slot]
+
+    def submit(self, slot: int, frame_id: int, timestamp: float) -> None:
+        """Hand a filled slot to the child for detection."""
+        try:
+            self._connection.send((slot, frame_id, timestamp))
+        except (BrokenPipeError, OSError) as e:
+            logger.error("Failed to submit frame to inference process: %s", e)
+            self.release(slot)
+
+    def release(self, slot: int) -> None:
+        """Return a slot to the pool once its frame is no longer needed."""
+        if slot not in self._free:
+            self._free.append(slot)
+
+    def poll(self) -> List[InferenceResult]:
+        """
+        Collect finished results without blocking.
+
+        Each result's slot stays reserved until release() is called for it.
+
+        Returns:
+            list: Results in submission order
+        """
+        results = []
+        try:
+            while self._connection is not None and self._connection.poll():
+                slot, frame_id, timestamp, landmarks, gesture_data = self._connection.recv()
+                results.append(InferenceResult(slot, frame_id, timestamp, self.ring[slot],
+                                               landmarks, gesture_data))
+        except (EOFError, OSError) as e:
+            logger.error("Lost connection to inference process: %s", e)
+        return results
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the child process and free the ring."""
+        if self.process is not None:
+            try:
+                self._connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+            self._connection.close()
+            self.process = None
+            self._connection = None
+        if self.ring is not None:
+            if not self.ring.close():
+                # A result or buffer still points into the ring; free it once they are gone
+                logger.debug("Keeping the old frame ring mapped until its views are dropped")
+                self._retired.append(self.ring)
+            self.ring = None
+        self._free.clear()
+        self._close_retired()
+
+    def _close_retired(self) -> None:
+        """Free retired rings whose views have all been dropped."""
+        self._retired = [ring for ring in self._retired if not ring.close()]
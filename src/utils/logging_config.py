@@ -0,0 +1,164 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+# Attributes present on every LogRecord; anything else came from `extra=`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+            'where': f"{record.module}:{record.lineno}"
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limit how often each call site may log per interval.
+
+    Intended for per-frame messages: records at or below `max_level` from the
+    same source line are let through at most `limit` times per `interval`
+    seconds. The first record after a suppressed run carries a `suppressed`
+    count. Records arrive from every thread that logs, so the per-site
+    counters are updated under a lock.
+    """
+
+    def __init__(self, limit: int = 10, interval: float = 1.0, max_level: int = logging.INFO):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self.max_level = max_level
+        # (pathname, lineno) -> [window start, count in window, suppressed]
+        self._sites: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        now = record.created
+        with self._lock:
+            site = self._sites.get((record.pathname, record.lineno))
+            if site is None or now - site[0] >= self.interval:
+                suppressed = site[2] if site else 0
+                self._sites[(record.pathname, record.lineno)] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if site[1] < self.limit:
+                site[1] += 1
+                return True
+            site[2] += 1
+            return False
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the listener thread.
+
+    The stock handler formats every record before enqueueing it, which puts
+    string formatting back on the calling thread. Records are passed through
+    unchanged instead, so arguments should be values that are not mutated
+    after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(level: str = 'INFO',
+                  log_dir: Optional[str] = 'logs',
+                  console: bool = True,
+                  max_bytes: int = 10 * 1024 * 1024,
+                  backup_count: int = 5,
+                  rate_limit: int = 10) -> logging.Logger:
+    """
+    Setup asynchronous logging.
+
+    Application threads only enqueue records; a background QueueListener
+    formats them and writes rotating JSON-lines files and, optionally, the
+    console. Per-frame messages are rate limited per call site.
+
+    Args:
+        level: Root log level name (e.g. 'INFO', 'DEBUG')
+        log_dir: Directory for rotating JSON-lines files, None to disable
+        console: Whether to also log human-readable lines to stdout
+        max_bytes: Size at which a log file is rotated
+        backup_count: Number of rotated files to keep
+        rate_limit: Maximum records per second per call site, 0 to disable
+
+    Returns:
+        logging.Logger: Logger for the calling module
+    """
+    global _listener
+    shutdown_logging()
+
+    handlers = []
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, 'hologest.jsonl'),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    if rate_limit:
+        queue_handler.addFilter(RateLimitFilter(limit=rate_limit))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return logging.getLogger(__name__)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
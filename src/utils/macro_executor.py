@@ -0,0 +1,195 @@
+"""
+Timed input macros.
+
+Some actions are sequences of inputs with pauses in between, e.g. opening
+the shutdown menu (Win+X, wait for the menu, U) or gliding the cursor to a
+target. Sleeping between the steps would stall whichever thread dispatches
+gestures, so MacroExecutor schedules the steps instead: each macro has at
+most one pending step in a heap ordered by due time, and steps run when due.
+
+    - The first step of a macro runs at once on the calling thread when it has
+      no delay, so an action is not delayed by a thread hop.
+    - Later steps run on a worker thread that sleeps until the next due step
+      (started on first use). On a virtual clock there is no worker: the owner
+      calls run_pending() as time advances, which keeps tests and replays
+      deterministic.
+    - A macro name is in flight at most once: run() refuses a second one, or
+      with replace=True cancels the one in flight (cursor glides).
+    - Cancelled steps are dropped lazily when they reach the top of the heap.
+
+Actuator calls are serialized, so steps of different macros never interleave
+inside one call.
+"""
+import heapq
+import itertools
+import logging
+import threading
+from collections import namedtuple
+from typing import Dict, List, Optional, Sequence
+
+from .clock import SYSTEM_CLOCK
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# One input of a macro: seconds after the previous step, the actuator method and its arguments
+MacroStep = namedtuple('MacroStep', ['delay', 'call', 'args'])
+
+
+class _Macro:
+    __slots__ = ('name', 'steps', 'position', 'cancelled')
+
+    def __init__(self, name: str, steps: Sequence[MacroStep]):
+        self.name = name
+        self.steps = list(steps)
+        self.position = 0
+        self.cancelled = False
+
+
+class MacroExecutor:
+    """Run input macros as scheduled steps instead of sleeping between them."""
+
+    def __init__(self, actuator, clock=None, threaded: Optional[bool] = None, metrics=None):
+        """
+        Args:
+            actuator: Input injector whose methods the steps call
+            clock: Clock providing now() in seconds, defaults to the monotonic system clock
+            threaded: Run later steps on a worker thread; defaults to True on the system
+                clock and False otherwise (the owner then calls run_pending())
+            metrics: Metrics registry, defaults to the shared one
+        """
+        self.actuator = actuator
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.threaded = self.clock is SYSTEM_CLOCK if threaded is None else threaded
+        self.metrics = metrics if metrics is not None else METRICS
+        self._condition = threading.Condition()
+        self._call_lock = threading.Lock()
+        self._heap: List = []
+        self._order = itertools.count()
+        self._running: Dict[str, _Macro] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def busy(self, name: str) -> bool:
+        """Check whether a macro of this name is in flight."""
+        return name in self._running
+
+    def run(self, name: str, steps: Sequence[MacroStep], replace: bool = False) -> bool:
+        """
+        Start a macro.
+
+        Args:
+            name: Macro name; at most one macro per name is in flight
+            steps: Steps to run in order
+            replace: Cancel a macro of the same name in flight instead of refusing to start
+
+        Returns:
+            bool: False if a macro of this name is in flight and replace is False
+
+        Raises:
+            ValueError: If there are no steps
+        """
+        if not steps:
+            raise ValueError(f"Macro '{name}' has no steps")
+        with self._condition:
+            current = self._running.get(name)
+            if current is not None:
+                if not replace:
+                    logger.debug("Macro %s already running", name)
+                    self.metrics.increment('macro.refused.' + name)
+                    return False
+                current.cancelled = True
+            macro = self._running[name] = _Macro(name, steps)
+            self._schedule(macro, self.clock.now() + macro.steps[0].delay)
+        self.run_pending()
+        return True
+
+    def next_due(self) -> Optional[float]:
+        """Due time of the earliest scheduled step, None if nothing is scheduled."""
+        with self._condition:
+            return self._heap[0][0] if self._heap else None
+
+    def cancel(self, name: str) -> bool:
+        """
+        Cancel the steps of a macro that have not run yet.
+
+        Returns:
+            bool: False if no macro of this name was in flight
+        """
+        with self._condition:
+            macro = self._running.pop(name, None)
+            if macro is None:
+                return False
+            macro.cancelled = True
+            return True
+
+    def run_pending(self) -> int:
+        """
+        Run the steps that are due.
+
+        Returns:
+            int: Number of steps run
+        """
+        executed = 0
+        while True:
+            with self._condition:
+                if not self._heap or self._heap[0][0] > self.clock.now():
+                    return executed
+                due, _, macro = heapq.heappop(self._heap)
+                if macro.cancelled:
+                    continue
+                step = macro.steps[macro.position]
+                macro.position += 1
+            failed = False
+            with self._call_lock:
+                try:
+                    getattr(self.actuator, step.call)(*step.args)
+                except Exception as e:
+                    logger.error(f"Error running macro {macro.name}: {str(e)}")
+                    failed = True
+            executed += 1
+            with self._condition:
+                if macro.cancelled:
+                    continue
+                if failed or macro.position == len(macro.steps):
+                    del self._running[macro.name]
+                else:
+                    # Delays count from when the previous step was due, so a late step does not
+                    # push back the rest of the schedule
+                    self._schedule(macro, due + macro.steps[macro.position].delay)
+
+    def _schedule(self, macro: _Macro, due: float) -> None:
+        """Queue the next step of a macro; the caller holds the condition."""
+        heapq.heappush(self._heap, (due, next(self._order), macro))
+        if not self.threaded or due <= self.clock.now():
+            # Due steps are run by the caller's run_pending()
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='macros', daemon=True)
+            self._thread.start()
+        self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    wait = self._heap[0][0] - self.clock.now() if self._heap else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self._condition.wait(wait)
+                if self._stopped:
+                    return
+            self.run_pending()
+
+    def stop(self) -> None:
+        """Cancel all macros and stop the worker thread."""
+        with self._condition:
+            for macro in self._running.values():
+                macro.cancelled = True
+            self._running.clear()
+            self._heap.clear()
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
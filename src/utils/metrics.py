@@ -0,0 +1,87 @@
+"""
+In-process metrics: named counters and running summaries.
+
+Components record into the shared METRICS registry (or one passed in for
+tests); snapshot() returns plain dicts suitable for logging or display.
+"""
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+class Summary:
+    """Running count, mean, minimum, maximum and last value of a series."""
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float('inf')
+        self.maximum = float('-inf')
+        self.last = None
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {'count': self.count, 'mean': self.mean, 'min': self.minimum,
+                'max': self.maximum, 'last': self.last}
+
+
+class Metrics:
+    """Thread-safe registry of counters and summaries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._summaries: Dict[str, Summary] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """Add to a counter."""
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        """Add a value to a summary."""
+        with self._lock:
+            summary = self._summaries.get(name)
+            if summary is None:
+                summary = self._summaries[name] = Summary()
+            summary.observe(value)
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def summary(self, name: str) -> Dict[str, float]:
+        with self._lock:
+            summary = self._summaries.get(name)
+            return summary.to_dict() if summary is not None else Summary().to_dict()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Copy of all counters and summaries."""
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'summaries': {name: s.to_dict() for name, s in self._summaries.items()}
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+# Shared default registry
+METRICS = Metrics()
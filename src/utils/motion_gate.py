@@ -0,0 +1,107 @@
+"""
+Motion gate for hand tracking.
+
+While the hand is held still - hovering to click, holding a pose - MediaPipe
+returns the same landmarks frame after frame. The gate compares a tiny
+grayscale thumbnail of each frame with the thumbnail of the last frame that
+went through inference; below the motion threshold the detector reuses that
+inference result, and at most max_skips frames in a row are served from the
+cache before inference runs again. Motion is the mean difference of the most
+changed block of thumbnail pixels rather than of the whole thumbnail: a hand
+covers a few percent of the frame, so moving it barely shifts the global mean,
+while sensor noise averages out within a block. Thumbnails average a sparse sample of
+pixels (nearest-neighbour to 4x the thumbnail size, then area interpolation),
+so building and comparing one takes about 40us even for 720p frames, against
+the tens of milliseconds of a hand-tracking pass.
+"""
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MotionGate:
+    """Decide whether a frame differs enough from the last inferred one to need inference."""
+
+    def __init__(self, threshold: float = 2.0, max_skips: int = 4, size: Tuple[int, int] = (32, 24),
+                 block: int = 4):
+        """
+        Args:
+            threshold: Mean absolute thumbnail difference of the most changed block,
+                in gray levels (0-255), below which a frame counts as unchanged
+            max_skips: Consecutive unchanged frames served from the cache before
+                inference is forced
+            size: Thumbnail (width, height), multiples of block
+            block: Side of the square blocks of thumbnail pixels compared, in pixels
+        """
+        if size[0] % block or size[1] % block:
+            raise ValueError(f"Thumbnail size {size} is not a multiple of the block size {block}")
+        self.threshold = threshold
+        self.max_skips = max_skips
+        self.size = size
+        self.block = block
+        # Consecutive frames skipped since the last inference
+        self.skipped = 0
+        # Difference of the latest frame to the reference, in gray levels
+        self.last_motion = 0.0
+        self._samples: Optional[np.ndarray] = None
+        self._thumbnail: Optional[np.ndarray] = None
+        self._gray = np.empty((size[1], size[0]), dtype=np.uint8)
+        self._diff = np.empty_like(self._gray)
+        self._reference: Optional[np.ndarray] = None
+
+    def should_infer(self, frame: np.ndarray) -> bool:
+        """
+        Check a frame and make it the new reference if it needs inference.
+
+        Args:
+            frame: BGR or grayscale frame
+
+        Returns:
+            bool: True if the frame moved, the cache is too old or there is no reference yet
+        """
+        width, height = self.size
+        if self._samples is None or self._samples.shape[2:] != frame.shape[2:]:
+            self._samples = np.empty((4 * height, 4 * width) + frame.shape[2:], dtype=np.uint8)
+            self._thumbnail = np.empty((height, width) + frame.shape[2:], dtype=np.uint8)
+        # Area interpolation over the whole frame costs over a millisecond at 720p
+        cv2.resize(frame, (4 * width, 4 * height), dst=self._samples, interpolation=cv2.INTER_NEAREST)
+        cv2.resize(self._samples, self.size, dst=self._thumbnail, interpolation=cv2.INTER_AREA)
+        if frame.ndim == 3:
+            cv2.cvtColor(self._thumbnail, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        else:
+            np.copyto(self._gray, self._thumbnail)
+
+        if self._reference is None:
+            self._reference = self._gray.copy()
+            self.skipped = 0
+            return True
+        cv2.absdiff(self._gray, self._reference, dst=self._diff)
+        blocks = self._diff.reshape(height // self.block, self.block, width // self.block, self.block)
+        self.last_motion = blocks.sum(axis=(1, 3), dtype=np.int32).max() / self.block ** 2
+        if self.last_motion < self.threshold and self.skipped < self.max_skips:
+            self.skipped += 1
+            return False
+        np.copyto(self._reference, self._gray)
+        self.skipped = 0
+        return True
+
+    def reset(self) -> None:
+        """Forget the reference so the next frame runs inference."""
+        self._reference = None
+        self.skipped = 0
+
+
+def create_motion_gate(config: Dict[str, Any]) -> Optional[MotionGate]:
+    """
+    Create a motion gate from the 'motion_gate' configuration section.
+
+    Returns:
+        MotionGate or None: The gate, None if disabled
+    """
+    if not config['enabled']:
+        return None
+    return MotionGate(config['threshold'], config['max_skips'])
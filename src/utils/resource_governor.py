@@ -0,0 +1,190 @@
+"""
+Resource governor for gesture detection.
+
+Hand tracking cost depends on the machine: a weak laptop cannot keep up with
+full-resolution frames and the full landmark model, while a strong desktop
+could afford them. The governor watches the process CPU time and the
+capture-to-result latency of the frames and moves along a quality ladder, one
+rung at a time:
+
+    max_width         frames wider than this are downscaled before tracking
+    model_complexity  MediaPipe hand landmark model (0: lite, 1: full)
+    roi               track inside a crop around the last hand position
+    preview_fps       rate at which the preview window is repainted
+
+Hysteresis keeps it from oscillating: it steps down as soon as an evaluation
+window exceeds a budget, but steps up only after several consecutive windows
+below `headroom` times both budgets, and every step up that is undone at once
+doubles the number of calm windows required for the next one. The window
+right after a transition is discarded, so reloading the model does not count
+against the new level. Transitions are logged and counted in the metrics
+(governor.step_down, governor.step_up, governor.level).
+"""
+import logging
+import time
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .clock import SYSTEM_CLOCK
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# One rung of the quality ladder; max_width None keeps the camera resolution
+QualityLevel = namedtuple('QualityLevel', ['name', 'max_width', 'model_complexity', 'roi', 'preview_fps'])
+
+# Cheapest first; the top rung is the detector's behaviour without a governor
+QUALITY_LADDER: List[QualityLevel] = [
+    QualityLevel('minimal', 320, 0, True, 10),
+    QualityLevel('low', 480, 0, True, 15),
+    QualityLevel('medium', 640, 0, False, 20),
+    QualityLevel('high', 640, 1, False, 30),
+    QualityLevel('full', None, 1, False, 30)
+]
+
+
+def quality_level(name: str, ladder: Sequence[QualityLevel] = QUALITY_LADDER) -> QualityLevel:
+    """
+    Look up a ladder rung by name.
+
+    Raises:
+        ValueError: If the ladder has no rung of that name
+    """
+    for level in ladder:
+        if level.name == name:
+            return level
+    raise ValueError(f"Unknown quality level '{name}', expected one of: {', '.join(rung.name for rung in ladder)}")
+
+
+class ResourceGovernor:
+    """Move along the quality ladder to keep CPU use and latency within budget."""
+
+    def __init__(self, ladder: Sequence[QualityLevel] = QUALITY_LADDER, start: Optional[str] = None,
+                 cpu_budget: float = 0.6, latency_budget: float = 0.05, headroom: float = 0.7,
+                 interval: float = 2.0, up_after: int = 3, max_up_after: int = 48, clock=None,
+                 cpu_time: Optional[Callable[[], float]] = None, metrics=None):
+        """
+        Args:
+            ladder: Quality levels, cheapest first
+            start: Name of the starting level, defaults to the top of the ladder
+            cpu_budget: Process CPU time allowed per second of wall-clock time, in cores
+            latency_budget: Capture-to-result latency allowed (90th percentile), seconds
+            headroom: Fraction of both budgets below which a window counts as calm
+            interval: Length of an evaluation window in seconds
+            up_after: Consecutive calm windows before stepping up
+            max_up_after: Upper bound for up_after after failed steps up
+            clock: Clock providing now() in seconds, defaults to the monotonic system clock
+            cpu_time: Callable returning the process CPU time in seconds
+            metrics: Metrics registry, defaults to the shared one
+        """
+        self.ladder = list(ladder)
+        self.index = self.ladder.index(quality_level(start, self.ladder)) if start else len(self.ladder) - 1
+        self.cpu_budget = cpu_budget
+        self.latency_budget = latency_budget
+        self.headroom = headroom
+        self.interval = interval
+        self.base_up_after = up_after
+        self.max_up_after = max_up_after
+        self.up_after = up_after
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.cpu_time = cpu_time if cpu_time is not None else time.process_time
+        self.metrics = metrics if metrics is not None else METRICS
+        # Measurements of the last completed window
+        self.cpu = 0.0
+        self.latency = 0.0
+        self._calm = 0
+        self._probing = False
+        self._settling = False
+        self._latencies: List[float] = []
+        self._window_start = self.clock.now()
+        self._cpu_start = self.cpu_time()
+
+    @property
+    def level(self) -> QualityLevel:
+        """Current quality level."""
+        return self.ladder[self.index]
+
+    def record_frame(self, latency: float) -> Optional[QualityLevel]:
+        """
+        Add the capture-to-result latency of a processed frame.
+
+        Args:
+            latency: Seconds from capture to the detection result
+
+        Returns:
+            QualityLevel or None: The new level if the governor changed it, for the
+                caller to apply (e.g. GestureDetector.set_quality)
+        """
+        self._latencies.append(latency)
+        now = self.clock.now()
+        elapsed = now - self._window_start
+        if elapsed < self.interval:
+            return None
+        cpu_now = self.cpu_time()
+        cpu = (cpu_now - self._cpu_start) / elapsed
+        latency_p90 = float(np.percentile(self._latencies, 90))
+        self._latencies.clear()
+        self._window_start = now
+        self._cpu_start = cpu_now
+        if self._settling:
+            # Model reloads and cold caches of a fresh transition
+            self._settling = False
+            return None
+        return self._evaluate(cpu, latency_p90)
+
+    def _evaluate(self, cpu: float, latency: float) -> Optional[QualityLevel]:
+        """Decide on a transition from one window's measurements."""
+        self.cpu, self.latency = cpu, latency
+        self.metrics.observe('governor.cpu', cpu)
+        self.metrics.observe('governor.latency', latency)
+        probing, self._probing = self._probing, False
+
+        if cpu > self.cpu_budget or latency > self.latency_budget:
+            self._calm = 0
+            if probing:
+                # The level just stepped up to cannot be sustained: wait longer next time
+                self.up_after = min(self.up_after * 2, self.max_up_after)
+            if self.index == 0:
+                return None
+            return self._transition(-1, 'step_down')
+
+        if probing:
+            self.up_after = self.base_up_after
+        if cpu < self.cpu_budget * self.headroom and latency < self.latency_budget * self.headroom:
+            self._calm += 1
+        else:
+            self._calm = 0
+        if self._calm < self.up_after or self.index == len(self.ladder) - 1:
+            return None
+        self._calm = 0
+        self._probing = True
+        return self._transition(1, 'step_up')
+
+    def _transition(self, step: int, kind: str) -> QualityLevel:
+        previous = self.level
+        self.index += step
+        self._settling = True
+        self.metrics.increment('governor.' + kind)
+        self.metrics.observe('governor.level', self.index)
+        logger.info("Quality %s -> %s (cpu %.0f%% of a core, p90 latency %.0f ms)",
+                    previous.name, self.level.name, self.cpu * 100, self.latency * 1000)
+        return self.level
+
+
+def create_resource_governor(config: Dict[str, Any]) -> Optional[ResourceGovernor]:
+    """
+    Create a resource governor from the 'governor' configuration section.
+
+    Returns:
+        ResourceGovernor or None: The governor, None if disabled
+
+    Raises:
+        ValueError: If the start level is unknown
+    """
+    if not config['enabled']:
+        return None
+    return ResourceGovernor(start=config['start'], cpu_budget=config['cpu_budget'],
+                            latency_budget=config['latency_budget'], headroom=config['headroom'],
+                            interval=config['interval'])
@@ -0,0 +1,448 @@
+"""
+Gesture session traces.
+
+A trace is an append-only binary file holding, for every processed frame, its
+timestamp, hand landmarks and the gesture dispatched for it, followed by the
+action results, the time each gesture was dispatched to the mapping and the
+input actually injected into the desktop. Traces are replayed against a
+RecordingActuator with a VirtualClock pinned to the recorded dispatch times
+(the capture times for frames without one), so timing-dependent logic (latency
+compensation, hover clicks, double clicks, throttles) runs exactly as it did
+live and every replay of a trace produces the same actuator calls. Frames that
+were never dispatched, e.g. dropped by the actuation queue, are not executed.
+
+File layout (little endian):
+    magic (8 bytes) | version (u16) | metadata length (u32) | metadata (JSON)
+    records: kind (u8) | timestamp (f64) | payload length (u32) | payload
+
+The metadata holds the session's screen size and cursor position and, under
+'mapping', the configuration the gesture mapping ran with (see
+mapping_metadata), so a replay rebuilds the same mapping; traces without it
+replay with the default configuration.
+
+Timestamps are monotonic clock seconds. Frame payloads are frame id (u32),
+flags (u8), 21x3 float32 landmarks when flag bit 0 is set, then gesture data
+as length-prefixed JSON. Action, dispatch and actuation payloads are JSON;
+a dispatch record holds the capture time of the frame it dispatched.
+"""
+import argparse
+import json
+import logging
+import struct
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from .clock import SYSTEM_CLOCK, VirtualClock
+from .config import DEFAULT_CONFIG
+from .event_bus import EventBus, LandmarksEvent, GestureEvent, ActionResultEvent
+
+logger = logging.getLogger(__name__)
+
+TRACE_MAGIC = b'HGTRACE\x00'
+TRACE_VERSION = 1
+
+# Record kinds
+FRAME = 1
+ACTION = 2
+ACTUATION = 3
+DISPATCH = 4
+
+_FILE_HEADER = struct.Struct('<8sHI')
+_RECORD_HEADER = struct.Struct('<BdI')
+_FRAME_HEADER = struct.Struct('<IB')
+_LANDMARKS = struct.Struct('<63f')
+_DATA_LENGTH = struct.Struct('<H')
+
+_HAS_LANDMARKS = 0x01
+
+
+def mapping_metadata(config: Dict[str, Any], bindings: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Trace metadata describing the gesture mapping of a session.
+
+    Args:
+        config: Configuration as returned by load_config
+        bindings: Actions of custom gestures the mapping was created with
+
+    Returns:
+        dict: JSON-serializable mapping settings, stored under 'mapping'
+    """
+    return {
+        'min_confidence': config['gestures']['min_confidence'],
+        'sequences': config['gestures']['sequences'],
+        'cursor': config['cursor'],
+        'bindings': bindings or {}
+    }
+
+
+def _encode_json(value: Any) -> bytes:
+    # repr-based float encoding round-trips exactly
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+class TraceRecord:
+    """A decoded trace record."""
+    __slots__ = ('kind', 'timestamp', 'frame_id', 'landmarks', 'data')
+
+    def __init__(self, kind: int, timestamp: float, frame_id: Optional[int] = None,
+                 landmarks: Optional[np.ndarray] = None, data: Optional[Dict[str, Any]] = None):
+        self.kind = kind
+        self.timestamp = timestamp
+        self.frame_id = frame_id
+        self.landmarks = landmarks
+        self.data = data or {}
+
+
+class TraceRecorder:
+    """Append-only, buffered writer for session traces."""
+
+    def __init__(self, path: str, metadata: Optional[Dict[str, Any]] = None, buffer_size: int = 64 * 1024):
+        """
+        Open a trace file for appending.
+
+        Args:
+            path: Trace file path; a header is written if the file is new
+            metadata: JSON-serializable session information (screen size, cursor, ...)
+            buffer_size: Size of the write buffer in bytes
+        """
+        self.path = path
+        self._file = open(path, 'ab', buffering=buffer_size)
+        self._lock = threading.Lock()
+        self._pending_landmarks: Dict[int, Optional[np.ndarray]] = {}
+        self._subscriptions = []
+        self._event_bus: Optional[EventBus] = None
+        if self._file.tell() == 0:
+            header = dict(metadata or {}, created=time.strftime('%Y-%m-%dT%H:%M:%S'))
+            encoded = _encode_json(header)
+            self._file.write(_FILE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, len(encoded)))
+            self._file.write(encoded)
+        logger.info("Recording session trace to %s", path)
+
+    def attach(self, event_bus: EventBus) -> None:
+        """Record landmarks, gestures and action results published on the bus."""
+        self._event_bus = event_bus
+        self._subscriptions = [
+            event_bus.subscribe(LandmarksEvent, self._on_landmarks, name='trace-landmarks'),
+            event_bus.subscribe(GestureEvent, self._on_gesture, name='trace-gesture'),
+            event_bus.subscribe(ActionResultEvent, self.record_action, name='trace-action')
+        ]
+
+    def record_frame(self, timestamp: float, frame_id: int, landmarks: Optional[np.ndarray],
+                     gesture_data: Optional[Dict[str, Any]]) -> None:
+        """Append a frame record."""
+        flags = _HAS_LANDMARKS if landmarks is not None else 0
+        parts = [_FRAME_HEADER.pack(frame_id & 0xFFFFFFFF, flags)]
+        if landmarks is not None:
+            parts.append(_LANDMARKS.pack(*np.asarray(landmarks, dtype=np.float32).ravel()))
+        encoded = _encode_json(gesture_data) if gesture_data else b''
+        parts.append(_DATA_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+        self._write(FRAME, timestamp, b''.join(parts))
+
+    def record_action(self, event: ActionResultEvent) -> None:
+        """Append an action result record."""
+        self._write(ACTION, event.timestamp, _encode_json(
+            {'gesture': event.gesture, 'success': event.success, 'status': event.status}))
+
+    def record_dispatch(self, timestamp: float, frame_time: float) -> None:
+        """Append a record of the gesture of the frame captured at `frame_time` being dispatched."""
+        self._write(DISPATCH, timestamp, _encode_json({'frame_time': frame_time}))
+
+    def record_actuation(self, timestamp: float, call: str, args: Tuple) -> None:
+        """Append a record of input injected into the desktop."""
+        self._write(ACTUATION, timestamp, _encode_json({'call': call, 'args': list(args)}))
+
+    def close(self) -> None:
+        """Detach from the bus and flush the trace to disk."""
+        if self._event_bus is not None:
+            for subscription in self._subscriptions:
+                self._event_bus.unsubscribe(subscription)
+            self._event_bus = None
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        logger.info("Session trace closed: %s", self.path)
+
+    def _on_landmarks(self, event: LandmarksEvent) -> None:
+        self._pending_landmarks[event.frame_id] = event.landmarks
+
+    def _on_gesture(self, event: GestureEvent) -> None:
+        landmarks = self._pending_landmarks.pop(event.frame_id, None)
+        self._pending_landmarks.clear()
+        self.record_frame(event.timestamp, event.frame_id, landmarks, event.data)
+
+    def _write(self, kind: int, timestamp: float, payload: bytes) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(_RECORD_HEADER.pack(kind, timestamp, len(payload)))
+            self._file.write(payload)
+
+
+def read_trace(path: str) -> Tuple[Dict[str, Any], Iterator[TraceRecord]]:
+    """
+    Open a trace file.
+
+    Args:
+        path: Trace file path
+
+    Returns:
+        tuple: (metadata, iterator over TraceRecord objects)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, metadata_length = _FILE_HEADER.unpack_from(data, 0)
+    if magic != TRACE_MAGIC:
+        raise ValueError(f"Not a HoloGest trace: {path}")
+    if version != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version {version}: {path}")
+    offset = _FILE_HEADER.size
+    metadata = json.loads(data[offset:offset + metadata_length])
+    offset += metadata_length
+    return metadata, _iter_records(data, offset)
+
+
+def _iter_records(data: bytes, offset: int) -> Iterator[TraceRecord]:
+    end = len(data)
+    while offset + _RECORD_HEADER.size <= end:
+        kind, timestamp, length = _RECORD_HEADER.unpack_from(data, offset)
+        offset += _RECORD_HEADER.size
+        if offset + length > end:
+            logger.warning("Trace truncated at offset %d", offset)
+            return
+        payload = data[offset:offset + length]
+        offset += length
+        if kind == FRAME:
+            frame_id, flags = _FRAME_HEADER.unpack_from(payload, 0)
+            position = _FRAME_HEADER.size
+            landmarks = None
+            if flags & _HAS_LANDMARKS:
+                landmarks = np.array(_LANDMARKS.unpack_from(payload, position), dtype=np.float32).reshape(21, 3)
+                position += _LANDMARKS.size
+            (data_length,) = _DATA_LENGTH.unpack_from(payload, position)
+            position += _DATA_LENGTH.size
+            gesture_data = json.loads(payload[position:position + data_length]) if data_length else {}
+            yield TraceRecord(kind, timestamp, frame_id, landmarks, gesture_data)
+        else:
+            yield TraceRecord(kind, timestamp, data=json.loads(payload))
+
+
+class _ReplayScreenshot:
+    """Screenshot placeholder that records where it would have been saved."""
+
+    def __init__(self, actuator: 'RecordingActuator'):
+        self._actuator = actuator
+
+    def save(self, path: str) -> None:
+        self._actuator._record('save_screenshot', (path,))
+
+
+class RecordingActuator:
+    """
+    Actuator that records every injected input.
+
+    With a delegate (e.g. a DesktopActuator) calls are forwarded and recorded,
+    which is how live sessions capture what was actually injected. Without one
+    nothing reaches the OS: the cursor is simulated, which is how traces are
+    replayed.
+    """
+
+    def __init__(self, delegate=None, clock=None,
+                 screen_size: Tuple[int, int] = (1920, 1080), cursor: Optional[Tuple[int, int]] = None,
+                 sink: Optional[Callable[[float, str, Tuple], None]] = None):
+        """
+        Args:
+            delegate: Actuator to forward calls to, None to simulate
+            clock: Clock providing now() in seconds, defaults to the monotonic system clock
+            screen_size: Simulated screen size when there is no delegate
+            cursor: Simulated initial cursor position, defaults to the screen center
+            sink: Optional callback receiving (timestamp, call, args) for each call
+        """
+        self.delegate = delegate
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.sink = sink
+        self.calls: List[Tuple[float, str, Tuple]] = []
+        self._screen_size = tuple(delegate.size()) if delegate is not None else tuple(screen_size)
+        self._cursor = tuple(cursor) if cursor is not None else (self._screen_size[0] // 2,
+                                                                  self._screen_size[1] // 2)
+
+    def size(self) -> Tuple[int, int]:
+        return self._screen_size
+
+    def position(self) -> Tuple[int, int]:
+        if self.delegate is not None:
+            return self.delegate.position()
+        return self._cursor
+
+    def move_to(self, x: float, y: float, duration: float = 0.0) -> None:
+        self._record('move_to', (x, y, duration))
+        self._cursor = (int(x), int(y))
+        if self.delegate is not None:
+            self.delegate.move_to(x, y, duration=duration)
+
+    def click(self, x: Optional[float] = None, y: Optional[float] = None) -> None:
+        self._record('click', (x, y))
+        if x is not None and y is not None:
+            self._cursor = (int(x), int(y))
+        if self.delegate is not None:
+            self.delegate.click(x, y)
+
+    def double_click(self) -> None:
+        self._record('double_click', ())
+        if self.delegate is not None:
+            self.delegate.double_click()
+
+    def scroll(self, clicks: int) -> None:
+        self._record('scroll', (clicks,))
+        if self.delegate is not None:
+            self.delegate.scroll(clicks)
+
+    def press(self, key: str) -> None:
+        self._record('press', (key,))
+        if self.delegate is not None:
+            self.delegate.press(key)
+
+    def hotkey(self, *keys: str) -> None:
+        self._record('hotkey', keys)
+        if self.delegate is not None:
+            self.delegate.hotkey(*keys)
+
+    def screenshot(self):
+        self._record('screenshot', ())
+        if self.delegate is not None:
+            return self.delegate.screenshot()
+        return _ReplayScreenshot(self)
+
+    def minimize_foreground_window(self) -> bool:
+        self._record('minimize_foreground_window', ())
+        if self.delegate is not None:
+            return self.delegate.minimize_foreground_window()
+        return True
+
+    def _record(self, call: str, args: Tuple) -> None:
+        timestamp = self.clock.now()
+        self.calls.append((timestamp, call, tuple(args)))
+        if self.sink is not None:
+            self.sink(timestamp, call, tuple(args))
+
+
+class TraceReplayer:
+    """Re-drive gesture mapping (and optionally classification) from a trace."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.metadata, records = read_trace(path)
+        self.records = list(records)
+
+    def recorded_actuations(self) -> List[Tuple[float, str, Tuple]]:
+        """Inputs injected during the recorded session."""
+        return [(r.timestamp, r.data['call'], tuple(r.data['args']))
+                for r in self.records if r.kind == ACTUATION]
+
+    def dispatch_times(self) -> Dict[float, float]:
+        """Time each frame's gesture was dispatched to the mapping, by frame capture time."""
+        return {r.data['frame_time']: r.timestamp for r in self.records if r.kind == DISPATCH}
+
+    def replay(self, detector=None, mapping=None, clock: Optional[VirtualClock] = None) -> RecordingActuator:
+        """
+        Replay the trace.
+
+        Args:
+            detector: Optional GestureDetector sharing `clock`; when given, gestures
+                are re-classified from the recorded landmarks instead of using the
+                recorded gesture data
+            mapping: Optional GestureMapping sharing `clock` and a RecordingActuator;
+                one is created from the recorded mapping settings when omitted
+            clock: VirtualClock used by the components, created when omitted
+
+        Returns:
+            RecordingActuator: The actuator holding the replayed calls
+        """
+        if mapping is None:
+            clock = clock if clock is not None else VirtualClock()
+            mapping = self._create_mapping(clock)
+        elif clock is None:
+            clock = mapping.clock
+
+        dispatch_times = self.dispatch_times()
+        for record in self.records:
+            if record.kind != FRAME:
+                continue
+            # Gestures are executed when they were dispatched live, so the measured latency
+            # and the hover and throttle timing match the recorded session
+            dispatch_time = dispatch_times.get(record.timestamp)
+            clock.set(max(clock.now(), record.timestamp if dispatch_time is None else dispatch_time))
+            # Macro steps run as time passes, whether or not the frame has a gesture
+            mapping.macros.run_pending()
+            if detector is not None:
+                gesture_data = detector.classify_landmarks(record.landmarks, record.timestamp) \
+                    if record.landmarks is not None else {}
+                if record.landmarks is None:
+                    detector.trajectory_recognizer.reset()
+            elif dispatch_times and dispatch_time is None:
+                # Never reached the mapping in the recorded session
+                gesture_data = {}
+            else:
+                gesture_data = record.data
+            if gesture_data and gesture_data.get('gesture'):
+                mapping.execute_gesture(gesture_data, record.timestamp)
+        # Finish the macros still in flight when the trace ends, as the live session did
+        due = mapping.macros.next_due()
+        while due is not None:
+            clock.set(max(clock.now(), due))
+            mapping.macros.run_pending()
+            due = mapping.macros.next_due()
+        return mapping.actuator
+
+    def _create_mapping(self, clock: VirtualClock):
+        """Gesture mapping with the recorded settings, actuating a RecordingActuator."""
+        # Imported here: the mapping pulls in the gesture recognition package
+        from ..gesture_recognition.gesture_mapping import GestureMapping
+        from .cursor_predictor import create_cursor_predictor
+        settings = dict(mapping_metadata(DEFAULT_CONFIG), **self.metadata.get('mapping', {}))
+        actuator = RecordingActuator(
+            clock=clock,
+            screen_size=tuple(self.metadata.get('screen_size', (1920, 1080))),
+            cursor=self.metadata.get('cursor')
+        )
+        return GestureMapping(clock=clock, actuator=actuator, min_confidence=settings['min_confidence'],
+                              cursor_predictor=create_cursor_predictor(settings['cursor']),
+                              bindings=settings['bindings'], sequences=settings['sequences'])
+
+
+def main(argv=None) -> int:
+    """Command line entry point: summarize or replay a trace."""
+    parser = argparse.ArgumentParser(description='Inspect and replay HoloGest session traces')
+    parser.add_argument('command', choices=['dump', 'replay'])
+    parser.add_argument('trace', help='Path to a trace file')
+    parser.add_argument('--reclassify', action='store_true',
+                        help='Re-run gesture classification on the recorded landmarks')
+    args = parser.parse_args(argv)
+
+    replayer = TraceReplayer(args.trace)
+    if args.command == 'dump':
+        print(json.dumps(replayer.metadata))
+        for record in replayer.records:
+            frame = f" frame={record.frame_id}" if record.kind == FRAME else ''
+            print(f"{record.timestamp:.6f} kind={record.kind}{frame} {json.dumps(record.data)}")
+        return 0
+
+    detector = None
+    clock = VirtualClock()
+    if args.reclassify:
+        from ..gesture_recognition.gesture_detector import GestureDetector
+        detector = GestureDetector(clock=clock)
+    replayed = replayer.replay(detector=detector, clock=clock).calls
+    recorded = replayer.recorded_actuations()
+    for timestamp, call, call_args in replayed:
+        print(f"{timestamp:.6f} {call}{call_args}")
+    matches = [(c, a) for _, c, a in replayed] == [(c, a) for _, c, a in recorded]
+    print(f"{len(replayed)} replayed calls, {len(recorded)} recorded, "
+          f"{'identical' if matches else 'different'} sequence")
+    return 0 if matches else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import os
+import numpy as np
+from src.gesture_recognition.augmentation import Augmenter, mirror, scale_fingers, FINGER_CHAINS
+from src.gesture_recognition.landmarks import load_dataset, normalize_to_dataset
+from src.scripts.augment_dataset import augment_dataset
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'gesture_recognition',
+                            'gesture_data', 'gesture_data.csv')
+
+
+def test_mirroring_swaps_direction_labels():
+    """Test that mirroring flips x and swaps move_left/move_right only where selected."""
+    labels, landmarks = load_dataset(DATASET_PATH)
+    mask = np.arange(len(labels)) % 2 == 0
+    mirrored, swapped = mirror(landmarks, labels, mask)
+    assert np.allclose(mirrored[mask, :, 0], -landmarks[mask, :, 0])
+    assert np.array_equal(mirrored[~mask], landmarks[~mask])
+    assert set(zip(labels[mask], swapped[mask])) == {('move_left', 'move_right'), ('move_right', 'move_left')}
+    assert np.array_equal(swapped[~mask], labels[~mask])
+    twice, restored = mirror(mirrored, swapped, mask)
+    assert np.allclose(twice, landmarks) and np.array_equal(restored, labels)
+
+
+def test_finger_scaling_keeps_bases_and_scales_bones():
+    """Test that only the bones beyond each finger base change length, by their finger's factor."""
+    _, landmarks = load_dataset(DATASET_PATH)
+    factors = np.random.default_rng(0).uniform(0.8, 1.2, (len(landmarks), 5))
+    scaled = scale_fingers(landmarks, factors)
+    assert np.array_equal(scaled[:, FINGER_CHAINS[:, 0]], landmarks[:, FINGER_CHAINS[:, 0]])
+    before = np.linalg.norm(np.diff(landmarks[:, FINGER_CHAINS], axis=2), axis=-1)
+    after = np.linalg.norm(np.diff(scaled[:, FINGER_CHAINS], axis=2), axis=-1)
+    assert np.allclose(after, before * factors[:, :, None])
+
+
+def test_augmented_batches_stay_in_dataset_layout():
+    """Test that augmentation varies samples, keeps the normalization and is the identity when disabled."""
+    labels, landmarks = load_dataset(DATASET_PATH)
+    augmented, new_labels = Augmenter(seed=1).augment(landmarks, labels)
+    assert augmented.shape == landmarks.shape and len(new_labels) == len(labels)
+    assert np.allclose(normalize_to_dataset(augmented), augmented)
+    assert np.abs(augmented - landmarks).mean() > 0.05
+
+    identity = Augmenter(roll=0, tilt=0, scale=0, jitter=0, finger_length=0, mirror=0)
+    same, same_labels = identity.augment(landmarks, labels)
+    assert np.allclose(same, landmarks) and np.array_equal(same_labels, labels)
+
+    chunks = list(Augmenter(seed=2).generate(landmarks, labels, 1000, chunk_size=300))
+    assert [len(chunk_labels) for _, chunk_labels in chunks] == [300, 300, 300, 100]
+
+
+def test_augmented_dataset_is_streamed_reproducibly(tmp_path):
+    """Test that the written dataset loads back and depends only on the seed."""
+    first, second = str(tmp_path / 'a.csv'), str(tmp_path / 'b.csv')
+    assert augment_dataset(DATASET_PATH, first, 500, seed=7, chunk_size=128, include_source=True, workers=1) == 615
+    augment_dataset(DATASET_PATH, second, 500, seed=7, chunk_size=128, include_source=True, workers=1)
+    assert open(first).read() == open(second).read()
+    labels, landmarks = load_dataset(first)
+    source_labels, source = load_dataset(DATASET_PATH)
+    assert landmarks.shape == (615, 21, 3)
+    assert np.allclose(landmarks[:115], source, atol=1e-5) and np.array_equal(labels[:115], source_labels)
+    assert np.allclose(normalize_to_dataset(landmarks[115:]), landmarks[115:], atol=1e-4)
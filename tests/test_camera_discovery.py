@@ -0,0 +1,49 @@
+import pytest
+from src.utils import camera_discovery
+from src.utils.camera_discovery import CameraInfo, enumerate_cameras, invalidate_camera_cache
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    """Count device probes on a machine without device nodes."""
+    calls = []
+
+    def fake_probe(max_index):
+        calls.append(max_index)
+        return [CameraInfo(0, 'Camera 0'), CameraInfo(2, 'Camera 2')]
+
+    monkeypatch.setattr(camera_discovery, '_memory_cache', None)
+    monkeypatch.setattr(camera_discovery, '_device_signature', lambda: None)
+    monkeypatch.setattr(camera_discovery, '_probe_devices', fake_probe)
+    return calls
+
+
+def test_results_are_cached_on_disk(probe, tmp_path, monkeypatch):
+    """Test that a second enumeration, even in a new process, does not probe again."""
+    cache_path = str(tmp_path / 'cameras.json')
+    first = enumerate_cameras(cache_path=cache_path)
+    monkeypatch.setattr(camera_discovery, '_memory_cache', None)
+    second = enumerate_cameras(cache_path=cache_path)
+    assert [c.index for c in first] == [c.index for c in second] == [0, 2]
+    assert len(probe) == 1
+
+
+def test_invalidation_forces_a_new_probe(probe, tmp_path):
+    """Test that invalidating the cache probes the devices again."""
+    cache_path = str(tmp_path / 'cameras.json')
+    enumerate_cameras(cache_path=cache_path)
+    invalidate_camera_cache(cache_path)
+    enumerate_cameras(cache_path=cache_path)
+    assert len(probe) == 2
+
+
+def test_changed_devices_invalidate_the_cache(probe, tmp_path, monkeypatch):
+    """Test that a different device signature is treated as a cache miss."""
+    cache_path = str(tmp_path / 'cameras.json')
+    monkeypatch.setattr(camera_discovery, '_device_signature', lambda: [['/dev/video0', 1, 1]])
+    monkeypatch.setattr(camera_discovery, '_list_v4l2_devices', lambda: [CameraInfo(0, 'Webcam')])
+    monkeypatch.setattr(camera_discovery.os.path, 'isdir', lambda path: True)
+    assert enumerate_cameras(cache_path=cache_path)[0].name == 'Webcam'
+    monkeypatch.setattr(camera_discovery, '_device_signature', lambda: [['/dev/video0', 1, 2]])
+    monkeypatch.setattr(camera_discovery, '_list_v4l2_devices', lambda: [CameraInfo(0, 'New webcam')])
+    assert enumerate_cameras(cache_path=cache_path)[0].name == 'New webcam'
@@ -0,0 +1,37 @@
+import numpy as np
+from src.utils.camera_manager import CameraManager
+
+
+class _FakeCamera:
+    """Stands in for cv2.VideoCapture: delivers gray frames, failing every third read."""
+
+    def __init__(self):
+        self.reads = 0
+
+    def read(self, out=None):
+        self.reads += 1
+        if self.reads % 3 == 0:
+            return False, None
+        frame = out if out is not None else np.empty((48, 64, 3), dtype=np.uint8)
+        frame[...] = 128
+        return True, frame
+
+
+def test_capture_is_measured_on_the_frames_read_anyway():
+    """Test that measuring reads nothing itself and times the next successful reads."""
+    manager = CameraManager()
+    manager.camera = _FakeCamera()
+    manager.measure_capture(frames=4)
+    assert manager.camera.reads == 0 and manager.capture_stats is None
+
+    buffer = np.zeros((48, 64, 3), dtype=np.uint8)
+    for _ in range(4):
+        success, frame = manager.read_frame(buffer)
+        assert frame is buffer if success else frame is None
+    assert manager.capture_stats is None
+    manager.read_frame()
+    stats = manager.capture_stats
+    assert set(stats) == {'fps', 'read_ms'} and stats['fps'] > 0 and stats['read_ms'] >= 0
+
+    manager.read_frame()
+    assert manager.capture_stats is stats
@@ -0,0 +1,57 @@
+import time
+from src.utils.clock import MonotonicClock, VirtualClock
+from src.utils.application_controller import ApplicationController
+from src.utils.session_trace import RecordingActuator
+
+
+def test_monotonic_clock_never_goes_backwards():
+    """Test that consecutive readings are non-decreasing."""
+    clock = MonotonicClock()
+    readings = [clock.now_ns() for _ in range(1000)]
+    assert readings == sorted(readings)
+
+
+def test_virtual_clock_only_moves_when_told():
+    """Test that virtual time is controlled explicitly."""
+    clock = VirtualClock(10.0)
+    assert clock.now() == 10.0
+    clock.advance(0.25)
+    assert clock.now() == 10.25
+    assert clock.now_ns() == 10_250_000_000
+    clock.set(3.5)
+    assert clock.now() == 3.5
+
+
+def _controller(clock):
+    return ApplicationController(clock=clock, actuator=RecordingActuator(clock=clock))
+
+
+def test_hover_click_uses_injected_clock():
+    """Test that hover clicks fire on virtual time without waiting."""
+    clock = VirtualClock(0.0)
+    controller = _controller(clock)
+    center = {'x': 0.5, 'y': 0.5}
+    for _ in range(70):  # a little over 2 s at 30 fps
+        controller.control_cursor(center, 'move')
+        clock.advance(1 / 30)
+    clicks = [call for call in controller.actuator.calls if call[1] == 'click']
+    assert len(clicks) == 1
+
+
+def test_error_backoff_does_not_block():
+    """Test that error backoff is a cooldown instead of a sleep."""
+    clock = VirtualClock(0.0)
+    controller = _controller(clock)
+
+    started = time.monotonic()
+    controller._handle_error(RuntimeError("actuation failed"))
+    assert time.monotonic() - started < 0.1
+
+    assert controller.in_cooldown()
+    controller.control_cursor({'x': 0.9, 'y': 0.5}, 'move')
+    assert controller.actuator.calls == []
+
+    clock.advance(2.0)
+    assert not controller.in_cooldown()
+    controller.control_cursor({'x': 0.9, 'y': 0.5}, 'move')
+    assert controller.actuator.calls[-1][1] == 'move_to'
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from src.gesture_recognition.confidence import (GESTURES, GESTURE_INDEX, pose_confidences,
+                                                gesture_confidence)
+from src.gesture_recognition.gesture_mapping import GestureMapping
+from src.gesture_recognition.landmarks import canonicalize
+from src.utils.clock import VirtualClock
+from src.utils.metrics import Metrics
+from src.utils.session_trace import RecordingActuator
+
+
+def _pointing_hand(index_tip_y=0.3):
+    """Canonical landmarks of a hand with the index finger raised and the other fingers folded."""
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, 0] = 0.5
+    hand[:, 1] = 0.65
+    hand[0, 1] = 0.8    # wrist
+    hand[9, 1] = 0.6    # middle finger MCP: hand size 0.2
+    hand[2, 1] = 0.6    # thumb MCP above the thumb tip (folded thumb)
+    hand[6, 1] = 0.5    # index PIP
+    hand[8, 1] = index_tip_y
+    return canonicalize(hand)
+
+
+def test_clean_pose_is_fully_confident():
+    """Test that a pose well inside every threshold scores 1."""
+    assert gesture_confidence(_pointing_hand(), 'cursor_move') == pytest.approx(1.0)
+
+
+def test_marginal_pose_scores_lower():
+    """Test that confidence falls as the pose approaches the rule threshold."""
+    clean = gesture_confidence(_pointing_hand(0.3), 'cursor_move')
+    marginal = gesture_confidence(_pointing_hand(0.49), 'cursor_move')
+    assert 0.0 < marginal < clean
+    assert gesture_confidence(_pointing_hand(0.55), 'cursor_move') == 0.0
+
+
+def test_tracking_score_and_motion_gestures():
+    """Test that the tracking score weights the pose score and stands in for swipes."""
+    assert gesture_confidence(_pointing_hand(), 'cursor_move', 0.8) == pytest.approx(0.8)
+    assert gesture_confidence(_pointing_hand(), 'swipe_left', 0.9) == pytest.approx(0.9)
+
+
+def test_tilted_and_distant_hands_score_alike():
+    """Test that confidence does not depend on hand rotation or size in the image."""
+    upright = gesture_confidence(_pointing_hand(0.45), 'cursor_move')
+    angle = np.radians(35)
+    rotation = np.array([[np.cos(angle), -np.sin(angle), 0], [np.sin(angle), np.cos(angle), 0], [0, 0, 1]])
+    raw = np.zeros((21, 3))
+    raw[:, 1] = 0.65
+    raw[0, 1], raw[9, 1], raw[2, 1], raw[6, 1], raw[8, 1] = 0.8, 0.6, 0.6, 0.5, 0.45
+    tilted_far = (raw - 0.5) @ rotation.T * 0.5 + 0.5
+    assert gesture_confidence(canonicalize(tilted_far), 'cursor_move') == pytest.approx(upright)
+
+
+def test_batch_scores_match_single_hand_scores():
+    """Test that the vectorized path agrees with the per-gesture path."""
+    hands = np.random.default_rng(3).random((50, 21, 3))
+    scores = pose_confidences(hands)
+    assert scores.shape == (50, len(GESTURES))
+    for hand, row in zip(hands, scores):
+        for gesture, index in GESTURE_INDEX.items():
+            assert row[index] == pytest.approx(gesture_confidence(hand, gesture))
+
+
+def test_low_confidence_blocks_costly_actions():
+    """Test that an uncertain shutdown confirmation is not acted on."""
+    metrics = Metrics()
+    actuator = RecordingActuator(clock=VirtualClock())
+    mapping = GestureMapping(actuator=actuator, metrics=metrics, min_confidence={'take_screenshot': 0.9})
+    assert not mapping.execute_gesture({'gesture': 'take_screenshot', 'confidence': 0.5})
+    assert not mapping.execute_gesture({'gesture': 'confirm_shutdown', 'confidence': 0.2})
+    assert metrics.counter('rejected_low_confidence.take_screenshot') == 1
+    assert metrics.counter('rejected_low_confidence.confirm_shutdown') == 1
+    assert actuator.calls == []
@@ -0,0 +1,66 @@
+import pytest
+from src.gesture_recognition.gesture_mapping import GestureMapping
+from src.scripts.evaluate_cursor_prediction import synthetic_trajectory, evaluate
+from src.utils.clock import VirtualClock
+from src.utils.cursor_predictor import CursorPredictor
+from src.utils.event_bus import GestureEvent
+from src.utils.metrics import Metrics
+from src.utils.session_trace import RecordingActuator
+
+
+def _track(predictor, velocity, frames=30, rate=30.0, confidence=None):
+    for frame in range(frames):
+        t = frame / rate
+        predicted = predictor.predict(0.2 + velocity * t, 0.5, t, confidence)
+    return 0.2 + velocity * t, predicted
+
+
+def test_steady_motion_is_led_by_the_latency():
+    """Test that a steadily moving hand is extrapolated by speed times latency."""
+    predictor = CursorPredictor()
+    predictor.observe_latency(0.1)
+    actual, predicted = _track(predictor, 0.3)
+    assert predicted[0] - actual == pytest.approx(0.03, abs=0.003)
+    assert predicted[1] == 0.5
+
+
+def test_still_hand_and_low_confidence_are_not_extrapolated():
+    """Test that prediction leaves slow hands and uncertain detections alone."""
+    predictor = CursorPredictor()
+    predictor.observe_latency(0.1)
+    actual, predicted = _track(predictor, 0.05)
+    assert predicted == (actual, 0.5)
+    predictor.reset()
+    actual, predicted = _track(predictor, 0.3, confidence=0.3)
+    assert predicted == (actual, 0.5)
+
+
+def test_lead_is_capped():
+    """Test that fast motion never leads by more than max_lead."""
+    predictor = CursorPredictor(max_lead=0.05)
+    predictor.observe_latency(0.15)
+    actual, predicted = _track(predictor, 2.0)
+    assert predicted[0] - actual == pytest.approx(0.05)
+
+
+def test_prediction_reduces_lag_on_reaching_movements():
+    """Test offline that prediction trades most lag for little overshoot."""
+    trajectory = synthetic_trajectory(30)
+    baseline = evaluate(trajectory, 0.1)
+    predicted = evaluate(trajectory, 0.1, CursorPredictor())
+    assert predicted['lag_mean'] < 0.8 * baseline['lag_mean']
+    assert predicted['overshoot_mean'] < 0.1 * baseline['lag_mean']
+
+
+def test_mapping_measures_capture_to_actuation_latency():
+    """Test that gesture events feed their measured latency to metrics and the predictor."""
+    clock = VirtualClock(10.0)
+    metrics = Metrics()
+    predictor = CursorPredictor()
+    mapping = GestureMapping(clock=clock, actuator=RecordingActuator(clock=clock), metrics=metrics,
+                             cursor_predictor=predictor)
+    data = {'gesture': 'cursor_move', 'cursor_pos': {'x': 0.6, 'y': 0.5}, 'confidence': 1.0}
+    mapping.on_gesture_event(GestureEvent(1, 'cursor_move', data, 9.92))
+    assert predictor.latency == pytest.approx(0.08)
+    assert metrics.summary('latency.capture_to_actuation')['count'] == 1
+    assert mapping.actuator.calls[-1][1] == 'move_to'
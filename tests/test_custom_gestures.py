@@ -0,0 +1,90 @@
+import os
+import time
+import numpy as np
+import pytest
+from src.gesture_recognition.augmentation import Augmenter, scale_fingers
+from src.gesture_recognition.custom_gestures import GestureIndex, GestureRecorder, pose_features
+from src.gesture_recognition.gesture_mapping import GestureMapping
+from src.gesture_recognition.landmarks import load_dataset
+from src.utils.clock import VirtualClock
+from src.utils.event_bus import EventBus, LandmarksEvent
+from src.utils.session_trace import RecordingActuator
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'gesture_recognition',
+                            'gesture_data', 'gesture_data.csv')
+
+
+def _poses(count=40, seed=0):
+    """Noisy samples of an open hand and of the same hand with the index finger folded."""
+    _, landmarks = load_dataset(DATASET_PATH)
+    open_hand = np.repeat(landmarks[:1], count, axis=0)
+    folded = scale_fingers(open_hand, np.tile([1.0, 0.2, 1.0, 1.0, 1.0], (count, 1)))
+    augmenter = Augmenter(roll=10, tilt=0, scale=0.05, jitter=0.02, finger_length=0.05, mirror=0, seed=seed)
+    return augmenter.augment(open_hand, np.zeros(count))[0], augmenter.augment(folded, np.zeros(count))[0]
+
+
+def test_index_learns_rejects_and_stays_bounded(tmp_path):
+    """Test matching, open-set rejection, the per-class bound, removal and persistence."""
+    open_hand, folded = _poses()
+    index = GestureIndex(max_per_class=50, seed=0)
+    index.add('open', pose_features(open_hand[:20]))
+    index.add('fold', pose_features(folded[:20]))
+
+    assert all(index.query(f)[0] == 'open' for f in pose_features(open_hand[20:]))
+    assert all(index.query(f)[0] == 'fold' for f in pose_features(folded[20:]))
+    fist = scale_fingers(open_hand[:1], np.full((1, 5), 0.2))[0]
+    assert index.query(pose_features(fist)) is None
+
+    index.add('open', pose_features(np.repeat(open_hand, 10, axis=0)))
+    assert index.counts() == {'open': 50, 'fold': 20}
+    index.bindings['fold'] = 'key:space'
+    path = str(tmp_path / 'custom.npz')
+    index.save(path)
+    assert index.remove('open') and not index.remove('open')
+    assert index.query(pose_features(folded[25]))[0] == 'fold'
+
+    loaded = GestureIndex.load(path, max_per_class=50)
+    assert loaded.counts() == {'open': 50, 'fold': 20} and loaded.bindings == {'fold': 'key:space'}
+    assert loaded.query(pose_features(open_hand[30]))[0] == 'open'
+
+
+def test_lookup_stays_fast_with_many_gestures():
+    """Test that a lookup among 30 full gestures takes well under a millisecond."""
+    rng = np.random.default_rng(1)
+    index = GestureIndex(max_per_class=200)
+    for gesture in range(30):
+        index.add(f'gesture_{gesture}', rng.normal(0, 1, (200, 60)))
+    query = rng.normal(0, 1, 60)
+    started = time.perf_counter()
+    for _ in range(200):
+        index.query(query)
+    assert (time.perf_counter() - started) / 200 < 1e-3
+
+
+def test_recorded_gesture_is_bindable_immediately():
+    """Test the record -> learn -> bind -> act workflow on the event bus."""
+    _, folded = _poses(count=60)
+    clock = VirtualClock()
+    event_bus = EventBus()
+    index = GestureIndex()
+    recorder = GestureRecorder(index, event_bus, clock=clock)
+    finished = []
+    recorder.start('fold', duration=1.0, delay=0.5, on_finished=lambda name, samples: finished.append(samples))
+
+    for frame_id, landmarks in enumerate(folded, 1):
+        clock.advance(1 / 30)
+        event_bus.publish(LandmarksEvent(frame_id, landmarks, clock.now()))
+    assert not recorder.recording and finished and finished[0] >= 25
+    assert not event_bus.has_subscribers(LandmarksEvent)
+
+    actuator = RecordingActuator()
+    mapping = GestureMapping(clock=clock, actuator=actuator, bindings={'fold': 'key:space'})
+    name, confidence = index.query(pose_features(folded[0]))
+    assert name == 'fold'
+    assert mapping.execute_gesture({'gesture': name, 'confidence': confidence})
+    mapping.execute_gesture({'gesture': name, 'confidence': confidence})
+    assert [args for _, call, args in actuator.calls if call == 'press'] == [('space',)]
+    with pytest.raises(ValueError):
+        mapping.bind('scroll_up', 'key:space')
+    with pytest.raises(ValueError):
+        mapping.bind('fold', 'launch_rocket')
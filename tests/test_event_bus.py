@@ -0,0 +1,128 @@
+import threading
+import pytest
+from src.utils.event_bus import (EventBus, Event, GestureEvent, ActionResultEvent,
+                                 THREAD, DROP_OLDEST, DROP_NEWEST)
+
+
+@pytest.fixture
+def event_bus():
+    bus = EventBus()
+    yield bus
+    bus.close()
+
+
+def test_events_are_slotted():
+    """Test that events carry no per-instance __dict__."""
+    event = GestureEvent(1, 'cursor_move', {'gesture': 'cursor_move'})
+    assert not hasattr(event, '__dict__')
+    with pytest.raises(AttributeError):
+        event.unknown_field = 1
+
+
+def test_sync_subscriber_receives_matching_type(event_bus):
+    """Test that synchronous subscribers only see their event type."""
+    received = []
+    event_bus.subscribe(GestureEvent, received.append)
+    event_bus.publish(GestureEvent(1, 'scroll_up'))
+    event_bus.publish(ActionResultEvent('scroll_up', True, 'Scrolling up'))
+    assert [e.gesture for e in received] == ['scroll_up']
+
+
+def test_base_type_subscriber_receives_all_events(event_bus):
+    """Test that subscribing to Event receives every published event."""
+    received = []
+    event_bus.subscribe(Event, received.append)
+    event_bus.publish(GestureEvent(1, 'scroll_up'))
+    event_bus.publish(ActionResultEvent('scroll_up', True, 'Scrolling up'))
+    assert len(received) == 2
+
+
+def test_predicate_filters_on_publisher(event_bus):
+    """Test that the predicate drops events before delivery."""
+    received = []
+    event_bus.subscribe(GestureEvent, received.append, predicate=lambda e: e.gesture is not None)
+    event_bus.publish(GestureEvent(1, None))
+    event_bus.publish(GestureEvent(2, 'cursor_move'))
+    assert [e.frame_id for e in received] == [2]
+
+
+def test_unsubscribe_stops_delivery(event_bus):
+    """Test that unsubscribed callbacks no longer receive events."""
+    received = []
+    subscription = event_bus.subscribe(GestureEvent, received.append)
+    event_bus.unsubscribe(subscription)
+    event_bus.publish(GestureEvent(1, 'cursor_move'))
+    assert received == []
+    assert not event_bus.has_subscribers(GestureEvent)
+
+
+def test_subscriber_error_does_not_reach_publisher(event_bus):
+    """Test that a failing subscriber is counted, not raised."""
+    def fail(event):
+        raise RuntimeError("boom")
+    subscription = event_bus.subscribe(GestureEvent, fail)
+    event_bus.publish(GestureEvent(1, 'cursor_move'))
+    assert subscription.errors == 1
+
+
+def test_thread_subscriber_runs_off_publisher_thread(event_bus):
+    """Test that thread-handoff subscribers run on a worker thread."""
+    done = threading.Event()
+    threads = []
+
+    def record(event):
+        threads.append(threading.current_thread())
+        done.set()
+
+    event_bus.subscribe(GestureEvent, record, mode=THREAD)
+    event_bus.publish(GestureEvent(1, 'cursor_move'))
+    assert done.wait(2.0)
+    assert threads[0] is not threading.current_thread()
+
+
+def _blocked_subscriber(event_bus, policy, gestures=('cursor_move',) * 4, droppable=None):
+    """Subscribe a worker that blocks on its first event, returning its received list."""
+    release = threading.Event()
+    started = threading.Event()
+    received = []
+
+    def slow(event):
+        started.set()
+        release.wait(2.0)
+        received.append(event.frame_id)
+
+    subscription = event_bus.subscribe(GestureEvent, slow, mode=THREAD, maxsize=2, policy=policy,
+                                       droppable=droppable)
+    event_bus.publish(GestureEvent(0, 'cursor_move'))
+    assert started.wait(2.0)
+    for frame_id, gesture in enumerate(gestures, 1):
+        event_bus.publish(GestureEvent(frame_id, gesture))
+    release.set()
+    subscription.close()
+    return subscription, received
+
+
+def test_drop_oldest_keeps_latest_events(event_bus):
+    """Test that DROP_OLDEST discards the oldest queued events."""
+    subscription, received = _blocked_subscriber(event_bus, DROP_OLDEST)
+    assert received == [0, 3, 4]
+    assert subscription.dropped == 2
+
+
+def test_drop_newest_keeps_earliest_events(event_bus):
+    """Test that DROP_NEWEST rejects events while the queue is full."""
+    subscription, received = _blocked_subscriber(event_bus, DROP_NEWEST)
+    assert received == [0, 1, 2]
+    assert subscription.dropped == 2
+
+
+def test_only_droppable_events_are_dropped(event_bus):
+    """Test that a full queue drops queued cursor moves but keeps every discrete gesture."""
+    gestures = ('cursor_move', 'show_shutdown_options', 'cursor_move', 'scroll_up', 'press_enter', 'cursor_move')
+    droppable = lambda event: event.gesture == 'cursor_move'
+    subscription, received = _blocked_subscriber(event_bus, DROP_OLDEST, gestures, droppable)
+    assert received == [0, 2, 4, 5, 6]
+    assert subscription.dropped == 2
+    subscription, received = _blocked_subscriber(event_bus, DROP_NEWEST, gestures, droppable)
+    assert received == [0, 1, 2, 4, 5]
+    assert subscription.dropped == 2
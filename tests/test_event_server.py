@@ -0,0 +1,80 @@
+import time
+import numpy as np
+import pytest
+from src.utils.event_bus import EventBus, LandmarksEvent, GestureEvent, ActionResultEvent
+from src.utils.event_server import EventServer, EventClient, KINDS
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for the event server"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def served_bus():
+    """An event bus attached to a server on a free localhost port."""
+    event_bus = EventBus()
+    server = EventServer(port=0, max_behind=10)
+    server.start()
+    server.attach(event_bus)
+    yield event_bus, server
+    server.stop()
+    event_bus.close()
+
+
+def _connect(server, events, gestures=None):
+    """Connect a client and wait until the server has applied its subscription."""
+    client = EventClient(*server.address, timeout=5.0)
+    client.subscribe(events, gestures)
+    kinds = frozenset(KINDS[name] for name in events)
+    _wait_for(lambda: any(c.kinds == kinds for c in list(server._clients.values())))
+    return client
+
+
+def test_clients_receive_only_their_subscriptions(served_bus):
+    """Test that each client gets the event kinds and gestures it subscribed to."""
+    event_bus, server = served_bus
+    cursor_client = _connect(server, ['gesture', 'cursor'], ['cursor_move'])
+    landmark_client = _connect(server, ['landmarks', 'action'])
+    assert cursor_client.hello['version'] == 1
+
+    landmarks = np.random.default_rng(0).random((21, 3)).astype(np.float32)
+    event_bus.publish(GestureEvent(1, 'scroll_up', {'confidence': 0.9}, 1.0))
+    event_bus.publish(LandmarksEvent(2, landmarks, 2.0))
+    event_bus.publish(GestureEvent(2, 'cursor_move', {'confidence': 0.75, 'cursor_pos': {'x': 0.25, 'y': 0.5}}, 2.0))
+    event_bus.publish(ActionResultEvent('cursor_move', True, 'Moving cursor', 2.5))
+
+    gesture = cursor_client.receive()
+    assert (gesture['kind'], gesture['gesture'], gesture['frame_id']) == ('gesture', 'cursor_move', 2)
+    assert gesture['confidence'] == pytest.approx(0.75)
+    cursor = cursor_client.receive()
+    assert (cursor['kind'], cursor['x'], cursor['y']) == ('cursor', 0.25, 0.5)
+
+    received = landmark_client.receive()
+    assert received['kind'] == 'landmarks' and received['timestamp'] == 2.0
+    assert np.array_equal(received['landmarks'], landmarks)
+    action = landmark_client.receive()
+    assert (action['gesture'], action['success'], action['status']) == ('cursor_move', True, 'Moving cursor')
+    cursor_client.close()
+    landmark_client.close()
+
+
+def test_slow_client_is_dropped_without_blocking_the_publisher(served_bus):
+    """Test that a client that stops reading loses messages and is disconnected."""
+    event_bus, server = served_bus
+    stalled = _connect(server, ['landmarks'])
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+
+    started = time.monotonic()
+    frame_id = 0
+    while server.disconnected_slow == 0:
+        for _ in range(1000):
+            frame_id += 1
+            event_bus.publish(LandmarksEvent(frame_id, landmarks, float(frame_id)))
+        time.sleep(0.01)
+        assert time.monotonic() - started < 20
+    assert server.dropped >= 10
+    assert server.client_count == 0
+    stalled.close()
@@ -0,0 +1,90 @@
+import os
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+from src.gesture_recognition.landmarks import array_to_landmarks
+from src.scripts import extract_landmarks
+from src.scripts.extract_landmarks import discover_units, extract, process_unit
+
+
+class _FakeHands:
+    """Stands in for MediaPipe Hands: finds a hand in every frame brighter than mid-gray."""
+
+    def __init__(self, static_image_mode, min_detection_confidence):
+        self.hand = np.random.default_rng(0).random((21, 3))
+
+    def process(self, rgb):
+        found = rgb.mean() > 100
+        return SimpleNamespace(multi_hand_landmarks=[array_to_landmarks(self.hand)] if found else None)
+
+    def reset(self):
+        pass
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    """A corpus with one bright image and a ten-frame video getting brighter, models faked."""
+    created = []
+
+    def create_hands(static_image_mode, min_detection_confidence):
+        created.append(static_image_mode)
+        return _FakeHands(static_image_mode, min_detection_confidence)
+
+    monkeypatch.setattr(extract_landmarks, '_create_hands', create_hands)
+    os.makedirs(tmp_path / 'corpus' / 'open')
+    os.makedirs(tmp_path / 'corpus' / 'swipe')
+    cv2.imwrite(str(tmp_path / 'corpus' / 'open' / 'hand.png'), np.full((48, 64, 3), 200, dtype=np.uint8))
+    (tmp_path / 'corpus' / 'open' / 'notes.txt').write_text('not a sample')
+    writer = cv2.VideoWriter(str(tmp_path / 'corpus' / 'swipe' / 'clip.avi'), cv2.VideoWriter_fourcc(*'MJPG'),
+                             30, (64, 48))
+    for index in range(10):
+        writer.write(np.full((48, 64, 3), 25 * index, dtype=np.uint8))
+    writer.release()
+    return str(tmp_path / 'corpus'), created
+
+
+def test_discover_units(corpus):
+    """Test that media files become units in a fixed order, with long videos split into segments."""
+    root, _ = corpus
+    image = os.path.join(root, 'open', 'hand.png')
+    video = os.path.join(root, 'swipe', 'clip.avi')
+    assert discover_units(root) == [('open', image, 0, 1), ('swipe', video, 0, 10)]
+    assert discover_units(root, segment_frames=4) == [('open', image, 0, 1), ('swipe', video, 0, 4),
+                                                      ('swipe', video, 4, 8), ('swipe', video, 8, 10)]
+
+
+def test_process_unit_creates_only_the_models_it_needs(corpus):
+    """Test frame striding and segment bounds, and that each model is created on first use."""
+    root, created = corpus
+    video = os.path.join(root, 'swipe', 'clip.avi')
+    extract_landmarks._init_worker(0.5, 2)
+    # Frames 0, 2, 4, 6 and 8; those from 5 on are bright
+    assert len(process_unit(('swipe', video, 0, 10))) == 2
+    assert len(process_unit(('swipe', video, 4, 8))) == 1
+    assert created == [False]
+    rows = process_unit(('open', os.path.join(root, 'open', 'hand.png'), 0, 1))
+    assert len(rows) == 1 and rows[0].startswith('open,')
+    assert created == [False, True]
+
+
+def test_resume_reuses_chunks_only_for_the_same_settings(corpus, tmp_path):
+    """Test that a rerun reuses finished chunks, but not those extracted with other settings."""
+    root, _ = corpus
+    output = str(tmp_path / 'dataset.csv')
+    assert extract(root, output, workers=1, segment_frames=4) == 6
+    chunk_dir = output + '.chunks'
+    chunks = sorted(os.listdir(chunk_dir))
+    assert len(chunks) == 4
+    with open(os.path.join(chunk_dir, chunks[0]), 'a', encoding='utf-8') as f:
+        f.write('marker\n')
+
+    assert extract(root, output, workers=1, segment_frames=4) == 7
+    with open(output, encoding='utf-8') as f:
+        assert 'marker\n' in f.read()
+    assert extract(root, output, workers=1, segment_frames=4, frame_stride=2) == 3
+    assert extract(root, output, workers=1, segment_frames=4, min_detection_confidence=0.8) == 6
+    with open(output, encoding='utf-8') as f:
+        assert 'marker' not in f.read()
+    assert len(os.listdir(chunk_dir)) == 12
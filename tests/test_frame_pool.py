@@ -0,0 +1,36 @@
+import cv2
+import numpy as np
+from src.utils.frame_pool import FramePool
+
+
+def test_released_buffers_are_reused():
+    """Test that a steady stream of frames allocates only once."""
+    pool = FramePool(capacity=2)
+    for _ in range(10):
+        buffer = pool.acquire((48, 64, 3))
+        cv2.cvtColor(np.zeros((48, 64, 3), np.uint8), cv2.COLOR_BGR2RGB, dst=buffer)
+        pool.release(buffer)
+    assert pool.allocations == 1
+    assert pool.reuses == 9
+
+
+def test_size_change_drops_old_buffers():
+    """Test that buffers of a previous frame size are not handed out."""
+    pool = FramePool()
+    pool.release(pool.acquire((4, 4, 3)))
+    buffer = pool.acquire((8, 8, 3))
+    assert buffer.shape == (8, 8, 3)
+    assert pool.allocations == 2
+
+
+def test_views_and_excess_buffers_are_not_adopted():
+    """Test that the pool keeps only owned buffers, up to its capacity."""
+    pool = FramePool(capacity=1)
+    backing = np.zeros((2, 4, 4, 3), np.uint8)
+    pool.release(backing[0])
+    assert pool.acquire((4, 4, 3)) is not backing[0]
+    first, second = np.zeros((4, 4, 3), np.uint8), np.zeros((4, 4, 3), np.uint8)
+    pool.release(first)
+    pool.release(second)
+    assert pool.acquire((4, 4, 3)) is first
+    assert pool.acquire((4, 4, 3)) is not second
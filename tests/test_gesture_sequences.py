@@ -0,0 +1,71 @@
+import pytest
+from src.gesture_recognition.gesture_mapping import GestureMapping
+from src.gesture_recognition.gesture_sequences import GestureSequence, SequenceAutomaton, parse_sequences
+from src.utils.clock import VirtualClock
+from src.utils.event_bus import ActionResultEvent, EventBus
+from src.utils.session_trace import RecordingActuator
+
+
+def _feed(automaton, events):
+    """Push (gesture, timestamp) pairs and collect the completed sequences."""
+    completed = []
+    for gesture, timestamp in events:
+        completed.extend(automaton.push(gesture, timestamp))
+    return completed
+
+
+def test_overlapping_sequences_share_one_automaton():
+    """Test that combos sharing prefixes and suffixes are all recognized in one pass."""
+    automaton = SequenceAutomaton([
+        GestureSequence('ab', ('a', 'b'), 2.0),
+        GestureSequence('abc', ('a', 'b', 'c'), 3.0),
+        GestureSequence('bc', ('b', 'c'), 2.0),
+        GestureSequence('aa', ('a', 'a'), 2.0)
+    ])
+    assert _feed(automaton, [('a', 0.0), ('b', 0.5), ('c', 1.0)]) == ['ab', 'abc', 'bc']
+    # A held pose is one step; unrelated gestures in between are ignored
+    assert _feed(automaton, [('a', 2.0), ('a', 2.1), ('cursor_move', 2.2), ('b', 2.3)]) == ['ab']
+    # The same gesture again after a pause is a new step
+    assert _feed(automaton, [('a', 5.0), ('a', 5.6)]) == ['aa']
+
+
+def test_sequence_windows_expire_without_polling():
+    """Test that stale partial matches are dropped when the next step arrives."""
+    automaton = SequenceAutomaton([GestureSequence('abc', ('a', 'b', 'c'), 1.0),
+                                   GestureSequence('bc', ('b', 'c'), 1.0)])
+    assert _feed(automaton, [('a', 0.0), ('b', 0.6), ('c', 1.2)]) == ['bc']
+    assert _feed(automaton, [('a', 10.0), ('b', 12.0)]) == []
+    assert automaton.progress == 1
+    assert _feed(automaton, [('c', 14.0)]) == []
+    with pytest.raises(ValueError):
+        parse_sequences({'broken': {'steps': 'a', 'within': 1.0}})
+    assert parse_sequences({'off': {'steps': [], 'within': 1.0}}) == []
+
+
+def test_shutdown_needs_the_whole_sequence():
+    """Test that confirm_shutdown acts only right after show_shutdown_options."""
+    clock = VirtualClock()
+    event_bus = EventBus()
+    results = []
+    event_bus.subscribe(ActionResultEvent, results.append)
+    actuator = RecordingActuator()
+    mapping = GestureMapping(event_bus, clock=clock, actuator=actuator,
+                             sequences={'copy': {'steps': ['scroll_up', 'scroll_down'], 'within': 1.0,
+                                                 'action': 'hotkey:ctrl+c'}})
+
+    def perform(gesture):
+        clock.advance(1.0)
+        mapping.execute_gesture({'gesture': gesture, 'confidence': 1.0}, clock.now())
+
+    perform('confirm_shutdown')
+    assert not actuator.calls
+    perform('show_shutdown_options')
+    perform('confirm_shutdown')
+    perform('confirm_shutdown')
+    assert [(call, args) for _, call, args in actuator.calls] == [
+        ('hotkey', ('win', 'x')), ('press', ('u',)), ('press', ('s',))]
+    assert [result.gesture for result in results] == ['shutdown']
+
+    perform('scroll_up')
+    perform('scroll_down')
+    assert actuator.calls[-1][1:] == ('hotkey', ('ctrl', 'c'))
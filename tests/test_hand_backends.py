@@ -0,0 +1,159 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from src.gesture_recognition.gesture_detector import GestureDetector
+from src.gesture_recognition.hand_backends import (HandDetection, ReplayHandBackend, TasksHandBackend,
+                                                   create_hand_backend)
+from src.utils.clock import VirtualClock
+from src.utils.resource_governor import quality_level
+from src.utils.session_trace import TraceRecorder
+
+
+def _pointing_hand():
+    """Image-space landmarks of a hand with the index finger raised and the other fingers folded."""
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, 0] = 0.4
+    hand[:, 1] = 0.65
+    hand[0, 1] = 0.8    # wrist
+    hand[9, 1] = 0.6    # middle finger MCP: hand size 0.2
+    hand[2, 1] = 0.6    # thumb MCP above the thumb tip (folded thumb)
+    hand[6, 1] = 0.5    # index PIP
+    hand[8, 1] = 0.3    # index tip
+    return hand
+
+
+class _RecordingBackend(ReplayHandBackend):
+    """Replay backend that keeps the shapes of the frames it was given."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shapes = []
+
+    def process(self, rgb, timestamp):
+        self.shapes.append(rgb.shape)
+        return super().process(rgb, timestamp)
+
+
+def test_detector_classifies_backend_landmarks():
+    """Test that a detector on the replay backend tracks and classifies without MediaPipe."""
+    created = []
+
+    def factory(model_complexity):
+        created.append(model_complexity)
+        return ReplayHandBackend([_pointing_hand(), None], score=0.9)
+
+    detector = GestureDetector(clock=VirtualClock(), draw=False, backend=factory)
+    assert not created
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    _, gesture_data = detector.detect_gestures(frame, timestamp=1.0)
+    assert created == [1]
+    assert gesture_data['gesture'] == 'cursor_move'
+    assert gesture_data['cursor_pos'] == pytest.approx({'x': 0.6, 'y': 0.3})
+    assert gesture_data['confidence'] <= 0.9
+    assert detector.detect_gestures(frame, timestamp=1.1)[1] is None
+    assert detector.last_landmarks is None
+
+    detector.set_backend(ReplayHandBackend([_pointing_hand()]))
+    detector.draw = True
+    drawn, gesture_data = detector.detect_gestures(frame, timestamp=1.2)
+    assert gesture_data['gesture'] == 'cursor_move'
+    assert drawn.any()
+    assert created == [1]
+
+
+def test_roi_crop_is_mapped_back_to_frame_coordinates():
+    """Test that landmarks tracked in the hand crop come back in whole-frame coordinates."""
+    hand = _pointing_hand()
+    backend = _RecordingBackend([hand])
+    detector = GestureDetector(clock=VirtualClock(), draw=False, quality=quality_level('minimal'),
+                               backend=backend)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    detector.detect_gestures(frame, timestamp=0.0)
+    roi = detector._roi
+    assert roi is not None
+    # The first frame is tracked whole (downscaled), the second in the crop around the hand
+    detector.detect_gestures(frame, timestamp=0.1)
+    assert backend.shapes[0][:2] == (240, 320)
+    x0, y0, x1, y1 = roi
+    assert backend.shapes[1][1] == min(x1 - x0, 320)
+    assert backend.shapes[1][0] == pytest.approx((y1 - y0) * backend.shapes[1][1] / (x1 - x0), abs=1)
+    expected = hand[8, :2] * (x1 - x0, y1 - y0) / (640, 480) + (x0 / 640, y0 / 480)
+    assert detector.last_landmarks[8, :2] == pytest.approx(expected, abs=1e-5)
+
+    detections = [HandDetection(np.full((21, 3), 0.5, dtype=np.float32), 'Right', 1.0)]
+    GestureDetector._roi_to_frame(detections, (100, 50, 300, 250), (480, 640))
+    assert detections[0].landmarks[0] == pytest.approx([200 / 640, 150 / 480, 100 / 640])
+
+
+def test_live_stream_results_are_mapped_with_their_own_crop(tmp_path, monkeypatch):
+    """Test that asynchronous results, repeated until the next one arrives, map back with their frame's crop."""
+    from mediapipe.tasks.python import vision
+    hand = _pointing_hand()
+    crops = []
+
+    class _Landmarker:
+        """Finishes each odd frame's submission with the result of the frame before it."""
+
+        def __init__(self, callback):
+            self.callback = callback
+
+        def detect_async(self, image, timestamp_ms):
+            crops.append((timestamp_ms, detector._roi))
+            if len(crops) % 2 == 0:
+                source_ms, roi = crops[-2]
+                x0, y0, x1, y1 = (0, 0, 640, 480) if roi is None else roi
+                local = (hand[:, :2] * (640, 480) - (x0, y0)) / (x1 - x0, y1 - y0)
+                result = SimpleNamespace(
+                    hand_landmarks=[[SimpleNamespace(x=x, y=y, z=0.0) for x, y in local]],
+                    handedness=[[SimpleNamespace(category_name='Right', score=0.9)]])
+                self.callback(result, image, source_ms)
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(vision.HandLandmarker, 'create_from_options',
+                        lambda options: _Landmarker(options.result_callback))
+    model = tmp_path / 'hand_landmarker.task'
+    model.write_bytes(b'')
+    backend = TasksHandBackend(str(model), running_mode='live_stream')
+    detector = GestureDetector(clock=VirtualClock(), draw=False, quality=quality_level('low'), backend=backend)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    assert detector.detect_gestures(frame, timestamp=0.0)[1] is None
+    for index in range(1, 7):
+        detector.detect_gestures(frame, timestamp=index / 30)
+        assert detector.last_landmarks[:, :2] == pytest.approx(hand[:, :2], abs=1e-5)
+    # Cropped frames were tracked, and results of uncropped frames were still mapped as such
+    assert crops[1][1] is None and crops[2][1] is not None
+
+
+def test_backend_factory(tmp_path):
+    """Test backend selection from the hand_tracking configuration."""
+    path = tmp_path / 'session.hgt'
+    recorder = TraceRecorder(str(path), {})
+    recorder.record_frame(0.0, 0, _pointing_hand(), None)
+    recorder.record_frame(0.1, 1, None, None)
+    recorder.close()
+    backend = create_hand_backend({'backend': 'replay', 'trace': str(path)})
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    assert backend.process(frame, 0.0)[0].landmarks == pytest.approx(_pointing_hand())
+    assert backend.process(frame, 0.1) == []
+    assert len(backend.process(frame, 0.2)) == 1
+
+    with pytest.raises(ValueError):
+        create_hand_backend({'backend': 'replay', 'trace': None})
+    with pytest.raises(ValueError):
+        create_hand_backend({'backend': 'openpose'})
+
+
+def test_hand_tracker_runs_on_a_backend():
+    """Test that the standalone tracker lists pixel positions of the backend's landmarks."""
+    from src.utils.hand_tracker import HandTracker
+    tracker = HandTracker(backend=ReplayHandBackend([_pointing_hand(), None], loop=False), clock=VirtualClock())
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    tracker.findHands(image)
+    positions = tracker.getPosition(image)
+    assert len(positions) == 21 and image.any()
+    assert positions[8] == (8, 256, 144)
+    tracker.findHands(image, draw=False)
+    assert tracker.getPosition(image) == []
@@ -0,0 +1,83 @@
+import json
+import numpy as np
+import pytest
+from src.headless import HeadlessService
+from src.gesture_recognition.gesture_mapping import GestureMapping
+from src.utils.config import DEFAULT_CONFIG, load_config
+from src.utils.event_bus import EventBus
+from src.utils.session_trace import RecordingActuator
+
+
+class FakeCamera:
+    """Camera delivering a fixed number of frames, then asking the service to stop."""
+
+    def __init__(self, frames, on_exhausted):
+        self.frames = frames
+        self.on_exhausted = on_exhausted
+        self.read = 0
+        self.released = False
+
+    def initialize(self):
+        return True
+
+    def read_frame(self, out=None):
+        if self.read == self.frames:
+            self.on_exhausted()
+            return False, None
+        self.read += 1
+        frame = out if out is not None else np.empty((48, 64, 3), np.uint8)
+        frame[...] = 0
+        return True, frame
+
+    def release(self):
+        self.released = True
+
+
+class ScrollingDetector:
+    def __init__(self):
+        self.last_landmarks = None
+        self.released = False
+
+    def detect_gestures(self, frame, timestamp=None):
+        return frame, {'gesture': 'scroll_up', 'confidence': 1.0}
+
+    def release(self):
+        self.released = True
+
+
+def test_config_file_and_overrides_are_merged(tmp_path):
+    """Test that file values override defaults and command line values override the file."""
+    path = tmp_path / 'hologest.json'
+    path.write_text(json.dumps({'camera': {'index': 2, 'width': 1280}, 'service': {'max_fps': 10}}))
+    config = load_config(str(path), {'camera': {'index': 1}, 'service': {'max_fps': None}})
+    assert config['camera']['index'] == 1
+    assert config['camera']['width'] == 1280
+    assert config['camera']['height'] == DEFAULT_CONFIG['camera']['height']
+    assert config['service']['max_fps'] == 10
+    assert DEFAULT_CONFIG['camera']['index'] == 0
+
+
+def test_invalid_config_file_is_rejected(tmp_path):
+    """Test that a malformed configuration file raises ValueError."""
+    path = tmp_path / 'broken.json'
+    path.write_text('{"camera": ')
+    with pytest.raises(ValueError):
+        load_config(str(path))
+
+
+def test_service_runs_until_stopped_and_cleans_up():
+    """Test that the loop acts on every frame and releases everything on stop."""
+    config = load_config(overrides={'service': {'max_fps': 0}})
+    actuator = RecordingActuator()
+    event_bus = EventBus()
+    detector = ScrollingDetector()
+    service = HeadlessService(config, gesture_detector=detector, event_bus=event_bus,
+                              gesture_mapping=GestureMapping(event_bus, actuator=actuator))
+    camera = FakeCamera(5, service.stop)
+    service.camera_manager = camera
+
+    assert service.run() == 0
+    assert service.frame_id == 5
+    assert [call for _, call, _ in actuator.calls].count('scroll') >= 1
+    assert camera.released and detector.released
+    assert service.frame_pool.allocations == 0
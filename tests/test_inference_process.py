@@ -0,0 +1,113 @@
+import time
+import numpy as np
+import pytest
+from src.utils.inference_process import InferenceProcess, SharedFrameRing
+
+
+class MarkingDetector:
+    """Detector stand-in that marks the frame in place and reports its mean."""
+
+    def __init__(self):
+        self.last_landmarks = None
+
+    def detect_gestures(self, frame, timestamp=None):
+        mean = float(frame.mean())
+        frame[0, 0] = 255
+        self.last_landmarks = np.full((21, 3), mean, dtype=np.float32)
+        return frame, {'gesture': 'cursor_move', 'mean': mean}
+
+    def release(self):
+        pass
+
+
+def _collect(inference, count, timeout=20.0):
+    results = []
+    deadline = time.monotonic() + timeout
+    while len(results) < count and time.monotonic() < deadline:
+        results.extend(inference.poll())
+        time.sleep(0.005)
+    return results
+
+
+@pytest.fixture
+def inference():
+    process = InferenceProcess(slots=2, detector_factory=MarkingDetector)
+    process.start((48, 64, 3))
+    yield process
+    process.stop()
+
+
+def test_ring_slots_are_shared_between_views():
+    """Test that a ring attached by name sees the owner's writes."""
+    owner = SharedFrameRing((4, 4, 3), slots=2)
+    attached = SharedFrameRing((4, 4, 3), slots=2, name=owner.name)
+    owner[1][...] = 7
+    assert attached[1].sum() == 7 * 48
+    assert attached[0].sum() == 0
+    attached.close()
+    owner.close()
+
+
+def test_frames_are_processed_in_place(inference):
+    """Test that results come back in order with the child's overlay in the slot."""
+    received = []
+
+    def drain():
+        results = _collect(inference, 1)
+        assert results, 'timed out waiting for inference results'
+        for result in results:
+            received.append((result.frame_id, result.gesture_data['mean'], int(result.frame[0, 0, 0])))
+            inference.release(result.slot)
+
+    for frame_id in range(1, 6):
+        acquired = inference.acquire()
+        while acquired is None:
+            drain()
+            acquired = inference.acquire()
+        slot, buffer = acquired
+        buffer[...] = frame_id
+        inference.submit(slot, frame_id, float(frame_id))
+    while len(received) < 5:
+        drain()
+    assert [r[0] for r in received] == [1, 2, 3, 4, 5]
+    assert [r[1] for r in received] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert all(r[2] == 255 for r in received)
+
+
+def test_acquire_bounds_frames_in_flight(inference):
+    """Test that frames are dropped rather than queued once every slot is busy."""
+    assert inference.acquire() is not None
+    assert inference.acquire() is not None
+    assert inference.acquire() is None
+    assert inference.dropped == 1
+
+
+def test_crashed_child_is_restarted(inference):
+    """Test that a dead inference process is replaced on the next acquire."""
+    inference.process.kill()
+    inference.process.join()
+    assert inference.acquire() is not None
+    assert inference.alive
+
+
+def test_restart_keeps_the_ring_of_a_held_result_mapped(inference):
+    """Test that a result held across a restart stays readable and its ring is freed once dropped."""
+    slot, buffer = inference.acquire()
+    buffer[...] = 9
+    inference.submit(slot, 1, 1.0)
+    del buffer
+    results = _collect(inference, 1)
+    assert results, 'timed out waiting for inference results'
+    result = results[0]
+    old_ring = inference.ring
+    assert not old_ring.close()
+
+    inference.restart((24, 32, 3))
+    assert inference._retired == [old_ring]
+    assert int(result.frame[0, 0, 0]) == 255 and int(result.frame[1, 1, 1]) == 9
+    assert inference.acquire()[1].shape == (24, 32, 3)
+    assert inference._retired == [old_ring]
+
+    del result, results
+    assert inference.acquire() is not None
+    assert inference._retired == [] and old_ring.frames is None
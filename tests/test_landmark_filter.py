@@ -0,0 +1,55 @@
+import time
+import numpy as np
+from src.gesture_recognition.landmark_filter import LandmarkFilter
+
+INDEX_PIP, INDEX_TIP = 6, 8
+
+
+def _noisy_still_hand(count=300, noise=0.003, seed=0):
+    """A still hand whose index tip sits right at the height of its PIP joint, plus tracking noise."""
+    rng = np.random.default_rng(seed)
+    hand = rng.random((21, 3)).astype(np.float32)
+    hand[INDEX_TIP, 1] = hand[INDEX_PIP, 1] + 0.002
+    return hand + rng.normal(0.0, noise, (count, 21, 3)).astype(np.float32)
+
+
+def test_smoothing_removes_boundary_flicker():
+    """Test that a tip.y < pip.y rule flips far less often on filtered landmarks."""
+    frames = _noisy_still_hand()
+    landmark_filter = LandmarkFilter()
+    filtered = np.array([landmark_filter(frame, i / 30) for i, frame in enumerate(frames)])
+
+    def flips(hands):
+        extended = hands[30:, INDEX_TIP, 1] < hands[30:, INDEX_PIP, 1]
+        return np.count_nonzero(extended[1:] != extended[:-1])
+
+    assert flips(filtered) * 3 < flips(frames)
+    assert filtered[30:].std(axis=0).mean() < 0.5 * frames[30:].std(axis=0).mean()
+
+
+def test_moving_hand_lags_little_and_reset_restarts():
+    """Test that fast motion raises the cutoff, and that a reset jumps to the new hand."""
+    landmark_filter = LandmarkFilter()
+    hand = np.full((21, 3), 0.2, dtype=np.float32)
+    for i in range(30):
+        moved = hand + np.float32([i / 30, 0, 0])  # one image width per second
+        filtered = landmark_filter(moved, i / 30)
+    assert moved[0, 0] - filtered[0, 0] < 0.03
+
+    landmark_filter.reset()
+    assert np.array_equal(landmark_filter(hand, 1.1), hand)
+    # A gap in the timestamps restarts the filter as well
+    assert np.array_equal(landmark_filter(moved, 5.0), moved)
+
+
+def test_filter_step_fits_the_millisecond_budget():
+    """Test the per-frame cost of filtering all 21 landmarks, best of several runs to ride out machine load."""
+    frames = _noisy_still_hand(count=200)
+    best = float('inf')
+    for _ in range(5):
+        landmark_filter = LandmarkFilter()
+        started = time.perf_counter()
+        for i, frame in enumerate(frames):
+            landmark_filter(frame, i / 30)
+        best = min(best, (time.perf_counter() - started) / len(frames))
+    assert best < 1e-3
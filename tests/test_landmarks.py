@@ -0,0 +1,62 @@
+import os
+import numpy as np
+from src.gesture_recognition.landmarks import (DATASET_COLUMNS, load_dataset, normalize_to_dataset,
+                                               format_dataset_row, canonicalize, hand_roi, roi_contains)
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'gesture_recognition',
+                            'gesture_data', 'gesture_data.csv')
+
+
+def test_dataset_is_already_normalized():
+    """Test that normalizing the shipped dataset leaves it unchanged."""
+    labels, landmarks = load_dataset(DATASET_PATH)
+    assert landmarks.shape == (len(labels), 21, 3)
+    assert np.allclose(normalize_to_dataset(landmarks), landmarks)
+
+
+def test_rows_match_dataset_format():
+    """Test that formatted rows reproduce the dataset lines exactly."""
+    with open(DATASET_PATH, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert lines[0] == ','.join(DATASET_COLUMNS)
+    labels, landmarks = load_dataset(DATASET_PATH)
+    assert format_dataset_row(labels[0], landmarks[0]) == lines[1]
+
+
+def test_normalization_removes_translation_and_scale():
+    """Test that shifted and scaled copies of a hand normalize identically."""
+    hand = np.random.default_rng(1).random((21, 3))
+    batch = np.stack([hand, hand * 2.5 + 0.3])
+    normalized = normalize_to_dataset(batch)
+    assert np.allclose(normalized[0], normalized[1])
+    assert np.allclose(normalized[:, 0], 0)
+    assert np.allclose(np.linalg.norm(normalized[:, 9], axis=-1), 1)
+
+
+def test_canonical_frame_is_rotation_invariant():
+    """Test that rotated copies of a hand share one canonical form, with the palm pointing up."""
+    hand = np.random.default_rng(2).random((21, 3))
+    angle = np.radians(-60)
+    rotation = np.array([[np.cos(angle), -np.sin(angle), 0], [np.sin(angle), np.cos(angle), 0], [0, 0, 1]])
+    batch = np.stack([hand, (hand @ rotation.T) * 0.7 + 0.2])
+    canonical = canonicalize(batch)
+    assert np.allclose(canonical[0], canonical[1])
+    assert np.allclose(canonical[:, 9, 0], 0)
+    assert np.all(canonical[:, 9, 1] < 0)
+    assert np.allclose(np.linalg.norm(canonical[:, 9], axis=-1), 1)
+
+
+def test_unrotated_canonical_frame_is_the_dataset_layout():
+    """Test that canonicalize without rotation reproduces the dataset normalization."""
+    hand = np.random.default_rng(4).random((21, 3))
+    assert np.array_equal(canonicalize(hand, rotate=False), normalize_to_dataset(hand))
+
+
+def test_hand_roi_is_a_square_crop_inside_the_frame():
+    """Test that the tracking crop contains the hand and is clipped to the frame."""
+    rng = np.random.default_rng(3)
+    hand = np.column_stack([rng.uniform(0.85, 0.95, 21), rng.uniform(0.4, 0.5, 21), np.zeros(21)])
+    x0, y0, x1, y1 = hand_roi(hand, 640, 480)
+    assert x1 - x0 == y1 - y0 and x1 <= 640 and x0 >= 0 and y0 >= 0 and y1 <= 480
+    assert roi_contains((x0, y0, x1, y1), hand, 640, 480, margin=0.0)
+    assert not roi_contains((0, 0, 200, 200), hand, 640, 480)
@@ -0,0 +1,99 @@
+import json
+import logging
+import sys
+import threading
+
+import pytest
+from src.utils.logging_config import JsonLinesFormatter, RateLimitFilter, setup_logging, shutdown_logging
+
+
+def _record(created, lineno=10, level=logging.INFO, msg='frame %d', args=(1,), **extra):
+    """A log record from a fixed call site and time."""
+    record = logging.LogRecord('src.test', level, 'src/test.py', lineno, msg, args, None)
+    record.created = created
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def root_logger():
+    """Restore the root logger's handlers and level after setup_logging replaced them."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_rate_limit_window_and_suppressed_count():
+    """Test that each call site passes `limit` records per interval and reports what it dropped."""
+    rate_limit = RateLimitFilter(limit=2, interval=1.0)
+    assert [rate_limit.filter(_record(t)) for t in (0.0, 0.1, 0.2, 0.3, 0.9)] == [True, True, False, False, False]
+    assert rate_limit.filter(_record(0.5, lineno=11))
+    assert rate_limit.filter(_record(0.5, level=logging.WARNING))
+
+    record = _record(1.0)
+    assert rate_limit.filter(record)
+    assert record.suppressed == 3
+    record = _record(2.5)
+    assert rate_limit.filter(record)
+    assert not hasattr(record, 'suppressed')
+
+
+def test_rate_limit_counts_are_exact_across_threads():
+    """Test that concurrent loggers never let more than `limit` records through or lose a count."""
+    rate_limit = RateLimitFilter(limit=10, interval=60.0)
+    passed = []
+
+    def log():
+        passed.append(sum(rate_limit.filter(_record(0.0)) for _ in range(2000)))
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=log) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert sum(passed) == 10
+    record = _record(60.0)
+    rate_limit.filter(record)
+    assert record.suppressed == 8 * 2000 - 10
+
+
+def test_json_lines_formatter_fields():
+    """Test the JSON fields, `extra` values and exceptions of formatted records."""
+    record = _record(0.0, msg='moved to %s', args=((3, 4),), gesture='cursor_move', latency=0.02)
+    entry = json.loads(JsonLinesFormatter().format(record))
+    assert entry['level'] == 'INFO' and entry['logger'] == 'src.test'
+    assert entry['msg'] == 'moved to (3, 4)'
+    assert entry['where'] == 'test:10'
+    assert entry['gesture'] == 'cursor_move' and entry['latency'] == 0.02
+    assert 'exc' not in entry and 'args' not in entry
+
+    try:
+        raise ValueError('broken frame')
+    except ValueError:
+        record = _record(0.0, exc_info=sys.exc_info())
+    assert 'ValueError: broken frame' in json.loads(JsonLinesFormatter().format(record))['exc']
+
+
+def test_queue_listener_flushes_on_shutdown(tmp_path, root_logger):
+    """Test that records queued for the background writer all reach the file on shutdown."""
+    setup_logging(level='DEBUG', log_dir=str(tmp_path), console=False, rate_limit=0)
+    logger = logging.getLogger('src.test')
+    for index in range(500):
+        logger.debug('frame %d', index, extra={'frame_id': index})
+    shutdown_logging()
+
+    with open(tmp_path / 'hologest.jsonl', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry['frame_id'] for entry in entries] == list(range(500))
+    assert entries[-1]['msg'] == 'frame 499' and entries[-1]['level'] == 'DEBUG'
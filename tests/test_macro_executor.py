@@ -0,0 +1,89 @@
+import threading
+import time
+from src.utils.application_controller import ApplicationController
+from src.utils.clock import VirtualClock
+from src.utils.macro_executor import MacroExecutor, MacroStep
+from src.utils.metrics import Metrics
+from src.utils.session_trace import RecordingActuator
+
+
+def test_steps_are_scheduled_not_slept():
+    """Test that the first step runs at once, later ones when due, one macro per name."""
+    clock = VirtualClock(0.0)
+    actuator = RecordingActuator(clock=clock)
+    metrics = Metrics()
+    macros = MacroExecutor(actuator, clock=clock, metrics=metrics)
+    steps = [MacroStep(0.0, 'hotkey', ('win', 'x')), MacroStep(0.5, 'press', ('u',)),
+             MacroStep(0.0, 'press', ('s',))]
+
+    started = time.monotonic()
+    assert macros.run('menu', steps)
+    assert time.monotonic() - started < 0.1
+    assert not macros.run('menu', steps)
+    assert metrics.counter('macro.refused.menu') == 1
+    assert [call for _, call, _ in actuator.calls] == ['hotkey']
+
+    clock.advance(0.4)
+    assert macros.run_pending() == 0
+    clock.advance(0.1)
+    assert macros.run_pending() == 2
+    assert [(t, args) for t, _, args in actuator.calls] == [(0.0, ('win', 'x')), (0.5, ('u',)), (0.5, ('s',))]
+    assert not macros.busy('menu')
+
+
+def test_cancel_and_replace():
+    """Test that cancelled steps never run and a replacing macro takes over."""
+    clock = VirtualClock(0.0)
+    actuator = RecordingActuator(clock=clock)
+    macros = MacroExecutor(actuator, clock=clock)
+    macros.run('keys', [MacroStep(0.0, 'press', ('a',)), MacroStep(1.0, 'press', ('b',))])
+    assert macros.cancel('keys') and not macros.cancel('keys')
+    macros.run('glide', [MacroStep(0.0, 'move_to', (1, 1)), MacroStep(0.1, 'move_to', (2, 2))])
+    macros.run('glide', [MacroStep(0.0, 'move_to', (5, 5)), MacroStep(0.1, 'move_to', (6, 6))], replace=True)
+    clock.advance(2.0)
+    macros.run_pending()
+    assert [args for _, _, args in actuator.calls] == [('a',), (1, 1, 0.0), (5, 5, 0.0), (6, 6, 0.0)]
+
+
+def test_worker_thread_runs_later_steps():
+    """Test that on the system clock the worker runs the delayed steps off the calling thread."""
+    done = threading.Event()
+    threads = []
+
+    class Actuator(RecordingActuator):
+        def press(self, key):
+            threads.append(threading.current_thread().name)
+            super().press(key)
+            if key == 'b':
+                done.set()
+
+    macros = MacroExecutor(Actuator())
+    macros.run('keys', [MacroStep(0.0, 'press', ('a',)), MacroStep(0.02, 'press', ('b',))])
+    assert done.wait(2.0)
+    assert threads == [threading.current_thread().name, 'macros']
+    macros.stop()
+
+
+def test_cursor_glides_without_blocking():
+    """Test that a cursor move takes its first step at once and finishes on schedule."""
+    clock = VirtualClock(0.0)
+    controller = ApplicationController(clock=clock, actuator=RecordingActuator(clock=clock, cursor=(0, 0)))
+    controller.glide_to(150, 300, duration=0.05)
+    assert controller.actuator.position() == (50, 100)
+    clock.advance(0.05)
+    controller.macros.run_pending()
+    assert controller.actuator.position() == (150, 300)
+
+
+def test_glide_starts_from_the_previous_target():
+    """Test that a glide replacing one in flight starts from its target, not the cursor mid-glide."""
+    clock = VirtualClock(0.0)
+    controller = ApplicationController(clock=clock, actuator=RecordingActuator(clock=clock, cursor=(0, 0)))
+    controller.glide_to(300, 0, duration=0.05)
+    assert controller.actuator.position() == (100, 0)
+    controller.glide_to(300, 300, duration=0.05)
+    assert controller.actuator.position() == (300, 100)
+    clock.advance(0.05)
+    controller.macros.run_pending()
+    moves = [args[:2] for _, call, args in controller.actuator.calls if call == 'move_to']
+    assert moves == [(100, 0), (300, 100), (300, 200), (300, 300)]
@@ -0,0 +1,61 @@
+import cv2
+import numpy as np
+from src.utils.motion_gate import MotionGate
+
+
+def _scene(rng, noise=0):
+    """A textured 480p frame with optional sensor noise."""
+    base = np.tile(np.linspace(0, 255, 640, dtype=np.uint8), (480, 1))
+    frame = np.repeat(base[:, :, None], 3, axis=2).astype(np.int16)
+    if noise:
+        frame += rng.integers(-noise, noise + 1, frame.shape, dtype=np.int16)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def test_still_scene_is_cached_until_refresh():
+    """Test that unchanged frames skip inference for at most max_skips frames in a row."""
+    rng = np.random.default_rng(0)
+    gate = MotionGate(threshold=2.0, max_skips=3)
+    decisions = [gate.should_infer(_scene(rng, noise=8)) for _ in range(9)]
+    assert decisions == [True, False, False, False, True, False, False, False, True]
+
+
+def test_motion_forces_inference():
+    """Test that a moving object triggers inference on every frame."""
+    rng = np.random.default_rng(1)
+    gate = MotionGate(threshold=2.0, max_skips=10)
+    decisions = []
+    for step in range(6):
+        frame = _scene(rng)
+        frame[100:300, 60 * step:60 * step + 150] = 255
+        decisions.append(gate.should_infer(frame))
+    assert all(decisions)
+    assert gate.last_motion > 2.0
+
+
+def test_slow_drift_accumulates_against_the_reference():
+    """Test that small per-frame changes still trigger inference once they add up."""
+    gate = MotionGate(threshold=2.0, max_skips=100)
+    frame = np.zeros((480, 640), dtype=np.uint8)
+    decisions = []
+    for level in range(0, 12, 1):
+        frame[:] = level
+        decisions.append(gate.should_infer(frame))
+    assert decisions[0] and not all(decisions[1:])
+    assert any(decisions[1:])
+
+
+def test_small_moving_hand_always_triggers_inference():
+    """Test that a hand covering a few percent of the frame is never served from the cache while it moves."""
+    rng = np.random.default_rng(2)
+    for speed in (4, 8, 12):
+        gate = MotionGate(threshold=2.0, max_skips=4)
+        decisions = []
+        for step in range(20):
+            frame = _scene(rng, noise=8)
+            x = 200 + speed * step
+            cv2.ellipse(frame, (x, 300), (35, 45), 0, 0, 360, (150, 170, 210), -1)
+            for finger in range(4):
+                cv2.rectangle(frame, (x - 30 + 16 * finger, 200), (x - 20 + 16 * finger, 260), (150, 170, 210), -1)
+            decisions.append(gate.should_infer(frame))
+        assert all(decisions), speed
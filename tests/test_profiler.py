@@ -0,0 +1,48 @@
+import sys
+import threading
+import time
+import tracemalloc
+from src.utils.profiler import Profiler
+
+
+def _busy_frame_loop(seconds):
+    """Stand-in for the frame loop: burns CPU and keeps allocating."""
+    kept = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        kept.append(bytearray(1024))
+        sum(range(1000))
+    return kept
+
+
+def test_session_writes_flamegraph_top_and_allocation_reports(tmp_path):
+    """Test that a session samples the busy function and reports its allocations."""
+    profiler = Profiler(output_dir=str(tmp_path), interval=0.002)
+    assert profiler.start(duration=0)
+    assert not profiler.start()
+    kept = _busy_frame_loop(0.3)
+    reports = profiler.stop()
+    assert kept
+
+    folded = open(reports['folded'], encoding='utf-8').read().splitlines()
+    assert folded and all(line.rsplit(' ', 1)[1].isdigit() for line in folded)
+    assert any(line.startswith('MainThread;') and '_busy_frame_loop' in line for line in folded)
+    assert '_busy_frame_loop' in open(reports['top'], encoding='utf-8').read()
+    assert 'test_profiler.py' in open(reports['alloc'], encoding='utf-8').read()
+    assert not tracemalloc.is_tracing()
+
+
+def test_inactive_profiler_costs_nothing_and_timed_sessions_stop(tmp_path):
+    """Test that nothing runs while idle and that a timed session ends by itself."""
+    threads = threading.active_count()
+    profiler = Profiler(output_dir=str(tmp_path), memory=False)
+    assert threading.active_count() == threads
+    assert sys.gettrace() is None and not tracemalloc.is_tracing()
+    assert profiler.stop() == {}
+
+    profiler.start(duration=0.1)
+    deadline = time.monotonic() + 5
+    while profiler.active:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert set(profiler.last_reports) == {'folded', 'top'}
@@ -0,0 +1,89 @@
+import pytest
+from src.utils.clock import VirtualClock
+from src.utils.metrics import Metrics
+from src.utils.resource_governor import ResourceGovernor, quality_level, create_resource_governor
+from src.utils.config import DEFAULT_CONFIG
+
+
+class Load:
+    """Process CPU time consumed at a configurable rate of the virtual clock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.rate = 0.0
+        self.cpu = 0.0
+        self._last = clock.now()
+
+    def __call__(self):
+        now = self.clock.now()
+        self.cpu += (now - self._last) * self.rate
+        self._last = now
+        return self.cpu
+
+
+def _governor(**kwargs):
+    clock = VirtualClock()
+    load = Load(clock)
+    governor = ResourceGovernor(cpu_budget=0.5, latency_budget=0.05, interval=1.0, up_after=2,
+                                clock=clock, cpu_time=load, metrics=Metrics(), **kwargs)
+    return governor, clock, load
+
+
+def _run(governor, clock, seconds, latency=0.01):
+    """Feed 10 frames per second; return the levels the governor switched to."""
+    changes = []
+    for _ in range(int(seconds * 10)):
+        clock.advance(0.1)
+        level = governor.record_frame(latency)
+        if level is not None:
+            changes.append(level.name)
+    return changes
+
+
+def test_overload_steps_down_and_idle_steps_back_up():
+    """Test that the governor sheds quality under load and restores it with hysteresis."""
+    governor, clock, load = _governor()
+    load.rate = 0.9
+    assert _run(governor, clock, 4) == ['high', 'medium']
+    assert governor.metrics.counter('governor.step_down') == 2
+
+    # Within the budget but above the headroom: hold
+    load.rate = 0.45
+    assert _run(governor, clock, 10) == []
+    load.rate = 0.1
+    assert _run(governor, clock, 10) == ['high', 'full']
+    assert governor.metrics.counter('governor.step_up') == 2
+
+    # Latency alone also counts as overload
+    load.rate = 0.1
+    assert _run(governor, clock, 2, latency=0.2) == ['high']
+
+
+def test_failed_step_up_backs_off():
+    """Test that a level that overloads right after a step up is retried less and less often."""
+    governor, clock, load = _governor(start='medium')
+
+    def cost():
+        # 'high' (index 3) overloads, 'medium' is comfortable
+        return 0.8 if governor.index >= 3 else 0.2
+
+    changes = []
+    for _ in range(600):
+        load.rate = cost()
+        clock.advance(0.1)
+        level = governor.record_frame(0.01)
+        if level is not None:
+            changes.append((round(clock.now()), level.name))
+    ups = [t for t, name in changes if name == 'high']
+    gaps = [b - a for a, b in zip(ups, ups[1:])]
+    assert len(ups) >= 3 and all(later > earlier for earlier, later in zip(gaps, gaps[1:]))
+    assert governor.level.name == 'medium'
+
+
+def test_configuration():
+    """Test the config factory and level lookup."""
+    governor = create_resource_governor(dict(DEFAULT_CONFIG['governor'], start='low'))
+    assert governor.level == quality_level('low')
+    assert create_resource_governor(dict(DEFAULT_CONFIG['governor'], enabled=False)) is None
+    with pytest.raises(ValueError):
+        quality_level('ultra')
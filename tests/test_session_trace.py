@@ -0,0 +1,186 @@
+import numpy as np
+import pytest
+from src.gesture_recognition.gesture_mapping import GestureMapping
+from src.utils.clock import VirtualClock
+from src.utils.config import load_config
+from src.utils.cursor_predictor import create_cursor_predictor
+from src.utils.event_bus import ActionResultEvent, EventBus, GestureEvent
+from src.utils.session_trace import (TraceRecorder, TraceReplayer, RecordingActuator, mapping_metadata, read_trace,
+                                     FRAME, ACTION, ACTUATION, DISPATCH)
+
+
+def _centered_pointing_trace(path, duration=3.0, fps=30):
+    """Record a trace of a still pointing hand at the frame center."""
+    recorder = TraceRecorder(str(path), {'screen_size': [1920, 1080], 'cursor': [960, 540]})
+    landmarks = np.random.default_rng(0).random((21, 3), dtype=np.float32)
+    for frame_id in range(int(duration * fps)):
+        gesture_data = {'gesture': 'cursor_move', 'cursor_pos': {'x': 0.5, 'y': 0.5}}
+        recorder.record_frame(100.0 + frame_id / fps, frame_id, landmarks, gesture_data)
+    recorder.close()
+    return landmarks
+
+
+def test_trace_round_trip(tmp_path):
+    """Test that records are read back exactly as written."""
+    path = tmp_path / 'session.hgt'
+    recorder = TraceRecorder(str(path), {'screen_size': [1920, 1080]})
+    landmarks = np.linspace(0, 1, 63, dtype=np.float32).reshape(21, 3)
+    recorder.record_frame(1.25, 7, landmarks, {'gesture': 'scroll_up', 'cursor_pos': {'x': 0.1 + 0.2, 'y': 0.3}})
+    recorder.record_frame(1.5, 8, None, None)
+    recorder.record_dispatch(1.255, 1.25)
+    recorder.record_action(ActionResultEvent('scroll_up', True, 'Scrolling up', timestamp=1.26))
+    recorder.record_actuation(1.27, 'scroll', (100,))
+    recorder.close()
+
+    metadata, records = read_trace(str(path))
+    records = list(records)
+    assert metadata['screen_size'] == [1920, 1080]
+    assert [r.kind for r in records] == [FRAME, FRAME, DISPATCH, ACTION, ACTUATION]
+    assert records[0].timestamp == 1.25
+    assert records[0].frame_id == 7
+    assert np.array_equal(records[0].landmarks, landmarks)
+    assert records[0].data['cursor_pos']['x'] == 0.1 + 0.2
+    assert records[1].landmarks is None and records[1].data == {}
+    assert records[2].timestamp == 1.255 and records[2].data == {'frame_time': 1.25}
+    assert records[3].data == {'gesture': 'scroll_up', 'success': True, 'status': 'Scrolling up'}
+    assert records[4].data == {'call': 'scroll', 'args': [100]}
+
+
+def test_read_rejects_foreign_files(tmp_path):
+    """Test that files without the trace header are rejected."""
+    path = tmp_path / 'not_a_trace.bin'
+    path.write_bytes(b'\x00' * 32)
+    with pytest.raises(ValueError):
+        read_trace(str(path))
+
+
+def test_replay_reproduces_hover_click(tmp_path):
+    """Test that hovering past the threshold clicks once at the recorded time."""
+    path = tmp_path / 'hover.hgt'
+    _centered_pointing_trace(path)
+
+    actuator = TraceReplayer(str(path)).replay()
+    clicks = [(t, args) for t, call, args in actuator.calls if call == 'click']
+    assert len(clicks) == 1
+    assert clicks[0][0] >= 102.0
+    assert clicks[0][1] == (960, 540)
+
+
+def test_replay_is_deterministic(tmp_path):
+    """Test that replaying a trace twice produces identical actuator calls."""
+    path = tmp_path / 'hover.hgt'
+    _centered_pointing_trace(path)
+    replayer = TraceReplayer(str(path))
+    assert replayer.replay().calls == replayer.replay().calls
+
+
+def test_replay_rebuilds_the_recorded_mapping(tmp_path):
+    """Test that replays use the minimum confidence and cursor settings the session ran with."""
+    def replay(overrides):
+        path = tmp_path / 'session.hgt'
+        if path.exists():
+            path.unlink()
+        config = load_config(overrides=overrides)
+        recorder = TraceRecorder(str(path), {'screen_size': [1920, 1080], 'cursor': [0, 540],
+                                             'mapping': mapping_metadata(config)})
+        for frame_id in range(10):
+            gesture_data = {'gesture': 'cursor_move', 'cursor_pos': {'x': 0.4 + 0.02 * frame_id, 'y': 0.5},
+                            'confidence': 0.9}
+            recorder.record_frame(10.0 + frame_id / 30, frame_id, None, gesture_data)
+        recorder.record_frame(11.0, 10, None, {'gesture': 'scroll_up', 'confidence': 0.7})
+        recorder.close()
+        calls = TraceReplayer(str(path)).replay().calls
+        return [args[0] for _, call, args in calls if call == 'move_to'], [c for _, c, _ in calls if c == 'scroll']
+
+    moves, scrolls = replay({})
+    assert scrolls == ['scroll']
+    strict_moves, scrolls = replay({'gestures': {'min_confidence': {'scroll_up': 0.8}},
+                                    'cursor': {'extra_latency': 0.1}})
+    assert scrolls == []
+    # Extrapolating over the display latency leads the hand moving right
+    assert strict_moves[-1] > moves[-1]
+
+
+def test_replay_runs_macro_steps_on_frames_without_a_gesture(tmp_path):
+    """Test that a macro finishes over frames without a hand, and at the end of the trace."""
+    def replay(frames):
+        path = tmp_path / 'shutdown.hgt'
+        if path.exists():
+            path.unlink()
+        recorder = TraceRecorder(str(path), {'screen_size': [1920, 1080]})
+        recorder.record_frame(10.0, 0, None, {'gesture': 'show_shutdown_options', 'confidence': 0.9})
+        for frame_id in range(1, frames):
+            recorder.record_frame(10.0 + frame_id / 30, frame_id, None, None)
+        recorder.close()
+        return [(t, call, args) for t, call, args in TraceReplayer(str(path)).replay().calls]
+
+    shutdown = [(10.0, 'hotkey', ('win', 'x')), (10.5, 'press', ('u',))]
+    calls = replay(frames=30)
+    assert [(call, args) for _, call, args in calls] == [(call, args) for _, call, args in shutdown]
+    assert 10.5 <= calls[1][0] < 10.5 + 1 / 30
+    assert replay(frames=3) == shutdown
+
+
+def test_live_session_replays_identically_with_prediction(tmp_path):
+    """Test that a recorded session with latency compensation replays to the same inputs."""
+    path = tmp_path / 'live.hgt'
+    config = load_config()
+    assert config['cursor']['prediction']
+    clock = VirtualClock(10.0)
+    bus = EventBus()
+    recorder = TraceRecorder(str(path), {'screen_size': [1920, 1080], 'cursor': [960, 540],
+                                         'mapping': mapping_metadata(config)})
+    recorder.attach(bus)
+    actuator = RecordingActuator(clock=clock, cursor=(960, 540), sink=recorder.record_actuation)
+    mapping = GestureMapping(clock=clock, actuator=actuator, min_confidence=config['gestures']['min_confidence'],
+                             cursor_predictor=create_cursor_predictor(config['cursor']),
+                             sequences=config['gestures']['sequences'], dispatch_sink=recorder.record_dispatch)
+    for frame_id in range(180):
+        timestamp = 10.0 + frame_id / 30
+        clock.set(timestamp)
+        mapping.macros.run_pending()
+        if frame_id < 60:
+            gesture_data = {'gesture': 'cursor_move', 'confidence': 0.9,
+                            'cursor_pos': {'x': 0.3 + 0.4 * np.sin(frame_id / 10) ** 2, 'y': 0.6}}
+        elif frame_id < 150:
+            gesture_data = {'gesture': 'cursor_move', 'confidence': 0.9, 'cursor_pos': {'x': 0.5, 'y': 0.5}}
+        elif frame_id == 155:
+            gesture_data = {'gesture': 'show_shutdown_options', 'confidence': 0.9}
+        else:
+            gesture_data = {}
+        event = GestureEvent(frame_id, gesture_data.get('gesture'), gesture_data, timestamp)
+        bus.publish(event)
+        if event.gesture and frame_id % 7:
+            # Actuation runs later, by a varying latency; every seventh frame is dropped by its queue
+            clock.advance(0.02 + 0.005 * (frame_id % 4))
+            mapping.on_gesture_event(event)
+    clock.advance(1.0)
+    mapping.macros.run_pending()
+    recorder.close()
+
+    assert mapping.cursor_predictor.latency > 0.02
+    recorded = [(call, args) for _, call, args in TraceReplayer(str(path)).recorded_actuations()]
+    assert {'move_to', 'click', 'hotkey', 'press'} <= {call for call, _ in recorded}
+    replayed = [(call, args) for _, call, args in TraceReplayer(str(path)).replay().calls]
+    assert replayed == recorded
+
+
+def test_recording_actuator_forwards_and_records():
+    """Test that a delegate receives calls while the sink records them."""
+    class Delegate:
+        def __init__(self):
+            self.pressed = []
+
+        def size(self):
+            return (800, 600)
+
+        def press(self, key):
+            self.pressed.append(key)
+
+    delegate = Delegate()
+    sunk = []
+    actuator = RecordingActuator(delegate, clock=VirtualClock(5.0), sink=lambda *call: sunk.append(call))
+    actuator.press('enter')
+    assert delegate.pressed == ['enter']
+    assert actuator.size() == (800, 600)
+    assert sunk == [(5.0, 'press', ('enter',))]
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from src.gesture_recognition.confidence import GESTURES, classify_poses
+from src.gesture_recognition.gesture_detector import GestureDetector
+from src.gesture_recognition.gesture_mapping import GestureMapping
+from src.gesture_recognition.landmarks import canonicalize
+from src.gesture_recognition.synthetic_hands import POSES, SyntheticHands, hand_pose
+from src.utils.clock import VirtualClock
+from src.utils.session_trace import RecordingActuator
+
+
+def test_every_pose_is_recognized_by_its_rule():
+    """Test that each generated pose is classified as its gesture, in the canonical frame."""
+    hands = hand_pose(np.array(list(POSES.values())))
+    assert np.allclose(hands[:, 0], 0.0) and np.allclose(hands[:, 9], [0.0, -1.0, 0.0])
+    gestures, confidences = classify_poses(canonicalize(hands))
+    assert [GESTURES[index] for index in gestures] == list(POSES)
+    assert confidences.min() > 0.8
+
+
+def test_stream_is_labelled_continuous_and_reproducible():
+    """Test that chunks join into one time line and held poses classify as their labels."""
+    chunks = list(SyntheticHands(seed=4, path='random_walk').stream(10000, chunk_size=3000))
+    assert [len(chunk.labels) for chunk in chunks] == [3000, 3000, 3000, 1000]
+    landmarks = np.concatenate([chunk.landmarks for chunk in chunks])
+    labels = np.concatenate([chunk.labels for chunk in chunks])
+    timestamps = np.concatenate([chunk.timestamps for chunk in chunks])
+    assert landmarks.dtype == np.float32 and landmarks.shape == (10000, 21, 3)
+    assert np.allclose(np.diff(timestamps), 1 / 30)
+    assert 0.0 < landmarks[..., :2].min() and landmarks[..., :2].max() < 1.0
+    held = np.isin(labels, GESTURES)
+    assert held.mean() > 0.5 and set(labels) - set(GESTURES) <= {'', 'swipe_left', 'swipe_right'}
+    gestures, _ = classify_poses(canonicalize(landmarks[held], aspect_ratio=4 / 3))
+    assert np.mean(np.array(GESTURES)[gestures] == labels[held]) > 0.98
+    again = next(SyntheticHands(seed=4, path='random_walk').stream(3000))
+    assert np.array_equal(again.landmarks, chunks[0].landmarks)
+
+
+def test_scripted_sequence_drives_the_detector_and_mapping():
+    """Test that swipes are recognized once each and a combo reaches the actuator."""
+    clock = VirtualClock()
+    generator = SyntheticHands(seed=3, path='still')
+    detector = GestureDetector(clock=clock, draw=False)
+    detector.aspect_ratio = generator.aspect_ratio
+    actuator = RecordingActuator(clock=clock)
+    mapping = GestureMapping(clock=clock, actuator=actuator)
+
+    frames = generator.sequence(['cursor_move', 'swipe_left', 'cursor_move', 'swipe_right', 'scroll_up',
+                                 'show_shutdown_options', 'confirm_shutdown'], hold=0.6)
+    swipes = []
+    for landmarks, label, timestamp in zip(*frames):
+        clock.set(timestamp)
+        gesture_data = detector.classify_landmarks(landmarks, timestamp)
+        if gesture_data.get('gesture', '').startswith('swipe'):
+            swipes.append((gesture_data['gesture'], label))
+        if gesture_data:
+            mapping.execute_gesture(gesture_data, timestamp)
+    assert swipes == [('swipe_left', 'swipe_left'), ('swipe_right', 'swipe_right')]
+    calls = [(call, args) for _, call, args in actuator.calls if call != 'move_to']
+    shutdown = [('hotkey', ('win', 'x')), ('press', ('u',)), ('press', ('s',))]
+    assert [call for call in calls if call in shutdown] == shutdown
+
+    with pytest.raises(ValueError):
+        generator.sequence(['wave'])
+    with pytest.raises(ValueError):
+        SyntheticHands(path='spiral')
+
+
+def test_noise_does_not_repeat_after_a_short_first_call():
+    """Test that held frames of a still hand all get distinct noise, whatever the first call was."""
+    generator = SyntheticHands(seed=5, path='still')
+    generator.sequence(['cursor_click'], hold=0.1)
+    frames = generator.sequence(['cursor_click'], hold=3.0)
+    held = frames.landmarks[frames.labels != ''].reshape(-1, 63)
+    assert len(held) > 80
+    assert len(np.unique(held, axis=0)) == len(held)
+
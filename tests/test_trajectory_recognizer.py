@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from src.gesture_recognition.gesture_detector import GestureDetector
+from src.gesture_recognition.gesture_mapping import GestureMapping
+from src.gesture_recognition.synthetic_hands import POSES, hand_pose
+from src.gesture_recognition.trajectory_recognizer import TrajectoryRecognizer
+from src.utils.clock import VirtualClock
+from src.utils.session_trace import RecordingActuator
+
+FRAME_TIME = 1 / 30
+
+
+@pytest.fixture
+def recognizer():
+    return TrajectoryRecognizer(window_size=10)
+
+
+def _feed(recognizer, xs, ys, start_time=0.0):
+    """Feed a path of trajectory points and collect the emitted gestures."""
+    events = []
+    n_points = len(recognizer.tracked_landmarks)
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        points = np.tile([x, y], (n_points, 1))
+        gesture = recognizer.update(points, start_time + i * FRAME_TIME)
+        if gesture:
+            events.append(gesture)
+    return events
+
+
+def test_swipe_right_detected_once(recognizer):
+    """Test that a fast horizontal sweep emits a single swipe event."""
+    xs = np.linspace(0.2, 0.8, 12)
+    events = _feed(recognizer, xs, np.full(12, 0.5))
+    assert events == ['swipe_right']
+
+
+def test_swipe_left_detected(recognizer):
+    """Test that a sweep in the opposite direction emits swipe_left."""
+    xs = np.linspace(0.8, 0.2, 12)
+    assert _feed(recognizer, xs, np.full(12, 0.5)) == ['swipe_left']
+
+
+def test_stationary_hand_is_not_a_swipe(recognizer):
+    """Test that jitter around a fixed point does not emit events."""
+    rng = np.random.default_rng(0)
+    xs = 0.5 + rng.normal(0, 0.005, 60)
+    ys = 0.5 + rng.normal(0, 0.005, 60)
+    assert _feed(recognizer, xs, ys) == []
+
+
+def test_slow_drift_is_not_a_swipe(recognizer):
+    """Test that slow movement across the frame is ignored."""
+    xs = np.linspace(0.2, 0.8, 120)
+    assert _feed(recognizer, xs, np.full(120, 0.5)) == []
+
+
+def test_vertical_motion_is_not_a_swipe(recognizer):
+    """Test that a fast vertical sweep is not reported as horizontal."""
+    ys = np.linspace(0.1, 0.9, 12)
+    assert _feed(recognizer, np.full(12, 0.5), ys) == []
+
+
+def test_reset_discards_partial_trajectory(recognizer):
+    """Test that losing the hand mid-swipe discards the partial path."""
+    _feed(recognizer, np.linspace(0.2, 0.35, 4), np.full(4, 0.5))
+    recognizer.reset()
+    events = _feed(recognizer, np.linspace(0.35, 0.45, 4), np.full(4, 0.5), start_time=1.0)
+    assert events == []
+
+
+def test_only_the_open_hand_swipes_and_never_clicks_mid_sweep():
+    """Test that a fast pointing hand keeps moving the cursor while the open hand swipes without clicking."""
+    def sweep(pose):
+        clock = VirtualClock()
+        detector = GestureDetector(clock=clock, draw=False)
+        detector.aspect_ratio = 4 / 3
+        actuator = RecordingActuator(clock=clock)
+        mapping = GestureMapping(clock=clock, actuator=actuator)
+        hand = hand_pose(np.array(POSES[pose]))[0] * 0.15
+        hand[:, 0] /= detector.aspect_ratio
+        results, calls = [], []
+        for frame in range(30):
+            # Still until frame 15, then 0.05 to the right per frame until frame 23
+            clock.set(frame * FRAME_TIME)
+            x = 0.3 + 0.05 * min(max(frame - 15, 0), 8)
+            result = detector.classify_landmarks(hand + [x, 0.6, 0.0], frame * FRAME_TIME)
+            count = len(actuator.calls)
+            if result:
+                mapping.execute_gesture(result, frame * FRAME_TIME)
+            results.append(result)
+            calls.append([call for _, call, _ in actuator.calls[count:] if call != 'move_to'])
+        return results, calls
+
+    pointing, _ = sweep('cursor_move')
+    assert all(result['gesture'] == 'cursor_move' and 'cursor_pos' in result for result in pointing)
+    results, calls = sweep('cursor_click')
+    swipes = [frame for frame, result in enumerate(results) if result.get('gesture', '').startswith('swipe')]
+    assert len(swipes) == 1 and 'cursor_pos' not in results[swipes[0]]
+    assert all(frame_calls == ['click'] for frame_calls in calls[:16] + calls[24:])
+    assert [call for frame_calls in calls[16:24] for call in frame_calls] == ['press']
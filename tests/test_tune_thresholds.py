@@ -0,0 +1,52 @@
+import os
+import numpy as np
+import pytest
+from src.gesture_recognition.confidence import GESTURES, classify_poses
+from src.gesture_recognition.landmarks import canonicalize, normalize_to_dataset, format_dataset_row, DATASET_COLUMNS
+from src.scripts.tune_thresholds import (CLASSES, NONE, load_samples, grid_candidates, search, evaluate,
+                                         tune_min_confidence)
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'gesture_recognition',
+                            'gesture_data', 'gesture_data.csv')
+TRUE_THRESHOLDS = {'scroll_gap': 0.3, 'touch_distance': 0.7}
+
+
+@pytest.fixture
+def labelled_dataset(tmp_path):
+    """Random hands labelled by the rules with known thresholds."""
+    hands = np.random.default_rng(5).random((3000, 21, 3))
+    gestures, _ = classify_poses(canonicalize(hands), TRUE_THRESHOLDS)
+    path = tmp_path / 'poses.csv'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(','.join(DATASET_COLUMNS) + '\n')
+        for hand, gesture in zip(normalize_to_dataset(hands), gestures):
+            f.write(format_dataset_row(GESTURES[gesture] if gesture >= 0 else 'none', hand) + '\n')
+    return str(path)
+
+
+def test_search_recovers_the_labelling_thresholds(labelled_dataset):
+    """Test that a parallel grid search finds thresholds reproducing every label."""
+    truth, landmarks = load_samples([labelled_dataset])
+    assert len(set(truth.tolist())) > 3
+    report = search(truth, landmarks, grid_candidates(10), workers=2)
+    confusion = np.array(report['confusion'])
+    assert report['macro_f1'] == pytest.approx(1.0)
+    assert confusion.sum() == len(truth)
+    assert np.count_nonzero(confusion - np.diag(np.diag(confusion))) == 0
+    assert evaluate(truth, landmarks, {'scroll_gap': 0.9, 'touch_distance': 0.1})['macro_f1'] < 1.0
+
+
+def test_minimum_confidence_filters_marginal_false_positives():
+    """Test that a gesture's minimum confidence is raised just enough to reject weak false positives."""
+    scroll_up = GESTURES.index('scroll_up')
+    truth = np.array([scroll_up, scroll_up, NONE, NONE])
+    predicted = np.array([scroll_up, scroll_up, scroll_up, NONE])
+    confidences = np.array([0.9, 0.6, 0.2, 0.0])
+    assert tune_min_confidence(truth, predicted, confidences) == {'scroll_up': 0.25}
+
+
+def test_swipe_only_dataset_is_rejected():
+    """Test that datasets without static gesture labels are reported rather than tuned on."""
+    with pytest.raises(ValueError):
+        load_samples([DATASET_PATH])
+    assert CLASSES[NONE] == 'none'